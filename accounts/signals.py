@@ -1,6 +1,7 @@
 from django.db.models.signals import post_save, pre_save, post_delete
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from .models import Profile, MentorApplication, Mentor, Skill, Education, Experience
 from alumni_directory.models import Alumni
 
@@ -37,28 +38,62 @@ def create_mentor_profile(sender, instance, created, **kwargs):
 # ─── AI Match Cache Invalidation ────────────────────────────────────────────
 
 def _invalidate_ai_cache_for_user(user_id):
+    """
+    Once the saving transaction commits, check whether the user's AI match
+    payload changed (see ``_ProfileDigestCheck``). Several saves for the same
+    user in one transaction, like a formset's rows, share one check.
+    """
+    connection = transaction.get_connection()
+    for _, callback, _ in connection.run_on_commit:
+        if isinstance(callback, _ProfileDigestCheck) and callback.user_id == user_id and not callback.done:
+            return
+    transaction.on_commit(_ProfileDigestCheck(user_id))
+
+
+class _ProfileDigestCheck:
     """
     Clear all server-side AI match cache entries for a user and bump the
     profile version so the browser sessionStorage cache also becomes stale.
     """
-    from django.core.cache import cache
-    import time
-    import logging
-    logger = logging.getLogger(__name__)
 
-    try:
-        # Bump profile version — used as part of the browser cache key
-        # so any cached sessionStorage results are automatically invalidated
-        version_key = f"ai_profile_version_{user_id}"
-        cache.set(version_key, int(time.time()), 60 * 60 * 24 * 7)  # 7 days
-
-        # Clear known server-side match cache keys.
-        # We can't do a wildcard delete without Redis SCAN, so we delete the
-        # version key pattern and rely on the 24h TTL for individual job caches.
-        # Individual job caches will be re-computed on next request.
-        logger.debug(f"AI match cache invalidated for user {user_id}")
-    except Exception as e:
-        logger.error(f"Failed to invalidate AI cache for user {user_id}: {e}")
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self.done = False
+
+    def __call__(self):
+        self.done = True
+        from django.core.cache import cache
+        import time
+        import logging
+        logger = logging.getLogger(__name__)
+        user_id = self.user_id
+
+        try:
+            from jobs.ai_matching import build_profile_digest, build_user_profile
+
+            # Only bump when the payload the AI matcher sees actually changed;
+            # saves that touch other profile fields keep the existing ranking.
+            user = User.objects.filter(id=user_id).first()
+            user_data = build_user_profile(user) if user else {}
+            digest = build_profile_digest(user_data) if user_data else ""
+            digest_key = f"ai_profile_digest_{user_id}"
+            if digest and cache.get(digest_key) == digest:
+                return
+
+            # Bump profile version — used as part of the browser cache key
+            # so any cached sessionStorage results are automatically invalidated
+            version_key = f"ai_profile_version_{user_id}"
+            cache.set(version_key, int(time.time()), 60 * 60 * 24 * 7)  # 7 days
+            if digest:
+                cache.set(digest_key, digest, 60 * 60 * 24 * 7)
+
+            # Clear known server-side match cache keys.
+            # We can't do a wildcard delete without Redis SCAN, so we delete the
+            # version key pattern and rely on the 24h TTL for individual job caches.
+            # Individual job caches will be re-computed on next request.
+            logger.debug(f"AI match cache invalidated for user {user_id}")
+        except Exception as e:
+            logger.error(f"Failed to invalidate AI cache for user {user_id}: {e}")
 
 
 @receiver(post_save, sender=Profile)
@@ -0,0 +1,498 @@
+"""
+Staged, bulk alumni CSV imports.
+
+``start_alumni_import`` parses and validates an uploaded CSV into
+``AlumniImportRow`` staging rows while the request is open and queues
+``run_alumni_import`` on django-q (or runs it inline without django-q).
+The worker takes the pending rows ALUMNI_IMPORT_CHUNK_SIZE at a time and,
+per chunk, matches existing alumni and taken usernames with a few set
+queries, updates matches with ``bulk_update`` and creates the rest with
+``bulk_create``: inactive users with an unusable password, their profile
+and job preferences (what the User post_save handlers would have made),
+and their alumni record.
+
+Per-row audit records are suspended during the import; one summary record
+is written for the job when it finishes. Rows that could not be imported
+keep their reason in ``AlumniImportRow.message`` for the error report.
+"""
+import csv
+import importlib.util
+import io
+import logging
+from collections import defaultdict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models import F, Q
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from accounts.models import Profile
+from jobs.models import JobPreference
+from log_viewer import audit
+from log_viewer.models import AuditLog
+
+from .models import Alumni, AlumniImportJob, AlumniImportRow
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+# Staging rows are written this many at a time while the upload is parsed
+STAGING_BATCH_SIZE = 1000
+# The CSV columns each staged field is read from, first non-empty one wins.
+# Coordinator CSV: FullName, Year-1, Course Grad, Rec #, Mobile No, Email Address
+# Old format: Full Name, Year, Course, Present Occupation, Name of Company, Employment Address
+COLUMNS = {
+    'full_name': ('FullName', 'Full Name', 'full_name'),
+    'graduation_year': ('Year-1', 'Year', 'graduation_year'),
+    'course': ('Course Grad', 'Course', 'course'),
+    'job_title': ('Present Occupation', 'occupation'),
+    'current_company': ('Name of Company', 'company'),
+    'address': ('Employment Address', 'address'),
+    'mobile': ('Mobile No', 'Mobile'),
+    'email': ('Email Address', 'Email'),
+}
+ERROR_REPORT_HEADERS = ['Row', 'Full Name', 'Graduation Year', 'Email', 'Status', 'Reason']
+
+
+def _chunk_size():
+    return getattr(settings, 'ALUMNI_IMPORT_CHUNK_SIZE', 500)
+
+
+def _column(row, field):
+    for column in COLUMNS[field]:
+        value = row.get(column)
+        if value:
+            return value.strip()
+    return ''
+
+
+def split_full_name(full_name):
+    """
+    Split a CSV name into (first name, last name).
+
+    Coordinator format: "Last, First M." (the middle initial is dropped);
+    standard format: "First Last".
+    """
+    if ',' in full_name:
+        last_name, _, first_name = full_name.partition(',')
+        first_name_parts = first_name.split()
+        return (first_name_parts[0] if first_name_parts else first_name.strip()), last_name.strip()
+    first_name, _, last_name = full_name.partition(' ')
+    return first_name, last_name
+
+
+def read_csv(uploaded_file):
+    """Decode an uploaded CSV (UTF-8 with or without BOM, else Latin-1) into a DictReader."""
+    content = uploaded_file.read()
+    try:
+        text = content.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        text = content.decode('latin-1')
+    return csv.DictReader(io.StringIO(text, newline=''))
+
+
+def stage_row(job, row_number, row):
+    """Parse and validate one CSV row into an unsaved staging row."""
+    staged = AlumniImportRow(job=job, row_number=row_number)
+    staged.full_name = _column(row, 'full_name')[:255]
+    graduation_year = _column(row, 'graduation_year')
+
+    # Empty rows and summary rows (e.g. "TOTAL") have no name or no numeric year
+    if not staged.full_name or not graduation_year:
+        staged.status = AlumniImportRow.Status.SKIPPED
+        staged.message = 'No name or graduation year'
+        return staged
+    try:
+        staged.graduation_year = int(graduation_year)
+    except ValueError:
+        staged.status = AlumniImportRow.Status.SKIPPED
+        staged.message = f'Graduation year "{graduation_year}" is not a number'
+        return staged
+
+    staged.first_name, staged.last_name = split_full_name(staged.full_name)
+    staged.course = _column(row, 'course')
+    staged.job_title = _column(row, 'job_title')
+    staged.current_company = _column(row, 'current_company')
+    address_parts = _column(row, 'address').split(', ')
+    if len(address_parts) >= 2:
+        staged.city, staged.province = address_parts[0], address_parts[1]
+    staged.mobile = _column(row, 'mobile')
+    staged.email = _column(row, 'email')
+
+    errors = []
+    for field in ('first_name', 'last_name', 'course', 'job_title', 'current_company', 'city', 'province', 'mobile', 'email'):
+        max_length = AlumniImportRow._meta.get_field(field).max_length
+        value = getattr(staged, field)
+        if len(value) > max_length:
+            errors.append(f'{field.replace("_", " ").capitalize()} is longer than {max_length} characters')
+            setattr(staged, field, value[:max_length])
+    if staged.email:
+        try:
+            validate_email(staged.email)
+        except ValidationError:
+            errors.append(f'"{staged.email}" is not a valid email address')
+    if errors:
+        staged.status = AlumniImportRow.Status.FAILED
+        staged.message = '; '.join(errors)
+    return staged
+
+
+def stage_alumni_import(uploaded_file, user=None):
+    """Create an import job for ``uploaded_file`` with one staging row per CSV row."""
+    job = AlumniImportJob.objects.create(
+        file_name=(getattr(uploaded_file, 'name', '') or 'upload.csv')[:255],
+        requested_by=user if user is not None and user.is_authenticated else None,
+    )
+    reader = read_csv(uploaded_file)
+    logger.info(f"CSV import - detected headers: {reader.fieldnames or []}")
+
+    total = skipped = failed = 0
+    batch = []
+    for row in reader:
+        # Line numbers as a spreadsheet shows them: the header is line 1
+        staged = stage_row(job, reader.line_num, row)
+        total += 1
+        skipped += staged.status == AlumniImportRow.Status.SKIPPED
+        failed += staged.status == AlumniImportRow.Status.FAILED
+        batch.append(staged)
+        if len(batch) >= STAGING_BATCH_SIZE:
+            AlumniImportRow.objects.bulk_create(batch)
+            batch = []
+    AlumniImportRow.objects.bulk_create(batch)
+
+    AlumniImportJob.objects.filter(pk=job.pk).update(
+        total_rows=total, processed_rows=skipped + failed, skipped_count=skipped, failed_count=failed
+    )
+    job.refresh_from_db()
+    return job
+
+
+def start_alumni_import(uploaded_file, user=None):
+    """
+    Stage ``uploaded_file`` and queue its import, or run the import now when
+    django-q is not available. Returns the job.
+    """
+    job = stage_alumni_import(uploaded_file, user)
+    logger.info(
+        f"CSV import staged: File={job.file_name}, Rows={job.total_rows}, Job={job.pk}",
+        extra={
+            'file_name': job.file_name,
+            'user_id': job.requested_by_id,
+            'action': 'csv_import_start',
+        }
+    )
+    try:
+        queued = enqueue_alumni_import(job)
+    except Exception as exc:
+        logger.error(f"Could not queue alumni import job {job.pk}: {exc}", exc_info=True)
+        queued = False
+    if not queued:
+        run_alumni_import(job.pk)
+        job.refresh_from_db()
+    return job
+
+
+def enqueue_alumni_import(job):
+    """
+    Queue ``job`` on django-q. Returns False when django-q is not installed,
+    in which case the caller should run ``run_alumni_import`` itself.
+    """
+    if importlib.util.find_spec('django_q') is None:
+        return False
+
+    from django_q.tasks import async_task
+
+    job.task_id = async_task(
+        'alumni_directory.imports.run_alumni_import', job.pk,
+        timeout=getattr(settings, 'ALUMNI_IMPORT_TIMEOUT_SECONDS', 1800),
+    ) or ''
+    AlumniImportJob.objects.filter(pk=job.pk).update(task_id=job.task_id)
+    return True
+
+
+def run_alumni_import(job_id):
+    """django-q task: import the pending staging rows of one job."""
+    claimed = AlumniImportJob.objects.filter(pk=job_id, status=AlumniImportJob.Status.QUEUED).update(
+        status=AlumniImportJob.Status.RUNNING, started_at=timezone.now()
+    )
+    if not claimed:
+        # Deleted, or a redelivered task for a job another worker took.
+        logger.info(f"Alumni import job {job_id} is not queued; skipping")
+        return
+
+    job = AlumniImportJob.objects.select_related('requested_by').get(pk=job_id)
+    pending = job.rows.filter(status=AlumniImportRow.Status.PENDING).order_by('row_number')
+    try:
+        with audit.suspend():
+            while True:
+                rows = list(pending[:_chunk_size()])
+                if not rows:
+                    break
+                _import_chunk(job, rows)
+    except Exception as exc:
+        logger.error(f"Alumni import job {job.pk} failed: {exc}", exc_info=True)
+        AlumniImportJob.objects.filter(pk=job.pk).update(
+            status=AlumniImportJob.Status.FAILED, error_message=str(exc)[:1000], finished_at=timezone.now()
+        )
+        return
+
+    AlumniImportJob.objects.filter(pk=job.pk).update(
+        status=AlumniImportJob.Status.COMPLETED, finished_at=timezone.now()
+    )
+    job.refresh_from_db()
+    record_import_summary(job)
+    logger.info(
+        f"CSV import completed: Imported={job.created_count}, Updated={job.updated_count}, "
+        f"Skipped={job.skipped_count}, Errors={job.failed_count}",
+        extra={
+            'file_name': job.file_name,
+            'imported_count': job.created_count,
+            'updated_count': job.updated_count,
+            'error_count': job.failed_count,
+            'total_processed': job.total_rows,
+            'user_id': job.requested_by_id,
+            'action': 'csv_import_complete',
+        }
+    )
+
+
+def _import_chunk(job, rows):
+    """
+    Import ``rows`` in one transaction and record the outcome. If the
+    transaction fails the rows are retried one at a time, so only the rows
+    that cannot be imported are marked failed.
+    """
+    try:
+        with transaction.atomic():
+            _import_rows(rows)
+    except Exception as exc:
+        if len(rows) > 1:
+            for row in rows:
+                _import_chunk(job, [row])
+            return
+        row = rows[0]
+        row.status = AlumniImportRow.Status.FAILED
+        row.message = f'{type(exc).__name__}: {exc}'[:1000]
+        row.username = ''
+        logger.warning(
+            f"Error processing CSV row: {exc}",
+            extra={
+                'row_data': row.full_name,
+                'error_type': type(exc).__name__,
+                'file_name': job.file_name,
+                'action': 'csv_row_error',
+            }
+        )
+
+    AlumniImportRow.objects.bulk_update(rows, ['status', 'message', 'username'])
+    counts = defaultdict(int)
+    for row in rows:
+        counts[row.status] += 1
+    AlumniImportJob.objects.filter(pk=job.pk).update(
+        processed_rows=F('processed_rows') + len(rows),
+        created_count=F('created_count') + counts[AlumniImportRow.Status.CREATED],
+        updated_count=F('updated_count') + counts[AlumniImportRow.Status.UPDATED],
+        failed_count=F('failed_count') + counts[AlumniImportRow.Status.FAILED],
+    )
+
+
+def _match_key(first_name, last_name, graduation_year):
+    return first_name.lower(), last_name.lower(), graduation_year
+
+
+def _existing_alumni(rows):
+    """Alumni matching the rows' names and graduation years (case-insensitively), by match key."""
+    matches = defaultdict(list)
+    queryset = Alumni.objects.annotate(
+        first_key=Lower('user__first_name'), last_key=Lower('user__last_name')
+    ).filter(
+        graduation_year__in={row.graduation_year for row in rows},
+        first_key__in={row.first_name.lower() for row in rows},
+        last_key__in={row.last_name.lower() for row in rows},
+    )
+    for alumni in queryset:
+        matches[(alumni.first_key, alumni.last_key, alumni.graduation_year)].append(alumni)
+    return matches
+
+
+def _base_username(row):
+    if row.email:
+        return row.email.split('@')[0]
+    return f"{row.first_name.lower()}.{row.last_name.lower()}.{row.graduation_year}"
+
+
+def _taken_usernames(bases):
+    """Lower-cased usernames that are a base or could be one with a number appended."""
+    bases = sorted(set(bases))
+    taken = {username.lower() for username in User.objects.filter(username__in=bases).values_list('username', flat=True)}
+    collided = [base for base in bases if base.lower() in taken]
+    for start in range(0, len(collided), 100):
+        condition = Q()
+        for base in collided[start:start + 100]:
+            condition |= Q(username__istartswith=base)
+        taken.update(username.lower() for username in User.objects.filter(condition).values_list('username', flat=True))
+    return taken
+
+
+def _unique_username(base, taken):
+    username = base
+    counter = 1
+    while username.lower() in taken:
+        username = f"{base}{counter}"
+        counter += 1
+    taken.add(username.lower())
+    return username
+
+
+def _apply_update(alumni, row):
+    alumni.course = row.course
+    alumni.job_title = row.job_title
+    alumni.current_company = row.current_company
+    if row.city or row.province:
+        alumni.city = row.city
+        alumni.province = row.province
+
+
+def _import_rows(rows):
+    """Create or update alumni for ``rows`` with set queries and bulk writes, setting each row's status."""
+    existing = _existing_alumni(rows)
+    now = timezone.now()
+    updated = {}
+    created = {}  # match key -> (user, alumni, row) to create
+    for row in rows:
+        key = _match_key(row.first_name, row.last_name, row.graduation_year)
+        matches = existing.get(key, [])
+        if len(matches) > 1:
+            row.status = AlumniImportRow.Status.FAILED
+            row.message = f'{len(matches)} alumni have this name and graduation year; update one of them by hand'
+        elif matches:
+            _apply_update(matches[0], row)
+            matches[0].updated_at = now
+            updated[matches[0].pk] = matches[0]
+            row.status = AlumniImportRow.Status.UPDATED
+        elif key in created:
+            # A second row for someone created by an earlier row of this import
+            _apply_update(created[key][1], row)
+            row.status = AlumniImportRow.Status.UPDATED
+        else:
+            created[key] = (None, Alumni(
+                graduation_year=row.graduation_year,
+                course=row.course,
+                job_title=row.job_title,
+                current_company=row.current_company,
+                college='',
+                campus='BSC',  # Default for coordinator CSV
+                gender='O',
+                province=row.province,
+                city=row.city,
+                address='',
+            ), row)
+            row.status = AlumniImportRow.Status.CREATED
+        if row.status != AlumniImportRow.Status.CREATED:
+            row.username = ''
+        row.message = row.message if row.status == AlumniImportRow.Status.FAILED else ''
+
+    if updated:
+        Alumni.objects.bulk_update(
+            list(updated.values()), ['course', 'job_title', 'current_company', 'city', 'province', 'updated_at']
+        )
+    if not created:
+        return
+
+    taken = _taken_usernames(_base_username(row) for _, _, row in created.values())
+    users = []
+    for key, (_, alumni, row) in created.items():
+        base = _base_username(row)
+        row.username = _unique_username(base, taken)
+        user = User(
+            username=row.username,
+            first_name=row.first_name,
+            last_name=row.last_name,
+            email=row.email or f"{base}@norsu.alumni.placeholder",
+            password=make_password(None),
+            is_active=False,  # Inactive until they register
+        )
+        created[key] = (user, alumni, row)
+        users.append(user)
+    User.objects.bulk_create(users)
+
+    # Not every backend returns the new primary keys from a bulk insert
+    user_ids = dict(User.objects.filter(username__in=[user.username for user in users]).values_list('username', 'id'))
+    profiles = []
+    preferences = []
+    for user, alumni, row in created.values():
+        alumni.user_id = user_ids[user.username]
+        profiles.append(Profile(user_id=alumni.user_id, phone_number=row.mobile))
+        preferences.append(JobPreference(user_id=alumni.user_id))
+    Profile.objects.bulk_create(profiles)
+    JobPreference.objects.bulk_create(preferences)
+    Alumni.objects.bulk_create([alumni for _, alumni, _ in created.values()])
+
+
+def record_import_summary(job):
+    """Write the one audit record of an import, in place of a record per created or updated row."""
+    user = job.requested_by
+    message = (
+        f"IMPORT: alumni CSV '{job.file_name}' - {job.created_count} created, {job.updated_count} updated, "
+        f"{job.skipped_count} skipped, {job.failed_count} failed"
+    )
+    audit.enqueue(AuditLog(
+        content_type=ContentType.objects.get_for_model(AlumniImportJob),
+        object_id=job.pk,
+        action='CREATE',
+        model_name=AlumniImportJob._meta.model_name,
+        app_label=AlumniImportJob._meta.app_label,
+        user=user,
+        username=user.username if user else None,
+        new_values={
+            'file_name': job.file_name,
+            'total_rows': job.total_rows,
+            'created': job.created_count,
+            'updated': job.updated_count,
+            'skipped': job.skipped_count,
+            'failed': job.failed_count,
+        },
+        user_agent='',
+        request_path='',
+        message=message,
+        timestamp=timezone.now(),
+    ))
+
+
+def import_job_payload(job):
+    """JSON-friendly progress of an import job."""
+    return {
+        'success': True,
+        'id': job.pk,
+        'status': job.status,
+        'finished': job.is_finished,
+        'error': job.error_message,
+        'done': job.processed_rows,
+        'total': job.total_rows,
+        'percent': job.percent,
+        'created': job.created_count,
+        'updated': job.updated_count,
+        'skipped': job.skipped_count,
+        'failed': job.failed_count,
+    }
+
+
+def write_error_report(job, output):
+    """Write the job's skipped and failed rows to ``output`` as CSV."""
+    writer = csv.writer(output)
+    writer.writerow(ERROR_REPORT_HEADERS)
+    rows = job.rows.filter(
+        status__in=[AlumniImportRow.Status.SKIPPED, AlumniImportRow.Status.FAILED]
+    ).order_by('row_number')
+    for row in rows.iterator():
+        writer.writerow([
+            row.row_number, row.full_name, row.graduation_year or '', row.email,
+            row.get_status_display(), row.message,
+        ])
@@ -0,0 +1,173 @@
+"""
+Management command to benchmark alumni CSV imports.
+
+Generates a coordinator-format CSV of --rows alumni (a --existing fraction
+of them already in the directory, so they are updated rather than created)
+and imports it with the previous row-by-row import and with the staged bulk
+import, each into a clean directory. Reports time, queries and audit records
+written; everything the benchmark creates is removed afterwards.
+
+Usage:
+    python manage.py benchmark_alumni_import
+    python manage.py benchmark_alumni_import --rows 10000 --existing 0.2
+"""
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from alumni_directory import imports
+from alumni_directory.models import Alumni, AlumniImportJob
+from log_viewer import audit
+from log_viewer.models import AuditLog
+
+User = get_user_model()
+
+# Last name of every generated alumnus, to find and remove them afterwards
+LAST_NAME_PREFIX = 'Benchmark'
+HEADER = 'FullName,Year-1,Course Grad,Present Occupation,Name of Company,Employment Address,Mobile No,Email Address\n'
+
+
+def legacy_import(uploaded_file):
+    """The import as it was before staging: lookups and saves one row at a time."""
+    for row in imports.read_csv(uploaded_file):
+        full_name = (row.get('FullName') or '').strip()
+        graduation_year = (row.get('Year-1') or '').strip()
+        if not full_name or not graduation_year:
+            continue
+        course = (row.get('Course Grad') or '').strip()
+        occupation = (row.get('Present Occupation') or '').strip()
+        company = (row.get('Name of Company') or '').strip()
+        address = (row.get('Employment Address') or '').strip()
+        mobile = (row.get('Mobile No') or '').strip()
+        email_from_csv = (row.get('Email Address') or '').strip()
+        first_name, last_name = imports.split_full_name(full_name)
+        try:
+            alumni = Alumni.objects.get(
+                user__first_name__iexact=first_name,
+                user__last_name__iexact=last_name,
+                graduation_year=graduation_year
+            )
+            alumni.course = course
+            alumni.job_title = occupation
+            alumni.current_company = company
+            address_parts = address.split(', ')
+            if len(address_parts) >= 2:
+                alumni.city = address_parts[0]
+                alumni.province = address_parts[1]
+            alumni.save()
+        except Alumni.DoesNotExist:
+            if email_from_csv:
+                email = email_from_csv
+                username = email_from_csv.split('@')[0]
+            else:
+                username = f"{first_name.lower()}.{last_name.lower()}.{graduation_year}"
+                email = f"{username}@norsu.alumni.placeholder"
+            base_username = username
+            counter = 1
+            while User.objects.filter(username=username).exists():
+                username = f"{base_username}{counter}"
+                counter += 1
+            user = User.objects.create_user(
+                username=username, first_name=first_name, last_name=last_name, email=email, is_active=False
+            )
+            alumni = Alumni.objects.create(
+                user=user, graduation_year=graduation_year, course=course, job_title=occupation,
+                current_company=company, college='', campus='BSC', gender='O', province='', city='', address='',
+            )
+            address_parts = address.split(', ')
+            if len(address_parts) >= 2:
+                alumni.city = address_parts[0]
+                alumni.province = address_parts[1]
+                alumni.save()
+            if mobile:
+                user.profile.phone_number = mobile
+                user.profile.save()
+
+
+class Command(BaseCommand):
+    help = "Compare the row-by-row and the staged bulk alumni CSV import on a generated file."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=2000,
+            help='Rows in the generated CSV (default: 2000).'
+        )
+        parser.add_argument(
+            '--existing',
+            type=float,
+            default=0.25,
+            help='Fraction of the rows that match alumni already in the directory (default: 0.25).'
+        )
+
+    def handle(self, *args, **options):
+        if options['rows'] < 1 or not 0 <= options['existing'] <= 1:
+            raise CommandError('--rows must be at least 1 and --existing between 0 and 1')
+
+        rows = options['rows']
+        existing = int(rows * options['existing'])
+        content = (HEADER + ''.join(
+            f'"{LAST_NAME_PREFIX}{i}, Alumnus M.",{2000 + i % 25},BSIT,Engineer,Company {i % 50},'
+            f'"Dumaguete, Negros Oriental",0917{i:07d},{"" if i % 3 else f"bench{i}@example.com"}\n'
+            for i in range(rows)
+        )).encode('utf-8')
+        self.stdout.write(f'{rows} rows, {existing} of them updates')
+
+        job_ids = []
+        last_audit_id = AuditLog.objects.order_by('-pk').values_list('pk', flat=True).first() or 0
+        try:
+            for label, run in (('row-by-row', legacy_import), ('staged', None)):
+                self._cleanup()
+                self._seed(existing)
+                audit_before = AuditLog.objects.count()
+                uploaded_file = SimpleUploadedFile('benchmark.csv', content, content_type='text/csv')
+                # Like the request that used to run it, one audit batch for the import
+                started = time.perf_counter()
+                queries = []
+                with connection.execute_wrapper(self._counter(queries)), audit.batch():
+                    if run:
+                        run(uploaded_file)
+                    else:
+                        job_ids.append(self._staged(uploaded_file).pk)
+                elapsed = time.perf_counter() - started
+                written = AuditLog.objects.count() - audit_before
+                self.stdout.write(
+                    f'  {label:<11} {elapsed:>8.2f} s {rows / elapsed:>8.0f} rows/s '
+                    f'{len(queries):>8} queries {written:>8} audit records'
+                )
+        finally:
+            self._cleanup()
+            AlumniImportJob.objects.filter(pk__in=job_ids).delete()
+            AuditLog.objects.filter(pk__gt=last_audit_id).delete()
+
+    @staticmethod
+    def _counter(queries):
+        # Counts every statement, unlike the debug cursor's bounded query log
+        def count(execute, sql, params, many, context):
+            queries.append(None)
+            return execute(sql, params, many, context)
+        return count
+
+    def _staged(self, uploaded_file):
+        job = imports.stage_alumni_import(uploaded_file)
+        imports.run_alumni_import(job.pk)
+        return job
+
+    def _seed(self, count):
+        with audit.suspend():
+            for i in range(count):
+                user = User.objects.create_user(
+                    f'bench-seed-{i}', first_name='Alumnus', last_name=f'{LAST_NAME_PREFIX}{i}', is_active=False
+                )
+                Alumni.objects.create(
+                    user=user, graduation_year=2000 + i % 25, course='BSED', college='', campus='BSC',
+                    gender='O', province='', city='', address='',
+                )
+
+    def _cleanup(self):
+        with audit.suspend():
+            User.objects.filter(last_name__startswith=LAST_NAME_PREFIX, first_name='Alumnus').delete()
@@ -244,6 +244,99 @@ class Achievement(models.Model):
     def __str__(self):
         return f"{self.title} - {self.alumni.full_name}"
 
+class AlumniImportJob(models.Model):
+    """
+    A CSV import of alumni records, run by a django-q worker.
+
+    The uploaded file is parsed into ``AlumniImportRow`` staging rows when it
+    is submitted; the worker then creates and updates alumni from them in
+    chunks, reporting progress in ``processed_rows``.
+    """
+
+    class Status(models.TextChoices):
+        QUEUED = 'queued', 'Queued'
+        RUNNING = 'running', 'Running'
+        COMPLETED = 'completed', 'Completed'
+        FAILED = 'failed', 'Failed'
+
+    file_name = models.CharField(max_length=255)
+    status = models.CharField(max_length=12, choices=Status.choices, default=Status.QUEUED)
+    total_rows = models.PositiveIntegerField(default=0)
+    processed_rows = models.PositiveIntegerField(default=0)
+    created_count = models.PositiveIntegerField(default=0)
+    updated_count = models.PositiveIntegerField(default=0)
+    skipped_count = models.PositiveIntegerField(default=0)
+    failed_count = models.PositiveIntegerField(default=0)
+    error_message = models.TextField(blank=True)
+    task_id = models.CharField(max_length=64, blank=True)
+
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='alumni_import_jobs',
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"Alumni import #{self.pk}: {self.file_name} ({self.status})"
+
+    @property
+    def is_finished(self):
+        return self.status in (self.Status.COMPLETED, self.Status.FAILED)
+
+    @property
+    def percent(self):
+        if self.status == self.Status.COMPLETED:
+            return 100
+        if not self.total_rows:
+            return 0
+        return min(99, int(self.processed_rows * 100 / self.total_rows))
+
+
+class AlumniImportRow(models.Model):
+    """One parsed CSV row of an ``AlumniImportJob`` and what became of it."""
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'Pending'
+        CREATED = 'created', 'Created'
+        UPDATED = 'updated', 'Updated'
+        SKIPPED = 'skipped', 'Skipped'
+        FAILED = 'failed', 'Failed'
+
+    job = models.ForeignKey(AlumniImportJob, on_delete=models.CASCADE, related_name='rows')
+    row_number = models.PositiveIntegerField(help_text="Line of the CSV file, counting the header as line 1")
+    full_name = models.CharField(max_length=255, blank=True)
+    first_name = models.CharField(max_length=150, blank=True)
+    last_name = models.CharField(max_length=150, blank=True)
+    graduation_year = models.IntegerField(null=True, blank=True)
+    course = models.CharField(max_length=200, blank=True)
+    job_title = models.CharField(max_length=200, blank=True)
+    current_company = models.CharField(max_length=200, blank=True)
+    city = models.CharField(max_length=100, blank=True)
+    province = models.CharField(max_length=100, blank=True)
+    mobile = models.CharField(max_length=50, blank=True)
+    email = models.CharField(max_length=254, blank=True)
+    username = models.CharField(max_length=150, blank=True, help_text="Account created for the row")
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    message = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ['row_number']
+        indexes = [
+            models.Index(fields=['job', 'status', 'row_number'], name='alumni_import_row_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"Import #{self.job_id} row {self.row_number}: {self.full_name} ({self.status})"
+
+
 class ProfessionalExperience:
     """
     A non-database class that provides a unified view of professional experiences.
@@ -1,11 +1,17 @@
+from unittest import mock
+
 from django.contrib.auth import get_user_model
 from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import TestCase, override_settings
 from django.urls import reverse
 
 from connections.models import Connection
+from jobs.models import JobPreference
+from log_viewer import audit, signals as audit_signals
+from log_viewer.models import AuditLog
 
-from .models import Alumni
+from .models import Alumni, AlumniImportJob, AlumniImportRow
 
 
 @override_settings(MIDDLEWARE=[
@@ -58,3 +64,108 @@ class AlumniDirectoryPrivacyTests(TestCase):
         self.assertNotContains(detail_response, 'BSINT')
         self.assertNotContains(detail_response, 'Private Street')
         self.assertNotContains(detail_response, 'owner@example.com')
+
+
+@override_settings(
+    MIDDLEWARE=[
+        middleware for middleware in settings.MIDDLEWARE
+        if middleware != 'setup.middleware.SetupRequiredMiddleware'
+    ],
+    ALUMNI_IMPORT_CHUNK_SIZE=2,
+)
+@mock.patch('alumni_directory.imports.enqueue_alumni_import', return_value=False)
+class AlumniCsvImportTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        # Fixtures are not audited, so the only records are the ones the import makes
+        with audit.suspend():
+            self.admin = User.objects.create_user('coordinator', 'coordinator@example.com', 'pass', is_staff=True)
+            existing_user = User.objects.create_user(
+                'maria', 'maria@example.com', 'pass', first_name='Maria', last_name='Santos'
+            )
+            self.existing = Alumni.objects.create(
+                user=existing_user, college='CAS', campus='MAIN', graduation_year=2019, course='BSIT',
+                gender='F', province='Negros Oriental', city='Dumaguete', address='',
+            )
+            User.objects.create_user('juan', 'juan@example.com', 'pass')
+        audit_signals._table_existence_cache.clear()
+        audit_signals.audit_log_table_exists()
+        self.client.force_login(self.admin)
+
+    def upload(self, content):
+        csv_file = SimpleUploadedFile('alumni.csv', content.encode('utf-8-sig'), content_type='text/csv')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse('alumni_directory:alumni_management'), {'import_csv': '1', 'csv_file': csv_file}
+            )
+        job = AlumniImportJob.objects.get()
+        self.assertRedirects(response, reverse('alumni_directory:alumni_import_job', args=[job.pk]))
+        return job
+
+    def test_import_creates_updates_and_reports_rows(self, enqueue):
+        job = self.upload(
+            "FullName,Year-1,Course Grad,Present Occupation,Name of Company,Employment Address,Mobile No,Email Address\n"
+            "\"Santos, Maria L.\",2019,BSCS,Engineer,Acme,\"Bais, Negros Oriental\",,\n"
+            "\"Cruz, Juan P.\",2020,BSED,Teacher,DepEd,,09171234567,juan@example.com\n"
+            "\"Cruz, Juan P.\",2020,BSED,Principal,DepEd,,,juan@example.com\n"
+            "Ana Reyes,2021,BSN,,,,,\n"
+            "TOTAL,,,,,,,\n"
+            "Bad Email,2021,BSN,,,,,not-an-email\n"
+        )
+
+        self.assertEqual(job.status, AlumniImportJob.Status.COMPLETED)
+        self.assertEqual(
+            (job.total_rows, job.processed_rows, job.created_count, job.updated_count, job.skipped_count, job.failed_count),
+            (6, 6, 2, 2, 1, 1),
+        )
+
+        self.existing.refresh_from_db()
+        self.assertEqual((self.existing.course, self.existing.job_title, self.existing.city), ('BSCS', 'Engineer', 'Bais'))
+
+        juan = Alumni.objects.select_related('user__profile').get(user__first_name='Juan')
+        self.assertEqual(juan.user.username, 'juan1')
+        self.assertFalse(juan.user.is_active)
+        self.assertFalse(juan.user.has_usable_password())
+        self.assertEqual(juan.job_title, 'Principal')
+        self.assertEqual(juan.current_company, 'DepEd')
+        self.assertEqual(str(juan.user.profile.phone_number), '09171234567')
+        # As before, the CSV job details stay on the Alumni record only
+        self.assertEqual(juan.user.profile.current_position, '')
+        self.assertTrue(JobPreference.objects.filter(user=juan.user).exists())
+
+        ana = Alumni.objects.get(user__first_name='Ana')
+        self.assertEqual(ana.user.username, 'ana.reyes.2021')
+        self.assertEqual(ana.user.email, 'ana.reyes.2021@norsu.alumni.placeholder')
+
+        report = self.client.get(reverse('alumni_directory:alumni_import_errors', args=[job.pk]))
+        lines = report.content.decode().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertIn('TOTAL', lines[1])
+        self.assertIn('not a valid email address', lines[2])
+
+        status = self.client.get(reverse('alumni_directory:alumni_import_job_status', args=[job.pk])).json()
+        self.assertEqual((status['status'], status['percent'], status['created']), ('completed', 100, 2))
+
+    def test_import_writes_one_summary_audit_record(self, enqueue):
+        job = self.upload("Full Name,Year,Course\nAna Reyes,2021,BSN\nJose Rizal,2022,BSED\n")
+
+        self.assertEqual(job.created_count, 2)
+        self.assertFalse(AuditLog.objects.filter(model_name__in=['alumni', 'profile', 'user']).exists())
+        summary = AuditLog.objects.get(model_name='alumniimportjob', message__startswith='IMPORT')
+        self.assertEqual(summary.object_id, job.pk)
+        self.assertEqual(summary.new_values['created'], 2)
+
+    def test_ambiguous_match_fails_only_its_row(self, enqueue):
+        User = get_user_model()
+        with audit.suspend():
+            twin = User.objects.create_user('maria2', 'maria2@example.com', 'pass', first_name='maria', last_name='SANTOS')
+            Alumni.objects.create(
+                user=twin, college='CAS', campus='MAIN', graduation_year=2019, course='BSED',
+                gender='F', province='', city='', address='',
+            )
+
+        job = self.upload("Full Name,Year,Course\nMaria Santos,2019,BSN\nAna Reyes,2021,BSN\n")
+
+        self.assertEqual((job.created_count, job.failed_count), (1, 1))
+        failed = job.rows.get(status=AlumniImportRow.Status.FAILED)
+        self.assertIn('2 alumni have this name', failed.message)
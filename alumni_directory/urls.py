@@ -7,6 +7,9 @@ urlpatterns = [
     path('', views.alumni_list, name='alumni_list'),
     path('tabular/', views.tabular_alumni_list, name='tabular_alumni_list'),
     path('management/', views.alumni_management, name='alumni_management'),
+    path('management/imports/<int:job_id>/', views.alumni_import_job, name='alumni_import_job'),
+    path('management/imports/<int:job_id>/status/', views.alumni_import_job_status, name='alumni_import_job_status'),
+    path('management/imports/<int:job_id>/errors/', views.alumni_import_errors, name='alumni_import_errors'),
     path('<int:pk>/', views.alumni_detail, name='alumni_detail'),
     path('alumni/<int:pk>/detail-modal/', views.alumni_detail_modal, name='alumni_detail_modal'),
     path('document/<int:doc_id>/download/', views.download_document, name='download_document'),
@@ -7,15 +7,17 @@ from django.db.models import Q, Count, F
 from django.core.paginator import Paginator
 from django.http import JsonResponse, HttpResponse
 from django.contrib.auth import get_user_model
-from .models import Alumni, AlumniDocument, Achievement, ProfessionalExperience
+from .models import Alumni, AlumniDocument, AlumniImportJob, Achievement, ProfessionalExperience
 from django.core.exceptions import PermissionDenied
-from django.db import transaction, IntegrityError
+from django.db import transaction
 from django.http import Http404
 from django.core.mail import send_mail
 from django.urls import reverse
 from django.conf import settings
 from django.contrib import messages
 from accounts.models import Profile, Experience
+from core.export_jobs import export_job_response, is_export_job, report_export_progress, start_export_job
+from .imports import import_job_payload, start_alumni_import, write_error_report
 from .forms import AlumniForm, AlumniFilterForm, AlumniSearchForm, AlumniDocumentForm
 import csv
 from datetime import datetime
@@ -762,6 +764,12 @@ def tabular_alumni_list(request):
             
         # Export to CSV if requested
         if request.GET.get('format') == 'csv':
+            if not is_export_job(request):
+                job = start_export_job(
+                    request, 'alumni_directory.views.tabular_alumni_list', label='Alumni directory (CSV)'
+                )
+                return export_job_response(request, job)
+
             # Apply selective export filters
             export_queryset, filename, has_selective_filters = apply_selective_export_filters(request)
 
@@ -776,7 +784,9 @@ def tabular_alumni_list(request):
             writer = csv.writer(response)
             writer.writerow(['ID', 'Full Name', 'College', 'Year', 'Course', 'Present Occupation', 'Company', 'Employment Address'])
 
-            for alumni in export_queryset:
+            report_export_progress(request, 0, export_queryset.count())
+            for row_number, alumni in enumerate(export_queryset, 1):
+                report_export_progress(request, row_number)
                 # Get current experience for occupation and company
                 current_exp = None
                 if hasattr(alumni.user, 'profile'):
@@ -832,256 +842,24 @@ def alumni_management(request):
         if request.method == 'POST' and 'import_csv' in request.POST:
             csv_file = request.FILES.get('csv_file')
             if csv_file:
-                # Log CSV import start
-                file_size = csv_file.size
-                file_name = csv_file.name
-                
-                logger.info(
-                    f"CSV import started: File={file_name}, Size={file_size} bytes",
-                    extra={
-                        'file_name': file_name,
-                        'file_size': file_size,
-                        'user_id': request.user.id if hasattr(request, 'user') and request.user.is_authenticated else None,
-                        'action': 'csv_import_start'
-                    }
-                )
-                
                 try:
-                    # Decode with UTF-8-sig to handle BOM character from Excel-exported CSVs
-                    try:
-                        decoded_file = csv_file.read().decode('utf-8-sig')
-                    except UnicodeDecodeError:
-                        csv_file.seek(0)
-                        decoded_file = csv_file.read().decode('latin-1')
-                    csv_data = csv.DictReader(decoded_file.splitlines())
-
-                    # Log detected headers for debugging
-                    fieldnames = csv_data.fieldnames or []
-                    logger.info(f"CSV import - detected headers: {fieldnames}")
-                    
-                    imported_count = 0
-                    updated_count = 0
-                    error_count = 0
-                    error_details = []
-                    
-                    for row in csv_data:
-                        # Support both old column names and coordinator CSV format
-                        # Coordinator CSV: FullName, Year-1, Course Grad, Rec #, Mobile No, Email Address
-                        # Old format: Full Name, Year, Course, Present Occupation, Name of Company, Employment Address
-
-                        full_name = (
-                            row.get('FullName') or
-                            row.get('Full Name') or
-                            row.get('full_name') or ''
-                        ).strip()
-
-                        graduation_year = (
-                            row.get('Year-1') or
-                            row.get('Year') or
-                            row.get('graduation_year') or ''
-                        ).strip()
-
-                        course = (
-                            row.get('Course Grad') or
-                            row.get('Course') or
-                            row.get('course') or ''
-                        ).strip()
-
-                        occupation = (
-                            row.get('Present Occupation') or
-                            row.get('occupation') or ''
-                        ).strip()
-
-                        company = (
-                            row.get('Name of Company') or
-                            row.get('company') or ''
-                        ).strip()
-
-                        address = (
-                            row.get('Employment Address') or
-                            row.get('address') or ''
-                        ).strip()
-
-                        # Coordinator CSV extras
-                        rec_number = (row.get('Rec #') or row.get('Rec#') or '').strip()
-                        mobile = (row.get('Mobile No') or row.get('Mobile') or '').strip()
-                        email_from_csv = (row.get('Email Address') or row.get('Email') or '').strip()
-
-                        # Skip empty rows and summary rows (e.g. "TOTAL" row)
-                        if not full_name or not graduation_year:
-                            continue
-                        try:
-                            int(graduation_year)
-                        except ValueError:
-                            continue  # Skip non-numeric year rows
-
-                        # Parse name — handle both formats:
-                        # Coordinator format: "Last, First M." → reversed, comma-separated
-                        # Standard format: "First Last"
-                        if ',' in full_name:
-                            # Coordinator format: "Aungon, Airies M."
-                            parts = full_name.split(',', 1)
-                            last_name = parts[0].strip()
-                            first_name = parts[1].strip() if len(parts) > 1 else ''
-                            # Remove middle initial if present (e.g. "Airies M." → "Airies")
-                            first_name_parts = first_name.split()
-                            first_name = first_name_parts[0] if first_name_parts else first_name
-                        else:
-                            # Standard format: "First Last"
-                            name_parts = full_name.split(' ', 1)
-                            first_name = name_parts[0]
-                            last_name = name_parts[1] if len(name_parts) > 1 else ''
-
-                        # Try to find existing alumni by name and graduation year
-                        try:
-                            alumni = Alumni.objects.get(
-                                user__first_name__iexact=first_name,
-                                user__last_name__iexact=last_name,
-                                graduation_year=graduation_year
-                            )
-                            # Update existing alumni
-                            alumni.course = course
-                            alumni.job_title = occupation
-                            alumni.current_company = company
-                            if address:
-                                address_parts = address.split(', ')
-                                if len(address_parts) >= 2:
-                                    alumni.city = address_parts[0]
-                                    alumni.province = address_parts[1]
-                            alumni.save()
-                            updated_count += 1
-                        except Alumni.DoesNotExist:
-                            # Create new user and alumni
-                            try:
-                                # Use email from CSV if available, otherwise generate one
-                                if email_from_csv:
-                                    email = email_from_csv
-                                    username = email_from_csv.split('@')[0]
-                                else:
-                                    username = f"{first_name.lower()}.{last_name.lower()}.{graduation_year}"
-                                    email = f"{username}@norsu.alumni.placeholder"
-
-                                # Ensure username uniqueness
-                                base_username = username
-                                counter = 1
-                                while User.objects.filter(username=username).exists():
-                                    username = f"{base_username}{counter}"
-                                    counter += 1
-
-                                user = User.objects.create_user(
-                                    username=username,
-                                    first_name=first_name,
-                                    last_name=last_name,
-                                    email=email,
-                                    is_active=False  # Inactive until they register
-                                )
-
-                                alumni = Alumni.objects.create(
-                                    user=user,
-                                    graduation_year=graduation_year,
-                                    course=course,
-                                    job_title=occupation,
-                                    current_company=company,
-                                    college='',
-                                    campus='BSC',  # Default for coordinator CSV
-                                    gender='O',
-                                    province='',
-                                    city='',
-                                    address='',
-                                )
-
-                                if address:
-                                    address_parts = address.split(', ')
-                                    if len(address_parts) >= 2:
-                                        alumni.city = address_parts[0]
-                                        alumni.province = address_parts[1]
-                                        alumni.save()
-
-                                if mobile:
-                                    try:
-                                        user.profile.phone_number = mobile
-                                        user.profile.save()
-                                    except Exception:
-                                        pass
-
-                                imported_count += 1
-                            except IntegrityError as ie:
-                                # Handle database constraint violation (duplicate email/username)
-                                error_count += 1
-                                error_details.append({
-                                    'row': full_name,
-                                    'error': 'Unable to create account. A user with this email or username already exists.'
-                                })
-                                logger.error(
-                                    f"Database constraint violation during CSV import: {full_name}",
-                                    extra={
-                                        'row_data': full_name,
-                                        'error_type': 'IntegrityError',
-                                        'error_message': str(ie),
-                                        'file_name': file_name,
-                                        'action': 'csv_import_integrity_error'
-                                    }
-                                )
-                            except Exception as row_error:
-                                error_count += 1
-                                error_details.append({
-                                    'row': full_name,
-                                    'error': str(row_error)
-                                })
-                                logger.warning(
-                                    f"Error processing CSV row: {str(row_error)}",
-                                    extra={
-                                        'row_data': full_name,
-                                        'error_type': type(row_error).__name__,
-                                        'file_name': file_name,
-                                        'action': 'csv_row_error'
-                                    }
-                                )
-                    
-                    # Log CSV import completion
-                    logger.info(
-                        f"CSV import completed: Imported={imported_count}, Updated={updated_count}, Errors={error_count}",
-                        extra={
-                            'file_name': file_name,
-                            'file_size': file_size,
-                            'imported_count': imported_count,
-                            'updated_count': updated_count,
-                            'error_count': error_count,
-                            'total_processed': imported_count + updated_count + error_count,
-                            'user_id': request.user.id if hasattr(request, 'user') and request.user.is_authenticated else None,
-                            'action': 'csv_import_complete'
-                        }
-                    )
-                    
-                    if error_count > 0:
-                        logger.warning(
-                            f"CSV import completed with errors: {error_count} errors out of {imported_count + updated_count + error_count} rows",
-                            extra={
-                                'file_name': file_name,
-                                'error_count': error_count,
-                                'error_details': error_details[:10],  # Limit to first 10 errors
-                                'user_id': request.user.id if hasattr(request, 'user') and request.user.is_authenticated else None,
-                                'action': 'csv_import_errors'
-                            }
-                        )
-                    
-                    messages.success(request, f"Successfully imported {imported_count} new alumni and updated {updated_count} existing records.")
-                    if error_count > 0:
-                        messages.warning(request, f"Warning: {error_count} rows had errors during import.")
-                    
+                    # Parsing and validation happen now; the rows are imported by a worker
+                    job = start_alumni_import(csv_file, request.user)
                 except Exception as e:
                     logger.error(
                         f"Error importing CSV: {str(e)}",
                         exc_info=True,
                         extra={
-                            'file_name': file_name if 'file_name' in locals() else None,
-                            'file_size': file_size if 'file_size' in locals() else None,
+                            'file_name': csv_file.name,
+                            'file_size': csv_file.size,
                             'user_id': request.user.id if hasattr(request, 'user') and request.user.is_authenticated else None,
                             'error_type': type(e).__name__,
                             'action': 'csv_import_failed'
                         }
                     )
                     messages.error(request, f"Error importing CSV file: {str(e)}")
+                else:
+                    return redirect('alumni_directory:alumni_import_job', job_id=job.pk)
             else:
                 messages.error(request, "Please select a CSV file to import.")
         
@@ -1134,6 +912,13 @@ def alumni_management(request):
         # Export if requested (Excel and PDF only)
         export_format = request.GET.get('format')
         if export_format in ['excel', 'pdf']:
+            if not is_export_job(request):
+                job = start_export_job(
+                    request, 'alumni_directory.views.alumni_management',
+                    label=f"Alumni management ({export_format.upper()})",
+                )
+                return export_job_response(request, job)
+
             # Apply selective export filters
             export_queryset, filename, has_selective_filters = apply_selective_export_filters(request)
 
@@ -1178,7 +963,9 @@ def alumni_management(request):
                 data_start_row = header_start_row + 1
                 data_alignment = Alignment(horizontal="left", vertical="top", wrap_text=True)
                 
+                report_export_progress(request, 0, export_queryset.count())
                 for row_idx, alumni in enumerate(export_queryset, data_start_row):
+                    report_export_progress(request, row_idx - header_start_row)
                     # Get current experience for occupation and company
                     current_exp = None
                     try:
@@ -1357,7 +1144,9 @@ def alumni_management(request):
                 max_rows = 1000
                 export_queryset_limited = export_queryset[:max_rows]
                 
-                for alumni in export_queryset_limited:
+                report_export_progress(request, 0, min(export_queryset.count(), max_rows))
+                for row_number, alumni in enumerate(export_queryset_limited, 1):
+                    report_export_progress(request, row_number)
                     # Get current experience
                     current_exp = None
                     try:
@@ -1494,6 +1283,32 @@ def alumni_management(request):
         messages.error(request, "An error occurred while loading the alumni management page.")
         return redirect('alumni_directory:alumni_list')
 
+@user_passes_test(is_admin, login_url='account_login')
+def alumni_import_job(request, job_id):
+    """Progress page for a CSV import, polling ``alumni_import_job_status``."""
+    job = get_object_or_404(AlumniImportJob, pk=job_id)
+    return render(request, 'alumni_directory/import_job.html', {
+        'job': job,
+        'progress': import_job_payload(job),
+    })
+
+@user_passes_test(is_admin, login_url='account_login')
+def alumni_import_job_status(request, job_id):
+    """JSON progress of a CSV import."""
+    job = AlumniImportJob.objects.filter(pk=job_id).first()
+    if job is None:
+        return JsonResponse({'success': False, 'error': 'Import not found.'}, status=404)
+    return JsonResponse(import_job_payload(job))
+
+@user_passes_test(is_admin, login_url='account_login')
+def alumni_import_errors(request, job_id):
+    """Download the rows of a CSV import that were skipped or failed, with the reason."""
+    job = get_object_or_404(AlumniImportJob, pk=job_id)
+    response = HttpResponse(content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="alumni_import_{job.pk}_errors.csv"'
+    write_error_report(job, response)
+    return response
+
 @user_passes_test(is_admin, login_url='account_login')
 def alumni_detail_modal(request, pk):
     """
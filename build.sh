@@ -37,6 +37,9 @@ run_command "📁 Collecting static files" "python manage.py collectstatic --noi
 # Run migrations
 run_command "🗄️ Running database migrations" "python manage.py migrate --noinput"
 
+# Fill parsed salary columns for postings saved before they existed
+run_command "💵 Backfilling job salary columns" "python manage.py backfill_salary_columns"
+
 # Populate CMS data
 run_command "📝 Populating CMS data" "python manage.py seed_cms_data"
 
@@ -9,6 +9,7 @@ from .models.brevo_config import BrevoConfig
 from .models.email_provider import EmailProvider
 from .models.user_management import UserAuditLog, UserStatusChange
 from .models.seo import PageSEO, OrganizationSchema
+from .models.export_job import ExportJob
 
 # Register existing models if they aren't already registered
 try:
@@ -276,3 +277,22 @@ class OrganizationSchemaAdmin(admin.ModelAdmin):
             'fields': ('street_address', 'address_locality', 'address_region', 'postal_code', 'address_country')
         }),
     )
+
+
+@admin.register(ExportJob)
+class ExportJobAdmin(admin.ModelAdmin):
+    """Admin interface for background export jobs"""
+
+    list_display = ['label', 'status', 'requested_by', 'progress_done', 'progress_total', 'size', 'created_at', 'expires_at']
+    list_filter = ['status', 'created_at']
+    search_fields = ['label', 'filename', 'requested_by__email']
+    readonly_fields = [
+        'label', 'view', 'view_args', 'method', 'params', 'params_hash', 'status',
+        'progress_done', 'progress_total', 'error_message', 'task_id', 'artifact',
+        'filename', 'content_type', 'size', 'requested_by', 'created_at', 'started_at',
+        'finished_at', 'expires_at',
+    ]
+
+    def has_add_permission(self, request):
+        """Export jobs are created by export requests"""
+        return False
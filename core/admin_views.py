@@ -8,7 +8,7 @@ from django.core.exceptions import ValidationError
 from django.utils import timezone
 from datetime import datetime, timedelta
 from django.http import JsonResponse
-from django.http import HttpResponse
+from django.http import FileResponse
 import logging
 import time
 
@@ -29,7 +29,8 @@ from alumni_directory.models import Alumni
 
 # Import export utilities
 from .export_utils import export_queryset, ModelExporter
-from .export_utils import ExportMixin
+from .export_utils import ExportMixin, write_response_to_zip
+from .export_jobs import export_job_response, is_export_job, report_export_progress, start_export_job
 
 # Import permission helper
 from .decorators import is_admin_user
@@ -907,6 +908,12 @@ def edit_tracer_study(request, survey_id):
         _tracer_form_context(form=form, survey=survey, survey_is_employer=is_employer),
     )
 
+BULK_EXPORT_MODELS = (
+    'alumni', 'users', 'jobs', 'mentorships', 'events', 'donations',
+    'announcements', 'feedback', 'surveys', 'tracer_study',
+)
+
+
 @login_required
 def export_all_data(request, format_type='csv'):
     """Export all data in specified format"""
@@ -914,10 +921,19 @@ def export_all_data(request, format_type='csv'):
         messages.error(request, _('You do not have permission to access this page.'))
         return redirect('core:home')
     
-    # This would need to be implemented as a more complex export
-    # For now, redirect to dashboard
-    messages.info(request, _('Bulk export functionality coming soon.'))
-    return redirect('core:admin_dashboard')
+    if format_type not in ('csv', 'excel', 'pdf'):
+        messages.error(request, _('Unsupported export format.'))
+        return redirect('core:admin_dashboard')
+
+    # Same archive as the bulk export page with every data type selected
+    job = start_export_job(
+        request,
+        'core.admin_views.bulk_export_process',
+        label=f"All data ({format_type.upper()})",
+        method='POST',
+        data={'models': list(BULK_EXPORT_MODELS), 'format_type': [format_type]},
+    )
+    return export_job_response(request, job)
 
 @login_required
 def bulk_export_interface(request):
@@ -951,6 +967,15 @@ def bulk_export_process(request):
     if request.method == 'POST':
         selected_models = request.POST.getlist('models')
         format_type = request.POST.get('format_type', 'csv')
+        if selected_models and not is_export_job(request):
+            # Build the archive in a worker; the page polls the job for it
+            job = start_export_job(
+                request,
+                'core.admin_views.bulk_export_process',
+                label=f"Bulk export: {', '.join(selected_models)} ({format_type.upper()})",
+            )
+            return export_job_response(request, job)
+
         if selected_models == ['tracer_study'] and format_type == 'zip':
             survey = _tracer_study_survey()
             if not survey:
@@ -979,160 +1004,161 @@ def bulk_export_process(request):
             )
             return JsonResponse({'error': 'Please select at least one model to export.'}, status=400)
         
+        tmp_file = None
         try:
             # Create a zip file containing all selected exports
             import zipfile
             import tempfile
-            from django.core.files.base import ContentFile
             
             exported_count = 0
             failed_count = 0
             failed_models = []
             
-            # Create temporary file for zip
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.zip') as tmp_file:
-                with zipfile.ZipFile(tmp_file.name, 'w') as zip_file:
-                    
-                    for model_name in selected_models:
-                        try:
-                            if model_name == 'tracer_study':
-                                survey = _tracer_study_survey()
-                                if not survey:
-                                    failed_count += 1
-                                    failed_models.append(model_name)
-                                    continue
-                                response = tracer_study.tracer_study_report_export(request, survey.id, format_type)
-                                ext = 'xlsx' if format_type == 'excel' else format_type
-                                filename = f"tracer_study_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{ext}"
-                                zip_file.writestr(filename, response.content)
-                                exported_count += 1
-                                continue
-
-                            # Get the appropriate queryset and config based on model
-                            if model_name == 'alumni':
-                                queryset = Alumni.objects.select_related('user').all()
-                                export_config = ModelExporter.get_alumni_export_config()
-                            elif model_name == 'users':
-                                queryset = User.objects.all()
-                                export_config = ModelExporter.get_user_export_config()
-                            elif model_name == 'jobs':
-                                queryset = JobPosting.objects.all()
-                                export_config = ModelExporter.get_job_export_config()
-                            elif model_name == 'mentorships':
-                                queryset = MentorshipRequest.objects.select_related('mentor__user', 'mentee').all()
-                                export_config = ModelExporter.get_mentorship_export_config()
-                            elif model_name == 'events':
-                                queryset = Event.objects.all()
-                                export_config = ModelExporter.get_event_export_config()
-                            elif model_name == 'donations':
-                                queryset = Donation.objects.select_related('donor', 'campaign').all()
-                                export_config = ModelExporter.get_donation_export_config()
-                            elif model_name == 'announcements':
-                                queryset = Announcement.objects.select_related('category').all()
-                                export_config = ModelExporter.get_announcement_export_config()
-                            elif model_name == 'feedback':
-                                queryset = Feedback.objects.select_related('user').all()
-                                export_config = ModelExporter.get_feedback_export_config()
-                            elif model_name == 'surveys':
-                                queryset = Survey.objects.select_related('created_by').all()
-                                export_config = ModelExporter.get_survey_export_config()
-                            else:
-                                logger.warning(
-                                    f"Unknown model in bulk export: {model_name}",
-                                    extra={
-                                        'model_name': model_name,
-                                        'user_id': request.user.id,
-                                        'action': 'bulk_export_unknown_model'
-                                    }
-                                )
-                                continue
-                            
-                            # Generate the export
-                            if format_type == 'csv':
-                                response = ExportMixin().export_csv(
-                                    queryset, 
-                                    f"{model_name}_export", 
-                                    export_config.get('field_names'),
-                                    export_config.get('field_labels')
-                                )
-                                filename = f"{model_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-                            elif format_type == 'excel':
-                                response = ExportMixin().export_excel(
-                                    queryset, 
-                                    f"{model_name}_export", 
-                                    export_config.get('field_names'),
-                                    export_config.get('field_labels'),
-                                    export_config.get('sheet_name', 'Data')
-                                )
-                                filename = f"{model_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-                            elif format_type == 'pdf':
-                                response = ExportMixin().export_pdf(
-                                    queryset, 
-                                    f"{model_name}_export", 
-                                    export_config.get('field_names'),
-                                    export_config.get('field_labels'),
-                                    export_config.get('sheet_name', 'Data Export')
-                                )
-                                filename = f"{model_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-                            else:
-                                logger.warning(
-                                    f"Unknown format in bulk export: {format_type}",
-                                    extra={
-                                        'format_type': format_type,
-                                        'user_id': request.user.id,
-                                        'action': 'bulk_export_unknown_format'
-                                    }
-                                )
+            # Create temporary file for zip; FileResponse closes (and so removes) it
+            tmp_file = tempfile.TemporaryFile(suffix='.zip')
+            with zipfile.ZipFile(tmp_file, 'w') as zip_file:
+                
+                for index, model_name in enumerate(selected_models):
+                    report_export_progress(request, index, len(selected_models))
+                    try:
+                        if model_name == 'tracer_study':
+                            survey = _tracer_study_survey()
+                            if not survey:
+                                failed_count += 1
+                                failed_models.append(model_name)
                                 continue
-                            
-                            # Add file to zip
-                            zip_file.writestr(filename, response.content)
+                            response = tracer_study.tracer_study_report_export(request, survey.id, format_type)
+                            ext = 'xlsx' if format_type == 'excel' else format_type
+                            filename = f"tracer_study_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{ext}"
+                            write_response_to_zip(zip_file, filename, response)
                             exported_count += 1
-                            
-                            logger.info(
-                                f"Model exported successfully: Model={model_name}, Format={format_type}",
+                            continue
+
+                        # Get the appropriate queryset and config based on model
+                        if model_name == 'alumni':
+                            queryset = Alumni.objects.select_related('user').all()
+                            export_config = ModelExporter.get_alumni_export_config()
+                        elif model_name == 'users':
+                            queryset = User.objects.all()
+                            export_config = ModelExporter.get_user_export_config()
+                        elif model_name == 'jobs':
+                            queryset = JobPosting.objects.all()
+                            export_config = ModelExporter.get_job_export_config()
+                        elif model_name == 'mentorships':
+                            queryset = MentorshipRequest.objects.select_related('mentor__user', 'mentee').all()
+                            export_config = ModelExporter.get_mentorship_export_config()
+                        elif model_name == 'events':
+                            queryset = Event.objects.all()
+                            export_config = ModelExporter.get_event_export_config()
+                        elif model_name == 'donations':
+                            queryset = Donation.objects.select_related('donor', 'campaign').all()
+                            export_config = ModelExporter.get_donation_export_config()
+                        elif model_name == 'announcements':
+                            queryset = Announcement.objects.select_related('category').all()
+                            export_config = ModelExporter.get_announcement_export_config()
+                        elif model_name == 'feedback':
+                            queryset = Feedback.objects.select_related('user').all()
+                            export_config = ModelExporter.get_feedback_export_config()
+                        elif model_name == 'surveys':
+                            queryset = Survey.objects.select_related('created_by').all()
+                            export_config = ModelExporter.get_survey_export_config()
+                        else:
+                            logger.warning(
+                                f"Unknown model in bulk export: {model_name}",
                                 extra={
                                     'model_name': model_name,
-                                    'format_type': format_type,
                                     'user_id': request.user.id,
-                                    'action': 'model_export_success'
+                                    'action': 'bulk_export_unknown_model'
                                 }
                             )
-                            
-                        except Exception as e:
-                            # Log error but continue with other models
-                            failed_count += 1
-                            failed_models.append(model_name)
-                            logger.error(
-                                f"Error exporting model: Model={model_name}, Format={format_type}, Error={str(e)}",
+                            continue
+                        
+                        # Generate the export
+                        if format_type == 'csv':
+                            response = ExportMixin().export_csv(
+                                queryset, 
+                                f"{model_name}_export", 
+                                export_config.get('field_names'),
+                                export_config.get('field_labels')
+                            )
+                            filename = f"{model_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+                        elif format_type == 'excel':
+                            response = ExportMixin().export_excel(
+                                queryset, 
+                                f"{model_name}_export", 
+                                export_config.get('field_names'),
+                                export_config.get('field_labels'),
+                                export_config.get('sheet_name', 'Data')
+                            )
+                            filename = f"{model_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+                        elif format_type == 'pdf':
+                            response = ExportMixin().export_pdf(
+                                queryset, 
+                                f"{model_name}_export", 
+                                export_config.get('field_names'),
+                                export_config.get('field_labels'),
+                                export_config.get('sheet_name', 'Data Export')
+                            )
+                            filename = f"{model_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+                        else:
+                            logger.warning(
+                                f"Unknown format in bulk export: {format_type}",
                                 extra={
-                                    'model_name': model_name,
                                     'format_type': format_type,
                                     'user_id': request.user.id,
-                                    'error_type': type(e).__name__,
-                                    'action': 'model_export_failed'
-                                },
-                                exc_info=True
+                                    'action': 'bulk_export_unknown_format'
+                                }
                             )
                             continue
-                    
-                    # Check if any files were exported
-                    if exported_count == 0:
-                        logger.error(
-                            f"Bulk export failed: No files exported",
+                        
+                        # Add file to zip
+                        write_response_to_zip(zip_file, filename, response)
+                        exported_count += 1
+                        
+                        logger.info(
+                            f"Model exported successfully: Model={model_name}, Format={format_type}",
                             extra={
-                                'selected_models': selected_models,
-                                'failed_models': failed_models,
+                                'model_name': model_name,
+                                'format_type': format_type,
                                 'user_id': request.user.id,
-                                'action': 'bulk_export_no_files'
+                                'action': 'model_export_success'
                             }
                         )
-                        return JsonResponse({
-                            'error': 'Failed to export any files. Please check the logs for details.'
-                        }, status=500)
-                    
-                    # Add a README file to the zip
-                    readme_content = f"""Bulk Export Report
+                        
+                    except Exception as e:
+                        # Log error but continue with other models
+                        failed_count += 1
+                        failed_models.append(model_name)
+                        logger.error(
+                            f"Error exporting model: Model={model_name}, Format={format_type}, Error={str(e)}",
+                            extra={
+                                'model_name': model_name,
+                                'format_type': format_type,
+                                'user_id': request.user.id,
+                                'error_type': type(e).__name__,
+                                'action': 'model_export_failed'
+                            },
+                            exc_info=True
+                        )
+                        continue
+                
+                # Check if any files were exported
+                if exported_count == 0:
+                    logger.error(
+                        f"Bulk export failed: No files exported",
+                        extra={
+                            'selected_models': selected_models,
+                            'failed_models': failed_models,
+                            'user_id': request.user.id,
+                            'action': 'bulk_export_no_files'
+                        }
+                    )
+                    return JsonResponse({
+                        'error': 'Failed to export any files. Please check the logs for details.'
+                    }, status=500)
+                
+                # Add a README file to the zip
+                readme_content = f"""Bulk Export Report
 Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 Format: {format_type.upper()}
 Models requested: {', '.join(selected_models)}
@@ -1147,15 +1173,9 @@ This zip file contains exported data from the following models:
 
 Each file is named with the model name and timestamp for easy identification.
 """
-                    zip_file.writestr('README.txt', readme_content)
+                zip_file.writestr('README.txt', readme_content)
             
-            # Read the zip file and create response
-            with open(tmp_file.name, 'rb') as f:
-                zip_content = f.read()
-            
-            # Clean up temporary file
-            import os
-            os.unlink(tmp_file.name)
+            report_export_progress(request, len(selected_models), len(selected_models))
             
             # Log bulk export completion
             logger.info(
@@ -1171,10 +1191,15 @@ Each file is named with the model name and timestamp for easy identification.
                 }
             )
             
-            # Create response
-            response = HttpResponse(zip_content, content_type='application/zip')
-            response['Content-Disposition'] = f'attachment; filename="bulk_export_{datetime.now().strftime("%Y%m%d_%H%M%S")}.zip"'
-            
+            # Stream the zip back from the temporary file
+            tmp_file.seek(0)
+            response = FileResponse(
+                tmp_file,
+                as_attachment=True,
+                filename=f"bulk_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip",
+                content_type='application/zip',
+            )
+            tmp_file = None
             return response
             
         except Exception as e:
@@ -1192,5 +1217,9 @@ Each file is named with the model name and timestamp for easy identification.
             return JsonResponse({
                 'error': f'Export failed: {str(e)}'
             }, status=500)
+        finally:
+            # Only the FileResponse path takes ownership of the temp file
+            if tmp_file is not None:
+                tmp_file.close()
     
     return redirect('core:bulk_export_interface')
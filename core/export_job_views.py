@@ -0,0 +1,68 @@
+"""
+Progress pages and signed downloads for background export jobs.
+
+Every URL carries a signed token for the job instead of its id, so the
+links handed out when an export is requested are the only way in, and
+only for the user who requested the export (or a superuser).
+"""
+import os
+
+from django.contrib.auth.decorators import login_required
+from django.http import FileResponse, Http404, JsonResponse
+from django.shortcuts import render
+from django.utils import timezone
+
+from .export_jobs import export_job_payload, load_export_job
+from .models import ExportJob
+
+
+def _user_job(request, token):
+    """The job ``token`` points at, if it belongs to the requesting user."""
+    job = load_export_job(token)
+    if job is None or not (request.user.is_superuser or job.requested_by_id == request.user.pk):
+        return None
+    return job
+
+
+def _job_or_404(request, token):
+    job = _user_job(request, token)
+    if job is None:
+        raise Http404("Export not found or link expired")
+    return job
+
+
+@login_required
+def export_job_detail(request, token):
+    """Progress page for an export, polling ``export_job_status``."""
+    job = _job_or_404(request, token)
+    return render(request, 'admin/export_job.html', {
+        'job': job,
+        'export': export_job_payload(job, token),
+    })
+
+
+@login_required
+def export_job_status(request, token):
+    """JSON progress of an export job."""
+    job = _user_job(request, token)
+    if job is None:
+        return JsonResponse({'success': False, 'error': 'Export not found or link expired.'}, status=404)
+    return JsonResponse(export_job_payload(job, token))
+
+
+@login_required
+def export_job_download(request, token):
+    """Serve a finished export's artifact until it expires."""
+    job = _job_or_404(request, token)
+    if (
+        job.status != ExportJob.Status.COMPLETED
+        or job.expires_at <= timezone.now()
+        or not os.path.exists(job.artifact_path)
+    ):
+        raise Http404("Export is not ready or has expired")
+    return FileResponse(
+        open(job.artifact_path, 'rb'),
+        as_attachment=True,
+        filename=job.filename,
+        content_type=job.content_type or None,
+    )
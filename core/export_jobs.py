@@ -0,0 +1,361 @@
+"""
+Background export jobs.
+
+Export views that can outlive a request call ``start_export_job`` instead of
+rendering their file. The django-q worker (``run_export_job``) replays the
+same view as the requesting user, with ``request.export_job`` set, and
+writes the response it returns to MEDIA_ROOT chunk by chunk. Users follow
+the job's progress and download the artifact through a signed link that
+stops working when the artifact expires.
+
+Identical requests (same user, view, arguments and query/form data) share
+one job while it is running or its artifact is fresh; ``cleanup_export_jobs`` removes
+expired artifacts and runs on a django-q schedule (see the
+``setup_export_cleanup_schedule`` command).
+"""
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+import time
+import uuid
+from datetime import timedelta
+from email.message import Message
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core import signing
+from django.db.models import Q
+from django.http import HttpRequest, JsonResponse, QueryDict
+from django.shortcuts import redirect
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import ExportJob
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = [ExportJob.Status.QUEUED, ExportJob.Status.RUNNING]
+SIGNING_SALT = 'core.export_jobs'
+# Progress is written at most this often; the job page polls every 2 seconds.
+PROGRESS_INTERVAL_SECONDS = 1.0
+
+
+class ExportJobError(Exception):
+    """The replayed export view did not return a file."""
+
+
+def _ttl() -> timedelta:
+    return timedelta(minutes=getattr(settings, 'EXPORT_JOB_TTL_MINUTES', 60))
+
+
+def _timeout() -> int:
+    return getattr(settings, 'EXPORT_JOB_TIMEOUT_SECONDS', 1800)
+
+
+def _export_dir() -> str:
+    return getattr(settings, 'EXPORT_JOB_DIR', 'exports')
+
+
+def is_export_job(request) -> bool:
+    """True while ``request`` is an export being replayed by the worker."""
+    return getattr(request, 'export_job', None) is not None
+
+
+def report_export_progress(request, done, total=None):
+    """
+    Record how far the export replayed by ``request`` has got. Does nothing
+    for ordinary requests, so export views can call it unconditionally.
+    """
+    job = getattr(request, 'export_job', None)
+    if job is None:
+        return
+    if total is not None:
+        job.progress_total = total
+    job.progress_done = done
+
+    now = time.monotonic()
+    finished = job.progress_total and done >= job.progress_total
+    if not finished and now - getattr(job, '_progress_saved_at', 0) < PROGRESS_INTERVAL_SECONDS:
+        return
+    job._progress_saved_at = now
+    ExportJob.objects.filter(pk=job.pk).update(progress_done=done, progress_total=job.progress_total)
+
+
+def export_params_hash(view, view_args, method, params, user_id=None) -> str:
+    # The user is part of the key: exports replay views with the requester's permissions
+    payload = json.dumps([user_id, view, list(view_args), method, params], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def find_reusable_job(params_hash, now=None):
+    """A job for ``params_hash`` that is still running or has a fresh artifact."""
+    now = now or timezone.now()
+    running = ExportJob.objects.filter(
+        params_hash=params_hash,
+        status__in=ACTIVE_STATUSES,
+        created_at__gte=now - timedelta(seconds=_timeout()),
+    ).order_by('-created_at').first()
+    if running:
+        return running
+
+    completed = ExportJob.objects.filter(
+        params_hash=params_hash,
+        status=ExportJob.Status.COMPLETED,
+        expires_at__gt=now,
+    ).order_by('-expires_at').first()
+    if completed and os.path.exists(completed.artifact_path):
+        return completed
+    return None
+
+
+def start_export_job(request, view, *view_args, label='', method=None, data=None):
+    """
+    Queue ``view`` (a dotted path) to be replayed in the background with the
+    query or form data of ``request``, or return the job already doing that.
+    ``method`` and ``data`` (a dict of value lists) replace the request's own.
+    """
+    if data is None:
+        method = 'POST' if request.method == 'POST' else 'GET'
+        source = request.POST if method == 'POST' else request.GET
+        data = {key: source.getlist(key) for key in source if key != 'csrfmiddlewaretoken'}
+    method = method or 'GET'
+    params = {key: list(data[key]) for key in sorted(data)}
+    user = request.user if request.user.is_authenticated else None
+    params_hash = export_params_hash(view, view_args, method, params, user.pk if user else None)
+
+    job = find_reusable_job(params_hash)
+    if job:
+        logger.info(f"Export request reuses job {job.pk} ({job.status}): {label}")
+        return job
+
+    job = ExportJob.objects.create(
+        label=label[:200],
+        view=view,
+        view_args=list(view_args),
+        method=method,
+        params=params,
+        params_hash=params_hash,
+        requested_by=user,
+    )
+    try:
+        queued = enqueue_export_job(job)
+    except Exception as exc:
+        logger.error(f"Could not queue export job {job.pk}: {exc}", exc_info=True)
+        queued = False
+    if not queued:
+        run_export_job(job.pk)
+        job.refresh_from_db()
+    return job
+
+
+def enqueue_export_job(job: ExportJob) -> bool:
+    """
+    Queue ``job`` on django-q. Returns False when django-q is not installed,
+    in which case the caller should run ``run_export_job`` itself.
+    """
+    if importlib.util.find_spec('django_q') is None:
+        return False
+
+    from django_q.tasks import async_task
+
+    job.task_id = async_task('core.export_jobs.run_export_job', job.pk, timeout=_timeout()) or ''
+    job.save(update_fields=['task_id'])
+    return True
+
+
+def _replay_request(job: ExportJob) -> HttpRequest:
+    request = HttpRequest()
+    request.method = job.method
+    data = QueryDict(mutable=True)
+    for key, values in job.params.items():
+        data.setlist(key, values)
+    data._mutable = False
+    if job.method == 'POST':
+        request.POST = data
+    else:
+        request.GET = data
+    request.user = job.requested_by or AnonymousUser()
+    request.export_job = job
+    return request
+
+
+def _write_response(response, path) -> int:
+    """Write a (streaming) response body to ``path`` one chunk at a time."""
+    size = 0
+    try:
+        with open(path, 'wb') as output:
+            for chunk in response:
+                output.write(chunk)
+                size += len(chunk)
+    finally:
+        # Not response.close(): outside a request it would fire request_finished.
+        file_to_stream = getattr(response, 'file_to_stream', None)
+        if file_to_stream is not None:
+            file_to_stream.close()
+    return size
+
+
+def _attachment_filename(response) -> str:
+    header = Message()
+    header['Content-Disposition'] = response.get('Content-Disposition', '')
+    return os.path.basename(header.get_filename() or '')
+
+
+def _response_error(response) -> str:
+    """Why a replayed export view's response is not a file."""
+    message = f"The export returned HTTP {response.status_code} instead of a file"
+    content_type = response.get('Content-Type', '')
+    error = None
+    try:
+        if content_type.startswith('application/json'):
+            error = json.loads(response.content).get('error')
+        elif content_type.startswith('text/plain'):
+            error = response.content.decode(errors='replace')[:500]
+    except (ValueError, AttributeError):
+        pass
+    return f"{message}: {error}" if error else message
+
+
+def _remove_file(path):
+    if path and os.path.exists(path):
+        try:
+            os.remove(path)
+        except OSError as exc:
+            logger.warning(f"Could not remove export file {path}: {exc}")
+
+
+def run_export_job(job_id: int):
+    """django-q task: render one export job into MEDIA_ROOT."""
+    now = timezone.now()
+    claimed = ExportJob.objects.filter(pk=job_id, status=ExportJob.Status.QUEUED).update(
+        status=ExportJob.Status.RUNNING, started_at=now
+    )
+    if not claimed:
+        # Deleted, or a redelivered task for a job another worker took.
+        logger.info(f"Export job {job_id} is not queued; skipping")
+        return
+
+    job = ExportJob.objects.select_related('requested_by').get(pk=job_id)
+    directory = os.path.join(settings.MEDIA_ROOT, _export_dir())
+    os.makedirs(directory, exist_ok=True)
+    partial = os.path.join(directory, f'{job.pk}-{uuid.uuid4().hex}.part')
+
+    try:
+        response = import_string(job.view)(_replay_request(job), *job.view_args)
+        if response.status_code != 200 or 'attachment' not in response.get('Content-Disposition', ''):
+            raise ExportJobError(_response_error(response))
+        size = _write_response(response, partial)
+        filename = _attachment_filename(response) or f'export-{job.pk}'
+        artifact = f'{_export_dir()}/{job.pk}-{uuid.uuid4().hex}{os.path.splitext(filename)[1]}'
+        os.replace(partial, os.path.join(settings.MEDIA_ROOT, artifact))
+    except Exception as exc:
+        logger.error(f"Export job {job.pk} failed: {exc}", exc_info=True)
+        _remove_file(partial)
+        job.status = ExportJob.Status.FAILED
+        job.error_message = str(exc)[:1000]
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'error_message', 'finished_at'])
+        return
+
+    finished = timezone.now()
+    job.status = ExportJob.Status.COMPLETED
+    job.artifact = artifact
+    job.filename = filename
+    job.content_type = response.get('Content-Type', 'application/octet-stream')[:100]
+    job.size = size
+    job.finished_at = finished
+    job.expires_at = finished + _ttl()
+    job.save()
+    logger.info(f"Export job {job.pk} wrote {size} bytes to {artifact}")
+
+
+def export_job_token(job: ExportJob) -> str:
+    return signing.dumps(job.pk, salt=SIGNING_SALT)
+
+
+def load_export_job(token: str):
+    """
+    The job a signed token points at, or None when the token is forged or
+    older than a job could run plus the artifact lifetime.
+    """
+    max_age = _ttl() + timedelta(seconds=_timeout())
+    try:
+        job_id = signing.loads(token, salt=SIGNING_SALT, max_age=max_age)
+    except signing.BadSignature:
+        return None
+    return ExportJob.objects.filter(pk=job_id).first()
+
+
+def export_job_payload(job: ExportJob, token=None) -> dict:
+    """JSON-friendly state of ``job`` with its page, status and download links."""
+    token = token or export_job_token(job)
+    return {
+        'success': True,
+        'id': job.pk,
+        'label': job.label,
+        'status': job.status,
+        'finished': job.is_finished,
+        'error': job.error_message,
+        'done': job.progress_done,
+        'total': job.progress_total,
+        'percent': job.percent,
+        'filename': job.filename,
+        'size': job.size,
+        'expires_at': job.expires_at.isoformat() if job.expires_at else None,
+        'page_url': reverse('core:export_job_detail', args=[token]),
+        'status_url': reverse('core:export_job_status', args=[token]),
+        'download_url': (
+            reverse('core:export_job_download', args=[token])
+            if job.status == ExportJob.Status.COMPLETED else None
+        ),
+    }
+
+
+def export_job_response(request, job: ExportJob):
+    """
+    Answer an export request with its job: JSON for AJAX callers, otherwise
+    the file itself when it is ready and the job's progress page when not.
+    """
+    payload = export_job_payload(job)
+    if request.headers.get('x-requested-with') == 'XMLHttpRequest':
+        return JsonResponse(payload, status=202 if not job.is_finished else 200)
+    return redirect(payload['download_url'] or payload['page_url'])
+
+
+def cleanup_export_jobs(now=None) -> int:
+    """
+    Fail jobs whose worker died, then delete expired and failed jobs with
+    their artifacts, and any stray files. Returns the jobs deleted.
+    """
+    now = now or timezone.now()
+    lost_before = now - timedelta(seconds=_timeout())
+    ExportJob.objects.filter(status__in=ACTIVE_STATUSES, created_at__lt=lost_before).update(
+        status=ExportJob.Status.FAILED,
+        error_message='Abandoned: the export did not finish in time',
+        finished_at=now,
+    )
+
+    expired = ExportJob.objects.filter(
+        Q(status=ExportJob.Status.COMPLETED, expires_at__lt=now)
+        | Q(status=ExportJob.Status.FAILED, finished_at__lt=now - _ttl())
+    )
+    for path in expired.exclude(artifact='').values_list('artifact', flat=True).iterator():
+        _remove_file(os.path.join(settings.MEDIA_ROOT, path))
+    deleted = expired.delete()[0]
+
+    # Partial files of dead workers, and artifacts whose job row is gone
+    directory = os.path.join(settings.MEDIA_ROOT, _export_dir())
+    if os.path.isdir(directory):
+        kept = set(ExportJob.objects.exclude(artifact='').values_list('artifact', flat=True))
+        for entry in os.scandir(directory):
+            if not entry.is_file() or entry.stat().st_mtime >= lost_before.timestamp():
+                continue
+            if entry.name.endswith('.part') or f'{_export_dir()}/{entry.name}' not in kept:
+                _remove_file(entry.path)
+
+    if deleted:
+        logger.info(f"Removed {deleted} expired export job(s)")
+    return deleted
@@ -1,19 +1,23 @@
 import csv
 import html
-import io
 import json
 import os
 import logging
+import tempfile
 from datetime import datetime
-from typing import Optional
-from django.http import HttpResponse
+from itertools import chain, islice
+from typing import Iterable, Iterator, List, Optional
+from django.core.exceptions import FieldDoesNotExist
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
 from django.db.models import QuerySet
 from django.utils import timezone
 from django.conf import settings
 from django.contrib.staticfiles import finders
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment
-from openpyxl.cell.cell import MergedCell
+from openpyxl.utils import get_column_letter
+from openpyxl.worksheet.cell_range import CellRange
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter, A4, landscape
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
@@ -586,6 +590,81 @@ class LogoHeaderService:
             return 1
 
 
+    @staticmethod
+    def add_write_only_excel_header(worksheet, logo_path: Optional[str],
+                                    title: str = "NORSU Alumni System") -> int:
+        """
+        Write-only counterpart of ``add_excel_header``: appends the logo
+        header rows to a ``Workbook(write_only=True)`` worksheet, which must
+        not have any rows yet.
+
+        Returns:
+            int: Row number where data should start (row 4 on success, row 1 on failure)
+        """
+        norsu_blue = '2b3c6b'
+        gray_color = '4a5568'
+        try:
+            if logo_path and os.path.exists(logo_path):
+                try:
+                    from openpyxl.drawing.image import Image as ExcelImage
+
+                    img = ExcelImage(logo_path)
+                    img.width, img.height = _fit_logo(logo_path, 50)
+                    img.anchor = 'A1'
+                    worksheet.add_image(img)
+                except Exception as img_error:
+                    logger.error(
+                        f"Error embedding logo in Excel: {str(img_error)}",
+                        extra={
+                            'logo_path': logo_path,
+                            'error_type': type(img_error).__name__,
+                            'fallback': 'text-only header'
+                        }
+                    )
+
+            institution = WriteOnlyCell(worksheet, value="Negros Oriental State University")
+            institution.font = Font(bold=True, size=12, color=norsu_blue)
+            institution.alignment = Alignment(horizontal='left', vertical='center')
+            system = WriteOnlyCell(worksheet, value="Alumni Management System")
+            system.font = Font(size=9, color=gray_color)
+            system.alignment = Alignment(horizontal='left', vertical='center')
+
+            worksheet.merged_cells.add(CellRange('B1:D1'))
+            worksheet.merged_cells.add(CellRange('B2:D2'))
+            worksheet.row_dimensions[1].height = 30
+            worksheet.row_dimensions[2].height = 20
+            worksheet.row_dimensions[3].height = 10  # Spacer row
+
+            worksheet.append([None, institution])
+            worksheet.append([None, system])
+            worksheet.append([])
+            return 4
+        except Exception as e:
+            logger.error(
+                f"Critical error adding Excel header: {str(e)}",
+                extra={
+                    'error_type': type(e).__name__,
+                    'title': title,
+                    'fallback': 'Returning row 1 for normal export'
+                }
+            )
+            return 1
+
+
+def _fit_logo(logo_path: str, max_logo_size: int):
+    """Logo (width, height) scaled to fit a ``max_logo_size`` box, keeping its aspect ratio."""
+    try:
+        from PIL import Image as PILImage
+        with PILImage.open(logo_path) as pil_img:
+            img_width, img_height = pil_img.size
+    except Exception:
+        return max_logo_size, max_logo_size
+    aspect_ratio = img_width / img_height
+    if aspect_ratio > 1:
+        return max_logo_size, max_logo_size / aspect_ratio
+    return max_logo_size * aspect_ratio, max_logo_size
+
+
 def get_nested_value(obj, field_name):
     """Get value from nested field (e.g., 'user__username')"""
     if '__' not in field_name:
@@ -627,14 +706,179 @@ def should_use_landscape(field_labels, sample_data):
     # If table width is more than 500 points, use landscape
     return table_width > 500
 
+# Rows fetched per database round trip by the streaming exports
+EXPORT_CHUNK_SIZE = 2000
+# Rows joined into one chunk of a streamed CSV response
+CSV_ROWS_PER_CHUNK = 500
+# Leading rows sampled to size Excel columns
+EXCEL_WIDTH_SAMPLE_ROWS = 500
+EXCEL_MAX_COLUMN_WIDTH = 50
+
+
+def format_export_value(value) -> str:
+    """Render one exported value the way every CSV/Excel export shows it."""
+    if hasattr(value, 'strftime'):  # Handle datetime fields
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    if value is None:
+        return ''
+    return str(value)
+
+
+_COLUMN, _INSTANCE, _MISSING = 'column', 'instance', 'missing'
+
+
+def _resolve_export_path(model, field_name):
+    """
+    Classify one ``__`` path of an export config as it would be read by
+    ``get_nested_value``. Returns ``(kind, select_related, prefetch_related)``
+    where the relation hints are lookup strings or None.
+    """
+    parts = field_name.split('__')
+    related = []
+    for index, part in enumerate(parts):
+        last = index == len(parts) - 1
+        hint = '__'.join(related) or None
+        try:
+            field = model._meta.pk if part == 'pk' else model._meta.get_field(part)
+        except FieldDoesNotExist:
+            # Properties and methods need the instance; names the model
+            # does not have at all always export as ''.
+            return (_INSTANCE, hint, None) if hasattr(model, part) else (_MISSING, None, None)
+        if not field.is_relation:
+            if last and field.concrete:
+                return _COLUMN, None, None
+            return _INSTANCE, hint, None
+        if field.related_model is None:  # generic foreign key
+            return _INSTANCE, None, None
+        related.append(part)
+        if field.many_to_many or field.one_to_many:
+            return _INSTANCE, None, '__'.join(related)
+        if last:
+            # The related object itself is exported as str(obj).
+            return _INSTANCE, '__'.join(related), None
+        model = field.related_model
+    return _INSTANCE, None, None
+
+
+def is_column_path(model, field_name) -> bool:
+    """
+    True if ``field_name`` (e.g. ``user__username``) follows only
+    single-valued relations to a concrete, non-relation column, so
+    ``values_list`` returns exactly what ``get_nested_value`` would.
+    """
+    return _resolve_export_path(model, field_name)[0] == _COLUMN
+
+
+class ExportPlan:
+    """
+    How to read an export config's ``field_names`` from a queryset in bulk.
+
+    Column paths are read with ``values_list``, so rows arrive as tuples
+    without model instances. When a config also names properties, related
+    objects or to-many paths, instances are loaded instead, with the
+    ``select_related``/``prefetch_related`` lookups those paths walk.
+    Names the model does not have are exported as ``''`` without touching
+    the database.
+    """
+
+    def __init__(self, queryset, field_names):
+        self.field_names = list(field_names)
+        annotations = queryset.query.annotations
+        self.kinds = {}
+        select_related, prefetch_related = [], []
+        for name in self.field_names:
+            if name in annotations:
+                kind, select, prefetch = _COLUMN, None, None
+            else:
+                kind, select, prefetch = _resolve_export_path(queryset.model, name)
+            self.kinds[name] = kind
+            if select and select not in select_related:
+                select_related.append(select)
+            if prefetch and prefetch not in prefetch_related:
+                prefetch_related.append(prefetch)
+        self.select_related = select_related
+        self.prefetch_related = prefetch_related
+        self.value_fields = list(dict.fromkeys(
+            name for name in self.field_names if self.kinds[name] == _COLUMN
+        ))
+
+    @property
+    def needs_instances(self) -> bool:
+        return _INSTANCE in self.kinds.values()
+
+    def apply(self, queryset):
+        """``queryset`` with the relation lookups instance-based reads need."""
+        if not self.needs_instances:
+            return queryset
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        return queryset
+
+    def rows(self, queryset, chunk_size=EXPORT_CHUNK_SIZE) -> Iterator[List[str]]:
+        """Yield one list of formatted strings per row of ``queryset``."""
+        if self.needs_instances:
+            for obj in self.apply(queryset).iterator(chunk_size=chunk_size):
+                yield [
+                    '' if self.kinds[name] == _MISSING else format_export_value(get_nested_value(obj, name))
+                    for name in self.field_names
+                ]
+            return
+
+        # values_list needs at least one column; 'pk' only counts the rows.
+        value_fields = self.value_fields or ['pk']
+        positions = [
+            value_fields.index(name) if self.kinds[name] == _COLUMN else None
+            for name in self.field_names
+        ]
+        for values in queryset.values_list(*value_fields).iterator(chunk_size=chunk_size):
+            yield ['' if position is None else format_export_value(values[position]) for position in positions]
+
+
+def iter_export_rows(queryset, field_names, chunk_size=EXPORT_CHUNK_SIZE) -> Iterator[List[str]]:
+    """
+    Yield one list of formatted strings per row, fetching ``chunk_size`` rows
+    at a time, as planned by ``ExportPlan``.
+    """
+    return ExportPlan(queryset, field_names).rows(queryset, chunk_size=chunk_size)
+
+
+class _Echo:
+    """File-like object whose ``write`` returns the data, for ``csv.writer``."""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(field_labels, rows: Iterable[List[str]], rows_per_chunk=CSV_ROWS_PER_CHUNK) -> Iterator[str]:
+    """Yield CSV text in chunks of ``rows_per_chunk`` rows."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(field_labels)
+    while True:
+        chunk = [writer.writerow(row) for row in islice(rows, rows_per_chunk)]
+        if not chunk:
+            return
+        yield ''.join(chunk)
+
+
+def sample_column_widths(field_labels, sample_rows, max_width=EXCEL_MAX_COLUMN_WIDTH) -> List[int]:
+    """Column widths fitting the header and the sampled rows."""
+    widths = [len(str(label)) for label in field_labels]
+    for row in sample_rows:
+        for index, value in enumerate(row):
+            widths[index] = max(widths[index], len(value))
+    return [min(width + 2, max_width) for width in widths]
+
+
 class ExportMixin:
     """Mixin class to add export functionality to views"""
     
     def export_csv(self, queryset, filename, field_names=None, field_labels=None):
-        """Export queryset to CSV format"""
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = f'attachment; filename="{filename}.csv"'
-        
+        """
+        Export queryset to CSV format. The response is streamed, so memory
+        use does not grow with the number of rows.
+        """
         if field_names is None:
             # Get all field names from the model
             field_names = [field.name for field in queryset.model._meta.fields]
@@ -642,97 +886,68 @@ class ExportMixin:
         if field_labels is None:
             field_labels = field_names
         
-        writer = csv.writer(response)
-        writer.writerow(field_labels)
-        
-        for obj in queryset:
-            row = []
-            for field_name in field_names:
-                value = get_nested_value(obj, field_name)
-                if hasattr(value, 'strftime'):  # Handle datetime fields
-                    value = value.strftime('%Y-%m-%d %H:%M:%S')
-                elif value is None:
-                    value = ''
-                row.append(str(value))
-            writer.writerow(row)
-        
+        response = StreamingHttpResponse(
+            stream_csv(field_labels, iter_export_rows(queryset, field_names)),
+            content_type='text/csv',
+        )
+        response['Content-Disposition'] = f'attachment; filename="{filename}.csv"'
         return response
     
     def export_excel(self, queryset, filename, field_names=None, field_labels=None, sheet_name="Data"):
-        """Export queryset to Excel format"""
-        wb = Workbook()
-        ws = wb.active
-        ws.title = sheet_name
-        
+        """
+        Export queryset to Excel format. Rows go through an openpyxl
+        write-only workbook into a temporary file that is streamed back, so
+        memory use does not grow with the number of rows.
+        """
         if field_names is None:
             field_names = [field.name for field in queryset.model._meta.fields]
         
         if field_labels is None:
             field_labels = field_names
         
+        output = tempfile.TemporaryFile()
+        self.write_excel(output, queryset, field_names, field_labels, sheet_name)
+        output.seek(0)
+        return FileResponse(
+            output,
+            as_attachment=True,
+            filename=f"{filename}.xlsx",
+            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        )
+
+    def write_excel(self, output, queryset, field_names, field_labels, sheet_name="Data"):
+        """Write the Excel export of ``queryset`` to the binary file ``output``."""
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet(title=sheet_name)
+
+        # Write-only sheets need their column widths before the first row.
+        rows = iter_export_rows(queryset, field_names)
+        sample = list(islice(rows, EXCEL_WIDTH_SAMPLE_ROWS))
+        for col, width in enumerate(sample_column_widths(field_labels, sample), 1):
+            ws.column_dimensions[get_column_letter(col)].width = width
+
         # Get logo path using LogoHeaderService
         logo_path = LogoHeaderService.get_logo_path()
-        
-        # Add logo header and get starting row number
-        header_start_row = LogoHeaderService.add_excel_header(ws, logo_path, title="NORSU Alumni System")
-        
+        LogoHeaderService.add_write_only_excel_header(ws, logo_path, title="NORSU Alumni System")
+
         # Style for header row
         header_font = Font(bold=True, color="FFFFFF")
         header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
         header_alignment = Alignment(horizontal="center", vertical="center")
-        
-        # Write header row at the returned row number (row 4)
-        for col, label in enumerate(field_labels, 1):
-            cell = ws.cell(row=header_start_row, column=col, value=label)
+
+        header = []
+        for label in field_labels:
+            cell = WriteOnlyCell(ws, value=label)
             cell.font = header_font
             cell.fill = header_fill
             cell.alignment = header_alignment
-        
-        # Write data rows starting at row 5 (header_start_row + 1)
-        data_start_row = header_start_row + 1
-        for row_idx, obj in enumerate(queryset, data_start_row):
-            for col, field_name in enumerate(field_names, 1):
-                value = get_nested_value(obj, field_name)
-                if hasattr(value, 'strftime'):  # Handle datetime fields
-                    value = value.strftime('%Y-%m-%d %H:%M:%S')
-                elif value is None:
-                    value = ''
-                ws.cell(row=row_idx, column=col, value=str(value))
-        
-        # Auto-adjust column widths
-        for column in ws.columns:
-            max_length = 0
-            # Get column letter from first non-merged cell
-            column_letter = None
-            for cell in column:
-                if not isinstance(cell, MergedCell):
-                    column_letter = cell.column_letter
-                    break
-            
-            if column_letter is None:
-                continue  # Skip if all cells in column are merged
-            
-            for cell in column:
-                try:
-                    if not isinstance(cell, MergedCell) and len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
-        
-        # Save to response
-        response = HttpResponse(
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
-        response['Content-Disposition'] = f'attachment; filename="{filename}.xlsx"'
-        
-        output = io.BytesIO()
+            header.append(cell)
+        ws.append(header)
+
+        for row in chain(sample, rows):
+            ws.append(row)
+
         wb.save(output)
-        output.seek(0)
-        response.write(output.getvalue())
-        
-        return response
     
     def export_pdf(self, queryset, filename, field_names=None, field_labels=None, title="Data Export"):
         """Export queryset to PDF format with black and white styling"""
@@ -749,21 +964,9 @@ class ExportMixin:
         logo_path = LogoHeaderService.get_logo_path()
         
         # Prepare sample data to determine page orientation
-        sample_data = []
-        sample_queryset = queryset[:10]  # Get first 10 records for width calculation
-        
-        for obj in sample_queryset:
-            row = []
-            for field_name in field_names:
-                value = get_nested_value(obj, field_name)
-                if hasattr(value, 'strftime'):
-                    value = value.strftime('%Y-%m-%d %H:%M:%S')
-                elif value is None:
-                    value = ''
-                value_str = str(value)
-                # Don't truncate in sample data for width calculation
-                row.append(value_str)
-            sample_data.append(row)
+        plan = ExportPlan(queryset, field_names)
+        # Get first 10 records for width calculation (not truncated)
+        sample_data = list(plan.rows(queryset[:10]))
         
         # Determine page orientation
         use_landscape = should_use_landscape(field_labels, sample_data)
@@ -871,18 +1074,9 @@ class ExportMixin:
             leading=8 if use_landscape else 9
         )
         
-        for obj in queryset_limited:
-            row = []
-            for field_name in field_names:
-                value = get_nested_value(obj, field_name)
-                if hasattr(value, 'strftime'):  # Handle datetime fields
-                    value = value.strftime('%Y-%m-%d %H:%M:%S')
-                elif value is None:
-                    value = ''
-                # Use Paragraph for automatic text wrapping
-                value_str = str(value)
-                row.append(Paragraph(html.escape(value_str), data_cell_style))
-            table_data.append(row)
+        for values in plan.rows(queryset_limited):
+            # Use Paragraph for automatic text wrapping
+            table_data.append([Paragraph(html.escape(value), data_cell_style) for value in values])
         
         # Calculate column widths dynamically based on content
         available_width = pagesize[0] - 30  # Total width minus margins
@@ -1107,6 +1301,21 @@ class ModelExporter:
             'sheet_name': 'Surveys'
         }
 
+def write_response_to_zip(zip_file, arcname, response):
+    """Add an export response to an open ``ZipFile``, copying streamed responses chunk by chunk."""
+    if not getattr(response, 'streaming', False):
+        zip_file.writestr(arcname, response.content)
+        return
+    # response.close() would send request_finished and close the database
+    # connection mid-request, so only the streamed file is closed.
+    try:
+        with zip_file.open(arcname, 'w') as dest:
+            for chunk in response.streaming_content:
+                dest.write(chunk)
+    finally:
+        if getattr(response, 'file_to_stream', None) is not None:
+            response.file_to_stream.close()
+
 def get_export_filename(model_name, format_type):
     """Generate standardized export filename"""
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
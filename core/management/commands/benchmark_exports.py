@@ -0,0 +1,189 @@
+"""
+Management command to benchmark the alumni CSV/Excel exports.
+
+Creates the requested number of alumni inside a transaction that is rolled
+back, then exports them with the previous in-memory implementation and with
+the streaming exports, reporting time, queries and peak Python memory.
+
+Usage:
+    python manage.py benchmark_exports
+    python manage.py benchmark_exports --rows 20000 --formats csv
+    python manage.py benchmark_exports --skip-legacy
+"""
+import csv
+import io
+import time
+import tracemalloc
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.http import HttpResponse
+from django.test.utils import CaptureQueriesContext
+from openpyxl import Workbook
+
+from alumni_directory.models import Alumni
+from core.export_utils import ExportMixin, ModelExporter, get_nested_value
+
+User = get_user_model()
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _legacy_value(obj, field_name):
+    value = get_nested_value(obj, field_name)
+    if hasattr(value, 'strftime'):
+        value = value.strftime('%Y-%m-%d %H:%M:%S')
+    elif value is None:
+        value = ''
+    return str(value)
+
+
+def legacy_export_csv(queryset, field_names, field_labels):
+    """The CSV export as it was before streaming: the whole file in one HttpResponse."""
+    response = HttpResponse(content_type='text/csv')
+    writer = csv.writer(response)
+    writer.writerow(field_labels)
+    for obj in queryset:
+        writer.writerow([_legacy_value(obj, name) for name in field_names])
+    return response
+
+
+def legacy_export_excel(queryset, field_names, field_labels):
+    """The Excel export as it was before streaming: a full workbook, widths from every cell."""
+    wb = Workbook()
+    ws = wb.active
+    for col, label in enumerate(field_labels, 1):
+        ws.cell(row=1, column=col, value=label)
+    for row_idx, obj in enumerate(queryset, 2):
+        for col, name in enumerate(field_names, 1):
+            ws.cell(row=row_idx, column=col, value=_legacy_value(obj, name))
+    for column in ws.columns:
+        width = max(len(str(cell.value)) for cell in column)
+        ws.column_dimensions[column[0].column_letter].width = min(width + 2, 50)
+    output = io.BytesIO()
+    wb.save(output)
+    response = HttpResponse(content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+    response.write(output.getvalue())
+    return response
+
+
+def _drain(response):
+    """Consume a response the way the WSGI server would; returns its size in bytes."""
+    if not response.streaming:
+        return len(response.content)
+    size = 0
+    for chunk in response.streaming_content:
+        size += len(chunk)
+    if getattr(response, 'file_to_stream', None) is not None:
+        response.file_to_stream.close()
+    return size
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare time, queries and peak memory of the in-memory and streaming alumni exports. "
+        "All benchmark data is created inside a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=100000,
+            help='Number of alumni to export (default: 100000).'
+        )
+        parser.add_argument(
+            '--formats',
+            nargs='+',
+            choices=['csv', 'excel'],
+            default=['csv', 'excel'],
+            help='Formats to benchmark (default: csv excel).'
+        )
+        parser.add_argument(
+            '--skip-legacy',
+            action='store_true',
+            help='Only run the streaming exports.'
+        )
+
+    def handle(self, *args, **options):
+        rows = max(1, options['rows'])
+        try:
+            with transaction.atomic():
+                self._seed(rows)
+                self._run(rows, options['formats'], options['skip_legacy'])
+                raise _Rollback()
+        except _Rollback:
+            pass
+
+    def _seed(self, rows):
+        self.stdout.write(f'Creating {rows} alumni...')
+        batch = 5000
+        for start in range(0, rows, batch):
+            users = User.objects.bulk_create([
+                User(
+                    username=f'export_benchmark_{i}',
+                    email=f'export_benchmark_{i}@example.com',
+                    first_name='Export',
+                    last_name=f'Benchmark {i}',
+                )
+                for i in range(start, min(start + batch, rows))
+            ])
+            if users and users[0].pk is None:
+                users = list(User.objects.filter(username__in=[user.username for user in users]))
+            Alumni.objects.bulk_create([
+                Alumni(
+                    user=user,
+                    college='CAS',
+                    campus='MAIN',
+                    graduation_year=2000 + i % 25,
+                    course='BS Information Technology',
+                    gender='F' if i % 2 else 'M',
+                    province='Negros Oriental',
+                    city='Dumaguete',
+                    address='Benchmark address',
+                    current_company='Benchmark Co',
+                    job_title='Analyst',
+                )
+                for i, user in enumerate(users, start)
+            ])
+
+    def _measure(self, export):
+        tracemalloc.start()
+        with CaptureQueriesContext(connection) as ctx:
+            started = time.perf_counter()
+            size = _drain(export())
+            elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return elapsed, len(ctx.captured_queries), peak, size
+
+    def _run(self, rows, formats, skip_legacy):
+        config = ModelExporter.get_alumni_export_config()
+        names, labels = config['field_names'], config['field_labels']
+        mixin = ExportMixin()
+
+        def queryset():
+            # A fresh queryset per case, as each export request builds its own.
+            return Alumni.objects.select_related('user').filter(user__username__startswith='export_benchmark_')
+
+        cases = []
+        for format_type in formats:
+            if format_type == 'csv':
+                if not skip_legacy:
+                    cases.append(('csv in-memory', lambda: legacy_export_csv(queryset(), names, labels)))
+                cases.append(('csv streaming', lambda: mixin.export_csv(queryset(), 'alumni', names, labels)))
+            else:
+                if not skip_legacy:
+                    cases.append(('xlsx in-memory', lambda: legacy_export_excel(queryset(), names, labels)))
+                cases.append(('xlsx streaming', lambda: mixin.export_excel(queryset(), 'alumni', names, labels)))
+
+        self.stdout.write(f'Exporting {rows} alumni ({connection.vendor}):')
+        for label, export in cases:
+            elapsed, queries, peak, size = self._measure(export)
+            self.stdout.write(
+                f'  {label:<15} {elapsed:>8.2f} s {queries:>6} queries '
+                f'{peak / 2 ** 20:>8.1f} MiB peak {size / 2 ** 20:>8.1f} MiB output'
+            )
@@ -0,0 +1,126 @@
+"""
+Management command to benchmark notifying a group's members of an event.
+
+Creates a group with --members approved members and a draft event, then
+notifies the members with the previous loop (``Notification.create_notification``
+per membership) and with the bulk fan-out, deleting the notifications in
+between. Reports time, queries and audit records written; everything the
+benchmark creates is removed afterwards.
+
+Usage:
+    python manage.py benchmark_notification_fanout
+    python manage.py benchmark_notification_fanout --members 10000
+"""
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from alumni_groups.models import AlumniGroup, GroupMembership
+from core.models import Notification
+from core.notifications import notify_users
+from events.models import Event
+from log_viewer import audit
+from log_viewer.models import AuditLog
+
+User = get_user_model()
+
+USERNAME_PREFIX = 'fanout-bench-'
+
+
+def legacy_notify(event, group):
+    """The fan-out as it was before: one create_notification per membership."""
+    for membership in group.memberships.filter(status='APPROVED', is_active=True):
+        Notification.create_notification(
+            recipient=membership.user,
+            notification_type='event',
+            title=f"New Event: {event.title}",
+            message=f"New event '{event.title}' has been announced for {group.name}.",
+            content_object=event,
+            action_url=f'/events/{event.pk}/'
+        )
+
+
+def bulk_notify(event, group):
+    notify_users(
+        User.objects.filter(
+            group_memberships__group=group,
+            group_memberships__status='APPROVED',
+            group_memberships__is_active=True,
+        ),
+        notification_type='event',
+        title=f"New Event: {event.title}",
+        message=f"New event '{event.title}' has been announced for {group.name}.",
+        content_object=event,
+        action_url=f'/events/{event.pk}/',
+    )
+
+
+class Command(BaseCommand):
+    help = "Compare per-recipient and bulk creation of event notifications for a group."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--members',
+            type=int,
+            default=3000,
+            help='Approved members of the notified group (default: 3000).'
+        )
+
+    def handle(self, *args, **options):
+        if options['members'] < 1:
+            raise CommandError('--members must be at least 1')
+
+        last_audit_id = AuditLog.objects.order_by('-pk').values_list('pk', flat=True).first() or 0
+        with audit.suspend():
+            organizer = User.objects.create_user(f'{USERNAME_PREFIX}organizer')
+            users = User.objects.bulk_create([
+                User(username=f'{USERNAME_PREFIX}{i}', is_active=False) for i in range(options['members'])
+            ])
+            users = User.objects.filter(username__in=[user.username for user in users])
+            group = AlumniGroup.objects.create(name='Fan-out benchmark', description='', group_type='MANUAL')
+            GroupMembership.objects.bulk_create([
+                GroupMembership(group=group, user=user, status='APPROVED') for user in users
+            ])
+            start = timezone.now() + timedelta(days=7)
+            # Saved as a draft so the event's own signal handlers notify nobody
+            event = Event.objects.create(
+                title='Benchmark', description='', start_date=start, end_date=start + timedelta(hours=1),
+                location='', created_by=organizer,
+            )
+        try:
+            self._run(event, group)
+        finally:
+            # Deleting the members records a LEAVE activity for each in the
+            # group, so the group goes in the same transaction, after them
+            with audit.suspend(), transaction.atomic():
+                event.delete()
+                User.objects.filter(username__startswith=USERNAME_PREFIX).delete()
+                group.delete()
+            AuditLog.objects.filter(pk__gt=last_audit_id).delete()
+
+    @staticmethod
+    def _counter(queries):
+        def count(execute, sql, params, many, context):
+            queries.append(None)
+            return execute(sql, params, many, context)
+        return count
+
+    def _run(self, event, group):
+        for label, run in (('per-recipient', legacy_notify), ('bulk', bulk_notify)):
+            Notification.objects.filter(recipient__username__startswith=USERNAME_PREFIX).delete()
+            audit_before = AuditLog.objects.count()
+            queries = []
+            # One audit batch, as in the request that saved the event
+            started = time.perf_counter()
+            with connection.execute_wrapper(self._counter(queries)), audit.batch():
+                run(event, group)
+            elapsed = time.perf_counter() - started
+            created = Notification.objects.filter(recipient__username__startswith=USERNAME_PREFIX).count()
+            self.stdout.write(
+                f'  {label:<14} {elapsed:>8.2f} s {created:>7} notifications {len(queries):>7} queries '
+                f'{AuditLog.objects.count() - audit_before:>7} audit records'
+            )
@@ -0,0 +1,87 @@
+"""
+Management command to set up the Django-Q schedule that removes expired exports.
+
+Background exports keep their files under MEDIA_ROOT for
+EXPORT_JOB_TTL_MINUTES; this schedule deletes them once they expire.
+
+Usage:
+    python manage.py setup_export_cleanup_schedule
+    python manage.py setup_export_cleanup_schedule --minutes 30
+    python manage.py setup_export_cleanup_schedule --remove
+    python manage.py setup_export_cleanup_schedule --run-now
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+SCHEDULE_NAME = 'Export Artifact Cleanup'
+
+
+class Command(BaseCommand):
+    help = 'Set up the Django-Q scheduled task that deletes expired export files'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--minutes',
+            type=int,
+            default=15,
+            help='How often to remove expired exports, in minutes (default: 15)'
+        )
+        parser.add_argument(
+            '--remove',
+            action='store_true',
+            help='Remove the existing export cleanup schedule'
+        )
+        parser.add_argument(
+            '--run-now',
+            action='store_true',
+            help='Remove expired exports once, without touching the schedule'
+        )
+
+    def handle(self, *args, **options):
+        if options['run_now']:
+            from core.export_jobs import cleanup_export_jobs
+
+            deleted = cleanup_export_jobs()
+            self.stdout.write(self.style.SUCCESS(f'✓ Removed {deleted} expired export job(s)'))
+            return
+
+        if options['minutes'] < 1:
+            raise CommandError('--minutes must be at least 1')
+
+        try:
+            from django_q.models import Schedule
+        except ImportError:
+            raise CommandError(
+                'Django-Q is not installed. Install it with: pip install django-q2'
+            )
+
+        deleted_count = Schedule.objects.filter(name=SCHEDULE_NAME).delete()[0]
+        if options['remove']:
+            if deleted_count:
+                self.stdout.write(self.style.SUCCESS(f'✓ Removed {deleted_count} export cleanup schedule(s)'))
+            else:
+                self.stdout.write(self.style.WARNING('○ No export cleanup schedule found'))
+            return
+
+        schedule = Schedule.objects.create(
+            func='core.export_jobs.cleanup_export_jobs',
+            name=SCHEDULE_NAME,
+            schedule_type=Schedule.MINUTES,
+            minutes=options['minutes'],
+            repeats=-1,  # Repeat indefinitely
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'✓ Created Django-Q scheduled task\n\n'
+                f'Schedule ID: {schedule.id}\n'
+                f'Function: {schedule.func}\n'
+                f'Runs every: {schedule.minutes} minute(s)\n'
+            )
+        )
+        self.stdout.write(
+            self.style.WARNING(
+                '\n⚠ Important: Django-Q cluster must be running for exports and cleanup to execute.\n'
+                'Start it with: python manage.py qcluster'
+            )
+        )
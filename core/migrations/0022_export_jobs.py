@@ -0,0 +1,46 @@
+# Generated by Django 5.0.2 on 2026-10-17 16:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0021_systemsettings'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('label', models.CharField(max_length=200)),
+                ('view', models.CharField(help_text='Dotted path of the export view the worker replays', max_length=200)),
+                ('view_args', models.JSONField(blank=True, default=list)),
+                ('method', models.CharField(default='GET', max_length=8)),
+                ('params', models.JSONField(blank=True, default=dict, help_text='Query or form data, as lists of values')),
+                ('params_hash', models.CharField(db_index=True, max_length=64)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='queued', max_length=12)),
+                ('progress_done', models.PositiveIntegerField(default=0)),
+                ('progress_total', models.PositiveIntegerField(default=0)),
+                ('error_message', models.TextField(blank=True)),
+                ('task_id', models.CharField(blank=True, max_length=64)),
+                ('artifact', models.CharField(blank=True, help_text='Path relative to MEDIA_ROOT', max_length=255)),
+                ('filename', models.CharField(blank=True, max_length=255)),
+                ('content_type', models.CharField(blank=True, max_length=100)),
+                ('size', models.PositiveBigIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('expires_at', models.DateTimeField(blank=True, null=True)),
+                ('requested_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='export_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['params_hash', 'status'], name='core_exportjob_dedupe_idx'), models.Index(fields=['expires_at'], name='core_exportjob_expiry_idx')],
+            },
+        ),
+    ]
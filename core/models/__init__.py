@@ -35,6 +35,7 @@ from .user_management import UserAuditLog, UserStatusChange
 from .seo import PageSEO, OrganizationSchema
 from .ai_config import AIConfig
 from .system_settings import SystemSettings
+from .export_job import ExportJob
 
 __all__ = [
     'TimeStampedModel',
@@ -58,4 +59,5 @@ __all__ = [
     'OrganizationSchema',
     'AIConfig',
     'SystemSettings',
+    'ExportJob',
 ]
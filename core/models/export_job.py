@@ -0,0 +1,80 @@
+"""
+Background export jobs and their downloadable artifacts.
+"""
+import os
+
+from django.conf import settings
+from django.db import models
+
+
+class ExportJob(models.Model):
+    """
+    An export rendered by a django-q worker instead of inside the request.
+
+    The worker replays the original export view (``view`` with ``view_args``,
+    ``method`` and ``params``) as the requesting user and writes the file it
+    returns to ``artifact`` under MEDIA_ROOT. Requests with the same
+    ``params_hash`` share one job while it is running or its artifact is fresh.
+    """
+
+    class Status(models.TextChoices):
+        QUEUED = 'queued', 'Queued'
+        RUNNING = 'running', 'Running'
+        COMPLETED = 'completed', 'Completed'
+        FAILED = 'failed', 'Failed'
+
+    label = models.CharField(max_length=200)
+    view = models.CharField(max_length=200, help_text="Dotted path of the export view the worker replays")
+    view_args = models.JSONField(default=list, blank=True)
+    method = models.CharField(max_length=8, default='GET')
+    params = models.JSONField(default=dict, blank=True, help_text="Query or form data, as lists of values")
+    params_hash = models.CharField(max_length=64, db_index=True)
+
+    status = models.CharField(max_length=12, choices=Status.choices, default=Status.QUEUED)
+    progress_done = models.PositiveIntegerField(default=0)
+    progress_total = models.PositiveIntegerField(default=0)
+    error_message = models.TextField(blank=True)
+    task_id = models.CharField(max_length=64, blank=True)
+
+    artifact = models.CharField(max_length=255, blank=True, help_text="Path relative to MEDIA_ROOT")
+    filename = models.CharField(max_length=255, blank=True)
+    content_type = models.CharField(max_length=100, blank=True)
+    size = models.PositiveBigIntegerField(default=0)
+
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='export_jobs',
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['params_hash', 'status'], name='core_exportjob_dedupe_idx'),
+            models.Index(fields=['expires_at'], name='core_exportjob_expiry_idx'),
+        ]
+
+    def __str__(self):
+        return f"Export #{self.pk}: {self.label} ({self.status})"
+
+    @property
+    def is_finished(self):
+        return self.status in (self.Status.COMPLETED, self.Status.FAILED)
+
+    @property
+    def percent(self):
+        if self.status == self.Status.COMPLETED:
+            return 100
+        if not self.progress_total:
+            return 0
+        return min(99, int(self.progress_done * 100 / self.progress_total))
+
+    @property
+    def artifact_path(self):
+        return os.path.join(settings.MEDIA_ROOT, self.artifact) if self.artifact else ''
@@ -0,0 +1,128 @@
+"""
+Bulk notification fan-out.
+
+``notify_users`` gives every user of a recipients queryset one in-app
+Notification. Recipients who switched the notification type off in their
+NotificationPreference, and recipients already notified of the same type
+about the same object, are filtered out in SQL; the rest are resolved with
+one query and inserted NOTIFICATION_FANOUT_CHUNK_SIZE rows per bulk_create,
+which also skips the per-row post_save (and audit) handlers.
+
+Fan-outs triggered by a save should not run inside its request:
+``dispatch_fanout`` queues a task on django-q once the current transaction
+commits, or runs it then without django-q.
+"""
+import importlib.util
+import logging
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Q
+from django.utils.module_loading import import_string
+
+from .models.notifications import Notification
+
+logger = logging.getLogger(__name__)
+
+# The NotificationPreference switch for each in-app notification type;
+# types without one (system notifications) are always delivered.
+PREFERENCE_FIELDS = {
+    'announcement': 'app_announcements',
+    'event': 'app_events',
+    'survey': 'app_surveys',
+    'job_posting': 'app_job_postings',
+    'connection_request': 'app_connections',
+    'connection_accepted': 'app_connections',
+    'mentorship_request': 'app_mentorship',
+    'mentorship_approved': 'app_mentorship',
+    'mentorship_rejected': 'app_mentorship',
+    'mentorship_disabled': 'app_mentorship',
+    'mentorship_reactivation_approved': 'app_mentorship',
+    'mentorship_reactivation_rejected': 'app_mentorship',
+    'new_message': 'app_messages',
+}
+
+
+def _chunk_size() -> int:
+    return max(1, getattr(settings, 'NOTIFICATION_FANOUT_CHUNK_SIZE', 1000))
+
+
+def recipient_ids(recipients, notification_type, content_object=None):
+    """
+    Ids of the users in ``recipients`` who should get a ``notification_type``
+    notification about ``content_object``, as a single query.
+    """
+    preference_field = PREFERENCE_FIELDS.get(notification_type)
+    if preference_field:
+        # Users without a preferences row get the defaults, which are all on
+        recipients = recipients.filter(
+            Q(alumni_notification_preferences__isnull=True)
+            | Q(**{f'alumni_notification_preferences__{preference_field}': True})
+        )
+    if content_object is not None:
+        already_notified = Notification.objects.filter(
+            content_type=ContentType.objects.get_for_model(content_object),
+            object_id=content_object.pk,
+            notification_type=notification_type,
+        ).values('recipient_id')
+        recipients = recipients.exclude(pk__in=already_notified)
+    return recipients.order_by().values_list('pk', flat=True).distinct()
+
+
+def notify_users(recipients, notification_type, title, message,
+                 sender=None, content_object=None, action_url=None):
+    """
+    Create one notification per user of the ``recipients`` queryset (see
+    ``recipient_ids`` for who is left out). Returns how many were created.
+    """
+    user_ids = list(recipient_ids(recipients, notification_type, content_object))
+    content_type = ContentType.objects.get_for_model(content_object) if content_object is not None else None
+    chunk_size = _chunk_size()
+    for start in range(0, len(user_ids), chunk_size):
+        Notification.objects.bulk_create([
+            Notification(
+                recipient_id=user_id,
+                sender=sender,
+                notification_type=notification_type,
+                title=title,
+                message=message,
+                content_type=content_type,
+                object_id=content_object.pk if content_object is not None else None,
+                action_url=action_url,
+            )
+            for user_id in user_ids[start:start + chunk_size]
+        ])
+    logger.info(f"Created {len(user_ids)} '{notification_type}' notifications: {title}")
+    return len(user_ids)
+
+
+def dispatch_fanout(func_path, *args):
+    """
+    Run the fan-out task ``func_path(*args)`` after the current transaction
+    commits: on django-q when it is installed, otherwise inline.
+    """
+    def run():
+        try:
+            queued = enqueue_fanout(func_path, *args)
+        except Exception as exc:
+            logger.error(f"Could not queue notification fan-out {func_path}{args}: {exc}", exc_info=True)
+            queued = False
+        if not queued:
+            import_string(func_path)(*args)
+
+    transaction.on_commit(run)
+
+
+def enqueue_fanout(func_path, *args) -> bool:
+    """
+    Queue ``func_path(*args)`` on django-q. Returns False when django-q is not
+    installed, in which case the caller should run the task itself.
+    """
+    if importlib.util.find_spec('django_q') is None:
+        return False
+
+    from django_q.tasks import async_task
+
+    async_task(func_path, *args)
+    return True
@@ -0,0 +1,202 @@
+"""
+Tests for background export jobs
+"""
+import csv
+import io
+import os
+import re
+import shutil
+import tempfile
+import zipfile
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core.export_jobs import cleanup_export_jobs, export_job_token, load_export_job, run_export_job
+from core.models import ExportJob
+
+User = get_user_model()
+
+
+class ExportJobTest(TestCase):
+    """Test cases for queuing, running and downloading export jobs"""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        setup_patcher = patch(
+            "setup.middleware.SetupRequiredMiddleware._is_setup_complete",
+            return_value=True,
+        )
+        setup_patcher.start()
+        self.addCleanup(setup_patcher.stop)
+
+        self.admin = User.objects.create_superuser(
+            username='exportadmin', email='exportadmin@example.com', password='SecurePass123!'
+        )
+        self.client.force_login(self.admin)
+
+    def _bulk_export(self, models=('users',), format_type='csv'):
+        return self.client.post(
+            reverse('core:bulk_export_process'),
+            {'models': list(models), 'format_type': format_type},
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest',
+        )
+
+    def _download(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content)
+
+    def test_bulk_export_is_queued_and_written_by_the_worker(self):
+        with patch('core.export_jobs.enqueue_export_job', return_value=True) as enqueue:
+            response = self._bulk_export(models=['users', 'events'])
+
+        self.assertEqual(response.status_code, 202)
+        queued = response.json()
+        self.assertEqual((queued['status'], queued['download_url']), ('queued', None))
+        job = ExportJob.objects.get(pk=queued['id'])
+        enqueue.assert_called_once_with(job)
+
+        run_export_job(job.pk)
+
+        status = self.client.get(queued['status_url']).json()
+        self.assertEqual((status['status'], status['done'], status['total']), ('completed', 2, 2))
+        self.assertTrue(status['filename'].startswith('bulk_export_'))
+        job.refresh_from_db()
+        self.assertTrue(job.artifact.startswith('exports/'))
+        self.assertTrue(os.path.exists(job.artifact_path))
+
+        with zipfile.ZipFile(io.BytesIO(self._download(status['download_url']))) as archive:
+            names = archive.namelist()
+            self.assertIn('README.txt', names)
+            users_csv = next(name for name in names if name.startswith('users_'))
+            rows = list(csv.reader(io.StringIO(archive.read(users_csv).decode())))
+        self.assertIn('exportadmin', [row[1] for row in rows[1:]])
+
+    def test_identical_requests_share_a_job_while_it_is_fresh(self):
+        with patch('core.export_jobs.enqueue_export_job', return_value=False):
+            first = self._bulk_export().json()
+            second = self._bulk_export().json()
+            other_format = self._bulk_export(format_type='excel').json()
+
+        self.assertEqual(first['status'], 'completed')
+        self.assertEqual(first['id'], second['id'])
+        self.assertNotEqual(first['id'], other_format['id'])
+
+        ExportJob.objects.filter(pk=first['id']).update(expires_at=timezone.now() - timedelta(seconds=1))
+        with patch('core.export_jobs.enqueue_export_job', return_value=False):
+            renewed = self._bulk_export().json()
+        self.assertNotEqual(first['id'], renewed['id'])
+
+    def test_each_user_gets_their_own_job_and_links(self):
+        with patch('core.export_jobs.enqueue_export_job', return_value=False):
+            first = self._bulk_export().json()
+            other_admin = User.objects.create_superuser(
+                username='otheradmin', email='otheradmin@example.com', password='SecurePass123!'
+            )
+            self.client.force_login(other_admin)
+            second = self._bulk_export().json()
+        self.assertNotEqual(first['id'], second['id'])
+        # Superusers may still follow anyone's links
+        self.assertEqual(self.client.get(first['status_url']).status_code, 200)
+
+        member = User.objects.create_user(username='member', email='member@example.com', password='SecurePass123!')
+        ExportJob.objects.filter(pk=first['id']).update(requested_by=member)
+        staff = User.objects.create_user(
+            username='staff', email='staff@example.com', password='SecurePass123!', is_staff=True
+        )
+        self.client.force_login(staff)
+        for url in (first['page_url'], first['status_url'], first['download_url']):
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 404)
+
+        self.client.force_login(member)
+        self.assertEqual(self.client.get(first['status_url']).json()['id'], first['id'])
+        self.assertEqual(self.client.get(first['page_url']).status_code, 200)
+        self.assertTrue(self._download(first['download_url']))
+
+    def test_worker_does_not_run_a_job_twice(self):
+        with patch('core.export_jobs.enqueue_export_job', return_value=True):
+            job_id = self._bulk_export().json()['id']
+
+        run_export_job(job_id)
+        finished_at = ExportJob.objects.get(pk=job_id).finished_at
+        run_export_job(job_id)  # redelivered task
+
+        self.assertEqual(ExportJob.objects.get(pk=job_id).finished_at, finished_at)
+        self.assertEqual(len(os.listdir(os.path.join(self.media_root, 'exports'))), 1)
+
+    def test_export_that_returns_no_file_fails_the_job(self):
+        opened = []
+        real_temporary_file = tempfile.TemporaryFile
+
+        def temporary_file(*args, **kwargs):
+            opened.append(real_temporary_file(*args, **kwargs))
+            return opened[-1]
+
+        with patch('core.export_jobs.enqueue_export_job', return_value=False), \
+                patch('tempfile.TemporaryFile', side_effect=temporary_file):
+            status = self._bulk_export(format_type='bogus').json()
+
+        self.assertEqual(status['status'], 'failed')
+        self.assertIn('Failed to export any files', status['error'])
+        self.assertEqual(os.listdir(os.path.join(self.media_root, 'exports')), [])
+        self.assertTrue(opened)
+        self.assertTrue(all(tmp.closed for tmp in opened))
+
+    def test_export_all_data_redirects_to_the_finished_download(self):
+        with patch('core.export_jobs.enqueue_export_job', return_value=False):
+            response = self.client.get(reverse('core:export_all_data', args=['csv']))
+
+        job = ExportJob.objects.get()
+        self.assertEqual(job.params['models'][0], 'alumni')
+        self.assertRedirects(
+            response, reverse('core:export_job_download', args=[export_job_token(job)]),
+            fetch_redirect_response=False,
+        )
+
+    def test_queued_export_redirects_to_its_progress_page(self):
+        with patch('core.export_jobs.enqueue_export_job', return_value=True):
+            response = self.client.get(reverse('core:export_all_data', args=['excel']))
+
+        job = ExportJob.objects.get()
+        page = self.client.get(response['Location'])
+        # Tokens embed the signing second, so compare the job they point at
+        status_url = re.search(r'/exports/([^/"\']+)/status/', page.content.decode())
+        self.assertIsNotNone(status_url)
+        self.assertEqual(load_export_job(status_url.group(1)), job)
+
+    def test_links_need_a_valid_unexpired_token(self):
+        with patch('core.export_jobs.enqueue_export_job', return_value=False):
+            status = self._bulk_export().json()
+
+        self.assertEqual(self.client.get(status['download_url'] + 'x').status_code, 404)
+        self.assertEqual(self.client.get(status['download_url'].replace('/download/', 'x/download/')).status_code, 404)
+
+        ExportJob.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(self.client.get(status['download_url']).status_code, 404)
+
+    def test_cleanup_removes_expired_artifacts_and_lost_jobs(self):
+        with patch('core.export_jobs.enqueue_export_job', return_value=False):
+            expired_id = self._bulk_export().json()['id']
+        with patch('core.export_jobs.enqueue_export_job', return_value=True):
+            lost_id = self._bulk_export(format_type='excel').json()['id']
+        expired = ExportJob.objects.get(pk=expired_id)
+        ExportJob.objects.filter(pk=expired_id).update(expires_at=timezone.now() - timedelta(seconds=1))
+        ExportJob.objects.filter(pk=lost_id).update(created_at=timezone.now() - timedelta(hours=2))
+
+        self.assertEqual(cleanup_export_jobs(), 1)
+        self.assertFalse(os.path.exists(expired.artifact_path))
+        self.assertEqual(ExportJob.objects.get(pk=lost_id).status, ExportJob.Status.FAILED)
+
+        self.assertEqual(cleanup_export_jobs(now=timezone.now() + timedelta(hours=2)), 1)
+        self.assertFalse(ExportJob.objects.exists())
@@ -1,13 +1,19 @@
 """
 Tests for export utilities with logo header integration
 """
+import csv
+import io
 import os
 import tempfile
+import zipfile
 from io import BytesIO
 from unittest.mock import patch, MagicMock
 from django.test import TestCase
 from django.contrib.auth import get_user_model
-from core.export_utils import ExportMixin, LogoHeaderService
+from core.export_utils import (
+    ExportMixin, ExportPlan, LogoHeaderService, ModelExporter, is_column_path, iter_export_rows, stream_csv,
+    write_response_to_zip,
+)
 
 User = get_user_model()
 
@@ -311,3 +317,140 @@ class ExportMixinPDFTest(TestCase):
             self.assertEqual(response.status_code, 200)
             self.assertGreater(len(response.content), 0)
 
+
+
+class ExportMixinStreamingTest(TestCase):
+    """Test cases for the streaming CSV and Excel exports"""
+
+    def setUp(self):
+        self.mixin = ExportMixin()
+        for i in range(3):
+            User.objects.create_user(
+                username=f'streamuser{i}',
+                email=f'stream{i}@example.com',
+                first_name='Stream',
+                last_name=f'User{i}'
+            )
+        self.config = ModelExporter.get_user_export_config()
+
+    def _csv_rows(self, response):
+        content = b''.join(response.streaming_content).decode()
+        return list(csv.reader(io.StringIO(content)))
+
+    def test_export_csv_streams_rows(self):
+        response = self.mixin.export_csv(
+            User.objects.order_by('username'), 'users', self.config['field_names'], self.config['field_labels']
+        )
+
+        self.assertTrue(response.streaming)
+        self.assertIn('users.csv', response['Content-Disposition'])
+        rows = self._csv_rows(response)
+        self.assertEqual(rows[0], self.config['field_labels'])
+        self.assertEqual([row[1] for row in rows[1:]], ['streamuser0', 'streamuser1', 'streamuser2'])
+        self.assertEqual(rows[1][9], '')  # last_login of a fresh user
+
+    def test_column_paths_are_read_with_values_list(self):
+        queryset = User.objects.order_by('username')
+
+        with self.assertNumQueries(1):
+            rows = list(iter_export_rows(queryset, ['username', 'date_joined']))
+
+        user = queryset.first()
+        self.assertEqual(rows[0], [user.username, user.date_joined.strftime('%Y-%m-%d %H:%M:%S')])
+
+    def test_non_column_fields_fall_back_to_instances(self):
+        self.assertTrue(is_column_path(User, 'username'))
+        self.assertFalse(is_column_path(User, 'get_full_name'))
+        self.assertFalse(is_column_path(User, 'groups__name'))
+
+        rows = list(iter_export_rows(User.objects.order_by('username'), ['username', 'no_such_field']))
+
+        self.assertEqual(rows[0], ['streamuser0', ''])
+
+    def test_csv_chunks_hold_many_rows(self):
+        chunks = list(stream_csv(['n'], iter([[str(i)] for i in range(5)]), rows_per_chunk=2))
+
+        self.assertEqual(chunks, ['n\r\n', '0\r\n1\r\n', '2\r\n3\r\n', '4\r\n'])
+
+    def test_export_excel_writes_header_rows_and_sampled_widths(self):
+        from openpyxl import load_workbook
+
+        response = self.mixin.export_excel(
+            User.objects.order_by('username'), 'users',
+            self.config['field_names'], self.config['field_labels'], self.config['sheet_name'],
+        )
+
+        self.assertTrue(response.streaming)
+        self.assertIn('users.xlsx', response['Content-Disposition'])
+        ws = load_workbook(BytesIO(b''.join(response.streaming_content)))['Users']
+        self.assertEqual(ws['B1'].value, 'Negros Oriental State University')
+        self.assertEqual([cell.value for cell in ws[4]], self.config['field_labels'])
+        self.assertEqual(ws['B5'].value, 'streamuser0')
+        self.assertEqual(ws.max_row, 7)
+        self.assertEqual(ws.column_dimensions['C'].width, len('stream0@example.com') + 2)
+
+    def test_streamed_export_is_copied_into_zip(self):
+        response = self.mixin.export_csv(User.objects.all(), 'users', ['username'], ['Username'])
+        buffer = BytesIO()
+
+        with zipfile.ZipFile(buffer, 'w') as zip_file:
+            write_response_to_zip(zip_file, 'users.csv', response)
+
+        with zipfile.ZipFile(buffer) as zip_file:
+            self.assertEqual(zip_file.read('users.csv').decode().splitlines()[0], 'Username')
+
+
+class ExportPlanTest(TestCase):
+    """Test cases for planning export queries from field paths"""
+
+    def setUp(self):
+        from alumni_directory.models import Alumni
+
+        self.Alumni = Alumni
+        for i in range(3):
+            user = User.objects.create_user(
+                username=f'planuser{i}', email=f'plan{i}@example.com', first_name='Plan', last_name=f'User{i}'
+            )
+            Alumni.objects.create(
+                user=user, college='CAS', campus='MAIN', graduation_year=2020, course='BSIT',
+                gender='F', province='Negros Oriental', city='Dumaguete', address='Address',
+            )
+
+    def test_classifies_config_paths(self):
+        from jobs.models import JobPosting
+        from mentorship.models import MentorshipRequest
+
+        config = ModelExporter.get_job_export_config()
+        plan = ExportPlan(JobPosting.objects.all(), config['field_names'])
+        self.assertFalse(plan.needs_instances)
+        self.assertEqual(plan.kinds['title'], 'missing')
+        self.assertIn('requirements', plan.value_fields)
+
+        config = ModelExporter.get_mentorship_export_config()
+        plan = ExportPlan(MentorshipRequest.objects.all(), config['field_names'])
+        self.assertFalse(plan.needs_instances)
+        self.assertIn('mentor__user__username', plan.value_fields)
+
+    def test_related_columns_export_in_one_query(self):
+        config = ModelExporter.get_alumni_export_config()
+        queryset = self.Alumni.objects.order_by('user__username')
+
+        with self.assertNumQueries(1):
+            rows = list(iter_export_rows(queryset, config['field_names']))
+
+        self.assertEqual([row[1] for row in rows], ['planuser0', 'planuser1', 'planuser2'])
+        self.assertEqual(rows[0][2], 'plan0@example.com')
+
+    def test_instance_paths_select_the_relations_they_walk(self):
+        queryset = self.Alumni.objects.order_by('user__username')
+        plan = ExportPlan(queryset, ['user__get_full_name', 'user', 'user__groups__name', 'graduation_year'])
+
+        self.assertTrue(plan.needs_instances)
+        self.assertEqual(plan.select_related, ['user'])
+        self.assertEqual(plan.prefetch_related, ['user__groups'])
+
+        with self.assertNumQueries(2):
+            rows = list(plan.rows(queryset))
+
+        self.assertEqual(rows[0][1], 'planuser0')
+        self.assertEqual(rows[0][3], '2020')
@@ -0,0 +1,82 @@
+"""
+Tests for the bulk notification fan-out
+"""
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from alumni_groups.models import AlumniGroup, GroupMembership
+from core.models import Notification, NotificationPreference
+from core.notifications import notify_users
+from events.models import Event
+
+User = get_user_model()
+
+
+@override_settings(NOTIFICATION_FANOUT_CHUNK_SIZE=2)
+@patch('core.notifications.enqueue_fanout', return_value=False)
+class NotificationFanoutTest(TestCase):
+    """Test cases for notifying group members of events in bulk"""
+
+    def setUp(self):
+        self.organizer = User.objects.create_user('organizer', 'organizer@example.com', 'pass')
+        self.batch = AlumniGroup.objects.create(name='Batch 2020', description='', group_type='MANUAL')
+        self.club = AlumniGroup.objects.create(name='Alumni Club', description='', group_type='MANUAL')
+        self.members = [
+            User.objects.create_user(f'member{i}', f'member{i}@example.com', 'pass') for i in range(5)
+        ]
+        for member in self.members:
+            GroupMembership.objects.create(group=self.batch, user=member, status='APPROVED')
+        GroupMembership.objects.create(group=self.club, user=self.members[0], status='APPROVED')
+        pending = User.objects.create_user('pending', 'pending@example.com', 'pass')
+        GroupMembership.objects.create(group=self.batch, user=pending, status='PENDING')
+        NotificationPreference.objects.create(user=self.members[4], app_events=False)
+
+    def create_event(self, status='published'):
+        start = timezone.now() + timedelta(days=7)
+        return Event.objects.create(
+            title='Homecoming', description='', start_date=start, end_date=start + timedelta(hours=3),
+            location='Dumaguete', status=status, created_by=self.organizer,
+        )
+
+    def test_published_event_notifies_each_member_once(self, enqueue):
+        event = self.create_event()
+        with self.captureOnCommitCallbacks(execute=True):
+            event.notified_groups.add(self.batch, self.club)
+
+        notifications = Notification.objects.filter(notification_type='event', object_id=event.pk)
+        self.assertEqual(
+            sorted(notifications.values_list('recipient__username', flat=True)),
+            ['member0', 'member1', 'member2', 'member3'],
+        )
+        self.assertEqual(
+            notifications.get(recipient=self.members[0]).message,
+            "New event 'Homecoming' has been announced for Alumni Club.",
+        )
+        self.assertEqual(Notification.get_unread_count(self.members[0]), 1)
+
+        # Adding a group again, or a retried task, does not notify anyone twice
+        with self.captureOnCommitCallbacks(execute=True):
+            event.notified_groups.add(self.batch)
+        self.assertEqual(notifications.count(), 4)
+
+    def test_draft_event_notifies_nobody(self, enqueue):
+        event = self.create_event(status='draft')
+        with self.captureOnCommitCallbacks(execute=True):
+            event.notified_groups.add(self.batch)
+        self.assertFalse(Notification.objects.filter(notification_type='event').exists())
+
+    def test_notify_users_resolves_recipients_in_one_query(self, enqueue):
+        event = self.create_event()
+        ContentType.objects.get_for_model(Event)
+        # The recipients, then one INSERT per chunk of two
+        with self.assertNumQueries(4):
+            created = notify_users(
+                User.objects.filter(group_memberships__group=self.batch),
+                notification_type='system', title='Maintenance', message='Tonight', content_object=event,
+            )
+        self.assertEqual(created, 6)
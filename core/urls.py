@@ -5,6 +5,7 @@ from . import recaptcha_admin_views, recaptcha_analytics_views
 from . import sso_admin_views
 from . import ai_config_views
 from . import system_admin_views
+from . import export_job_views
 from .view_handlers.error_handlers import health_check_view
 from django.views.generic.base import RedirectView
 # Import views directly from views.py file to avoid conflict with views directory
@@ -52,6 +53,11 @@ urlpatterns = [
     path('bulk-export/', admin_views.bulk_export_interface, name='bulk_export_interface'),
     path('bulk-export/process/', admin_views.bulk_export_process, name='bulk_export_process'),
 
+    # Background export jobs
+    path('exports/<str:token>/', export_job_views.export_job_detail, name='export_job_detail'),
+    path('exports/<str:token>/status/', export_job_views.export_job_status, name='export_job_status'),
+    path('exports/<str:token>/download/', export_job_views.export_job_download, name='export_job_download'),
+
 
     path('api/engagement-data/', views.engagement_data_api, name='engagement_data_api'),
     path('search/', views.search, name='search'),
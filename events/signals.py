@@ -2,6 +2,7 @@ from django.db.models.signals import post_save, m2m_changed
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
 from django.utils import timezone
+from core.notifications import dispatch_fanout, notify_users
 from .models import Event, EventRSVP
 
 User = get_user_model()
@@ -31,46 +32,46 @@ def notify_groups(event, group_pks=None):
     Helper function to send notifications to group members.
     If group_pks is provided, only notify those specific groups.
     Otherwise, notify all groups associated with the event.
+
+    The notifications are created by ``send_event_notifications`` on a
+    worker once the event is committed, not in the saving request.
+    """
+    dispatch_fanout(
+        'events.signals.send_event_notifications',
+        event.pk,
+        sorted(group_pks) if group_pks else None,
+    )
+
+def send_event_notifications(event_id, group_pks=None):
     """
-    groups = event.notified_groups.all()
+    Notification fan-out task for a published event: one notification per
+    approved, active member of each notified group. Members of several groups
+    are notified once, for the first group by name.
+    """
+    event = Event.objects.filter(pk=event_id, status='published').first()
+    if event is None:
+        return 0
+
+    groups = event.notified_groups.order_by('name')
     if group_pks:
         groups = groups.filter(pk__in=group_pks)
 
+    notified = 0
     for group in groups:
-        # Get all approved members of the group through GroupMembership
-        memberships = group.memberships.filter(status='APPROVED', is_active=True)
-        
-        # Here you would implement your notification logic
-        # This could be sending emails, creating notifications in your notification system, etc.
-        # For example:
-        for membership in memberships:
-            create_notification(
-                user=membership.user,
-                event=event,
-                group=group,
-                message=f"New event '{event.title}' has been announced for {group.name}."
-            )
-
-def create_notification(user, event, group, message):
-    """
-    Helper function to create a notification for a user.
-    Creates a private notification for the specific user about the event.
-    """
-    try:
-        from core.models.notifications import Notification
-        
-        # Create a private notification for the user
-        Notification.create_notification(
-            recipient=user,
+        members = User.objects.filter(
+            group_memberships__group=group,
+            group_memberships__status='APPROVED',
+            group_memberships__is_active=True,
+        )
+        notified += notify_users(
+            members,
             notification_type='event',
             title=f"New Event: {event.title}",
-            message=message,
+            message=f"New event '{event.title}' has been announced for {group.name}.",
             content_object=event,
-            action_url=f'/events/{event.pk}/'
+            action_url=f'/events/{event.pk}/',
         )
-    except ImportError:
-        # If core.models.notifications is not available, log this
-        pass
+    return notified
 
 @receiver(post_save, sender=EventRSVP)
 def rsvp_post_save(sender, instance, created, **kwargs):
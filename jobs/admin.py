@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.contrib import admin
 from django.contrib import messages
 from django.http import HttpResponseRedirect
@@ -6,7 +7,9 @@ from django.urls import path, reverse
 from django.utils.html import format_html
 from django.utils.safestring import mark_safe
 
-from .models import JobPosting, JobApplication, JobPreference, ScrapedJob, UserJobAIScore
+from .models import (
+    JobPosting, JobApplication, JobPreference, ScrapeCampaign, ScrapedJob, SourceHealth, UserJobAIScore,
+)
 
 @admin.register(JobPosting)
 class JobPostingAdmin(admin.ModelAdmin):
@@ -177,6 +180,41 @@ class UserJobAIScoreAdmin(admin.ModelAdmin):
     ordering = ('-computed_at', '-updated_at')
 
 
+@admin.register(ScrapeCampaign)
+class ScrapeCampaignAdmin(admin.ModelAdmin):
+    list_display = (
+        'name', 'search_keyword', 'search_location', 'interval_minutes',
+        'auto_publish', 'is_active', 'last_run_at', 'next_run_at',
+    )
+    list_filter = ('is_active', 'auto_publish')
+    search_fields = ('name', 'search_keyword', 'search_location')
+    readonly_fields = ('last_run_at', 'created_at')
+    actions = ['run_now']
+
+    @admin.action(description="Run selected campaigns at the next dispatch")
+    def run_now(self, request, queryset):
+        from django.utils import timezone
+
+        updated = queryset.update(next_run_at=timezone.now())
+        self.message_user(request, f"{updated} campaign(s) will run at the next dispatch.", messages.SUCCESS)
+
+
+@admin.register(SourceHealth)
+class SourceHealthAdmin(admin.ModelAdmin):
+    list_display = (
+        'source', 'runs', 'avg_new_jobs', 'avg_latency_seconds', 'failure_rate',
+        'consecutive_failures', 'last_new_job_at', 'retry_after',
+    )
+    ordering = ('source',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def get_readonly_fields(self, request, obj=None):
+        # Maintained by the scraper; only ``retry_after`` can be cleared by hand.
+        return [field.name for field in self.model._meta.fields if field.name != 'retry_after']
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # ScrapedJob Admin — scrape + publish workflow
 # ─────────────────────────────────────────────────────────────────────────────
@@ -291,7 +329,7 @@ class ScrapedJobAdmin(admin.ModelAdmin):
                 self.message_user(
                     request,
                     f"Scraping '{keyword}' in '{location}' from {len(sources)} site(s)… "
-                    "This may take up to 60 seconds.",
+                    f"This may take up to {settings.SCRAPER_DEADLINE_SECONDS:.0f} seconds.",
                     messages.INFO,
                 )
 
@@ -4,10 +4,13 @@ Used by the Django admin to publish scraped jobs to the job board.
 """
 import logging
 import re
-from typing import Optional
+from typing import Iterable, List, Optional, Set, Tuple
 
 from django.contrib.auth import get_user_model
 from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.utils.text import slugify
 
 from .models import JobPosting, ScrapedJob
 
@@ -89,6 +92,34 @@ def scraped_job_dict_to_posting(
     Convert a single scraped job dict into a JobPosting instance.
     Returns None if the job is a duplicate (same title + company already exists).
     Does NOT save — caller must call .save() or use bulk_create.
+
+    Publishing many jobs should go through ``publish_scraped_jobs``, which
+    checks duplicates for the whole batch at once.
+    """
+    posting = build_posting_from_dict(job_dict, source_key, posted_by, is_featured)
+    if posting is None:
+        return None
+
+    # Deduplication: skip if a posting with same title+company already exists
+    if JobPosting.objects.filter(
+        job_title__iexact=posting.job_title,
+        company_name__iexact=(job_dict.get("company") or "").strip(),
+        is_active=True,
+    ).exists():
+        logger.debug(f"Skipping duplicate: '{posting.job_title}' at '{posting.company_name}'")
+        return None
+    return posting
+
+
+def build_posting_from_dict(
+    job_dict: dict,
+    source_key: str,
+    posted_by: User,
+    is_featured: bool = False,
+) -> Optional[JobPosting]:
+    """
+    Build an unsaved JobPosting from a scraped job dict without any
+    duplicate check. Returns None if the dict has no usable title.
     """
     title = (job_dict.get("title") or "").strip()
     company = (job_dict.get("company") or "").strip()
@@ -101,15 +132,6 @@ def scraped_job_dict_to_posting(
     if not title or title.lower() == "job title not available":
         return None
 
-    # Deduplication: skip if a posting with same title+company already exists
-    if JobPosting.objects.filter(
-        job_title__iexact=title,
-        company_name__iexact=company,
-        is_active=True,
-    ).exists():
-        logger.debug(f"Skipping duplicate: '{title}' at '{company}'")
-        return None
-
     source_value = SOURCE_LABEL_MAP.get(source_key, "other")
     category = guess_category(title, description)
     job_type = guess_job_type(title, description, job_type_raw)
@@ -132,70 +154,144 @@ def scraped_job_dict_to_posting(
         posted_by=posted_by,
         accepts_internal_applications=False,
     )
+    # bulk_create skips save(), so fill the parsed salary columns here.
+    posting.set_salary_bounds()
     return posting
 
 
-def publish_scraped_job(scraped_job: ScrapedJob, posted_by: User) -> dict:
+def _dedup_key(title: str, company: str) -> Tuple[str, str]:
+    """Case-insensitive (title, company) key, matching the old ``iexact`` check."""
+    return (title.strip().lower(), company.strip().lower())
+
+
+def _existing_dedup_keys(keys: Set[Tuple[str, str]], chunk_size: int = 500) -> Set[Tuple[str, str]]:
     """
-    Convert all jobs in a ScrapedJob record into JobPosting records.
+    Return the subset of ``keys`` already used by active postings, with one
+    query per ``chunk_size`` distinct titles.
 
-    Returns a summary dict:
-        {
-            "published": int,   # new postings created
-            "skipped":   int,   # duplicates skipped
-            "errors":    int,   # jobs that failed
-        }
+    ``JobPosting.hash_signature`` is computed in ``save()`` but has no
+    database column, so the (title, company) pair is the lookup key.
     """
-    summary = {"published": 0, "skipped": 0, "errors": 0}
-    source_key = scraped_job.source
+    titles = sorted({title for title, _ in keys})
+    existing = set()
+    for start in range(0, len(titles), chunk_size):
+        rows = (
+            JobPosting.objects.filter(is_active=True)
+            .annotate(title_key=Lower("job_title"), company_key=Lower("company_name"))
+            .filter(title_key__in=titles[start:start + chunk_size])
+            .values_list("title_key", "company_key")
+        )
+        existing.update(_dedup_key(title or "", company or "") for title, company in rows)
+    return existing & keys
+
+
+def _slug_stem(base_slug: str) -> str:
+    # Same suffix rule as JobPosting.save(): "foo-2" is numbered as "foo-N".
+    return re.sub(r"-\d+$", "", base_slug)
+
+
+def _taken_slugs(base_slugs: Iterable[str], chunk_size: int = 200) -> Set[str]:
+    """Existing slugs equal to a base slug or starting with ``<stem>-``."""
+    base_slugs = sorted(set(base_slugs))
+    taken = set()
+    for start in range(0, len(base_slugs), chunk_size):
+        chunk = base_slugs[start:start + chunk_size]
+        query = Q(slug__in=chunk)
+        for stem in {_slug_stem(base) for base in chunk}:
+            query |= Q(slug__startswith=f"{stem}-")
+        taken.update(JobPosting.objects.filter(query).values_list("slug", flat=True))
+    return taken
+
+
+def assign_unique_slugs(postings: List[JobPosting]) -> None:
+    """
+    Give every posting without a slug a unique one, resolving numeric
+    suffixes in memory against the slugs fetched by ``_taken_slugs``.
+    """
+    pending = [posting for posting in postings if not posting.slug]
+    bases = {id(posting): slugify(f"{posting.job_title}-{posting.company_name}") for posting in pending}
+    taken = _taken_slugs(bases.values())
 
+    for posting in pending:
+        base_slug = bases[id(posting)]
+        slug = base_slug
+        n = 0
+        while slug in taken:
+            n += 1
+            slug = f"{_slug_stem(base_slug)}-{n}"
+        posting.slug = slug
+        taken.add(slug)
+
+
+def _jobs_data_for(scraped_job: ScrapedJob) -> list:
     jobs_data = scraped_job.jobs_data
     if not jobs_data:
         # Try to get jobs from the nested result dict
         raw = scraped_job.scraped_data
         if isinstance(raw, dict):
             jobs_data = raw.get("jobs", [])
+    return jobs_data or []
 
-    postings_to_create = []
 
-    for job_dict in jobs_data:
-        try:
-            posting = scraped_job_dict_to_posting(
-                job_dict=job_dict,
-                source_key=source_key,
-                posted_by=posted_by,
-            )
+def publish_scraped_jobs(scraped_jobs, posted_by: User) -> dict:
+    """
+    Convert all jobs in the given ScrapedJob records into JobPosting records.
+
+    Duplicates (against active postings and within the batch) and slug
+    suffixes are resolved in memory from a handful of set-based queries,
+    then everything is inserted with one ``bulk_create``.
+
+    Returns a summary dict:
+        {
+            "published": int,   # new postings created
+            "skipped":   int,   # duplicates skipped
+            "errors":    int,   # jobs that failed
+        }
+    """
+    summary = {"published": 0, "skipped": 0, "errors": 0}
+
+    candidates = []
+    for scraped_job in scraped_jobs:
+        for job_dict in _jobs_data_for(scraped_job):
+            try:
+                posting = build_posting_from_dict(
+                    job_dict=job_dict,
+                    source_key=scraped_job.source,
+                    posted_by=posted_by,
+                )
+            except Exception as exc:
+                logger.error(f"Error converting job dict: {exc}", exc_info=True)
+                summary["errors"] += 1
+                continue
             if posting is None:
                 summary["skipped"] += 1
-            else:
-                postings_to_create.append(posting)
-        except Exception as exc:
-            logger.error(f"Error converting job dict: {exc}", exc_info=True)
-            summary["errors"] += 1
+                continue
+            key = _dedup_key(posting.job_title, (job_dict.get("company") or ""))
+            candidates.append((key, posting))
+
+    if not candidates:
+        return summary
+
+    existing = _existing_dedup_keys({key for key, _ in candidates})
+    postings_to_create = []
+    seen = set(existing)
+    for key, posting in candidates:
+        if key in seen:
+            logger.debug(f"Skipping duplicate: '{posting.job_title}' at '{posting.company_name}'")
+            summary["skipped"] += 1
+            continue
+        seen.add(key)
+        postings_to_create.append(posting)
 
     # Bulk-create all new postings in one transaction
     if postings_to_create:
         try:
             with transaction.atomic():
-                # Generate slugs manually since bulk_create doesn't call save()
-                for posting in postings_to_create:
-                    if not posting.slug:
-                        from django.utils.text import slugify
-                        import re
-                        
-                        base_slug = slugify(f"{posting.job_title}-{posting.company_name}")
-                        posting.slug = base_slug
-                        n = 0
-                        # Ensure unique slug
-                        while JobPosting.objects.filter(slug=posting.slug).exists():
-                            n += 1
-                            # Remove any existing numeric suffix
-                            clean_slug = re.sub(r'-\d+$', '', base_slug)
-                            # Add new numeric suffix
-                            posting.slug = f"{clean_slug}-{n}"
-                
+                # bulk_create doesn't call save(), so slugs are assigned here.
+                assign_unique_slugs(postings_to_create)
                 created = JobPosting.objects.bulk_create(
                     postings_to_create,
+                    batch_size=500,
                     ignore_conflicts=True,
                 )
                 summary["published"] = len(created)
@@ -206,11 +302,11 @@ def publish_scraped_job(scraped_job: ScrapedJob, posted_by: User) -> dict:
     return summary
 
 
+def publish_scraped_job(scraped_job: ScrapedJob, posted_by: User) -> dict:
+    """Publish the jobs of one ScrapedJob record. See ``publish_scraped_jobs``."""
+    return publish_scraped_jobs([scraped_job], posted_by)
+
+
 def publish_multiple_scraped_jobs(scraped_jobs, posted_by: User) -> dict:
-    """Publish a queryset or list of ScrapedJob records. Returns aggregated summary."""
-    total = {"published": 0, "skipped": 0, "errors": 0}
-    for sj in scraped_jobs:
-        result = publish_scraped_job(sj, posted_by)
-        for k in total:
-            total[k] += result[k]
-    return total
+    """Publish a queryset or list of ScrapedJob records as one batch. Returns aggregated summary."""
+    return publish_scraped_jobs(list(scraped_jobs), posted_by)
@@ -10,10 +10,11 @@ from typing import Dict, Iterable, List, Optional
 
 from django.conf import settings
 from django.core.cache import cache
-from django.db.models import Case, IntegerField, QuerySet, When
+from django.db import connection
+from django.db.models import Count, F, FilteredRelation, Q, QuerySet
 from django.utils import timezone
 
-from .ai_matching import get_ai_match_score
+from .ai_matching import build_job_digest, get_ai_match_scores_batch
 from .models import JobPosting, UserJobAIScore
 
 logger = logging.getLogger(__name__)
@@ -39,10 +40,8 @@ def is_ai_score_stale(
     if not score_obj.computed_at:
         return True
 
-    job_updated_at = getattr(job, "updated_at", None)
-    if job_updated_at and score_obj.computed_at and job_updated_at > score_obj.computed_at:
-        return True
-
+    # Job edits invalidate scores in invalidate_job_scores() only when the
+    # content sent to the model changed, so updated_at is not compared here.
     return False
 
 
@@ -52,19 +51,30 @@ def _normalize_list(value) -> List[str]:
     return []
 
 
-def save_ai_score_result(
-    *,
-    user,
-    job: JobPosting,
-    profile_version: int,
-    score_data: dict,
-) -> UserJobAIScore:
-    now = timezone.now()
+SCORE_RESULT_FIELDS = [
+    "score",
+    "reason",
+    "strengths_json",
+    "gaps_json",
+    "status",
+    "error_message",
+    "profile_version",
+    "computed_at",
+    "rank_key",
+    "job_digest",
+    "updated_at",
+]
+PENDING_FIELDS = ["status", "profile_version", "error_message", "computed_at", "rank_key", "updated_at"]
+
+
+def _build_score_defaults(score_data: dict, profile_version: int, now, job=None) -> dict:
+    posted_date = getattr(job, "posted_date", None)
+    job_digest = build_job_digest(job) if job is not None else ""
     score_value = score_data.get("score")
     error_flag = bool(score_data.get("error", False))
 
     if error_flag or score_value is None:
-        defaults = {
+        return {
             "score": None,
             "reason": str(score_data.get("reason", ""))[:1000],
             "strengths_json": [],
@@ -73,20 +83,60 @@ def save_ai_score_result(
             "error_message": str(score_data.get("reason", "AI scoring failed."))[:1000],
             "profile_version": profile_version,
             "computed_at": now,
+            "rank_key": None,
+            "job_digest": job_digest,
         }
-    else:
-        safe_score = max(0, min(100, int(score_value)))
-        defaults = {
-            "score": safe_score,
-            "reason": str(score_data.get("reason", ""))[:1000],
-            "strengths_json": _normalize_list(score_data.get("strengths")),
-            "gaps_json": _normalize_list(score_data.get("gaps")),
-            "status": UserJobAIScore.Status.READY,
-            "error_message": "",
-            "profile_version": profile_version,
-            "computed_at": now,
-        }
 
+    safe_score = max(0, min(100, int(score_value)))
+    return {
+        "score": safe_score,
+        "reason": str(score_data.get("reason", ""))[:1000],
+        "strengths_json": _normalize_list(score_data.get("strengths")),
+        "gaps_json": _normalize_list(score_data.get("gaps")),
+        "status": UserJobAIScore.Status.READY,
+        "error_message": "",
+        "profile_version": profile_version,
+        "computed_at": now,
+        "rank_key": UserJobAIScore.compute_rank_key(safe_score, posted_date),
+        "job_digest": job_digest,
+    }
+
+
+def bulk_upsert_ai_scores(
+    user,
+    defaults_by_job_id: Dict[int, dict],
+    update_fields: List[str],
+) -> List[UserJobAIScore]:
+    """
+    Insert or update many ``UserJobAIScore`` rows for one user in a single
+    statement, relying on the ``(user, job)`` unique constraint.
+
+    MySQL's ``ON DUPLICATE KEY UPDATE`` takes no conflict target, so the
+    unique fields are only named on backends that support one.
+    """
+    if not defaults_by_job_id:
+        return []
+
+    rows = [
+        UserJobAIScore(user=user, job_id=job_id, **defaults)
+        for job_id, defaults in defaults_by_job_id.items()
+    ]
+    return UserJobAIScore.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=["user", "job"] if connection.features.supports_update_conflicts_with_target else None,
+        update_fields=update_fields,
+    )
+
+
+def save_ai_score_result(
+    *,
+    user,
+    job: JobPosting,
+    profile_version: int,
+    score_data: dict,
+) -> UserJobAIScore:
+    defaults = _build_score_defaults(score_data, profile_version, timezone.now(), job)
     row, _ = UserJobAIScore.objects.update_or_create(
         user=user,
         job=job,
@@ -95,19 +145,48 @@ def save_ai_score_result(
     return row
 
 
+def save_ai_score_results(
+    *,
+    user,
+    jobs_by_id: Dict[int, JobPosting],
+    profile_version: int,
+    results: Dict[int, dict],
+) -> List[UserJobAIScore]:
+    now = timezone.now()
+    # Pending results belong to another caller's in-flight request; leave
+    # those rows for that caller to fill in.
+    defaults_by_job_id = {
+        job_id: _build_score_defaults(score_data, profile_version, now, jobs_by_id[job_id])
+        for job_id, score_data in results.items()
+        if job_id in jobs_by_id and not score_data.get("pending")
+    }
+    return bulk_upsert_ai_scores(user, defaults_by_job_id, SCORE_RESULT_FIELDS)
+
+
+def get_prompt_batch_size() -> int:
+    return max(1, int(getattr(settings, "AI_GLOBAL_PROMPT_BATCH_SIZE", 10)))
+
+
+def iter_prompt_batches(job_ids: List[int], batch_size: Optional[int] = None):
+    size = batch_size or get_prompt_batch_size()
+    for index in range(0, len(job_ids), size):
+        yield job_ids[index:index + size]
+
+
 def mark_scores_pending(user, job_ids: Iterable[int], profile_version: int) -> None:
     now = timezone.now()
-    for job_id in job_ids:
-        UserJobAIScore.objects.update_or_create(
-            user=user,
-            job_id=job_id,
-            defaults={
-                "status": UserJobAIScore.Status.PENDING,
-                "profile_version": profile_version,
-                "error_message": "",
-                "computed_at": now,
-            },
-        )
+    defaults = {
+        "status": UserJobAIScore.Status.PENDING,
+        "profile_version": profile_version,
+        "error_message": "",
+        "computed_at": now,
+        "rank_key": None,
+    }
+    bulk_upsert_ai_scores(
+        user,
+        {job_id: defaults for job_id in job_ids},
+        PENDING_FIELDS,
+    )
 
 
 def get_stale_job_ids_for_jobs(user, jobs: List[JobPosting], profile_version: int) -> List[int]:
@@ -140,120 +219,176 @@ def compute_scores_for_job_ids(
 
     mark_scores_pending(user, job_ids, version)
 
-    for job_id in job_ids:
-        job = jobs_by_id.get(job_id)
-        if not job:
+    for batch_ids in iter_prompt_batches(job_ids):
+        batch_jobs = [jobs_by_id[job_id] for job_id in batch_ids if job_id in jobs_by_id]
+        if not batch_jobs:
             continue
 
         try:
-            score_data = get_ai_match_score(user, job)
+            results = get_ai_match_scores_batch(user, batch_jobs)
         except Exception as exc:  # pragma: no cover - defensive guard
-            logger.error("AI score computation failed for user=%s job=%s: %s", user.id, job.id, exc)
-            score_data = {
+            logger.error(
+                "AI batch score computation failed for user=%s jobs=%s: %s",
+                user.id,
+                [job.id for job in batch_jobs],
+                exc,
+            )
+            results = {}
+
+        for job in batch_jobs:
+            results.setdefault(job.id, {
                 "error": True,
                 "reason": "AI matching service is temporarily unavailable.",
                 "score": None,
                 "strengths": [],
                 "gaps": [],
-            }
+            })
 
-        save_ai_score_result(user=user, job=job, profile_version=version, score_data=score_data)
-        processed += 1
+        save_ai_score_results(
+            user=user,
+            jobs_by_id=jobs_by_id,
+            profile_version=version,
+            results=results,
+        )
+        processed += len(batch_jobs)
 
     return processed
 
 
-def rank_jobs_for_queryset(
-    *,
-    user,
-    queryset: QuerySet,
-    profile_version: Optional[int] = None,
-    batch_size: Optional[int] = None,
-    compute_batch: bool = True,
-) -> dict:
-    jobs = list(queryset.order_by("-posted_date"))
-    total_count = len(jobs)
-    if total_count == 0:
-        return {
-            "ordered_ids": [],
-            "scored_count": 0,
-            "pending_count": 0,
-            "total_count": 0,
-            "profile_version": profile_version if profile_version is not None else 0,
-            "computed_now": 0,
-        }
+def invalidate_job_scores(job: JobPosting) -> Dict[str, int]:
+    """
+    Incrementally maintain every user's ranking after ``job`` was saved.
 
-    version = profile_version if profile_version is not None else get_ai_profile_version(user.id)
-    effective_batch = batch_size or getattr(settings, "AI_GLOBAL_SORT_BATCH_SIZE", 10)
-    job_map = {job.id: job for job in jobs}
+    Only this job's rows are touched: scores computed from different job
+    content drop out of the ranking (PENDING, no rank key) until rescored,
+    and the rest are re-keyed in place if the posting date moved. Other
+    jobs' positions are implied by their own keys, so nothing else changes.
+    """
+    digest = build_job_digest(job)
+    rows = UserJobAIScore.objects.filter(job=job, status=UserJobAIScore.Status.READY)
 
-    stale_ids = get_stale_job_ids_for_jobs(user, jobs, version)
-    pending_cutoff = timezone.now() - timedelta(
-        minutes=max(1, int(getattr(settings, "AI_GLOBAL_PENDING_TIMEOUT_MINUTES", 5)))
+    invalidated = rows.exclude(job_digest=digest).update(
+        status=UserJobAIScore.Status.PENDING,
+        rank_key=None,
     )
-    pending_ids = set(
-        UserJobAIScore.objects.filter(
-            user=user,
-            job_id__in=stale_ids,
-            status=UserJobAIScore.Status.PENDING,
-            profile_version=version,
-            updated_at__gte=pending_cutoff,
-        ).values_list("job_id", flat=True)
+
+    posted_ts = max(0, int(job.posted_date.timestamp())) if job.posted_date else 0
+    new_rank_key = F("score") * UserJobAIScore.RANK_KEY_SCALE + posted_ts
+    rekeyed = rows.filter(job_digest=digest, score__isnull=False).exclude(
+        rank_key=new_rank_key,
+    ).update(rank_key=new_rank_key)
+
+    return {"invalidated": invalidated, "rekeyed": rekeyed}
+
+
+def annotate_ai_rank(queryset: QuerySet, user, profile_version: int) -> QuerySet:
+    """
+    Join each posting to the user's fresh READY score and expose its
+    ``rank_key`` as ``ai_rank_key`` (null when unscored or stale).
+    """
+    fresh_score = FilteredRelation(
+        "user_ai_scores",
+        condition=Q(
+            user_ai_scores__user=user,
+            user_ai_scores__status=UserJobAIScore.Status.READY,
+            user_ai_scores__profile_version=profile_version,
+        ),
+    )
+    return queryset.annotate(ai_fresh_score=fresh_score).annotate(
+        ai_rank_key=F("ai_fresh_score__rank_key"),
     )
-    stale_ids = [job_id for job_id in stale_ids if job_id not in pending_ids]
 
-    computed_now = 0
-    if compute_batch and stale_ids:
-        compute_ids = stale_ids[: max(1, int(effective_batch))]
-        computed_now = compute_scores_for_job_ids(
-            user=user,
-            jobs_by_id=job_map,
-            job_ids=compute_ids,
-            profile_version=version,
-        )
 
-    score_rows = UserJobAIScore.objects.filter(
+def order_by_ai_rank(queryset: QuerySet, user, profile_version: int) -> QuerySet:
+    """
+    Scored jobs by (score, posted_date) descending, then unscored jobs by
+    posted_date. The trailing ``-id`` makes the order total, so pages are
+    stable and the result can be seeked on ``(ai_rank_key, posted_date, id)``.
+    """
+    return annotate_ai_rank(queryset, user, profile_version).order_by(
+        F("ai_rank_key").desc(nulls_last=True),
+        "-posted_date",
+        "-id",
+    )
+
+
+def get_unscored_job_ids(
+    user,
+    queryset: QuerySet,
+    profile_version: int,
+    limit: Optional[int] = None,
+) -> List[int]:
+    """
+    Newest-first ids in ``queryset`` without a fresh score, skipping jobs
+    another request marked pending within the pending timeout.
+    """
+    pending_cutoff = timezone.now() - timedelta(
+        minutes=max(1, int(getattr(settings, "AI_GLOBAL_PENDING_TIMEOUT_MINUTES", 5)))
+    )
+    in_flight = UserJobAIScore.objects.filter(
         user=user,
-        job_id__in=job_map.keys(),
-        status=UserJobAIScore.Status.READY,
+        status=UserJobAIScore.Status.PENDING,
+        profile_version=profile_version,
+        updated_at__gte=pending_cutoff,
+    ).values("job_id")
+
+    unscored = (
+        annotate_ai_rank(queryset, user, profile_version)
+        .filter(ai_rank_key__isnull=True)
+        .exclude(id__in=in_flight)
+        .order_by("-posted_date", "-id")
+        .values_list("id", flat=True)
     )
-    fresh_scores: Dict[int, UserJobAIScore] = {}
-    for row in score_rows:
-        job = job_map.get(row.job_id)
-        if job and not is_ai_score_stale(row, job, version):
-            fresh_scores[row.job_id] = row
+    if limit is not None:
+        unscored = unscored[:limit]
+    return list(unscored)
 
-    scored_entries = []
-    for job_id, row in fresh_scores.items():
-        job = job_map[job_id]
-        scored_entries.append((job_id, int(row.score or 0), job.posted_date))
 
-    scored_entries.sort(key=lambda item: (item[1], item[2]), reverse=True)
-    scored_ids = [item[0] for item in scored_entries]
+def _count_ranked(queryset: QuerySet, user, profile_version: int) -> dict:
+    return annotate_ai_rank(queryset.order_by(), user, profile_version).aggregate(
+        total_count=Count("id"),
+        scored_count=Count("ai_rank_key"),
+    )
 
-    scored_set = set(scored_ids)
-    unscored_ids = [job.id for job in jobs if job.id not in scored_set]
-    ordered_ids = scored_ids + unscored_ids
 
-    scored_count = len(scored_ids)
-    pending_count = max(total_count - scored_count, 0)
+def rank_jobs_for_queryset(
+    *,
+    user,
+    queryset: QuerySet,
+    profile_version: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    compute_batch: bool = True,
+) -> dict:
+    """
+    Score up to one batch of unscored jobs and return ranking progress plus
+    ``queryset`` ordered by the persisted rank. Nothing is materialized
+    beyond the ids of the batch being scored.
+    """
+    version = profile_version if profile_version is not None else get_ai_profile_version(user.id)
+    effective_batch = batch_size or getattr(settings, "AI_GLOBAL_SORT_BATCH_SIZE", 10)
 
+    counts = _count_ranked(queryset, user, version)
+    computed_now = 0
+    if compute_batch and counts["scored_count"] < counts["total_count"]:
+        compute_ids = get_unscored_job_ids(
+            user, queryset, version, limit=max(1, int(effective_batch))
+        )
+        if compute_ids:
+            computed_now = compute_scores_for_job_ids(
+                user=user,
+                jobs_by_id=JobPosting.objects.in_bulk(compute_ids),
+                job_ids=compute_ids,
+                profile_version=version,
+            )
+            counts = _count_ranked(queryset, user, version)
+
+    total_count = counts["total_count"]
+    scored_count = counts["scored_count"]
     return {
-        "ordered_ids": ordered_ids,
+        "queryset": order_by_ai_rank(queryset, user, version),
         "scored_count": scored_count,
-        "pending_count": pending_count,
+        "pending_count": max(total_count - scored_count, 0),
         "total_count": total_count,
         "profile_version": version,
         "computed_now": computed_now,
     }
-
-
-def apply_ordered_ids(queryset: QuerySet, ordered_ids: List[int]) -> QuerySet:
-    if not ordered_ids:
-        return queryset
-
-    ordering = Case(
-        *[When(id=job_id, then=position) for position, job_id in enumerate(ordered_ids)],
-        output_field=IntegerField(),
-    )
-    return queryset.filter(id__in=ordered_ids).order_by(ordering)
@@ -10,34 +10,37 @@ from typing import Dict, List, Optional
 
 from django.contrib.auth import get_user_model
 
-from .ai_matching import get_ai_match_score
-from .ai_global_sort import get_ai_profile_version, save_ai_score_result
+from .ai_matching import get_ai_match_scores_batch
+from .ai_global_sort import get_ai_profile_version, iter_prompt_batches, save_ai_score_results
 from .models import JobPosting
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
 
 
-def _score_job_with_retry(user, job, max_retries: int = 2, backoff_seconds: float = 0.5) -> dict:
+def _score_jobs_with_retry(user, jobs, max_retries: int = 2, backoff_seconds: float = 0.5) -> dict:
     attempt = 0
     while True:
         attempt += 1
         try:
-            return get_ai_match_score(user, job)
+            return get_ai_match_scores_batch(user, jobs)
         except Exception as exc:  # pragma: no cover - protective fallback
             if attempt > max_retries:
                 logger.error(
-                    "Async AI scoring exhausted retries for user=%s job=%s: %s",
+                    "Async AI scoring exhausted retries for user=%s jobs=%s: %s",
                     user.id,
-                    job.id,
+                    [job.id for job in jobs],
                     exc,
                 )
                 return {
-                    "error": True,
-                    "reason": "AI scoring failed after retries.",
-                    "score": None,
-                    "strengths": [],
-                    "gaps": [],
+                    job.id: {
+                        "error": True,
+                        "reason": "AI scoring failed after retries.",
+                        "score": None,
+                        "strengths": [],
+                        "gaps": [],
+                    }
+                    for job in jobs
                 }
             sleep_for = backoff_seconds * (2 ** (attempt - 1))
             time.sleep(sleep_for)
@@ -65,28 +68,29 @@ def process_user_ai_scores_for_job_ids(
     ready = 0
     failed = 0
 
-    for job_id in job_ids:
-        job = jobs.get(job_id)
-        if not job:
+    for batch_ids in iter_prompt_batches(job_ids):
+        batch_jobs = [jobs[job_id] for job_id in batch_ids if job_id in jobs]
+        if not batch_jobs:
             continue
 
-        score_data = _score_job_with_retry(
+        results = _score_jobs_with_retry(
             user=user,
-            job=job,
+            jobs=batch_jobs,
             max_retries=max_retries,
             backoff_seconds=backoff_seconds,
         )
-        row = save_ai_score_result(
+        rows = save_ai_score_results(
             user=user,
-            job=job,
+            jobs_by_id=jobs,
             profile_version=version,
-            score_data=score_data,
+            results=results,
         )
 
-        processed += 1
-        if row.status == row.Status.READY:
-            ready += 1
-        else:
-            failed += 1
+        for row in rows:
+            processed += 1
+            if row.status == row.Status.READY:
+                ready += 1
+            else:
+                failed += 1
 
     return {"processed": processed, "ready": ready, "failed": failed}
@@ -5,28 +5,231 @@ Analyzes a user's skills, education, and experience against a job posting
 and returns a match score with strengths and gaps.
 """
 
+import hashlib
 import json
 import re
+import time
+import uuid
 import logging
+from django.conf import settings
 from django.core.cache import cache
+from django.db import connection
+from django.utils import timezone
+
+from .models import AIMatchResult
 
 logger = logging.getLogger(__name__)
 
+AI_MATCH_CACHE_TIMEOUT = 60 * 60 * 24
+SINGLE_FLIGHT_METRICS = ("hits", "durable_hits", "coalesced", "upstream_calls", "pending")
+_METRICS_PREFIX = "ai_match_single_flight"
 
-def _get_ai_profile_version(user_id):
-    return int(cache.get(f"ai_profile_version_{user_id}", 0) or 0)
 
+# Bump when the prompt or scoring guide changes so stored results made
+# with the old wording are not reused.
+AI_MATCH_PROMPT_VERSION = 1
 
-def _build_cache_key(user, job):
-    profile_version = _get_ai_profile_version(user.id)
-    job_version = 0
-    job_updated = getattr(job, "updated_at", None)
-    if job_updated:
-        try:
-            job_version = int(job_updated.timestamp())
-        except Exception:
-            job_version = 0
-    return f"ai_match_{user.id}_{job.id}_{profile_version}_{job_version}"
+
+def _payload_digest(payload):
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def build_profile_digest(user_data):
+    """Digest of the candidate payload (and prompt version) sent to Gemini."""
+    return _payload_digest({"prompt_version": AI_MATCH_PROMPT_VERSION, "profile": user_data})
+
+
+def build_job_digest(job):
+    """Digest of the job payload sent to Gemini; cosmetic edits don't change it."""
+    return _payload_digest(build_job_summary(job))
+
+
+def _build_cache_key(profile_digest, job_digest):
+    return f"ai_match_{profile_digest}_{job_digest}"
+
+
+class _MatchInputs:
+    """
+    Payloads sent to Gemini for one user and a set of jobs, with the
+    content digests and cache keys derived from them.
+    """
+
+    def __init__(self, user, jobs):
+        self.user_data = build_user_profile(user)
+        self.profile_digest = build_profile_digest(self.user_data) if self.user_data else ""
+        self.summaries = {job.id: build_job_summary(job) for job in jobs}
+        self.job_digests = {job_id: _payload_digest(data) for job_id, data in self.summaries.items()}
+        self.cache_keys = {
+            job_id: _build_cache_key(self.profile_digest, digest)
+            for job_id, digest in self.job_digests.items()
+        }
+
+
+def _get_stored_results(inputs, job_ids):
+    """
+    Look up results for ``job_ids`` in the cache, then in the durable
+    ``AIMatchResult`` table. Durable hits are written back to the cache.
+    Returns {job_id: result}.
+    """
+    cached = cache.get_many([inputs.cache_keys[job_id] for job_id in job_ids])
+    found = {}
+    for job_id in job_ids:
+        result = cached.get(inputs.cache_keys[job_id])
+        if result:
+            found[job_id] = result
+    if found:
+        _record_metric("hits", len(found))
+
+    missing_digests = {inputs.job_digests[job_id] for job_id in job_ids if job_id not in found}
+    if not missing_digests:
+        return found
+
+    rows = AIMatchResult.objects.filter(
+        profile_digest=inputs.profile_digest,
+        job_digest__in=missing_digests,
+    )
+    durable = {row.job_digest: row.as_result() for row in rows}
+    if not durable:
+        return found
+
+    AIMatchResult.objects.filter(
+        profile_digest=inputs.profile_digest,
+        job_digest__in=list(durable),
+    ).update(last_used_at=timezone.now())
+    cache.set_many(
+        {_build_cache_key(inputs.profile_digest, digest): result for digest, result in durable.items()},
+        AI_MATCH_CACHE_TIMEOUT,
+    )
+
+    durable_hits = 0
+    for job_id in job_ids:
+        if job_id not in found and inputs.job_digests[job_id] in durable:
+            found[job_id] = dict(durable[inputs.job_digests[job_id]])
+            durable_hits += 1
+    _record_metric("durable_hits", durable_hits)
+    return found
+
+
+def _store_results(inputs, results_by_job_id):
+    """Write freshly computed results to the cache and the durable table."""
+    by_digest = {inputs.job_digests[job_id]: result for job_id, result in results_by_job_id.items()}
+    if not by_digest:
+        return
+
+    cache.set_many(
+        {_build_cache_key(inputs.profile_digest, digest): result for digest, result in by_digest.items()},
+        AI_MATCH_CACHE_TIMEOUT,
+    )
+    now = timezone.now()
+    try:
+        AIMatchResult.objects.bulk_create(
+            [
+                AIMatchResult(
+                    profile_digest=inputs.profile_digest,
+                    job_digest=digest,
+                    score=result["score"],
+                    reason=str(result.get("reason", ""))[:1000],
+                    strengths_json=list(result.get("strengths") or []),
+                    gaps_json=list(result.get("gaps") or []),
+                    last_used_at=now,
+                )
+                for digest, result in by_digest.items()
+            ],
+            update_conflicts=True,
+            # MySQL upserts on any unique key and rejects an explicit target
+            unique_fields=(
+                ["profile_digest", "job_digest"]
+                if connection.features.supports_update_conflicts_with_target else None
+            ),
+            update_fields=["score", "reason", "strengths_json", "gaps_json", "last_used_at"],
+        )
+    except Exception as e:
+        # The cache already holds the results; losing the durable copy only
+        # costs a recomputation later.
+        logger.error(f"Failed to persist {len(by_digest)} AI match results: {e}", exc_info=True)
+
+
+def _record_metric(name, amount=1):
+    key = f"{_METRICS_PREFIX}:{name}"
+    try:
+        cache.add(key, 0, AI_MATCH_CACHE_TIMEOUT)
+        cache.incr(key, amount)
+    except ValueError:
+        # Counter expired between add() and incr().
+        cache.set(key, amount, AI_MATCH_CACHE_TIMEOUT)
+
+
+def get_single_flight_metrics():
+    """
+    Counters for the AI match single-flight layer:
+
+    - hits: scores served straight from the cache
+    - durable_hits: scores served from the AIMatchResult table
+    - coalesced: scores obtained by waiting on another caller's request
+    - upstream_calls: Gemini requests actually sent
+    - pending: scores given up on because another caller still held the lease
+    """
+    keys = {name: f"{_METRICS_PREFIX}:{name}" for name in SINGLE_FLIGHT_METRICS}
+    values = cache.get_many(list(keys.values()))
+    return {name: int(values.get(key, 0) or 0) for name, key in keys.items()}
+
+
+def reset_single_flight_metrics():
+    cache.delete_many([f"{_METRICS_PREFIX}:{name}" for name in SINGLE_FLIGHT_METRICS])
+
+
+def _lease_key(cache_key):
+    return f"{cache_key}:lease"
+
+
+def _acquire_leases(cache_keys):
+    """
+    Try to take the compute lease for each cache key. ``cache.add`` is
+    atomic, so exactly one concurrent caller wins each key.
+
+    Returns (token, set of cache keys now owned by this caller).
+    """
+    token = uuid.uuid4().hex
+    ttl = int(getattr(settings, "AI_MATCH_LEASE_SECONDS", 60))
+    owned = {key for key in cache_keys if cache.add(_lease_key(key), token, ttl)}
+    return token, owned
+
+
+def _release_leases(cache_keys, token):
+    for key in cache_keys:
+        lease_key = _lease_key(key)
+        if cache.get(lease_key) == token:
+            cache.delete(lease_key)
+
+
+def _await_results(cache_keys):
+    """
+    Wait for other callers holding the leases on ``cache_keys`` to publish
+    their results. Stops early once a lease is released without a result
+    (the owner failed) and returns whatever arrived in time.
+    """
+    wait_seconds = float(getattr(settings, "AI_MATCH_WAIT_SECONDS", 5))
+    poll_seconds = float(getattr(settings, "AI_MATCH_POLL_SECONDS", 0.2))
+    deadline = time.monotonic() + wait_seconds
+    remaining = set(cache_keys)
+    found = {}
+
+    while remaining:
+        arrived = cache.get_many(list(remaining))
+        for key, value in arrived.items():
+            if value:
+                found[key] = value
+                remaining.discard(key)
+        if not remaining or time.monotonic() >= deadline:
+            break
+        leases = cache.get_many([_lease_key(key) for key in remaining])
+        abandoned = {key for key in remaining if _lease_key(key) not in leases}
+        remaining -= abandoned
+        if remaining:
+            time.sleep(poll_seconds)
+
+    return found
 
 
 def _get_gemini_client():
@@ -187,6 +390,88 @@ def _extract_json(text):
     return None
 
 
+def _extract_json_array(text):
+    """
+    Extract a JSON array from a model response, tolerating markdown fences
+    and leading reasoning text. Falls back to wrapping a single object.
+    """
+    if not text:
+        return None
+
+    candidates = [text.strip()]
+    fence_match = re.search(r'```(?:json)?\s*([\s\S]*?)```', text)
+    if fence_match:
+        candidates.append(fence_match.group(1).strip())
+    start = text.find('[')
+    end = text.rfind(']')
+    if start != -1 and end > start:
+        candidates.append(text[start:end + 1])
+
+    for candidate in candidates:
+        try:
+            parsed = json.loads(candidate)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(parsed, list):
+            return parsed
+        if isinstance(parsed, dict):
+            if 'job_id' in parsed:
+                return [parsed]
+            # Some models wrap the array: {"results": [...]}
+            for value in parsed.values():
+                if isinstance(value, list) and all(isinstance(v, dict) for v in value):
+                    return value
+
+    single = _extract_json(text)
+    if isinstance(single, dict):
+        return [single]
+    return None
+
+
+def _normalize_result(result):
+    """Validate and clamp a raw score dict returned by the model."""
+    result['score'] = max(0, min(100, int(result.get('score', 0))))
+    result['strengths'] = result.get('strengths', [])[:5]
+    result['gaps'] = result.get('gaps', [])[:5]
+    result['reason'] = result.get('reason', '')
+    result['cached'] = False
+    return result
+
+
+def _generate_content(client, model_name, prompt, max_output_tokens):
+    """Call Gemini with the shared generation config used by job matching."""
+    # Disable thinking for 2.5 models when SDK supports it.
+    config_kwargs = {
+        "temperature": 0.1,
+        "max_output_tokens": max_output_tokens,
+    }
+
+    config_payload = config_kwargs
+    try:
+        from google.genai import types  # Optional; can fail on incompatible SDK/env.
+        if '2.5' in model_name:
+            config_kwargs["thinking_config"] = types.ThinkingConfig(thinking_budget=0)
+        config_payload = types.GenerateContentConfig(**config_kwargs)
+    except Exception:
+        # Fallback clients (or older envs) accept dict config.
+        pass
+
+    return client.models.generate_content(
+        model=model_name,
+        contents=prompt,
+        config=config_payload
+    )
+
+
+SCORING_GUIDE = """Scoring guide:
+- 80-100: Excellent match
+- 60-79: Good match with minor gaps
+- 40-59: Moderate match with notable gaps
+- 20-39: Weak match
+- 0-19: Poor match
+"""
+
+
 def get_ai_match_score(user, job):
     """
     Use Google Gemini to score how well a user matches a job posting.
@@ -201,22 +486,43 @@ def get_ai_match_score(user, job):
     }
     Falls back gracefully if the API is unavailable.
     """
-    # Check cache first (24 hours to save API calls)
-    cache_key = _build_cache_key(user, job)
-    cached = cache.get(cache_key)
-    if cached:
-        cached['cached'] = True
-        return cached
+    inputs = _MatchInputs(user, [job])
+    if not inputs.user_data:
+        return _fallback_result("Could not load your profile data.")
+
+    # Results are keyed on the exact payloads sent to the model, so they
+    # survive cache flushes and are shared by identical profiles.
+    stored = _get_stored_results(inputs, [job.id]).get(job.id)
+    if stored:
+        stored['cached'] = True
+        return stored
+
+    # Single-flight: only the lease holder calls Gemini; everyone else
+    # waits for its result instead of sending a duplicate request.
+    cache_key = inputs.cache_keys[job.id]
+    token, owned = _acquire_leases([cache_key])
+    if not owned:
+        coalesced = _await_results([cache_key]).get(cache_key)
+        if coalesced:
+            _record_metric("coalesced")
+            coalesced['cached'] = True
+            return coalesced
+        _record_metric("pending")
+        return _pending_result()
+
+    try:
+        return _compute_ai_match_score(user, job, inputs)
+    finally:
+        _release_leases([cache_key], token)
 
+
+def _compute_ai_match_score(user, job, inputs):
     client, model_name = _get_gemini_client()
     if not client:
         return _fallback_result("AI matching is currently unavailable. Please configure an AI API key in the admin dashboard.")
 
-    user_data = build_user_profile(user)
-    job_data = build_job_summary(job)
-
-    if not user_data:
-        return _fallback_result("Could not load your profile data.")
+    user_data = inputs.user_data
+    job_data = inputs.summaries[job.id]
 
     prompt = f"""You are a professional job matching assistant for a university alumni system.
 Analyze how well this candidate matches the job posting and provide a realistic assessment.
@@ -231,37 +537,12 @@ You MUST respond with ONLY a valid JSON object. No explanation, no markdown, no
 Use this exact structure:
 {{"score": 75, "reason": "One sentence summary.", "strengths": ["strength 1", "strength 2"], "gaps": ["gap 1"]}}
 
-Scoring guide:
-- 80-100: Excellent match
-- 60-79: Good match with minor gaps
-- 40-59: Moderate match with notable gaps
-- 20-39: Weak match
-- 0-19: Poor match
-"""
+{SCORING_GUIDE}"""
 
     raw = ""
     try:
-        # Disable thinking for 2.5 models when SDK supports it.
-        config_kwargs = {
-            "temperature": 0.1,
-            "max_output_tokens": 500,
-        }
-
-        config_payload = config_kwargs
-        try:
-            from google.genai import types  # Optional; can fail on incompatible SDK/env.
-            if '2.5' in model_name:
-                config_kwargs["thinking_config"] = types.ThinkingConfig(thinking_budget=0)
-            config_payload = types.GenerateContentConfig(**config_kwargs)
-        except Exception:
-            # Fallback clients (or older envs) accept dict config.
-            pass
-
-        response = client.models.generate_content(
-            model=model_name,
-            contents=prompt,
-            config=config_payload
-        )
+        _record_metric("upstream_calls")
+        response = _generate_content(client, model_name, prompt, max_output_tokens=500)
 
         # Safely get text using robust extractor
         raw = _extract_text_from_response(response)
@@ -278,15 +559,9 @@ Scoring guide:
             logger.error(f"Could not extract JSON from Gemini response: {raw[:300]}")
             return _fallback_result("AI returned an unexpected response format.")
 
-        # Validate and clamp
-        result['score'] = max(0, min(100, int(result.get('score', 0))))
-        result['strengths'] = result.get('strengths', [])[:5]
-        result['gaps'] = result.get('gaps', [])[:5]
-        result['reason'] = result.get('reason', '')
-        result['cached'] = False
+        result = _normalize_result(result)
 
-        # Cache for 24 hours
-        cache.set(cache_key, result, 60 * 60 * 24)
+        _store_results(inputs, {job.id: result})
 
         logger.info(f"AI match score: user={user.id}, job={job.id}, score={result['score']}")
         return result
@@ -296,6 +571,159 @@ Scoring guide:
         return _fallback_result("AI matching service is temporarily unavailable.")
 
 
+def get_ai_match_scores_batch(user, jobs):
+    """
+    Score several job postings for one user with a single Gemini request.
+
+    The candidate profile is sent once alongside N job summaries and the
+    model answers with a JSON array of scores keyed by ``job_id``. Cached
+    scores are reused and only the remaining jobs are sent upstream.
+
+    Returns a dict mapping job id to the same result shape as
+    ``get_ai_match_score``. Jobs the model omits get a fallback result.
+    """
+    jobs = [job for job in jobs if job is not None]
+    results = {}
+    if not jobs:
+        return results
+
+    inputs = _MatchInputs(user, jobs)
+    if not inputs.user_data:
+        return {job.id: _fallback_result("Could not load your profile data.") for job in jobs}
+
+    cache_keys = inputs.cache_keys
+    results = _get_stored_results(inputs, [job.id for job in jobs])
+    for result in results.values():
+        result['cached'] = True
+    uncached = [job for job in jobs if job.id not in results]
+    if not uncached:
+        return results
+
+    # Single-flight: score only the jobs whose lease we win, then wait for
+    # the callers holding the others.
+    token, owned = _acquire_leases([cache_keys[job.id] for job in uncached])
+    waiting = [job for job in uncached if cache_keys[job.id] not in owned]
+    uncached = [job for job in uncached if cache_keys[job.id] in owned]
+
+    try:
+        if uncached:
+            _score_jobs_upstream(user, inputs, uncached, results)
+    finally:
+        _release_leases(owned, token)
+
+    if waiting:
+        arrived = _await_results([cache_keys[job.id] for job in waiting])
+        for job in waiting:
+            coalesced = arrived.get(cache_keys[job.id])
+            if coalesced:
+                coalesced['cached'] = True
+                results[job.id] = coalesced
+            else:
+                results[job.id] = _pending_result()
+        coalesced_count = sum(1 for job in waiting if cache_keys[job.id] in arrived)
+        if coalesced_count:
+            _record_metric("coalesced", coalesced_count)
+        if len(waiting) > coalesced_count:
+            _record_metric("pending", len(waiting) - coalesced_count)
+
+    return results
+
+
+def _score_jobs_upstream(user, inputs, uncached, results):
+    """Send one Gemini request for ``uncached`` and fill ``results`` in place."""
+
+    def _fail_remaining(reason):
+        for job in uncached:
+            results.setdefault(job.id, _fallback_result(reason))
+        return results
+
+    client, model_name = _get_gemini_client()
+    if not client:
+        return _fail_remaining("AI matching is currently unavailable. Please configure an AI API key in the admin dashboard.")
+
+    user_data = inputs.user_data
+    jobs_payload = [dict(inputs.summaries[job.id], job_id=job.id) for job in uncached]
+
+    prompt = f"""You are a professional job matching assistant for a university alumni system.
+Analyze how well this candidate matches EACH of the job postings below and provide a realistic assessment for every one.
+
+CANDIDATE PROFILE:
+{json.dumps(user_data, indent=2)}
+
+JOB POSTINGS:
+{json.dumps(jobs_payload, indent=2)}
+
+You MUST respond with ONLY a valid JSON array containing exactly one object per job posting. No explanation, no markdown, no code fences.
+Use this exact structure for each element, copying job_id from the posting:
+[{{"job_id": 1, "score": 75, "reason": "One sentence summary.", "strengths": ["strength 1"], "gaps": ["gap 1"]}}]
+
+{SCORING_GUIDE}"""
+
+    job_ids = [job.id for job in uncached]
+    raw = ""
+    try:
+        _record_metric("upstream_calls")
+        response = _generate_content(
+            client,
+            model_name,
+            prompt,
+            max_output_tokens=min(8192, 200 + 250 * len(uncached)),
+        )
+        raw = _extract_text_from_response(response)
+
+        logger.debug(f"Gemini batch raw response for user={user.id}, jobs={job_ids}: {raw[:500]}")
+
+        if not raw:
+            logger.error(f"Gemini returned empty batch response for user={user.id}, jobs={job_ids}")
+            return _fail_remaining("AI returned an empty response.")
+
+        items = _extract_json_array(raw)
+        if items is None:
+            logger.error(f"Could not extract JSON array from Gemini batch response: {raw[:300]}")
+            return _fail_remaining("AI returned an unexpected response format.")
+
+        pending = {job.id: job for job in uncached}
+        to_cache = {}
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            try:
+                job_id = int(item.get('job_id'))
+            except (TypeError, ValueError):
+                continue
+            job = pending.pop(job_id, None)
+            if job is None:
+                continue
+            try:
+                result = _normalize_result({k: v for k, v in item.items() if k != 'job_id'})
+            except (TypeError, ValueError):
+                results[job_id] = _fallback_result("AI returned an unexpected response format.")
+                continue
+            results[job_id] = result
+            to_cache[job_id] = result
+
+        _store_results(inputs, to_cache)
+
+        if pending:
+            logger.warning(f"Gemini batch response omitted jobs {list(pending)} for user={user.id}")
+            for job_id in pending:
+                results[job_id] = _fallback_result("AI did not return a score for this job.")
+
+        logger.info(f"AI batch match scores: user={user.id}, jobs={len(job_ids)}, scored={len(to_cache)}")
+        return results
+
+    except Exception as e:
+        logger.error(f"Gemini API batch error for user={user.id}, jobs={job_ids}: {e}\nRaw: {raw[:200]}")
+        return _fail_remaining("AI matching service is temporarily unavailable.")
+
+
+def _pending_result():
+    """Result for a score another caller is still computing."""
+    result = _fallback_result("AI match is still being computed. Please check back shortly.")
+    result["pending"] = True
+    return result
+
+
 def _fallback_result(reason):
     """Return a safe fallback when AI matching fails."""
     return {
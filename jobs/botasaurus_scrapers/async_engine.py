@@ -0,0 +1,407 @@
+"""
+Asyncio fetch layer for the HTTP-based job site scrapers.
+
+All sites share one ``httpx.AsyncClient`` connection pool. Requests to the
+same host draw from a shared token bucket, search pages for every site are
+requested concurrently, and the whole run is bounded by a single deadline,
+so a run takes roughly as long as the slowest host rather than the sum of
+a worker pool's queue.
+
+Usage:
+    from jobs.botasaurus_scrapers.async_engine import scrape_sites
+
+    results = scrape_sites("software engineer", "Manila", sources=["JORA", "KALIBRR"])
+
+Sites that need a real browser (BossJob) have no ``SiteSpec``; they run their
+blocking scraper in a worker thread under the same deadline.
+
+Passing a ``FetchCache`` makes the run incremental: search pages are
+requested conditionally, unchanged pages are not parsed, and only cards
+whose signature is not already known are returned.
+"""
+import asyncio
+import hashlib
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from . import (
+    indeed_scraper,
+    jobstreet_scraper,
+    jora_scraper,
+    kalibrr_scraper,
+    linkedin_scraper,
+    mynimo_scraper,
+    onlinejobs_scraper,
+    philjobnet_scraper,
+    workabroad_scraper,
+)
+from .base import job_signature, make_empty_result, make_success_result
+from .rate_limit import HostRateLimiter, get_shared_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,application/json;q=0.8,*/*;q=0.7",
+    "Accept-Language": "en-US,en;q=0.5",
+}
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a request cannot start or finish before the run deadline."""
+
+
+class AsyncFetcher:
+    """
+    Rate-limited, deadline-aware GET requests over a shared connection pool.
+
+    Use as an async context manager. Transport errors and retryable status
+    codes are retried with exponential backoff while time remains.
+    """
+
+    def __init__(
+        self,
+        deadline: float,
+        limiter: Optional[HostRateLimiter] = None,
+        timeout: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        max_connections: Optional[int] = None,
+        backoff: Optional[float] = None,
+    ):
+        self.deadline = deadline
+        self.limiter = limiter or get_shared_rate_limiter()
+        self.timeout = timeout or getattr(settings, "SCRAPER_REQUEST_TIMEOUT", 15)
+        self.max_retries = max_retries if max_retries is not None else getattr(settings, "SCRAPER_MAX_RETRIES", 3)
+        self.max_connections = max_connections or getattr(settings, "SCRAPER_MAX_CONNECTIONS", 20)
+        self.backoff = backoff if backoff is not None else getattr(settings, "SCRAPER_RETRY_BACKOFF_SECONDS", 0.5)
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def __aenter__(self):
+        self._client = httpx.AsyncClient(
+            headers=DEFAULT_HEADERS,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=self.max_connections),
+        )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._client.aclose()
+
+    def remaining(self) -> float:
+        return self.deadline - time.monotonic()
+
+    async def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+        """
+        GET ``url``. A ``304 Not Modified`` answer to conditional ``headers``
+        is returned like a success; other non-2xx responses raise.
+        """
+        host = urlsplit(url).netloc
+        attempt = 0
+        while True:
+            delay = self.limiter.reserve(host, max_wait=self.remaining())
+            if delay is None:
+                raise DeadlineExceeded(f"Rate limit for {host} exceeds the remaining time")
+            if delay:
+                await asyncio.sleep(delay)
+
+            remaining = self.remaining()
+            if remaining <= 0:
+                raise DeadlineExceeded(f"Deadline reached before requesting {url}")
+            try:
+                response = await self._client.get(url, headers=headers, timeout=min(self.timeout, remaining))
+                if response.status_code == httpx.codes.NOT_MODIFIED:
+                    return response
+                if response.status_code not in RETRY_STATUS_CODES:
+                    response.raise_for_status()
+                    return response
+                error = httpx.HTTPStatusError(
+                    f"HTTP {response.status_code} for {url}", request=response.request, response=response,
+                )
+            except httpx.TransportError as exc:
+                error = exc
+
+            attempt += 1
+            wait = self.backoff * (2 ** (attempt - 1))
+            if attempt > self.max_retries or wait >= self.remaining():
+                raise error
+            await asyncio.sleep(wait)
+
+
+def content_hash(body: str) -> str:
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class FetchCache:
+    """
+    State for an incremental run, loaded and saved by ``jobs.fetch_cache``.
+
+    ``validators`` maps search URLs to the ``etag``, ``last_modified`` and
+    ``content_hash`` of their previous fetch; ``known_signatures`` maps
+    sources to the card signatures already stored for this search. Each
+    fetch stages its new validators, plus whether the page ``changed``, in
+    ``pending``; they move to ``updates`` (what gets saved) only once the
+    page parsed and the site's result was saved, so a failure refetches
+    the page next time instead of skipping it as unchanged.
+    """
+
+    validators: Dict[str, dict] = field(default_factory=dict)
+    known_signatures: Dict[str, Set[str]] = field(default_factory=dict)
+    updates: Dict[str, dict] = field(default_factory=dict)
+    pending: Dict[str, Dict[str, dict]] = field(default_factory=dict)
+
+    def request_headers(self, url: str) -> Dict[str, str]:
+        entry = self.validators.get(url) or {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def page_body(self, url: str, response: httpx.Response) -> Tuple[Optional[str], dict]:
+        """
+        Return ``response``'s body, or None if the page is unchanged, and the
+        validators to stage for the page.
+        """
+        previous = self.validators.get(url) or {}
+        if response.status_code == httpx.codes.NOT_MODIFIED:
+            return None, {**previous, "changed": False}
+
+        body = response.text
+        digest = content_hash(body)
+        changed = digest != previous.get("content_hash")
+        update = {
+            "etag": response.headers.get("ETag", ""),
+            "last_modified": response.headers.get("Last-Modified", ""),
+            "content_hash": digest,
+            "changed": changed,
+        }
+        return (body if changed else None), update
+
+    def commit(self, source: str, saved: bool) -> None:
+        """Keep the validators staged for ``source`` if its result was saved, else drop them."""
+        staged = self.pending.pop(source, {})
+        if saved:
+            self.updates.update(staged)
+
+
+@dataclass(frozen=True)
+class SiteSpec:
+    """How to page through one site and turn its responses into job dicts."""
+
+    source: str
+    build_search_url: Callable[..., str]
+    parse_search_results: Callable[[str, str, str], list]
+    apply_job_detail: Optional[Callable[[dict, str, str], dict]] = None
+    detail_limit: int = 0
+
+
+SITE_SPECS: Dict[str, SiteSpec] = {
+    spec.source: spec
+    for spec in (
+        SiteSpec(jobstreet_scraper.SOURCE, jobstreet_scraper.build_search_url, jobstreet_scraper.parse_search_results),
+        SiteSpec(
+            indeed_scraper.SOURCE, indeed_scraper.build_search_url, indeed_scraper.parse_search_results,
+            indeed_scraper.apply_job_detail, indeed_scraper.DETAIL_FETCH_LIMIT,
+        ),
+        SiteSpec(
+            linkedin_scraper.SOURCE, linkedin_scraper.build_search_url, linkedin_scraper.parse_search_results,
+            linkedin_scraper.apply_job_detail, linkedin_scraper.DETAIL_FETCH_LIMIT,
+        ),
+        SiteSpec(kalibrr_scraper.SOURCE, kalibrr_scraper.build_search_url, kalibrr_scraper.parse_search_results),
+        SiteSpec(
+            philjobnet_scraper.SOURCE, philjobnet_scraper.build_search_url, philjobnet_scraper.parse_search_results,
+            philjobnet_scraper.apply_job_detail, 20,
+        ),
+        SiteSpec(onlinejobs_scraper.SOURCE, onlinejobs_scraper.build_search_url, onlinejobs_scraper.parse_search_results),
+        SiteSpec(jora_scraper.SOURCE, jora_scraper.build_search_url, jora_scraper.parse_search_results),
+        SiteSpec(mynimo_scraper.SOURCE, mynimo_scraper.build_search_url, mynimo_scraper.parse_search_results),
+        SiteSpec(workabroad_scraper.SOURCE, workabroad_scraper.build_search_url, workabroad_scraper.parse_search_results),
+    )
+}
+
+
+def _describe(exc: BaseException) -> str:
+    # httpx timeouts often carry an empty message.
+    return str(exc) or type(exc).__name__
+
+
+async def _fetch_detail(fetcher: AsyncFetcher, spec: SiteSpec, job: dict, location: str) -> dict:
+    try:
+        response = await fetcher.get(job["url"])
+        detailed = spec.apply_job_detail(job, response.text, location)
+        if "signature" in job:
+            # Some sites rebuild the dict; keep the search card's signature.
+            detailed["signature"] = job["signature"]
+        return detailed
+    except Exception as exc:
+        logger.debug(f"[AsyncScraper] {spec.source} detail page {job['url']} skipped: {exc}")
+        return job
+
+
+async def scrape_site_async(
+    fetcher: AsyncFetcher,
+    spec: SiteSpec,
+    keyword: str,
+    location: str,
+    pages: int = 1,
+    cache: Optional[FetchCache] = None,
+) -> Dict:
+    """
+    Fetch ``pages`` search pages for one site concurrently, then its detail
+    pages. Failed pages are dropped; the site only fails if every page does.
+
+    With a ``cache``, unchanged pages are skipped and cards already known
+    for this search are dropped before detail pages are fetched; the result
+    then counts them in ``unchanged_pages`` and ``known_jobs``.
+    """
+    urls = [spec.build_search_url(keyword, location, page) for page in range(1, pages + 1)]
+    responses = await asyncio.gather(
+        *(fetcher.get(url, headers=cache.request_headers(url) if cache else None) for url in urls),
+        return_exceptions=True,
+    )
+    jobs, errors = [], []
+    unchanged_pages = 0
+    staged = cache.pending.setdefault(spec.source, {}) if cache else {}
+    for url, response in zip(urls, responses):
+        if isinstance(response, Exception):
+            errors.append(response)
+            continue
+        if cache:
+            body, update = cache.page_body(url, response)
+        else:
+            body, update = response.text, None
+        if body is None:
+            unchanged_pages += 1
+            staged[url] = update
+            continue
+        try:
+            jobs.extend(spec.parse_search_results(body, keyword, location))
+        except Exception as exc:
+            errors.append(exc)
+            continue
+        if update is not None:
+            staged[url] = update
+
+    if errors and len(errors) == len(responses):
+        error = _describe(errors[0])
+        logger.warning(f"[AsyncScraper] {spec.source} failed: {error}")
+        return make_empty_result(keyword, location, spec.source, error)
+
+    known_jobs = 0
+    if cache:
+        seen = set(cache.known_signatures.get(spec.source, ()))
+        new_jobs = []
+        for job in jobs:
+            # Signed before detail pages rewrite the card fields.
+            job["signature"] = job_signature(job)
+            if job["signature"] in seen:
+                known_jobs += 1
+                continue
+            seen.add(job["signature"])
+            new_jobs.append(job)
+        jobs = new_jobs
+
+    if spec.apply_job_detail and spec.detail_limit:
+        with_url = [job for job in jobs[:spec.detail_limit] if job["url"]]
+        detailed = await asyncio.gather(*(_fetch_detail(fetcher, spec, job, location) for job in with_url))
+        replaced = {id(job): new for job, new in zip(with_url, detailed)}
+        jobs = [replaced.get(id(job), job) for job in jobs]
+
+    result = make_success_result(keyword, location, spec.source, jobs)
+    if cache:
+        result["unchanged_pages"] = unchanged_pages
+        result["known_jobs"] = known_jobs
+    return result
+
+
+async def _scrape_in_thread(executor, source_key: str, keyword: str, location: str, remaining: float) -> Dict:
+    # Imported lazily: the orchestrator imports this module.
+    from .orchestrator import scrape_site
+
+    loop = asyncio.get_running_loop()
+    try:
+        return await asyncio.wait_for(
+            loop.run_in_executor(executor, scrape_site, source_key, keyword, location),
+            timeout=max(0.0, remaining),
+        )
+    except asyncio.TimeoutError:
+        return make_empty_result(keyword, location, source_key, f"Timed out after {remaining:.0f}s")
+
+
+async def scrape_sites_async(
+    keyword: str,
+    location: str,
+    sources: List[str],
+    pages: int = 1,
+    deadline_seconds: Optional[float] = None,
+    limiter: Optional[HostRateLimiter] = None,
+    max_workers: int = 4,
+    specs: Optional[Dict[str, SiteSpec]] = None,
+    on_result: Optional[Callable[[Dict], None]] = None,
+    cache: Optional[FetchCache] = None,
+) -> List[Dict]:
+    """
+    Scrape ``sources`` concurrently and return one result dict per source.
+
+    ``on_result`` is called with each site's result as soon as that site
+    finishes. It runs through ``sync_to_async`` on a single worker thread,
+    so it may use the ORM and calls never overlap.
+
+    ``cache`` makes HTTP-based sites incremental (see ``scrape_site_async``);
+    browser-based sites always return their full results. Every result
+    carries the site's wall-clock ``elapsed`` seconds.
+    """
+    specs = SITE_SPECS if specs is None else specs
+    if deadline_seconds is None:
+        deadline_seconds = getattr(settings, "SCRAPER_DEADLINE_SECONDS", 60)
+    deadline = time.monotonic() + deadline_seconds
+    report = sync_to_async(on_result, thread_sensitive=True) if on_result else None
+
+    async def run_source(fetcher, executor, src):
+        started = time.monotonic()
+        try:
+            if src in specs:
+                result = await scrape_site_async(fetcher, specs[src], keyword, location, pages, cache=cache)
+            else:
+                result = await _scrape_in_thread(executor, src, keyword, location, deadline_seconds)
+        except Exception as exc:
+            result = make_empty_result(keyword, location, src, _describe(exc))
+        result["elapsed"] = round(time.monotonic() - started, 3)
+        saved = bool(result.get("success"))
+        if report:
+            try:
+                await report(result)
+            except Exception as exc:
+                logger.error(f"[AsyncScraper] Result callback for {src} failed: {exc}", exc_info=True)
+                saved = False
+        if cache:
+            cache.commit(src, saved)
+        return result
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        async with AsyncFetcher(deadline, limiter=limiter) as fetcher:
+            return list(await asyncio.gather(*(run_source(fetcher, executor, src) for src in sources)))
+    finally:
+        # Browser scrapers that overran the deadline finish in the background.
+        executor.shutdown(wait=False)
+
+
+def scrape_sites(keyword: str, location: str, sources: List[str], **kwargs) -> List[Dict]:
+    """Synchronous entry point for views, admin actions and management commands."""
+    return asyncio.run(scrape_sites_async(keyword, location, sources, **kwargs))
@@ -1,6 +1,7 @@
 """
 Base utilities shared across all botasaurus job scrapers.
 """
+import hashlib
 import re
 import logging
 
@@ -96,6 +97,19 @@ def build_job_dict(
     }
 
 
+# Card fields that identify a listing as seen on a search results page.
+SIGNATURE_FIELDS = ("title", "company", "location", "salary", "job_type", "url")
+
+
+def job_signature(job: dict) -> str:
+    """
+    Return a stable digest of a job card. A listing whose card is edited
+    (new salary, retitled, ...) gets a new signature.
+    """
+    parts = [normalize_text(str(job.get(field) or "")).lower() for field in SIGNATURE_FIELDS]
+    return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
 def make_empty_result(keyword: str, location: str, source: str, error: str) -> dict:
     """Return a standard failure result dict."""
     return {
@@ -17,6 +17,7 @@ from .base import (
     is_meaningful_description,
     make_empty_result,
     make_success_result,
+    normalize_description,
 )
 
 logger = logging.getLogger(__name__)
@@ -74,18 +75,9 @@ def _extract_json_ld_description(soup) -> str:
     return ""
 
 
-def _fetch_indeed_job_description(req: Request, url: str) -> str:
-    """Fetch a single Indeed job page and extract full description."""
-    if not url:
-        return ""
-    try:
-        response = req.get(url, timeout=10)
-        response.raise_for_status()
-    except Exception as exc:
-        logger.debug(f"[Indeed] Could not fetch detail page {url}: {exc}")
-        return ""
-
-    soup = soupify(response)
+def parse_job_description(body: str) -> str:
+    """Extract the full description from an Indeed job page."""
+    soup = soupify(body)
 
     selectors = [
         "#jobDescriptionText",
@@ -104,30 +96,40 @@ def _fetch_indeed_job_description(req: Request, url: str) -> str:
     return json_ld_text if is_meaningful_description(json_ld_text) else ""
 
 
-@request(
-    output=None,
-    raise_exception=False,
-    close_on_crash=True,
-    max_retry=3,
-)
-def _fetch_indeed(req: Request, data: dict):
-    """Fetch and parse Indeed PH search results."""
-    keyword = data["keyword"]
-    location = data["location"]
+def apply_job_detail(job: dict, body: str, location: str) -> dict:
+    """Replace the search snippet with the description from the job page."""
+    full_description = parse_job_description(body)
+    if full_description:
+        job["description"] = normalize_description(full_description)
+    return job
+
+
+def _fetch_indeed_job_description(req: Request, url: str) -> str:
+    """Fetch a single Indeed job page and extract full description."""
+    if not url:
+        return ""
+    try:
+        response = req.get(url, timeout=10)
+        response.raise_for_status()
+    except Exception as exc:
+        logger.debug(f"[Indeed] Could not fetch detail page {url}: {exc}")
+        return ""
 
+    return parse_job_description(response.text)
+
+
+def build_search_url(keyword: str, location: str, page: int = 1) -> str:
+    """Return the Indeed search URL for one results page."""
     url = (
         f"https://ph.indeed.com/jobs"
         f"?q={quote_plus(keyword)}&l={quote_plus(location)}"
     )
+    return f"{url}&start={(page - 1) * 10}" if page > 1 else url
 
-    try:
-        response = req.get(url, timeout=15)
-        response.raise_for_status()
-    except Exception as exc:
-        logger.warning(f"[Indeed] Request failed: {exc}")
-        return make_empty_result(keyword, location, SOURCE, str(exc))
 
-    soup = soupify(response)
+def parse_search_results(body: str, keyword: str, location: str) -> list:
+    """Parse an Indeed search results page into job dicts (snippet descriptions only)."""
+    soup = soupify(body)
     jobs = []
 
     # Indeed job cards use data-jk attribute
@@ -162,10 +164,6 @@ def _fetch_indeed(req: Request, data: dict):
         if not title:
             continue
 
-        if href and len(jobs) < DETAIL_FETCH_LIMIT:
-            full_description = _fetch_indeed_job_description(req, href)
-            if full_description:
-                description = full_description
         if not is_meaningful_description(description):
             description = ""
 
@@ -179,6 +177,36 @@ def _fetch_indeed(req: Request, data: dict):
             source=SOURCE,
         ))
 
+    return jobs
+
+
+@request(
+    output=None,
+    raise_exception=False,
+    close_on_crash=True,
+    max_retry=3,
+)
+def _fetch_indeed(req: Request, data: dict):
+    """Fetch and parse Indeed PH search results."""
+    keyword = data["keyword"]
+    location = data["location"]
+
+    url = build_search_url(keyword, location)
+
+    try:
+        response = req.get(url, timeout=15)
+        response.raise_for_status()
+    except Exception as exc:
+        logger.warning(f"[Indeed] Request failed: {exc}")
+        return make_empty_result(keyword, location, SOURCE, str(exc))
+
+    jobs = parse_search_results(response.text, keyword, location)
+    for job in jobs[:DETAIL_FETCH_LIMIT]:
+        if job["url"]:
+            full_description = _fetch_indeed_job_description(req, job["url"])
+            if full_description:
+                job["description"] = normalize_description(full_description)
+
     return make_success_result(keyword, location, SOURCE, jobs)
 
 
@@ -15,29 +15,17 @@ logger = logging.getLogger(__name__)
 SOURCE = "JOBSTREET"
 
 
-@request(
-    output=None,
-    raise_exception=False,
-    close_on_crash=True,
-    max_retry=3,
-)
-def _fetch_jobstreet(req: Request, data: dict):
-    """Fetch and parse JobStreet PH search results."""
-    keyword = data["keyword"]
-    location = data["location"]
-
+def build_search_url(keyword: str, location: str, page: int = 1) -> str:
+    """Return the JobStreet PH search URL for one results page."""
     kw_slug = keyword.lower().replace(" ", "-")
     loc_slug = location.lower().replace(" ", "-")
     url = f"https://www.jobstreet.com.ph/jobs/{kw_slug}-jobs-in-{loc_slug}"
+    return f"{url}?page={page}" if page > 1 else url
 
-    try:
-        response = req.get(url, timeout=15)
-        response.raise_for_status()
-    except Exception as exc:
-        logger.warning(f"[JobStreet] Request failed: {exc}")
-        return make_empty_result(keyword, location, SOURCE, str(exc))
 
-    soup = soupify(response)
+def parse_search_results(body: str, keyword: str, location: str) -> list:
+    """Parse a JobStreet PH search results page into job dicts."""
+    soup = soupify(body)
     jobs = []
 
     # JobStreet renders job cards with data-automation attributes
@@ -73,6 +61,30 @@ def _fetch_jobstreet(req: Request, data: dict):
             source=SOURCE,
         ))
 
+    return jobs
+
+
+@request(
+    output=None,
+    raise_exception=False,
+    close_on_crash=True,
+    max_retry=3,
+)
+def _fetch_jobstreet(req: Request, data: dict):
+    """Fetch and parse JobStreet PH search results."""
+    keyword = data["keyword"]
+    location = data["location"]
+
+    url = build_search_url(keyword, location)
+
+    try:
+        response = req.get(url, timeout=15)
+        response.raise_for_status()
+    except Exception as exc:
+        logger.warning(f"[JobStreet] Request failed: {exc}")
+        return make_empty_result(keyword, location, SOURCE, str(exc))
+
+    jobs = parse_search_results(response.text, keyword, location)
     return make_success_result(keyword, location, SOURCE, jobs)
 
 
@@ -18,31 +18,19 @@ SOURCE = "JORA"
 BASE_URL = "https://ph.jora.com"
 
 
-@request(
-    output=None,
-    raise_exception=False,
-    close_on_crash=True,
-    max_retry=3,
-)
-def _fetch_jora(req: Request, data: dict):
-    """Fetch and parse Jora PH search results."""
-    keyword = data["keyword"]
-    location = data["location"]
-
+def build_search_url(keyword: str, location: str, page: int = 1) -> str:
+    """Return the Jora PH search URL for one results page."""
     url = (
         f"{BASE_URL}/j"
         f"?q={quote_plus(keyword)}"
         f"&l={quote_plus(location)}"
     )
+    return f"{url}&p={page}" if page > 1 else url
 
-    try:
-        response = req.get(url, timeout=15)
-        response.raise_for_status()
-    except Exception as exc:
-        logger.warning(f"[Jora] Request failed: {exc}")
-        return make_empty_result(keyword, location, SOURCE, str(exc))
 
-    soup = soupify(response)
+def parse_search_results(body: str, keyword: str, location: str) -> list:
+    """Parse a Jora PH search results page into job dicts."""
+    soup = soupify(body)
     jobs = []
 
     # Jora job cards
@@ -76,6 +64,30 @@ def _fetch_jora(req: Request, data: dict):
             source=SOURCE,
         ))
 
+    return jobs
+
+
+@request(
+    output=None,
+    raise_exception=False,
+    close_on_crash=True,
+    max_retry=3,
+)
+def _fetch_jora(req: Request, data: dict):
+    """Fetch and parse Jora PH search results."""
+    keyword = data["keyword"]
+    location = data["location"]
+
+    url = build_search_url(keyword, location)
+
+    try:
+        response = req.get(url, timeout=15)
+        response.raise_for_status()
+    except Exception as exc:
+        logger.warning(f"[Jora] Request failed: {exc}")
+        return make_empty_result(keyword, location, SOURCE, str(exc))
+
+    jobs = parse_search_results(response.text, keyword, location)
     return make_success_result(keyword, location, SOURCE, jobs)
 
 
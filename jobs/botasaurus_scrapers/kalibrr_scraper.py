@@ -3,6 +3,7 @@ Kalibrr Philippines scraper using botasaurus.
 Kalibrr exposes a public JSON API for job search.
 API: https://www.kalibrr.com/api/job_board/search?keyword={keyword}&location={location}
 """
+import json
 import logging
 from typing import Dict
 from urllib.parse import quote_plus
@@ -17,32 +18,22 @@ SOURCE = "KALIBRR"
 BASE_URL = "https://www.kalibrr.com"
 
 
-@request(
-    output=None,
-    raise_exception=False,
-    close_on_crash=True,
-    max_retry=3,
-)
-def _fetch_kalibrr(req: Request, data: dict):
-    """Fetch and parse Kalibrr job search via their JSON API."""
-    keyword = data["keyword"]
-    location = data["location"]
+PAGE_SIZE = 20
 
-    api_url = (
+
+def build_search_url(keyword: str, location: str, page: int = 1) -> str:
+    """Return the Kalibrr job board API URL for one results page."""
+    return (
         f"{BASE_URL}/api/job_board/search"
         f"?keyword={quote_plus(keyword)}"
         f"&location={quote_plus(location)}"
-        "&limit=20&offset=0"
+        f"&limit={PAGE_SIZE}&offset={(page - 1) * PAGE_SIZE}"
     )
 
-    try:
-        response = req.get(api_url, timeout=15)
-        response.raise_for_status()
-        payload = response.json()
-    except Exception as exc:
-        logger.warning(f"[Kalibrr] Request failed: {exc}")
-        return make_empty_result(keyword, location, SOURCE, str(exc))
 
+def parse_search_results(body: str, keyword: str, location: str) -> list:
+    """Parse a Kalibrr job board API response into job dicts."""
+    payload = json.loads(body)
     jobs = []
     job_list = payload.get("jobs") or payload.get("data") or []
 
@@ -72,6 +63,30 @@ def _fetch_kalibrr(req: Request, data: dict):
             source=SOURCE,
         ))
 
+    return jobs
+
+
+@request(
+    output=None,
+    raise_exception=False,
+    close_on_crash=True,
+    max_retry=3,
+)
+def _fetch_kalibrr(req: Request, data: dict):
+    """Fetch and parse Kalibrr job search via their JSON API."""
+    keyword = data["keyword"]
+    location = data["location"]
+
+    api_url = build_search_url(keyword, location)
+
+    try:
+        response = req.get(api_url, timeout=15)
+        response.raise_for_status()
+        jobs = parse_search_results(response.text, keyword, location)
+    except Exception as exc:
+        logger.warning(f"[Kalibrr] Request failed: {exc}")
+        return make_empty_result(keyword, location, SOURCE, str(exc))
+
     return make_success_result(keyword, location, SOURCE, jobs)
 
 
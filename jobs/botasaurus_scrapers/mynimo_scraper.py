@@ -18,31 +18,19 @@ SOURCE = "MYNIMO"
 BASE_URL = "https://www.mynimo.com"
 
 
-@request(
-    output=None,
-    raise_exception=False,
-    close_on_crash=True,
-    max_retry=3,
-)
-def _fetch_mynimo(req: Request, data: dict):
-    """Fetch and parse Mynimo search results."""
-    keyword = data["keyword"]
-    location = data["location"]
-
+def build_search_url(keyword: str, location: str, page: int = 1) -> str:
+    """Return the Mynimo search URL for one results page."""
     url = (
         f"{BASE_URL}/search"
         f"?q={quote_plus(keyword)}"
         f"&location={quote_plus(location)}"
     )
+    return f"{url}&page={page}" if page > 1 else url
 
-    try:
-        response = req.get(url, timeout=15)
-        response.raise_for_status()
-    except Exception as exc:
-        logger.warning(f"[Mynimo] Request failed: {exc}")
-        return make_empty_result(keyword, location, SOURCE, str(exc))
 
-    soup = soupify(response)
+def parse_search_results(body: str, keyword: str, location: str) -> list:
+    """Parse a Mynimo search results page into job dicts."""
+    soup = soupify(body)
     jobs = []
 
     # Mynimo job listing cards
@@ -79,6 +67,30 @@ def _fetch_mynimo(req: Request, data: dict):
             source=SOURCE,
         ))
 
+    return jobs
+
+
+@request(
+    output=None,
+    raise_exception=False,
+    close_on_crash=True,
+    max_retry=3,
+)
+def _fetch_mynimo(req: Request, data: dict):
+    """Fetch and parse Mynimo search results."""
+    keyword = data["keyword"]
+    location = data["location"]
+
+    url = build_search_url(keyword, location)
+
+    try:
+        response = req.get(url, timeout=15)
+        response.raise_for_status()
+    except Exception as exc:
+        logger.warning(f"[Mynimo] Request failed: {exc}")
+        return make_empty_result(keyword, location, SOURCE, str(exc))
+
+    jobs = parse_search_results(response.text, keyword, location)
     return make_success_result(keyword, location, SOURCE, jobs)
 
 
@@ -18,31 +18,19 @@ SOURCE = "ONLINEJOBS"
 BASE_URL = "https://www.onlinejobs.ph"
 
 
-@request(
-    output=None,
-    raise_exception=False,
-    close_on_crash=True,
-    max_retry=3,
-)
-def _fetch_onlinejobs(req: Request, data: dict):
-    """Fetch and parse OnlineJobs.ph search results."""
-    keyword = data["keyword"]
-    location = data["location"]
-
+def build_search_url(keyword: str, location: str, page: int = 1) -> str:
+    """Return the OnlineJobs.ph search URL for one results page."""
     url = (
         f"{BASE_URL}/jobseekers/jobsearch"
         f"?jobkeyword={quote_plus(keyword)}"
         "&jobregion=0"  # all regions
     )
+    return f"{url}&page={page}" if page > 1 else url
 
-    try:
-        response = req.get(url, timeout=15)
-        response.raise_for_status()
-    except Exception as exc:
-        logger.warning(f"[OnlineJobs] Request failed: {exc}")
-        return make_empty_result(keyword, location, SOURCE, str(exc))
 
-    soup = soupify(response)
+def parse_search_results(body: str, keyword: str, location: str) -> list:
+    """Parse a OnlineJobs.ph search results page into job dicts."""
+    soup = soupify(body)
     jobs = []
 
     # OnlineJobs.ph job cards
@@ -77,6 +65,30 @@ def _fetch_onlinejobs(req: Request, data: dict):
             source=SOURCE,
         ))
 
+    return jobs
+
+
+@request(
+    output=None,
+    raise_exception=False,
+    close_on_crash=True,
+    max_retry=3,
+)
+def _fetch_onlinejobs(req: Request, data: dict):
+    """Fetch and parse OnlineJobs.ph search results."""
+    keyword = data["keyword"]
+    location = data["location"]
+
+    url = build_search_url(keyword, location)
+
+    try:
+        response = req.get(url, timeout=15)
+        response.raise_for_status()
+    except Exception as exc:
+        logger.warning(f"[OnlineJobs] Request failed: {exc}")
+        return make_empty_result(keyword, location, SOURCE, str(exc))
+
+    jobs = parse_search_results(response.text, keyword, location)
     return make_success_result(keyword, location, SOURCE, jobs)
 
 
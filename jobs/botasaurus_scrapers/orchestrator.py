@@ -20,9 +20,11 @@ Each result dict has the shape:
     }
 """
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 
+from django.conf import settings
+
+from .async_engine import FetchCache, scrape_sites
 from .bossjob_scraper import scrape_bossjob
 from .jobstreet_scraper import scrape_jobstreet
 from .indeed_scraper import scrape_indeed
@@ -88,45 +90,50 @@ def scrape_all_sites(
     location: str,
     sources: Optional[List[str]] = None,
     max_workers: int = 4,
+    pages: Optional[int] = None,
+    deadline_seconds: Optional[float] = None,
+    on_result: Optional[Callable[[Dict], None]] = None,
+    fetch_cache: Optional[FetchCache] = None,
 ) -> List[Dict]:
     """
-    Run scrapers for all (or selected) sites in parallel.
+    Run scrapers for all (or selected) sites concurrently.
+
+    HTTP-based sites share the asyncio fetch layer in ``async_engine``
+    (one connection pool, per-host rate limits); browser-based sites run in
+    a thread pool. Every site is bounded by the same deadline.
 
     Args:
-        keyword:     Job search keyword.
-        location:    Location string (city, region, or "Philippines").
-        sources:     Optional list of source keys to limit scraping.
-                     Defaults to all 10 sites.
-        max_workers: Thread pool size. Keep ≤ 4 to be respectful.
+        keyword:          Job search keyword.
+        location:         Location string (city, region, or "Philippines").
+        sources:          Optional list of source keys to limit scraping.
+                          Defaults to all 10 sites.
+        max_workers:      Thread pool size for browser-based scrapers.
+        pages:            Search result pages per site
+                          (default: ``SCRAPER_PAGES_PER_SITE``).
+        deadline_seconds: Wall-clock budget for the whole run
+                          (default: ``SCRAPER_DEADLINE_SECONDS``).
+        on_result:        Optional callback receiving each site's result
+                          dict as soon as that site finishes.
+        fetch_cache:      Optional ``FetchCache`` (see ``jobs.fetch_cache``)
+                          to return only new or changed jobs.
 
     Returns:
         List of result dicts, one per site attempted.
     """
     target_sources = sources or list(SCRAPERS.keys())
-    results = []
-
-    with ThreadPoolExecutor(max_workers=max_workers) as pool:
-        future_to_source = {
-            pool.submit(scrape_site, src, keyword, location): src
-            for src in target_sources
-        }
-        for future in as_completed(future_to_source):
-            src = future_to_source[future]
-            try:
-                result = future.result()
-            except Exception as exc:
-                logger.error(f"[Orchestrator] Future for {src} raised: {exc}", exc_info=True)
-                result = {
-                    "success": False,
-                    "jobs": [],
-                    "total_found": 0,
-                    "keyword": keyword,
-                    "location": location,
-                    "source": src,
-                    "error": str(exc),
-                    "message": str(exc),
-                }
-            results.append(result)
+    if pages is None:
+        pages = getattr(settings, "SCRAPER_PAGES_PER_SITE", 1)
+
+    results = scrape_sites(
+        keyword,
+        location,
+        target_sources,
+        pages=max(1, pages),
+        deadline_seconds=deadline_seconds,
+        max_workers=max_workers,
+        on_result=on_result,
+        cache=fetch_cache,
+    )
 
     # Sort by source key for deterministic ordering
     results.sort(key=lambda r: r.get("source", ""))
@@ -25,15 +25,9 @@ SOURCE = "PHILJOBNET"
 BASE_URL = "https://philjobnet.gov.ph"
 
 
-def _fetch_job_details(req: Request, detail_url: str, fallback_location: str) -> dict:
-    """Fetch structured details from a PhilJobNet job detail page."""
-    try:
-        detail_resp = req.get(detail_url, timeout=12)
-        detail_resp.raise_for_status()
-    except Exception:
-        return {}
-
-    detail_soup = soupify(detail_resp)
+def parse_job_details(body: str, fallback_location: str) -> dict:
+    """Parse structured details from a PhilJobNet job detail page."""
+    detail_soup = soupify(body)
     title = ""
     title_el = detail_soup.select_one("h1.jobtitle")
     if title_el:
@@ -84,26 +78,47 @@ def _fetch_job_details(req: Request, detail_url: str, fallback_location: str) ->
     }
 
 
-@request(
-    output=None,
-    raise_exception=False,
-    close_on_crash=True,
-    max_retry=3,
-)
-def _fetch_philjobnet(req: Request, data: dict):
-    """Fetch and parse PhilJobNet job search results."""
-    keyword = data["keyword"]
-    location = data["location"]  # currently not directly supported by public filter
-    url = f"{BASE_URL}/job-vacancies/?s={quote_plus(keyword)}"
+def apply_job_detail(job: dict, body: str, location: str) -> dict:
+    """Rebuild a search-card job dict with the fields from its detail page."""
+    return _merge_job_details(job, parse_job_details(body, fallback_location=location), location)
+
 
+def _merge_job_details(job: dict, details: dict, location: str) -> dict:
+    return build_job_dict(
+        title=details.get("title") or job["title"],
+        company=details.get("company") or "",
+        location=details.get("location") or location,
+        description=details.get("description") or "",
+        salary=details.get("salary") or "",
+        url=job["url"],
+        source=SOURCE,
+    )
+
+
+def _fetch_job_details(req: Request, detail_url: str, fallback_location: str) -> dict:
+    """Fetch structured details from a PhilJobNet job detail page."""
     try:
-        response = req.get(url, timeout=15)
-        response.raise_for_status()
-    except Exception as exc:
-        logger.warning(f"[PhilJobNet] Request failed: {exc}")
-        return make_empty_result(keyword, location, SOURCE, str(exc))
+        detail_resp = req.get(detail_url, timeout=12)
+        detail_resp.raise_for_status()
+    except Exception:
+        return {}
+
+    return parse_job_details(detail_resp.text, fallback_location)
+
+
+def build_search_url(keyword: str, location: str, page: int = 1) -> str:
+    """Return the PhilJobNet search URL for one results page."""
+    # Location is currently not directly supported by the public filter.
+    url = f"{BASE_URL}/job-vacancies/?s={quote_plus(keyword)}"
+    return f"{BASE_URL}/job-vacancies/page/{page}/?s={quote_plus(keyword)}" if page > 1 else url
+
 
-    soup = soupify(response)
+def parse_search_results(body: str, keyword: str, location: str) -> list:
+    """
+    Parse a PhilJobNet search page into job dicts built from the search
+    cards alone; ``apply_job_detail`` fills in the detail page fields.
+    """
+    soup = soupify(body)
     jobs = []
 
     links = soup.select("a[href*='/job-vacancies/job/']")
@@ -114,8 +129,6 @@ def _fetch_philjobnet(req: Request, data: dict):
         if href.startswith("/"):
             href = BASE_URL + href
 
-        details = _fetch_job_details(req, href, fallback_location=location)
-
         # Fallback from search card only if detail parsing misses title.
         raw = " ".join(a.get_text(" ", strip=True).split())
         if not raw:
@@ -125,22 +138,40 @@ def _fetch_philjobnet(req: Request, data: dict):
         fallback_title = re.split(r"\s+salary\s+", fallback_title, maxsplit=1, flags=re.IGNORECASE)[0].strip()
         fallback_title = fallback_title[:140].strip()
 
-        title = details.get("title") or fallback_title
-        company = details.get("company") or ""
-        loc = details.get("location") or location
-        salary = details.get("salary") or ""
-        description = details.get("description") or ""
-
         jobs.append(build_job_dict(
-            title=title,
-            company=company,
-            location=loc,
-            description=description,
-            salary=salary,
+            title=fallback_title,
+            company="",
+            location=location,
             url=href,
             source=SOURCE,
         ))
 
+    return jobs
+
+
+@request(
+    output=None,
+    raise_exception=False,
+    close_on_crash=True,
+    max_retry=3,
+)
+def _fetch_philjobnet(req: Request, data: dict):
+    """Fetch and parse PhilJobNet job search results."""
+    keyword = data["keyword"]
+    location = data["location"]
+    url = build_search_url(keyword, location)
+
+    try:
+        response = req.get(url, timeout=15)
+        response.raise_for_status()
+    except Exception as exc:
+        logger.warning(f"[PhilJobNet] Request failed: {exc}")
+        return make_empty_result(keyword, location, SOURCE, str(exc))
+
+    jobs = [
+        _merge_job_details(job, _fetch_job_details(req, job["url"], fallback_location=location), location)
+        for job in parse_search_results(response.text, keyword, location)
+    ]
     return make_success_result(keyword, location, SOURCE, jobs)
 
 
@@ -0,0 +1,80 @@
+"""
+Per-host request rate limiting shared by the job scrapers.
+
+``get_shared_rate_limiter()`` returns one process-wide limiter, so the async
+engine and the legacy ``BossJobScraper`` draw from the same per-host budget
+no matter how many scrape runs are in flight.
+"""
+import threading
+import time
+from typing import Dict, Optional
+
+from django.conf import settings
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket that hands out reservations instead of blocking.
+
+    ``reserve()`` returns how long the caller must wait before its request
+    may start; async callers ``await asyncio.sleep`` and sync callers
+    ``time.sleep`` on it. No event-loop primitives are held, so one bucket
+    can be shared across threads and across ``asyncio.run`` calls.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait: Optional[float] = None) -> Optional[float]:
+        """
+        Take one token and return the delay in seconds before it is usable.
+        Returns None, without taking a token, if the delay exceeds ``max_wait``.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            delay = 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+            if max_wait is not None and delay > max_wait:
+                return None
+            self._tokens -= 1
+            return delay
+
+
+class HostRateLimiter:
+    """One ``TokenBucket`` per host, created on first use."""
+
+    def __init__(self, rate: float, burst: float = 1.0):
+        self.rate = rate
+        self.burst = burst
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, host: str) -> TokenBucket:
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self.rate, self.burst)
+            return self._buckets[host]
+
+    def reserve(self, host: str, max_wait: Optional[float] = None) -> Optional[float]:
+        return self.bucket(host).reserve(max_wait)
+
+
+_shared_limiter: Optional[HostRateLimiter] = None
+_shared_limiter_lock = threading.Lock()
+
+
+def get_shared_rate_limiter() -> HostRateLimiter:
+    """Process-wide limiter so concurrent scrape runs share per-host budgets."""
+    global _shared_limiter
+    with _shared_limiter_lock:
+        if _shared_limiter is None:
+            _shared_limiter = HostRateLimiter(
+                rate=getattr(settings, "SCRAPER_HOST_RATE", 0.5),
+                burst=getattr(settings, "SCRAPER_HOST_BURST", 2),
+            )
+        return _shared_limiter
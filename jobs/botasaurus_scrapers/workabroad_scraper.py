@@ -18,17 +18,8 @@ SOURCE = "WORKABROAD"
 BASE_URL = "https://www.workabroad.ph"
 
 
-@request(
-    output=None,
-    raise_exception=False,
-    close_on_crash=True,
-    max_retry=3,
-)
-def _fetch_workabroad(req: Request, data: dict):
-    """Fetch and parse WorkAbroad.ph search results."""
-    keyword = data["keyword"]
-    location = data["location"]
-
+def build_search_url(keyword: str, location: str, page: int = 1) -> str:
+    """Return the WorkAbroad.ph search URL for one results page."""
     # Legacy /search-jobs.php now returns 404.
     # Keep keyword in query string and use current public listing route.
     url = (
@@ -36,15 +27,12 @@ def _fetch_workabroad(req: Request, data: dict):
         f"?q={quote_plus(keyword)}"
         f"&country={quote_plus(location)}"
     )
+    return f"{url}&page={page}" if page > 1 else url
 
-    try:
-        response = req.get(url, timeout=15)
-        response.raise_for_status()
-    except Exception as exc:
-        logger.warning(f"[WorkAbroad] Request failed: {exc}")
-        return make_empty_result(keyword, location, SOURCE, str(exc))
 
-    soup = soupify(response)
+def parse_search_results(body: str, keyword: str, location: str) -> list:
+    """Parse a WorkAbroad.ph search results page into job dicts."""
+    soup = soupify(body)
     jobs = []
 
     # WorkAbroad job listing rows/cards
@@ -78,6 +66,30 @@ def _fetch_workabroad(req: Request, data: dict):
             source=SOURCE,
         ))
 
+    return jobs
+
+
+@request(
+    output=None,
+    raise_exception=False,
+    close_on_crash=True,
+    max_retry=3,
+)
+def _fetch_workabroad(req: Request, data: dict):
+    """Fetch and parse WorkAbroad.ph search results."""
+    keyword = data["keyword"]
+    location = data["location"]
+
+    url = build_search_url(keyword, location)
+
+    try:
+        response = req.get(url, timeout=15)
+        response.raise_for_status()
+    except Exception as exc:
+        logger.warning(f"[WorkAbroad] Request failed: {exc}")
+        return make_empty_result(keyword, location, SOURCE, str(exc))
+
+    jobs = parse_search_results(response.text, keyword, location)
     return make_success_result(keyword, location, SOURCE, jobs)
 
 
@@ -0,0 +1,113 @@
+"""
+Persistence for incremental scrapes.
+
+``load_fetch_cache`` builds the ``FetchCache`` the async engine needs: the
+validators from the previous fetch of each search URL, and the signatures
+of the cards already stored in active ScrapedJob records for the search.
+``save_fetch_cache`` writes back what the run learned.
+
+Both are kept per user: a card or page is only "known" to the user whose
+ScrapedJob records hold it.
+"""
+import hashlib
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from .botasaurus_scrapers.async_engine import SITE_SPECS, FetchCache
+from .botasaurus_scrapers.base import job_signature
+from .models import FetchCacheEntry, ScrapedJob
+
+
+def url_hash(url: str, scraped_by_id: Optional[int] = None) -> str:
+    key = url if scraped_by_id is None else f"{scraped_by_id}\x1f{url}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def search_urls(keyword: str, location: str, sources: Iterable[str], pages: int) -> List[str]:
+    """Search page URLs the engine will request for these sources."""
+    return [
+        SITE_SPECS[source].build_search_url(keyword, location, page)
+        for source in sources
+        if source in SITE_SPECS
+        for page in range(1, pages + 1)
+    ]
+
+
+def known_signatures(
+    keyword: str, location: str, sources: Iterable[str], scraped_by_id: Optional[int] = None,
+) -> Dict[str, Set[str]]:
+    """Card signatures in the user's active ScrapedJob records for this search, by source."""
+    signatures = defaultdict(set)
+    records = ScrapedJob.objects.filter(
+        search_keyword=keyword,
+        search_location=location,
+        source__in=list(sources),
+        scraped_by_id=scraped_by_id,
+        is_active=True,
+    ).values_list("source", "scraped_data")
+    for source, scraped_data in records:
+        jobs = scraped_data.get("jobs", []) if isinstance(scraped_data, dict) else []
+        # Records saved before signatures were stored are signed from the saved dict.
+        signatures[source].update(job.get("signature") or job_signature(job) for job in jobs)
+    return dict(signatures)
+
+
+def load_fetch_cache(
+    keyword: str, location: str, sources: Iterable[str], pages: int = None, scraped_by_id: Optional[int] = None,
+) -> FetchCache:
+    """Build ``scraped_by_id``'s incremental state for one scrape of ``sources``."""
+    sources = list(sources)
+    if pages is None:
+        pages = getattr(settings, "SCRAPER_PAGES_PER_SITE", 1)
+    urls = search_urls(keyword, location, sources, max(1, pages))
+
+    entries = FetchCacheEntry.objects.filter(url_hash__in=[url_hash(url, scraped_by_id) for url in urls])
+    validators = {
+        entry.url: {
+            "etag": entry.etag,
+            "last_modified": entry.last_modified,
+            "content_hash": entry.content_hash,
+        }
+        for entry in entries
+    }
+    return FetchCache(
+        validators=validators,
+        known_signatures=known_signatures(keyword, location, sources, scraped_by_id),
+    )
+
+
+def save_fetch_cache(cache: FetchCache, scraped_by_id: Optional[int] = None) -> int:
+    """Upsert the validators ``scraped_by_id``'s run recorded. Returns the number of URLs saved."""
+    now = timezone.now()
+    changed, unchanged = [], []
+    for url, update in cache.updates.items():
+        entry = FetchCacheEntry(
+            url=url,
+            url_hash=url_hash(url, scraped_by_id),
+            etag=(update.get("etag") or "")[:255],
+            last_modified=(update.get("last_modified") or "")[:64],
+            content_hash=update.get("content_hash") or "",
+            fetched_at=now,
+            checked_at=now,
+        )
+        (changed if update.get("changed") else unchanged).append(entry)
+
+    # MySQL upserts on any unique key and rejects an explicit target
+    common = {
+        "update_conflicts": True,
+        "unique_fields": ["url_hash"] if connection.features.supports_update_conflicts_with_target else None,
+    }
+    if changed:
+        FetchCacheEntry.objects.bulk_create(
+            changed, update_fields=["etag", "last_modified", "content_hash", "fetched_at", "checked_at"], **common,
+        )
+    if unchanged:
+        # ``fetched_at`` keeps the time the body last changed.
+        FetchCacheEntry.objects.bulk_create(
+            unchanged, update_fields=["etag", "last_modified", "content_hash", "checked_at"], **common,
+        )
+    return len(changed) + len(unchanged)
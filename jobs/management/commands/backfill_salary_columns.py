@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+
+from jobs.models import JobPosting
+from jobs.salary import parse_salary_bounds
+
+
+class Command(BaseCommand):
+    help = "Fill JobPosting.salary_min_php/salary_max_php from salary_range."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Re-parse every posting, not only those with empty salary columns.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Rows written per bulk_update (default: 500).",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(1, int(options["batch_size"]))
+        postings = JobPosting.objects.exclude(salary_range__isnull=True).exclude(salary_range="")
+        if not options["all"]:
+            postings = postings.filter(salary_min_php__isnull=True, salary_max_php__isnull=True)
+
+        scanned = 0
+        updated = 0
+        batch = []
+        for posting in postings.only("id", "salary_range", "salary_min_php", "salary_max_php").iterator(chunk_size=batch_size):
+            scanned += 1
+            bounds = parse_salary_bounds(posting.salary_range)
+            if bounds == (posting.salary_min_php, posting.salary_max_php):
+                continue
+            posting.salary_min_php, posting.salary_max_php = bounds
+            batch.append(posting)
+            if len(batch) >= batch_size:
+                JobPosting.objects.bulk_update(batch, ["salary_min_php", "salary_max_php"])
+                updated += len(batch)
+                batch = []
+
+        if batch:
+            JobPosting.objects.bulk_update(batch, ["salary_min_php", "salary_max_php"])
+            updated += len(batch)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Scanned {scanned} posting(s); updated salary columns on {updated}.")
+        )
@@ -0,0 +1,99 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from jobs.ai_global_sort import mark_scores_pending, save_ai_score_result, save_ai_score_results
+from jobs.models import JobPosting, UserJobAIScore
+
+User = get_user_model()
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare query counts of the per-row and bulk UserJobAIScore writers. "
+        "All benchmark data is created inside a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--jobs",
+            type=int,
+            default=100,
+            help="Number of job postings to score (default: 100).",
+        )
+
+    def handle(self, *args, **options):
+        job_count = max(1, int(options["jobs"]))
+        try:
+            with transaction.atomic():
+                self._run(job_count)
+                raise _Rollback()
+        except _Rollback:
+            pass
+
+    def _run(self, job_count):
+        user = User.objects.create_user(
+            username="ai_score_benchmark_user",
+            email="ai_score_benchmark_user@example.com",
+        )
+        JobPosting.objects.bulk_create([
+            JobPosting(
+                job_title=f"Benchmark Role {i}",
+                slug=f"ai-score-benchmark-role-{i}",
+                company_name="Benchmark Co",
+                location="Dumaguete",
+                job_description="Benchmark posting",
+            )
+            for i in range(job_count)
+        ])
+        jobs = list(JobPosting.objects.filter(slug__startswith="ai-score-benchmark-role-"))
+        jobs_by_id = {job.id: job for job in jobs}
+        results = {
+            job.id: {"score": 70, "reason": "Benchmark", "strengths": [], "gaps": []}
+            for job in jobs
+        }
+
+        def count(fn):
+            with CaptureQueriesContext(connection) as ctx:
+                fn()
+            return len(ctx.captured_queries)
+
+        def legacy_pending():
+            now = timezone.now()
+            for job in jobs:
+                UserJobAIScore.objects.update_or_create(
+                    user=user,
+                    job_id=job.id,
+                    defaults={
+                        "status": UserJobAIScore.Status.PENDING,
+                        "profile_version": 1,
+                        "error_message": "",
+                        "computed_at": now,
+                    },
+                )
+
+        def legacy_results():
+            for job in jobs:
+                save_ai_score_result(user=user, job=job, profile_version=1, score_data=results[job.id])
+
+        rows = [
+            ("per-row pending", count(legacy_pending)),
+            ("per-row results", count(legacy_results)),
+        ]
+        UserJobAIScore.objects.filter(user=user).delete()
+        rows += [
+            ("bulk pending (insert)", count(lambda: mark_scores_pending(user, list(jobs_by_id), 1))),
+            ("bulk results (update)", count(lambda: save_ai_score_results(
+                user=user, jobs_by_id=jobs_by_id, profile_version=1, results=results,
+            ))),
+        ]
+
+        self.stdout.write(f"Queries per {job_count} jobs ({connection.vendor}):")
+        for label, queries in rows:
+            self.stdout.write(f"  {label:<24} {queries}")
@@ -0,0 +1,131 @@
+import re
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils.text import slugify
+
+from jobs.admin_scraper_utils import publish_scraped_jobs, scraped_job_dict_to_posting
+from jobs.models import JobPosting, ScrapedJob
+
+User = get_user_model()
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare query counts and timings of per-job and batched scraped job publishing. "
+        "All benchmark data is created inside a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--jobs",
+            type=int,
+            default=500,
+            help="Number of scraped jobs to publish (default: 500).",
+        )
+        parser.add_argument(
+            "--duplicates",
+            type=int,
+            default=20,
+            help="Percentage of scraped jobs that already exist as postings (default: 20).",
+        )
+
+    def handle(self, *args, **options):
+        job_count = max(1, int(options["jobs"]))
+        duplicate_pct = min(100, max(0, int(options["duplicates"])))
+        try:
+            with transaction.atomic():
+                self._run(job_count, duplicate_pct)
+                raise _Rollback()
+        except _Rollback:
+            pass
+
+    def _scraped_job(self, job_count, user):
+        return ScrapedJob.objects.create(
+            source="JOBSTREET",
+            search_keyword="benchmark",
+            search_location="Dumaguete",
+            scraped_by=user,
+            total_found=job_count,
+            scraped_data={"jobs": [
+                {
+                    "title": f"Benchmark Role {i}",
+                    "company": "Benchmark Co",
+                    "location": "Dumaguete",
+                    "description": "Benchmark posting",
+                    "url": f"https://example.com/jobs/{i}",
+                }
+                for i in range(job_count)
+            ]},
+        )
+
+    def _run(self, job_count, duplicate_pct):
+        user = User.objects.create_user(
+            username="scraped_publish_benchmark_user",
+            email="scraped_publish_benchmark_user@example.com",
+        )
+        scraped_job = self._scraped_job(job_count, user)
+        existing = job_count * duplicate_pct // 100
+
+        def seed():
+            JobPosting.objects.filter(company_name="Benchmark Co").delete()
+            JobPosting.objects.bulk_create([
+                JobPosting(
+                    job_title=f"Benchmark Role {i}",
+                    slug=f"benchmark-role-{i}-benchmark-co",
+                    company_name="Benchmark Co",
+                    location="Dumaguete",
+                    job_description="Benchmark posting",
+                    posted_by=user,
+                )
+                for i in range(existing)
+            ])
+
+        def measure(fn):
+            seed()
+            with CaptureQueriesContext(connection) as ctx:
+                started = time.perf_counter()
+                summary = fn()
+                elapsed = time.perf_counter() - started
+            return len(ctx.captured_queries), elapsed, summary
+
+        def legacy():
+            summary = {"published": 0, "skipped": 0, "errors": 0}
+            postings = []
+            for job_dict in scraped_job.jobs_data:
+                posting = scraped_job_dict_to_posting(job_dict, scraped_job.source, user)
+                if posting is None:
+                    summary["skipped"] += 1
+                else:
+                    postings.append(posting)
+            for posting in postings:
+                base_slug = slugify(f"{posting.job_title}-{posting.company_name}")
+                clean_slug = re.sub(r"-\d+$", "", base_slug)
+                posting.slug = base_slug
+                n = 0
+                while JobPosting.objects.filter(slug=posting.slug).exists():
+                    n += 1
+                    posting.slug = f"{clean_slug}-{n}"
+            summary["published"] = len(JobPosting.objects.bulk_create(postings, ignore_conflicts=True))
+            return summary
+
+        rows = [
+            ("per-job", measure(legacy)),
+            ("batched", measure(lambda: publish_scraped_jobs([scraped_job], user))),
+        ]
+
+        self.stdout.write(
+            f"Publishing {job_count} scraped jobs, {existing} already posted ({connection.vendor}):"
+        )
+        for label, (queries, elapsed, summary) in rows:
+            self.stdout.write(
+                f"  {label:<8} {queries:>6} queries {elapsed * 1000:>9.1f} ms  "
+                f"published={summary['published']} skipped={summary['skipped']}"
+            )
@@ -4,11 +4,14 @@ from django.conf import settings
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 
-from jobs.models import UserJobAIScore
+from jobs.models import AIMatchResult, UserJobAIScore
 
 
 class Command(BaseCommand):
-    help = "Delete stale UserJobAIScore rows older than a retention window."
+    help = (
+        "Delete stale UserJobAIScore rows and unused AIMatchResult rows "
+        "older than a retention window."
+    )
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -23,8 +26,10 @@ class Command(BaseCommand):
         cutoff = timezone.now() - timedelta(days=days)
 
         deleted_count, _ = UserJobAIScore.objects.filter(updated_at__lt=cutoff).delete()
+        results_deleted, _ = AIMatchResult.objects.filter(last_used_at__lt=cutoff).delete()
         self.stdout.write(
             self.style.SUCCESS(
-                f"Deleted {deleted_count} AI score rows older than {days} day(s)."
+                f"Deleted {deleted_count} AI score rows and {results_deleted} stored "
+                f"match results older than {days} day(s)."
             )
         )
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from jobs.models import JobPosting
+from jobs.search import create_search_index, get_job_search_backend
+
+
+class Command(BaseCommand):
+    help = (
+        "Create (if missing) and rebuild the full-text job search index. "
+        "On SQLite this also restores the FTS triggers after table rebuilds."
+    )
+
+    def handle(self, *args, **options):
+        with connection.schema_editor() as schema_editor:
+            create_search_index(schema_editor, JobPosting)
+
+        backend = get_job_search_backend()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Job search index ready on {connection.vendor}; using {backend.__class__.__name__}."
+            )
+        )
@@ -5,6 +5,7 @@ Usage:
     python manage.py scrape_ph_jobs --keyword "software engineer" --location "Manila"
     python manage.py scrape_ph_jobs --keyword "nurse" --location "Cebu" --sources JOBSTREET INDEED
     python manage.py scrape_ph_jobs --keyword "accountant" --location "Philippines" --save
+    python manage.py scrape_ph_jobs --keyword "accountant" --location "Philippines" --save --incremental
     python manage.py scrape_ph_jobs --list-sources
 """
 import json
@@ -58,7 +59,25 @@ class Command(BaseCommand):
             "--workers",
             type=int,
             default=4,
-            help="Number of parallel scraper threads (default: 4).",
+            help="Number of threads for browser-based scrapers (default: 4).",
+        )
+        parser.add_argument(
+            "--pages",
+            type=int,
+            default=None,
+            help="Search result pages per site (default: SCRAPER_PAGES_PER_SITE).",
+        )
+        parser.add_argument(
+            "--deadline",
+            type=float,
+            default=None,
+            help="Wall-clock budget in seconds for the whole run (default: SCRAPER_DEADLINE_SECONDS).",
+        )
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            default=False,
+            help="Request result pages conditionally and keep only jobs not already saved for this search.",
         )
         parser.add_argument(
             "--list-sources",
@@ -118,7 +137,30 @@ class Command(BaseCommand):
             )
         )
 
-        results = scrape_all_sites(keyword, location, sources=sources, max_workers=workers)
+        fetch_cache = None
+        if options["incremental"]:
+            from jobs.fetch_cache import load_fetch_cache
+
+            # Known cards and pages are those of the user the results are saved for
+            fetch_cache = load_fetch_cache(
+                keyword, location, sources or list(SCRAPERS), options["pages"],
+                scraped_by_id=user.pk if user else None,
+            )
+
+        results = scrape_all_sites(
+            keyword,
+            location,
+            sources=sources,
+            max_workers=workers,
+            pages=options["pages"],
+            deadline_seconds=options["deadline"],
+            fetch_cache=fetch_cache,
+        )
+
+        if fetch_cache is not None:
+            from jobs.fetch_cache import save_fetch_cache
+
+            save_fetch_cache(fetch_cache, user.pk if user else None)
 
         # ── Summary ──────────────────────────────────────────────────────────
         total_jobs = 0
@@ -129,8 +171,11 @@ class Command(BaseCommand):
             total_jobs += count
 
             if result.get("success"):
+                known = ""
+                if "known_jobs" in result:
+                    known = f" new ({result['known_jobs']} known, {result['unchanged_pages']} unchanged page(s))"
                 self.stdout.write(
-                    self.style.SUCCESS(f"  ✓ {display_name:<30} {count} job(s)")
+                    self.style.SUCCESS(f"  ✓ {display_name:<30} {count} job(s){known}")
                 )
             else:
                 err = result.get("error", "unknown error")
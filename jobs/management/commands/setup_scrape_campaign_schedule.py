@@ -0,0 +1,87 @@
+"""
+Management command to set up the Django-Q schedule that dispatches scrape campaigns.
+
+Campaigns themselves are managed in Django Admin > Jobs > Scrape campaigns;
+this schedule checks for due campaigns every few minutes.
+
+Usage:
+    python manage.py setup_scrape_campaign_schedule
+    python manage.py setup_scrape_campaign_schedule --minutes 10
+    python manage.py setup_scrape_campaign_schedule --remove
+    python manage.py setup_scrape_campaign_schedule --dispatch-now
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+SCHEDULE_NAME = 'Scrape Campaign Dispatcher'
+
+
+class Command(BaseCommand):
+    help = 'Set up the Django-Q scheduled task that starts due scrape campaigns'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--minutes',
+            type=int,
+            default=5,
+            help='How often to check for due campaigns, in minutes (default: 5)'
+        )
+        parser.add_argument(
+            '--remove',
+            action='store_true',
+            help='Remove the existing campaign dispatcher schedule'
+        )
+        parser.add_argument(
+            '--dispatch-now',
+            action='store_true',
+            help='Start due campaigns once, without touching the schedule'
+        )
+
+    def handle(self, *args, **options):
+        if options['dispatch_now']:
+            from jobs.scrape_campaigns import dispatch_due_campaigns
+
+            started = dispatch_due_campaigns()
+            self.stdout.write(self.style.SUCCESS(f'✓ Started {started} campaign run(s)'))
+            return
+
+        if options['minutes'] < 1:
+            raise CommandError('--minutes must be at least 1')
+
+        try:
+            from django_q.models import Schedule
+        except ImportError:
+            raise CommandError(
+                'Django-Q is not installed. Install it with: pip install django-q2'
+            )
+
+        deleted_count = Schedule.objects.filter(name=SCHEDULE_NAME).delete()[0]
+        if options['remove']:
+            if deleted_count:
+                self.stdout.write(self.style.SUCCESS(f'✓ Removed {deleted_count} campaign dispatcher schedule(s)'))
+            else:
+                self.stdout.write(self.style.WARNING('○ No campaign dispatcher schedule found'))
+            return
+
+        schedule = Schedule.objects.create(
+            func='jobs.scrape_campaigns.dispatch_due_campaigns',
+            name=SCHEDULE_NAME,
+            schedule_type=Schedule.MINUTES,
+            minutes=options['minutes'],
+            repeats=-1,  # Repeat indefinitely
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'✓ Created Django-Q scheduled task\n\n'
+                f'Schedule ID: {schedule.id}\n'
+                f'Function: {schedule.func}\n'
+                f'Runs every: {schedule.minutes} minute(s)\n'
+            )
+        )
+        self.stdout.write(
+            self.style.WARNING(
+                '\n⚠ Important: Django-Q cluster must be running for campaigns to execute.\n'
+                'Start it with: python manage.py qcluster'
+            )
+        )
@@ -0,0 +1,53 @@
+# Generated by Django 5.0.2 on 2026-10-17 00:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+import re
+
+
+def _normalize_skill_name(value):
+    return re.sub(r'\s+', ' ', (value or '').strip().lower())[:100]
+
+
+def build_job_skill_index(apps, schema_editor):
+    """Populate the skill index for postings that existed before the table."""
+    JobPosting = apps.get_model('jobs', 'JobPosting')
+    JobSkill = apps.get_model('jobs', 'JobSkill')
+
+    rows = []
+    postings = JobPosting.objects.exclude(skills_required='').values_list('id', 'skills_required')
+    for job_id, skills_required in postings.iterator():
+        seen = set()
+        for raw in (skills_required or '').split(','):
+            name = _normalize_skill_name(raw)
+            if name and name not in seen:
+                seen.add(name)
+                rows.append(JobSkill(job_id=job_id, name=name))
+
+    JobSkill.objects.bulk_create(rows, batch_size=1000, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0012_jobposting_updated_at_userjobaiscore'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text='Lowercased, whitespace-normalized skill name', max_length=100)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_index', to='jobs.jobposting')),
+            ],
+            options={
+                'verbose_name': 'Job Skill',
+                'verbose_name_plural': 'Job Skills',
+                'ordering': ['id'],
+                'unique_together': {('job', 'name')},
+                'indexes': [models.Index(fields=['name'], name='jobs_jobskill_name_idx')],
+            },
+        ),
+        migrations.RunPython(build_job_skill_index, reverse_code=migrations.RunPython.noop),
+    ]
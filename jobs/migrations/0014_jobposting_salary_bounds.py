@@ -0,0 +1,31 @@
+# Generated by Django 5.0.2 on 2026-10-17 14:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0013_jobskill'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobposting',
+            name='salary_max_php',
+            field=models.IntegerField(blank=True, editable=False, help_text='Parsed upper bound of salary_range in PHP', null=True),
+        ),
+        migrations.AddField(
+            model_name='jobposting',
+            name='salary_min_php',
+            field=models.IntegerField(blank=True, editable=False, help_text='Parsed lower bound of salary_range in PHP', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['salary_min_php'], name='jobs_jobpos_salary__728eb0_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['salary_max_php'], name='jobs_jobpos_salary__9b89bd_idx'),
+        ),
+    ]
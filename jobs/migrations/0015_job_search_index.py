@@ -0,0 +1,27 @@
+from django.db import migrations
+
+
+def create_index(apps, schema_editor):
+    from jobs.search import create_search_index
+    create_search_index(schema_editor, apps.get_model('jobs', 'JobPosting'))
+
+
+def drop_index(apps, schema_editor):
+    from jobs.search import drop_search_index
+    drop_search_index(schema_editor, apps.get_model('jobs', 'JobPosting'))
+
+
+class Migration(migrations.Migration):
+    """
+    Vendor-specific full-text index for job board search (see jobs/search.py).
+    Not represented in model state because each backend uses a different
+    index type.
+    """
+
+    dependencies = [
+        ('jobs', '0014_jobposting_salary_bounds'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, reverse_code=drop_index),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.0.2 on 2026-10-17 15:05
+
+from django.db import migrations, models
+
+RANK_KEY_SCALE = 10 ** 10
+
+
+def backfill_rank_key(apps, schema_editor):
+    UserJobAIScore = apps.get_model('jobs', 'UserJobAIScore')
+    rows = (
+        UserJobAIScore.objects
+        .filter(status='ready', score__isnull=False)
+        .select_related('job')
+        .only('id', 'score', 'job__posted_date')
+    )
+    batch = []
+    for row in rows.iterator(chunk_size=1000):
+        posted_ts = int(row.job.posted_date.timestamp()) if row.job.posted_date else 0
+        row.rank_key = int(row.score) * RANK_KEY_SCALE + max(0, posted_ts)
+        batch.append(row)
+        if len(batch) >= 1000:
+            UserJobAIScore.objects.bulk_update(batch, ['rank_key'])
+            batch = []
+    if batch:
+        UserJobAIScore.objects.bulk_update(batch, ['rank_key'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0015_job_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userjobaiscore',
+            name='rank_key',
+            field=models.BigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='userjobaiscore',
+            index=models.Index(fields=['user', '-rank_key'], name='jobs_ujas_user_rank_idx'),
+        ),
+        migrations.RunPython(backfill_rank_key, migrations.RunPython.noop),
+    ]
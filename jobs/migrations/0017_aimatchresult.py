@@ -0,0 +1,34 @@
+# Generated by Django 5.0.2 on 2026-10-17 15:11
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0016_userjobaiscore_rank_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AIMatchResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('profile_digest', models.CharField(max_length=64)),
+                ('job_digest', models.CharField(max_length=64)),
+                ('score', models.IntegerField(help_text='AI match score (0-100)')),
+                ('reason', models.TextField(blank=True)),
+                ('strengths_json', models.JSONField(blank=True, default=list)),
+                ('gaps_json', models.JSONField(blank=True, default=list)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_used_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'AI Match Result',
+                'verbose_name_plural': 'AI Match Results',
+                'indexes': [models.Index(fields=['last_used_at'], name='jobs_aimr_last_used_idx')],
+                'unique_together': {('profile_digest', 'job_digest')},
+            },
+        ),
+    ]
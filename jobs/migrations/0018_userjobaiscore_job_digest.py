@@ -0,0 +1,18 @@
+# Generated by Django 5.0.2 on 2026-10-17 15:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0017_aimatchresult'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userjobaiscore',
+            name='job_digest',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.0.2 on 2026-10-17 15:26
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0018_userjobaiscore_job_digest'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScrapeRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('search_keyword', models.CharField(max_length=200)),
+                ('search_location', models.CharField(max_length=200)),
+                ('sources', models.JSONField(default=list)),
+                ('progress', models.JSONField(blank=True, default=dict)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='queued', max_length=12)),
+                ('error_message', models.TextField(blank=True)),
+                ('task_id', models.CharField(blank=True, max_length=64)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('scraped_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='scrape_runs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='scrapedjob',
+            name='run',
+            field=models.ForeignKey(blank=True, help_text='Background scrape run that produced this record', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='scraped_jobs', to='jobs.scraperun'),
+        ),
+        migrations.AddIndex(
+            model_name='scraperun',
+            index=models.Index(fields=['scraped_by', 'status'], name='jobs_scraperun_user_stat_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.0.2 on 2026-10-17 15:36
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0019_scraperun'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scraperun',
+            name='incremental',
+            field=models.BooleanField(default=False, help_text='Only keep jobs that are new or changed since the last scrape of this search'),
+        ),
+        migrations.CreateModel(
+            name='FetchCacheEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.TextField()),
+                ('url_hash', models.CharField(help_text='SHA-256 of the URL', max_length=64, unique=True)),
+                ('etag', models.CharField(blank=True, max_length=255)),
+                ('last_modified', models.CharField(blank=True, max_length=64)),
+                ('content_hash', models.CharField(blank=True, max_length=64)),
+                ('fetched_at', models.DateTimeField(default=django.utils.timezone.now, help_text='Last time the page body changed')),
+                ('checked_at', models.DateTimeField(default=django.utils.timezone.now, help_text='Last time the page was requested')),
+            ],
+            options={
+                'verbose_name': 'Fetch Cache Entry',
+                'verbose_name_plural': 'Fetch Cache Entries',
+                'indexes': [models.Index(fields=['checked_at'], name='jobs_fetchcache_checked_idx')],
+            },
+        ),
+    ]
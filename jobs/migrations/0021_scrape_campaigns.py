@@ -0,0 +1,77 @@
+# Generated by Django 5.0.2 on 2026-10-17 15:40
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0020_fetch_cache'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SourceHealth',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(choices=[('BOSSJOB', 'BossJob.ph'), ('JOBSTREET', 'JobStreet Philippines'), ('LINKEDIN', 'LinkedIn'), ('INDEED', 'Indeed Philippines'), ('KALIBRR', 'Kalibrr'), ('PHILJOBNET', 'PhilJobNet (DOLE)'), ('ONLINEJOBS', 'OnlineJobs.ph'), ('JORA', 'Jora Philippines'), ('MYNIMO', 'Mynimo'), ('WORKABROAD', 'WorkAbroad.ph'), ('OTHER', 'Other')], max_length=20, unique=True)),
+                ('runs', models.PositiveIntegerField(default=0)),
+                ('failures', models.PositiveIntegerField(default=0)),
+                ('jobs_found', models.PositiveIntegerField(default=0)),
+                ('new_jobs', models.PositiveIntegerField(default=0, help_text='New jobs seen by incremental runs')),
+                ('avg_latency_seconds', models.FloatField(default=0.0)),
+                ('avg_new_jobs', models.FloatField(default=0.0)),
+                ('failure_rate', models.FloatField(default=0.0)),
+                ('consecutive_failures', models.PositiveIntegerField(default=0)),
+                ('last_success_at', models.DateTimeField(blank=True, null=True)),
+                ('last_new_job_at', models.DateTimeField(blank=True, null=True)),
+                ('last_failure_at', models.DateTimeField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True)),
+                ('retry_after', models.DateTimeField(blank=True, help_text='Campaigns skip the source until then', null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Source Health',
+                'verbose_name_plural': 'Source Health',
+                'ordering': ['source'],
+            },
+        ),
+        migrations.AddField(
+            model_name='scraperun',
+            name='published',
+            field=models.PositiveIntegerField(default=0, help_text='Job postings auto-published from this run'),
+        ),
+        migrations.CreateModel(
+            name='ScrapeCampaign',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('search_keyword', models.CharField(max_length=200)),
+                ('search_location', models.CharField(default='Philippines', max_length=200)),
+                ('sources', models.JSONField(blank=True, default=list, help_text='Source keys to scrape; empty means every site')),
+                ('interval_minutes', models.PositiveIntegerField(default=360, help_text='Minutes between runs')),
+                ('auto_publish', models.BooleanField(default=True, help_text='Publish new jobs to the job board after each run')),
+                ('is_active', models.BooleanField(default=True)),
+                ('next_run_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_run_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('created_by', models.ForeignKey(help_text='Runs and published postings are attributed to this user', on_delete=django.db.models.deletion.CASCADE, related_name='scrape_campaigns', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['next_run_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='scraperun',
+            name='campaign',
+            field=models.ForeignKey(blank=True, help_text='Scheduled campaign that started this run', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='runs', to='jobs.scrapecampaign'),
+        ),
+        migrations.AddIndex(
+            model_name='scrapecampaign',
+            index=models.Index(fields=['is_active', 'next_run_at'], name='jobs_campaign_due_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.0.2 on 2026-10-17 17:35
+
+from django.db import migrations, models
+
+
+def count_existing_samples(apps, schema_editor):
+    # Rows that already have averages must not treat their next sample as the first
+    SourceHealth = apps.get_model('jobs', 'SourceHealth')
+    SourceHealth.objects.update(timed_runs=models.F('runs'))
+    SourceHealth.objects.filter(new_jobs__gt=0).update(incremental_runs=models.F('runs') - models.F('failures'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0021_scrape_campaigns'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sourcehealth',
+            name='incremental_runs',
+            field=models.PositiveIntegerField(default=0, help_text='Successful incremental runs'),
+        ),
+        migrations.AddField(
+            model_name='sourcehealth',
+            name='timed_runs',
+            field=models.PositiveIntegerField(default=0, help_text='Runs that reported their latency'),
+        ),
+        migrations.RunPython(count_existing_samples, migrations.RunPython.noop),
+    ]
@@ -88,6 +88,8 @@ class JobPosting(models.Model):
     benefits = models.TextField(blank=True, help_text="List job benefits and perks")
     application_link = models.URLField(max_length=500, validators=[URLValidator()], blank=True, null=True)
     salary_range = models.CharField(max_length=100, blank=True, null=True)
+    salary_min_php = models.IntegerField(null=True, blank=True, editable=False, help_text="Parsed lower bound of salary_range in PHP")
+    salary_max_php = models.IntegerField(null=True, blank=True, editable=False, help_text="Parsed upper bound of salary_range in PHP")
     posted_date = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_featured = models.BooleanField(default=False)
@@ -119,6 +121,8 @@ class JobPosting(models.Model):
             models.Index(fields=['is_featured']),
             models.Index(fields=['source_type']),
             models.Index(fields=['source']),  # Add index for source
+            models.Index(fields=['salary_min_php']),
+            models.Index(fields=['salary_max_php']),
         ]
 
     def save(self, *args, **kwargs):
@@ -148,9 +152,16 @@ class JobPosting(models.Model):
         import hashlib
         content = f"{self.job_title}|{self.company_name}|{self.location}|{self.job_type}"
         self.hash_signature = hashlib.sha256(content.encode()).hexdigest()
+
+        self.set_salary_bounds()
             
         super().save(*args, **kwargs)
 
+    def set_salary_bounds(self):
+        """Fill the indexed salary columns from the free-text salary_range."""
+        from .salary import parse_salary_bounds
+        self.salary_min_php, self.salary_max_php = parse_salary_bounds(self.salary_range)
+
     def __str__(self):
         return f"{self.job_title} at {self.company_name}"
 
@@ -206,6 +217,14 @@ class ScrapedJob(models.Model):
     scraped_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='scraped_jobs')
     scraped_at = models.DateTimeField(auto_now_add=True)
     is_active = models.BooleanField(default=True)
+    run = models.ForeignKey(
+        'ScrapeRun',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='scraped_jobs',
+        help_text="Background scrape run that produced this record",
+    )
     
     class Meta:
         ordering = ['-scraped_at']
@@ -239,6 +258,188 @@ class ScrapedJob(models.Model):
         return None
 
 
+class ScrapeRun(models.Model):
+    """
+    A scrape submitted from the scraper dashboard and executed by a
+    django-q worker. ``progress`` holds one entry per source, updated as
+    each site finishes:
+
+        {"JORA": {"state": "done", "total_found": 12, "error": ""}, ...}
+    """
+
+    class Status(models.TextChoices):
+        QUEUED = 'queued', 'Queued'
+        RUNNING = 'running', 'Running'
+        COMPLETED = 'completed', 'Completed'
+        FAILED = 'failed', 'Failed'
+
+    SOURCE_PENDING = 'pending'
+    SOURCE_DONE = 'done'
+    SOURCE_FAILED = 'failed'
+
+    search_keyword = models.CharField(max_length=200)
+    search_location = models.CharField(max_length=200)
+    sources = models.JSONField(default=list)
+    progress = models.JSONField(default=dict, blank=True)
+
+    incremental = models.BooleanField(
+        default=False,
+        help_text="Only keep jobs that are new or changed since the last scrape of this search",
+    )
+    campaign = models.ForeignKey(
+        'ScrapeCampaign',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='runs',
+        help_text="Scheduled campaign that started this run",
+    )
+    published = models.PositiveIntegerField(default=0, help_text="Job postings auto-published from this run")
+
+    status = models.CharField(max_length=12, choices=Status.choices, default=Status.QUEUED)
+    error_message = models.TextField(blank=True)
+    task_id = models.CharField(max_length=64, blank=True)
+
+    scraped_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='scrape_runs')
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['scraped_by', 'status'], name='jobs_scraperun_user_stat_idx'),
+        ]
+
+    def __str__(self):
+        return f"Scrape run #{self.pk} for '{self.search_keyword}' in '{self.search_location}' ({self.status})"
+
+    @property
+    def is_finished(self):
+        return self.status in (self.Status.COMPLETED, self.Status.FAILED)
+
+    def source_progress(self):
+        """Per-source progress in submission order, with display names."""
+        names = dict(ScrapedJob.SOURCE_CHOICES)
+        rows = []
+        for source in self.sources:
+            entry = self.progress.get(source) or {}
+            rows.append({
+                'source': source,
+                'name': names.get(source, source),
+                'state': entry.get('state', self.SOURCE_PENDING),
+                'total_found': entry.get('total_found', 0),
+                'error': entry.get('error', ''),
+            })
+        return rows
+
+
+class FetchCacheEntry(models.Model):
+    """
+    HTTP validators and body hash from the last fetch of a scraper search
+    URL, used to request the page conditionally on the next incremental run.
+    """
+
+    url = models.TextField()
+    url_hash = models.CharField(max_length=64, unique=True, help_text="SHA-256 of the URL")
+    etag = models.CharField(max_length=255, blank=True)
+    last_modified = models.CharField(max_length=64, blank=True)
+    content_hash = models.CharField(max_length=64, blank=True)
+    fetched_at = models.DateTimeField(default=timezone.now, help_text="Last time the page body changed")
+    checked_at = models.DateTimeField(default=timezone.now, help_text="Last time the page was requested")
+
+    class Meta:
+        verbose_name = 'Fetch Cache Entry'
+        verbose_name_plural = 'Fetch Cache Entries'
+        indexes = [
+            models.Index(fields=['checked_at'], name='jobs_fetchcache_checked_idx'),
+        ]
+
+    def __str__(self):
+        return f"Fetch cache for {self.url}"
+
+
+class ScrapeCampaign(models.Model):
+    """
+    A recurring incremental scrape of one search. Due campaigns are started
+    by ``jobs.scrape_campaigns.dispatch_due_campaigns``, which runs on a
+    django-q schedule.
+    """
+
+    name = models.CharField(max_length=100)
+    search_keyword = models.CharField(max_length=200)
+    search_location = models.CharField(max_length=200, default='Philippines')
+    sources = models.JSONField(default=list, blank=True, help_text="Source keys to scrape; empty means every site")
+    interval_minutes = models.PositiveIntegerField(default=360, help_text="Minutes between runs")
+    auto_publish = models.BooleanField(default=True, help_text="Publish new jobs to the job board after each run")
+    is_active = models.BooleanField(default=True)
+
+    created_by = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='scrape_campaigns',
+        help_text="Runs and published postings are attributed to this user",
+    )
+    next_run_at = models.DateTimeField(default=timezone.now)
+    last_run_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['next_run_at']
+        indexes = [
+            models.Index(fields=['is_active', 'next_run_at'], name='jobs_campaign_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ('{self.search_keyword}' in '{self.search_location}', every {self.interval_minutes} min)"
+
+
+class SourceHealth(models.Model):
+    """
+    Freshness and yield index for one job source, updated after every site
+    result. Averages are exponentially weighted so recent runs dominate;
+    ``retry_after`` benches a source that keeps failing.
+    """
+
+    source = models.CharField(max_length=20, choices=ScrapedJob.SOURCE_CHOICES, unique=True)
+
+    runs = models.PositiveIntegerField(default=0)
+    failures = models.PositiveIntegerField(default=0)
+    jobs_found = models.PositiveIntegerField(default=0)
+    new_jobs = models.PositiveIntegerField(default=0, help_text="New jobs seen by incremental runs")
+    # Samples behind each average, which do not come from every run
+    timed_runs = models.PositiveIntegerField(default=0, help_text="Runs that reported their latency")
+    incremental_runs = models.PositiveIntegerField(default=0, help_text="Successful incremental runs")
+
+    avg_latency_seconds = models.FloatField(default=0.0)
+    avg_new_jobs = models.FloatField(default=0.0)
+    failure_rate = models.FloatField(default=0.0)
+    consecutive_failures = models.PositiveIntegerField(default=0)
+
+    last_success_at = models.DateTimeField(null=True, blank=True)
+    last_new_job_at = models.DateTimeField(null=True, blank=True)
+    last_failure_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    retry_after = models.DateTimeField(null=True, blank=True, help_text="Campaigns skip the source until then")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Source Health'
+        verbose_name_plural = 'Source Health'
+        ordering = ['source']
+
+    def __str__(self):
+        return f"{self.get_source_display()}: {self.avg_new_jobs:.1f} new/run, {self.failure_rate:.0%} failing"
+
+    @property
+    def priority(self):
+        """Expected new jobs per second of latency, discounted by failure rate."""
+        return (1.0 + self.avg_new_jobs) / (1.0 + self.avg_latency_seconds) * (1.0 - self.failure_rate)
+
+    def is_available(self, now=None):
+        return self.retry_after is None or self.retry_after <= (now or timezone.now())
+
+
 class JobPreference(models.Model):
     """Stores user job filtering preferences"""
     
@@ -399,6 +600,13 @@ class UserJobAIScore(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Persisted AI-global sort key: score and posting time packed into one
+    # integer (see compute_rank_key). Null unless READY.
+    rank_key = models.BigIntegerField(null=True, blank=True, editable=False)
+    # Digest of the job payload the score was computed from (see
+    # ai_matching.build_job_digest); edits that leave it unchanged keep the score.
+    job_digest = models.CharField(max_length=64, blank=True, editable=False)
+
     class Meta:
         verbose_name = 'User Job AI Score'
         verbose_name_plural = 'User Job AI Scores'
@@ -406,9 +614,104 @@ class UserJobAIScore(models.Model):
         indexes = [
             models.Index(fields=['user', 'status'], name='jobs_ujas_user_stat_idx'),
             models.Index(fields=['user', 'score'], name='jobs_ujas_user_score_idx'),
+            models.Index(fields=['user', '-rank_key'], name='jobs_ujas_user_rank_idx'),
             models.Index(fields=['computed_at'], name='jobs_ujas_comp_at_idx'),
         ]
 
+    # Scores occupy the digits above the posting timestamp, so ordering by
+    # rank_key DESC equals ordering by (score DESC, posted_date DESC).
+    RANK_KEY_SCALE = 10 ** 10
+
+    @classmethod
+    def compute_rank_key(cls, score, posted_date):
+        if score is None:
+            return None
+        posted_ts = int(posted_date.timestamp()) if posted_date else 0
+        return int(score) * cls.RANK_KEY_SCALE + max(0, posted_ts)
+
+    def save(self, *args, **kwargs):
+        if self.status == self.Status.READY and self.score is not None:
+            if self.rank_key is None or UserJobAIScore.job.is_cached(self):
+                self.rank_key = self.compute_rank_key(self.score, self.job.posted_date)
+            else:
+                # The low digits already hold the posting time (re-keyed by
+                # invalidate_job_scores), so a new score needs no job lookup.
+                posted_ts = self.rank_key % self.RANK_KEY_SCALE
+                self.rank_key = int(self.score) * self.RANK_KEY_SCALE + posted_ts
+        else:
+            self.rank_key = None
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'score', 'status'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'rank_key'}
+        super().save(*args, **kwargs)
+
     def __str__(self):
         score_label = self.score if self.score is not None else 'N/A'
         return f"AI Score: user={self.user_id}, job={self.job_id}, score={score_label}"
+
+
+class AIMatchResult(models.Model):
+    """
+    Durable, content-addressed store of Gemini match results.
+
+    Rows are keyed on digests of the exact profile and job payloads sent to
+    the model, so a result outlives cache evictions and cosmetic job edits
+    and is shared by every user whose profile produces the same payload.
+    """
+
+    profile_digest = models.CharField(max_length=64)
+    job_digest = models.CharField(max_length=64)
+
+    score = models.IntegerField(help_text='AI match score (0-100)')
+    reason = models.TextField(blank=True)
+    strengths_json = models.JSONField(default=list, blank=True)
+    gaps_json = models.JSONField(default=list, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = 'AI Match Result'
+        verbose_name_plural = 'AI Match Results'
+        unique_together = ['profile_digest', 'job_digest']
+        indexes = [
+            models.Index(fields=['last_used_at'], name='jobs_aimr_last_used_idx'),
+        ]
+
+    def __str__(self):
+        return f"AI Match Result: profile={self.profile_digest[:12]}, job={self.job_digest[:12]}, score={self.score}"
+
+    def as_result(self):
+        """Return the result dict shape used by ``jobs.ai_matching``."""
+        return {
+            "score": self.score,
+            "reason": self.reason,
+            "strengths": list(self.strengths_json or []),
+            "gaps": list(self.gaps_json or []),
+            "cached": True,
+        }
+
+
+class JobSkill(models.Model):
+    """
+    Normalized, one-row-per-skill index of ``JobPosting.skills_required``.
+
+    Kept in sync when a posting is saved so skill matching can look up the
+    jobs that share a skill with a profile instead of re-splitting the CSV
+    of every active posting.
+    """
+
+    job = models.ForeignKey('JobPosting', on_delete=models.CASCADE, related_name='skill_index')
+    name = models.CharField(max_length=100, help_text='Lowercased, whitespace-normalized skill name')
+
+    class Meta:
+        verbose_name = 'Job Skill'
+        verbose_name_plural = 'Job Skills'
+        ordering = ['id']
+        unique_together = ['job', 'name']
+        indexes = [
+            models.Index(fields=['name'], name='jobs_jobskill_name_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} (job={self.job_id})"
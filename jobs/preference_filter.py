@@ -9,11 +9,17 @@ based on user preferences. It implements a hybrid filtering approach:
 
 import logging
 from typing import List, Dict, Optional, Tuple
+
+import numpy as np
 from django.core.cache import cache
 from django.db.models import Q, QuerySet
 from django.conf import settings
-from .models import JobPosting, JobPreference
-from .utils import calculate_job_match_score, parse_salary_range
+from .models import JobPosting, JobPreference, JobSkill
+from .utils import (
+    calculate_job_match_score,
+    calculate_skill_relevancy,
+    get_profile_skill_map,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -147,10 +153,10 @@ class PreferenceFilterService:
     
     def filter_by_salary(self, queryset: QuerySet, min_salary: int) -> QuerySet:
         """
-        Filter jobs by minimum salary using salary parsing utility.
+        Filter jobs by minimum salary using the parsed salary columns.
         
-        This method parses various salary formats and filters jobs where
-        the minimum salary meets or exceeds the user's requirement.
+        ``salary_min_php`` is filled from ``salary_range`` when a posting is
+        saved (see jobs/salary.py), so this is an indexed WHERE clause.
         
         Supported formats:
         - "₱20,000 - ₱30,000"
@@ -158,7 +164,7 @@ class PreferenceFilterService:
         - "Above ₱50,000"
         - "₱25,000"
         
-        Jobs without salary_range are excluded from results.
+        Jobs without a parseable salary_range are excluded from results.
         
         Args:
             queryset: Job queryset to filter
@@ -167,34 +173,7 @@ class PreferenceFilterService:
         Returns:
             Filtered queryset containing only jobs meeting salary requirement
         """
-        # Get all jobs with salary information
-        jobs_with_salary = queryset.filter(salary_range__isnull=False).exclude(salary_range='')
-        
-        # Filter jobs by parsing salary and comparing to minimum
-        matching_job_ids = []
-        
-        for job in jobs_with_salary:
-            try:
-                # Parse the salary range to get minimum value
-                parsed_min_salary = parse_salary_range(job.salary_range)
-                
-                # If parsing succeeded and meets minimum requirement, include it
-                if parsed_min_salary is not None and parsed_min_salary >= min_salary:
-                    matching_job_ids.append(job.id)
-                    
-            except Exception as e:
-                # Log error but continue processing other jobs
-                logger.error(
-                    f"Error processing salary for job {job.id} ('{job.salary_range}'): {e}"
-                )
-                continue
-        
-        # Return filtered queryset
-        if matching_job_ids:
-            return queryset.filter(id__in=matching_job_ids)
-        else:
-            # Return empty queryset if no jobs match
-            return queryset.none()
+        return queryset.filter(salary_min_php__gte=min_salary)
     
     def calculate_match_score(self, job: JobPosting) -> int:
         """
@@ -245,7 +224,8 @@ class PreferenceFilterService:
         Get skill match score from existing skill matching system.
         
         Integrates with the existing calculate_job_match_score function
-        from jobs/utils.py.
+        from jobs/utils.py. The user's skills are fetched once per service
+        instance.
         
         Args:
             job: JobPosting instance to score
@@ -258,78 +238,172 @@ class PreferenceFilterService:
                 return 0
             
             profile = self.user.profile
-            score, _, _ = calculate_job_match_score(profile, job)
+            score, _, _ = calculate_job_match_score(
+                profile, job, user_skills=self._get_user_skills()
+            )
             return int(score)
         except Exception as e:
             logger.error(f"Error calculating skill match score: {e}")
             return 0
-    
-    def get_filtered_jobs(self) -> List[Dict]:
+
+    def _get_user_skills(self) -> Dict:
+        if not hasattr(self, '_user_skills'):
+            self._user_skills = get_profile_skill_map(self.user.profile)
+        return self._user_skills
+
+    def _score_preferences_batch(self, categories, levels, locations) -> np.ndarray:
+        """Vectorized equivalent of calculate_match_score over candidate columns."""
+        n = len(categories)
+        score = np.zeros(n, dtype=float)
+        max_score = 0
+
+        # Industry Match (+20 points)
+        if self.preferences.industries:
+            max_score += 20
+            score += 20 * np.isin(categories, list(self.preferences.industries))
+
+        # Experience Level Match (+15 points)
+        if self.preferences.experience_levels:
+            max_score += 15
+            score += 15 * np.isin(levels, list(self.preferences.experience_levels))
+
+        # Location Match when willing to relocate (+15 points)
+        if self.preferences.location_text and self.preferences.willing_to_relocate:
+            max_score += 15
+            lowered = np.char.lower(locations.astype(str))
+            tokens = [loc.strip().lower() for loc in self.preferences.location_text.split(',')]
+            location_hit = np.zeros(n, dtype=bool)
+            for token in tokens:
+                location_hit |= np.char.find(lowered, token) >= 0
+            score += 15 * location_hit
+
+        if max_score == 0:
+            return np.zeros(n, dtype=int)
+        return np.trunc((score / max_score) * 100).astype(int)
+
+    def _score_skills_batch(self, job_ids: np.ndarray) -> np.ndarray:
         """
-        Get filtered and scored jobs based on user preferences.
-        
+        Vectorized skill match scores for ``job_ids``.
+
+        Each candidate's required skills (from the JobSkill index) form a
+        bitset over the user's skill vocabulary; the matched relevancy is
+        the bitset dotted with the per-skill relevancy vector.
+        """
+        n = len(job_ids)
+        if n == 0 or not hasattr(self.user, 'profile'):
+            return np.zeros(n, dtype=int)
+
+        user_skills = self._get_user_skills()
+        vocabulary = list(user_skills)
+        vocab_index = {name: i for i, name in enumerate(vocabulary)}
+        relevancy = np.array(
+            [calculate_skill_relevancy(user_skills[name], name) for name in vocabulary],
+            dtype=float,
+        )
+
+        row_index = {int(job_id): i for i, job_id in enumerate(job_ids)}
+        required_count = np.zeros(n, dtype=float)
+        bitsets = np.zeros((n, len(vocabulary)), dtype=bool)
+        for job_id, name in JobSkill.objects.filter(job_id__in=row_index).values_list('job_id', 'name'):
+            row = row_index[job_id]
+            required_count[row] += 1
+            column = vocab_index.get(name)
+            if column is not None:
+                bitsets[row, column] = True
+
+        matched = bitsets @ relevancy if vocabulary else np.zeros(n, dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scores = np.where(required_count > 0, (matched / required_count) * 100, 0.0)
+        return np.trunc(scores).astype(int)
+
+    def score_jobs(self, queryset: QuerySet) -> List[Tuple[int, int]]:
+        """
+        Score every job in ``queryset`` in one pass.
+
+        Loads only the columns needed for scoring, computes preference,
+        skill and blended scores as arrays, applies the skill threshold and
+        returns ``(job_id, score)`` pairs sorted by score descending (ties
+        keep the queryset order).
+        """
+        rows = list(queryset.values_list('id', 'category', 'experience_level', 'location'))
+        if not rows:
+            return []
+
+        job_ids = np.array([row[0] for row in rows], dtype=np.int64)
+        categories = np.array([row[1] or '' for row in rows], dtype=object)
+        levels = np.array([row[2] or '' for row in rows], dtype=object)
+        locations = np.array([row[3] or '' for row in rows], dtype=object)
+
+        final_scores = self._score_preferences_batch(categories, levels, locations)
+
+        # Integrate skill matching if enabled
+        if self.preferences.skill_matching_enabled:
+            skill_scores = self._score_skills_batch(job_ids)
+            # Skip jobs below skill match threshold
+            keep = skill_scores >= self.preferences.skill_match_threshold
+            # Blend scores (70% preference, 30% skills)
+            final_scores = np.trunc(final_scores * 0.7 + skill_scores * 0.3).astype(int)
+            job_ids = job_ids[keep]
+            final_scores = final_scores[keep]
+
+        # Sort by score descending
+        order = np.argsort(-final_scores, kind='stable')
+        return [(int(job_ids[i]), int(final_scores[i])) for i in order]
+
+    def get_filtered_job_scores(self) -> List[Tuple[int, int]]:
+        """
+        Get ``(job_id, score)`` pairs for jobs matching the user's preferences.
+
         Process:
         1. Check cache for existing results
         2. Get active jobs queryset
         3. Apply hard filters
-        4. Calculate match scores for remaining jobs
-        5. Integrate skill matching scores (if enabled)
-        6. Sort by score descending
-        7. Cache results
-        
-        Returns:
-            List of dictionaries with 'job' and 'score' keys
+        4. Score all remaining jobs in one vectorized pass
+        5. Cache the id/score pairs
         """
         # Check cache first with graceful fallback
         try:
             cached = cache.get(self.cache_key)
-            if cached:
+            if cached and isinstance(cached[0], (list, tuple)):
                 logger.debug(f"Returning cached job matches for user {self.user.id}")
-                return cached
+                return [tuple(item) for item in cached]
         except Exception as e:
             logger.warning(f"Cache unavailable for reading, proceeding without cache: {e}")
-        
+
         # Start with active jobs
         jobs = JobPosting.objects.filter(is_active=True)
-        
+
         # Apply hard filters
         jobs = self.apply_hard_filters(jobs)
-        
-        # Calculate match scores
-        job_matches = []
-        for job in jobs:
-            # Calculate preference-based score
-            preference_score = self.calculate_match_score(job)
-            
-            # Integrate skill matching if enabled
-            if self.preferences.skill_matching_enabled:
-                skill_score = self.get_skill_match_score(job)
-                
-                # Skip jobs below skill match threshold
-                if skill_score < self.preferences.skill_match_threshold:
-                    continue
-                
-                # Blend scores (70% preference, 30% skills)
-                final_score = int(preference_score * 0.7 + skill_score * 0.3)
-            else:
-                final_score = preference_score
-            
-            job_matches.append({
-                'job': job,
-                'score': final_score
-            })
-        
-        # Sort by score descending
-        job_matches.sort(key=lambda x: x['score'], reverse=True)
-        
+
+        job_scores = self.score_jobs(jobs)
+
         # Cache results with graceful fallback
         try:
-            cache.set(self.cache_key, job_matches, self.cache_timeout)
-            logger.debug(f"Cached {len(job_matches)} job matches for user {self.user.id}")
+            cache.set(self.cache_key, job_scores, self.cache_timeout)
+            logger.debug(f"Cached {len(job_scores)} job matches for user {self.user.id}")
         except Exception as e:
             logger.warning(f"Cache unavailable for writing, continuing without cache: {e}")
+
+        return job_scores
+
+    def get_filtered_jobs(self) -> List[Dict]:
+        """
+        Get filtered and scored jobs based on user preferences.
+        
+        Wraps get_filtered_job_scores and loads the matching JobPosting
+        objects with a single query.
         
-        return job_matches
+        Returns:
+            List of dictionaries with 'job' and 'score' keys
+        """
+        job_scores = self.get_filtered_job_scores()
+        jobs_by_id = JobPosting.objects.in_bulk([job_id for job_id, _ in job_scores])
+        return [
+            {'job': jobs_by_id[job_id], 'score': score}
+            for job_id, score in job_scores
+            if job_id in jobs_by_id
+        ]
     
     def invalidate_cache(self):
         """
@@ -0,0 +1,51 @@
+"""
+Salary text parsing shared by the job board.
+
+``JobPosting.salary_range`` is free text ("₱20,000 - ₱30,000", "20K-30K",
+"Above ₱50,000", ...). ``parse_salary_bounds`` is the single parser used to
+fill the indexed ``salary_min_php``/``salary_max_php`` columns.
+"""
+
+import re
+from typing import Optional, Tuple
+
+# Whole numbers only: the digits may not be cut short to dodge the lookaheads.
+# A unit or a trailing currency ("30000php") may follow, other words may not.
+_AMOUNT_RE = re.compile(r'(?<![\d.])(\d+(?:\.\d+)?)(?!\d|\.\d)\s*(k|m)?(?=php|[^a-z]|$)')
+_RANGE_GAP_RE = re.compile(r'^\s*(?:-|–|—|to)\s*(?:₱|php|p)?\s*$')
+_MULTIPLIERS = {'k': 1000, 'm': 1000000}
+
+
+def parse_salary_bounds(salary_text) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Return ``(min, max)`` salary in PHP parsed from free text.
+
+    The minimum is the first amount mentioned and the maximum the largest.
+    A unit written only on the upper bound ("20-30k") applies to both.
+    Returns ``(None, None)`` when no amount can be found.
+    """
+    if not salary_text or not isinstance(salary_text, str):
+        return None, None
+
+    text = salary_text.lower().replace(',', '')
+    matches = list(_AMOUNT_RE.finditer(text))
+    if not matches:
+        return None, None
+
+    units = [m.group(2) for m in matches]
+    for i in range(len(matches) - 1):
+        gap = text[matches[i].end():matches[i + 1].start()]
+        if units[i] is None and units[i + 1] and _RANGE_GAP_RE.match(gap):
+            units[i] = units[i + 1]
+
+    values = []
+    for match, unit in zip(matches, units):
+        try:
+            value = float(match.group(1))
+        except ValueError:
+            continue
+        values.append(int(value * _MULTIPLIERS.get(unit, 1)))
+
+    if not values:
+        return None, None
+    return values[0], max(values)
@@ -0,0 +1,95 @@
+"""
+Dispatcher for scheduled scrape campaigns.
+
+``dispatch_due_campaigns`` runs on a django-q schedule (see the
+``setup_scrape_campaign_schedule`` command). Each call starts the campaigns
+whose ``next_run_at`` has passed as incremental ScrapeRuns, without ever
+having more than ``SCRAPER_CAMPAIGN_CONCURRENCY`` campaign runs in flight.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .botasaurus_scrapers.orchestrator import SCRAPERS
+from .models import ScrapeCampaign, ScrapeRun
+from .scraper_tasks import enqueue_scrape_run, run_scrape
+from .source_health import plan_sources
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = [ScrapeRun.Status.QUEUED, ScrapeRun.Status.RUNNING]
+
+
+def _expire_abandoned_runs(now) -> int:
+    """Fail campaign runs whose worker died, so they stop holding a slot."""
+    cutoff = now - timedelta(minutes=getattr(settings, "SCRAPER_CAMPAIGN_RUN_TIMEOUT_MINUTES", 30))
+    return ScrapeRun.objects.filter(
+        campaign__isnull=False,
+        status__in=ACTIVE_STATUSES,
+        created_at__lt=cutoff,
+    ).update(
+        status=ScrapeRun.Status.FAILED,
+        error_message="Abandoned: the run did not finish in time",
+        finished_at=now,
+    )
+
+
+def start_campaign_run(campaign: ScrapeCampaign, now=None):
+    """
+    Create the next run of ``campaign`` and advance its schedule. Returns
+    None when every source of the campaign is currently benched.
+    """
+    now = now or timezone.now()
+    campaign.last_run_at = now
+    campaign.next_run_at = now + timedelta(minutes=campaign.interval_minutes)
+    campaign.save(update_fields=["last_run_at", "next_run_at"])
+
+    sources = plan_sources(campaign.sources or list(SCRAPERS), now)
+    if not sources:
+        logger.info(f"Campaign {campaign.pk} skipped: every source is backing off")
+        return None
+
+    return ScrapeRun.objects.create(
+        search_keyword=campaign.search_keyword,
+        search_location=campaign.search_location,
+        sources=sources,
+        incremental=True,
+        campaign=campaign,
+        scraped_by=campaign.created_by,
+    )
+
+
+def dispatch_due_campaigns() -> int:
+    """
+    Start due campaigns up to the concurrency cap, most overdue first.
+    Returns the number of runs started.
+    """
+    now = timezone.now()
+    _expire_abandoned_runs(now)
+
+    with transaction.atomic():
+        active = ScrapeRun.objects.filter(campaign__isnull=False, status__in=ACTIVE_STATUSES)
+        slots = getattr(settings, "SCRAPER_CAMPAIGN_CONCURRENCY", 2) - active.count()
+        if slots <= 0:
+            return 0
+
+        due = list(
+            ScrapeCampaign.objects.select_for_update(skip_locked=True)
+            .filter(is_active=True, next_run_at__lte=now)
+            .exclude(id__in=active.values("campaign_id"))
+            .order_by("next_run_at")[:slots]
+        )
+        runs = [run for run in (start_campaign_run(campaign, now) for campaign in due) if run]
+
+    for run in runs:
+        try:
+            queued = enqueue_scrape_run(run)
+        except Exception as exc:
+            logger.error(f"Could not queue campaign run {run.pk}: {exc}", exc_info=True)
+            queued = False
+        if not queued:
+            run_scrape(run.pk)
+    return len(runs)
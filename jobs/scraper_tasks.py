@@ -0,0 +1,182 @@
+"""
+Background task functions for the multi-site job scraper.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import logging
+from typing import Dict
+
+from django.db import transaction
+from django.utils import timezone
+
+from .admin_scraper_utils import publish_scraped_jobs
+from .botasaurus_scrapers.base import job_signature
+from .botasaurus_scrapers.orchestrator import scrape_all_sites
+from .fetch_cache import load_fetch_cache, save_fetch_cache
+from .models import ScrapedJob, ScrapeRun
+from .source_health import record_source_result
+
+logger = logging.getLogger(__name__)
+
+
+def _merge_jobs(previous_data, new_jobs):
+    """The jobs of earlier records followed by ``new_jobs``, one per signature."""
+    merged = {}
+    for scraped_data in previous_data:
+        jobs = scraped_data.get("jobs", []) if isinstance(scraped_data, dict) else []
+        for job in jobs:
+            merged[job.get("signature") or job_signature(job)] = job
+    for job in new_jobs:
+        merged[job.get("signature") or job_signature(job)] = job
+    return list(merged.values())
+
+
+def save_source_result(run: ScrapeRun, result: Dict) -> None:
+    """
+    Persist one site's result for ``run``: a ScrapedJob record when the site
+    returned jobs, superseding earlier records for the same search, and the
+    site's entry in ``run.progress``. An incremental run only scraped the
+    new jobs, so its record also carries the jobs of the records it
+    supersedes; each search keeps one active record per source.
+    """
+    source = result.get("source", "OTHER")
+    jobs_found = result.get("total_found", 0)
+
+    with transaction.atomic():
+        if result.get("jobs"):
+            # Deactivate previous entries for same search + source
+            previous = ScrapedJob.objects.select_for_update().filter(
+                search_keyword=run.search_keyword,
+                search_location=run.search_location,
+                source=source,
+                scraped_by_id=run.scraped_by_id,
+                is_active=True,
+            )
+            scraped_data = result
+            if run.incremental:
+                scraped_data = dict(result, jobs=_merge_jobs(
+                    previous.order_by("scraped_at").values_list("scraped_data", flat=True), result["jobs"]
+                ))
+                scraped_data["new_jobs"] = len(result["jobs"])
+            previous.update(is_active=False)
+
+            ScrapedJob.objects.create(
+                search_keyword=run.search_keyword,
+                search_location=run.search_location,
+                source=source,
+                scraped_data=scraped_data,
+                total_found=len(scraped_data["jobs"]) if run.incremental else jobs_found,
+                scraped_by_id=run.scraped_by_id,
+                run=run,
+            )
+
+        entry = {
+            "state": ScrapeRun.SOURCE_DONE if result.get("success") else ScrapeRun.SOURCE_FAILED,
+            "total_found": jobs_found,
+            "error": result.get("error", ""),
+        }
+        if "known_jobs" in result:
+            entry["known_jobs"] = result["known_jobs"]
+            entry["unchanged_pages"] = result["unchanged_pages"]
+        run.progress[source] = entry
+        run.save(update_fields=["progress"])
+
+    try:
+        record_source_result(result, incremental=run.incremental)
+    except Exception as exc:
+        logger.error(f"Could not update source health for {source}: {exc}", exc_info=True)
+
+
+def _finish_run(run: ScrapeRun, status: str, **fields) -> bool:
+    """
+    Record the outcome of ``run`` unless it stopped running meanwhile (a
+    campaign dispatcher fails runs that outlive their timeout). Returns
+    whether the outcome was recorded.
+    """
+    finished = timezone.now()
+    updated = ScrapeRun.objects.filter(pk=run.pk, status=ScrapeRun.Status.RUNNING).update(
+        status=status, finished_at=finished, **fields
+    )
+    if not updated:
+        run.refresh_from_db(fields=["status", "error_message", "finished_at"])
+        logger.warning(f"Scrape run {run.pk} finished after it was marked {run.status}; keeping that status")
+        return False
+    run.status = status
+    run.finished_at = finished
+    for name, value in fields.items():
+        setattr(run, name, value)
+    return True
+
+
+def run_scrape(run_id: int) -> Dict[str, int]:
+    """
+    Background worker: scrape every source of a ScrapeRun, saving each
+    site's results as soon as that site finishes. Runs of an auto-publishing
+    campaign then publish their records to the job board in one batch.
+    """
+    try:
+        run = ScrapeRun.objects.get(id=run_id)
+    except ScrapeRun.DoesNotExist:
+        return {"sources": 0, "jobs": 0}
+
+    started = timezone.now()
+    progress = {source: {"state": ScrapeRun.SOURCE_PENDING} for source in run.sources}
+    claimed = ScrapeRun.objects.filter(pk=run_id, status=ScrapeRun.Status.QUEUED).update(
+        status=ScrapeRun.Status.RUNNING, started_at=started, progress=progress
+    )
+    if not claimed:
+        # Expired while queued, or a redelivered task for a run another worker took.
+        logger.info(f"Scrape run {run_id} is not queued ({run.status}); skipping")
+        return {"sources": 0, "jobs": 0}
+    run.status = ScrapeRun.Status.RUNNING
+    run.started_at = started
+    run.progress = progress
+
+    try:
+        cache = None
+        if run.incremental:
+            cache = load_fetch_cache(
+                run.search_keyword, run.search_location, run.sources, scraped_by_id=run.scraped_by_id
+            )
+        results = scrape_all_sites(
+            run.search_keyword,
+            run.search_location,
+            sources=run.sources,
+            on_result=lambda result: save_source_result(run, result),
+            fetch_cache=cache,
+        )
+        if cache is not None:
+            save_fetch_cache(cache, run.scraped_by_id)
+    except Exception as exc:
+        logger.error(f"Scrape run {run_id} failed: {exc}", exc_info=True)
+        _finish_run(run, ScrapeRun.Status.FAILED, error_message=str(exc))
+        return {"sources": 0, "jobs": 0}
+
+    # A run expired while scraping no longer holds a campaign slot; leave its records unpublished
+    if _finish_run(run, ScrapeRun.Status.COMPLETED) and run.campaign_id and run.campaign.auto_publish:
+        try:
+            run.published = publish_scraped_jobs(run.scraped_jobs.all(), run.scraped_by)["published"]
+        except Exception as exc:
+            logger.error(f"Auto-publish for scrape run {run_id} failed: {exc}", exc_info=True)
+        ScrapeRun.objects.filter(pk=run.pk).update(published=run.published)
+    return {
+        "sources": len(results),
+        "jobs": sum(result.get("total_found", 0) for result in results),
+    }
+
+
+def enqueue_scrape_run(run: ScrapeRun) -> bool:
+    """
+    Queue ``run`` on django-q. Returns False when django-q is not installed,
+    in which case the caller should run ``run_scrape`` itself.
+    """
+    if importlib.util.find_spec("django_q") is None:
+        return False
+
+    from django_q.tasks import async_task
+
+    run.task_id = async_task("jobs.scraper_tasks.run_scrape", run.id) or ""
+    run.save(update_fields=["task_id"])
+    return True
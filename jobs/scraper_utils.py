@@ -3,10 +3,12 @@ import requests
 from bs4 import BeautifulSoup
 import time
 import logging
-from urllib.parse import urljoin, quote_plus
+from urllib.parse import urljoin, quote_plus, urlsplit
 from django.core.cache import cache
 from typing import List, Dict, Optional
 
+from .botasaurus_scrapers.rate_limit import get_shared_rate_limiter
+
 logger = logging.getLogger(__name__)
 
 class BossJobScraper:
@@ -27,8 +29,9 @@ class BossJobScraper:
             'Sec-Fetch-User': '?1',
             'DNT': '1',
         })
-        self.request_delay = 2  # 2 seconds between requests
-        self.last_request_time = 0
+        # Requests are throttled by the process-wide per-host token bucket
+        # (SCRAPER_HOST_RATE), shared with the async scraper engine.
+        self.rate_limiter = get_shared_rate_limiter()
         
         # Optional Selenium fallback config (Remote WebDriver recommended)
         self.enable_selenium = os.getenv('SELENIUM_ENABLE', 'false').lower() == 'true'
@@ -37,11 +40,9 @@ class BossJobScraper:
     
     def _throttle_request(self):
         """Implement request throttling to be respectful to the website"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        if time_since_last < self.request_delay:
-            time.sleep(self.request_delay - time_since_last)
-        self.last_request_time = time.time()
+        delay = self.rate_limiter.reserve(urlsplit(self.base_url).netloc)
+        if delay:
+            time.sleep(delay)
     
     def _get_cache_key(self, keyword: str, location: str) -> str:
         """Generate cache key for the search results"""
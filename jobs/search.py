@@ -0,0 +1,340 @@
+"""
+Full-text search backends for the job board ``q`` filter.
+
+Each backend filters a ``JobPosting`` queryset to postings matching a
+search string and annotates them with ``search_rank`` (higher is more
+relevant) so ``job_list`` can offer ``sort=relevance``:
+
+- PostgreSQL: weighted ``SearchVector`` served by a GIN expression index.
+- MySQL: ``MATCH ... AGAINST`` over a FULLTEXT index.
+- SQLite: an FTS5 external-content table kept in sync by triggers.
+- Anything else: the original ``icontains`` scan with a constant rank.
+
+The indexes are created by migration ``0015_job_search_index`` and are
+maintained by the database itself whenever a posting is saved. Whether the
+index exists is checked again every JOB_SEARCH_INDEX_CHECK_SECONDS, so a
+process notices an index created or dropped by another one.
+
+Set ``JOB_SEARCH_BACKEND`` to a dotted class path to override the
+vendor-based choice.
+"""
+
+import abc
+import functools
+import logging
+import re
+import time
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import F, FloatField, Func, Q, QuerySet, Value
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+SEARCH_FIELDS = ("job_title", "company_name", "job_description", "requirements")
+SQLITE_FTS_TABLE = "jobs_jobposting_fts"
+MYSQL_FULLTEXT_INDEX = "jobs_jobposting_fts"
+POSTGRES_GIN_INDEX = "jobs_jobposting_fts_gin"
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# InnoDB's default full-text stopwords; like words shorter than
+# innodb_ft_min_token_size they are never indexed, so no document can
+# satisfy a required "+word*" term for them.
+MYSQL_STOPWORDS = frozenset((
+    "a about an are as at be by com de en for from how i in is it la of on or "
+    "that the this to was what when where who will with und www"
+).split())
+
+
+def tokenize_query(query: str) -> list:
+    """Split raw user input into plain word tokens safe for any FTS syntax."""
+    return _TOKEN_RE.findall((query or "").lower())[:16]
+
+
+def postgres_search_vector():
+    """Weighted document shared by the GIN index and the search query."""
+    from django.contrib.postgres.search import SearchVector
+
+    return (
+        SearchVector("job_title", weight="A", config="english")
+        + SearchVector("company_name", weight="B", config="english")
+        + SearchVector("job_description", weight="C", config="english")
+        + SearchVector("requirements", weight="C", config="english")
+    )
+
+
+class BaseJobSearchBackend(abc.ABC):
+    """Interface: ``search`` returns a filtered queryset annotated with ``search_rank``."""
+
+    vendor = None
+
+    @abc.abstractmethod
+    def search(self, queryset: QuerySet, query: str) -> QuerySet:
+        """Filter ``queryset`` to postings matching ``query`` and rank them."""
+
+
+class BasicJobSearchBackend(BaseJobSearchBackend):
+    """Substring scan used when no full-text index is available."""
+
+    def search(self, queryset, query):
+        return queryset.filter(
+            Q(job_title__icontains=query) |
+            Q(company_name__icontains=query) |
+            Q(job_description__icontains=query) |
+            Q(requirements__icontains=query)
+        ).annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+
+class PostgresJobSearchBackend(BaseJobSearchBackend):
+    vendor = "postgresql"
+
+    def search(self, queryset, query):
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+
+        tokens = tokenize_query(query)
+        if not tokens:
+            return queryset.none()
+
+        # Prefix match on every token so partial words work while typing.
+        search_query = SearchQuery(
+            " & ".join(f"{token}:*" for token in tokens),
+            search_type="raw",
+            config="english",
+        )
+        vector = postgres_search_vector()
+        return queryset.annotate(search_document=vector).filter(
+            search_document=search_query
+        ).annotate(search_rank=SearchRank(vector, search_query))
+
+
+class _MySQLMatch(Func):
+    template = "MATCH (%(expressions)s) AGAINST (%%s IN BOOLEAN MODE)"
+    output_field = FloatField()
+
+    def __init__(self, boolean_query, **extra):
+        self.boolean_query = boolean_query
+        super().__init__(*[F(name) for name in SEARCH_FIELDS], **extra)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        sql, params = super().as_sql(compiler, connection, **extra_context)
+        return sql, (*params, self.boolean_query)
+
+
+class MySQLJobSearchBackend(BaseJobSearchBackend):
+    vendor = "mysql"
+
+    def search(self, queryset, query):
+        tokens = tokenize_query(query)
+        if not tokens:
+            return queryset.none()
+
+        # Words the index cannot hold ("hr", "it", "qa") are matched by
+        # substring instead; a query made only of them is a plain scan.
+        min_size = _mysql_min_token_size()
+        indexed = [token for token in tokens if len(token) >= min_size and token not in MYSQL_STOPWORDS]
+        if not indexed:
+            return BasicJobSearchBackend().search(queryset, query)
+        for token in tokens:
+            if token not in indexed:
+                queryset = queryset.filter(
+                    Q(job_title__icontains=token) |
+                    Q(company_name__icontains=token) |
+                    Q(job_description__icontains=token) |
+                    Q(requirements__icontains=token)
+                )
+
+        boolean_query = " ".join(f"+{token}*" for token in indexed)
+        return queryset.annotate(search_rank=_MySQLMatch(boolean_query)).filter(search_rank__gt=0)
+
+
+class _SQLiteFTSRank(Func):
+    # bm25() is lower-is-better, so negate it; title matches weigh most.
+    template = (
+        f"(SELECT -bm25({SQLITE_FTS_TABLE}, 10.0, 5.0, 1.0, 1.0) FROM {SQLITE_FTS_TABLE} "
+        f"WHERE {SQLITE_FTS_TABLE} MATCH %%s AND {SQLITE_FTS_TABLE}.rowid = %(expressions)s)"
+    )
+    output_field = FloatField()
+
+    def __init__(self, match_query, **extra):
+        self.match_query = match_query
+        super().__init__(F("id"), **extra)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        sql, params = super().as_sql(compiler, connection, **extra_context)
+        return sql, (self.match_query, *params)
+
+
+class SQLiteJobSearchBackend(BaseJobSearchBackend):
+    vendor = "sqlite"
+
+    def search(self, queryset, query):
+        tokens = tokenize_query(query)
+        if not tokens:
+            return queryset.none()
+
+        match_query = " AND ".join(f'"{token}"*' for token in tokens)
+        matching_ids = RawSQL(
+            f"SELECT rowid FROM {SQLITE_FTS_TABLE} WHERE {SQLITE_FTS_TABLE} MATCH %s",
+            (match_query,),
+        )
+        return queryset.filter(id__in=matching_ids).annotate(search_rank=_SQLiteFTSRank(match_query))
+
+
+_SQLITE_COLUMNS = ", ".join(SEARCH_FIELDS)
+_SQLITE_NEW_VALUES = ", ".join(f"new.{name}" for name in SEARCH_FIELDS)
+_SQLITE_OLD_VALUES = ", ".join(f"old.{name}" for name in SEARCH_FIELDS)
+_SQLITE_TRIGGERS = {
+    f"{SQLITE_FTS_TABLE}_ai": (
+        f"AFTER INSERT ON jobs_jobposting BEGIN "
+        f"INSERT INTO {SQLITE_FTS_TABLE}(rowid, {_SQLITE_COLUMNS}) VALUES (new.id, {_SQLITE_NEW_VALUES}); END"
+    ),
+    f"{SQLITE_FTS_TABLE}_ad": (
+        f"AFTER DELETE ON jobs_jobposting BEGIN "
+        f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, {_SQLITE_COLUMNS}) "
+        f"VALUES ('delete', old.id, {_SQLITE_OLD_VALUES}); END"
+    ),
+    f"{SQLITE_FTS_TABLE}_au": (
+        f"AFTER UPDATE ON jobs_jobposting BEGIN "
+        f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, {_SQLITE_COLUMNS}) "
+        f"VALUES ('delete', old.id, {_SQLITE_OLD_VALUES}); "
+        f"INSERT INTO {SQLITE_FTS_TABLE}(rowid, {_SQLITE_COLUMNS}) VALUES (new.id, {_SQLITE_NEW_VALUES}); END"
+    ),
+}
+
+
+def create_search_index(schema_editor, model):
+    """
+    Create the vendor's full-text index for ``model`` (JobPosting).
+    Idempotent; also used by the ``rebuild_job_search_index`` command.
+    """
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        from django.contrib.postgres.indexes import GinIndex
+
+        constraints = schema_editor.connection.introspection.get_constraints(
+            schema_editor.connection.cursor(), model._meta.db_table
+        )
+        if POSTGRES_GIN_INDEX not in constraints:
+            schema_editor.add_index(model, GinIndex(postgres_search_vector(), name=POSTGRES_GIN_INDEX))
+    elif vendor == "mysql":
+        constraints = schema_editor.connection.introspection.get_constraints(
+            schema_editor.connection.cursor(), model._meta.db_table
+        )
+        if MYSQL_FULLTEXT_INDEX not in constraints:
+            schema_editor.execute(
+                f"CREATE FULLTEXT INDEX {MYSQL_FULLTEXT_INDEX} ON {model._meta.db_table} ({_SQLITE_COLUMNS})"
+            )
+    elif vendor == "sqlite":
+        try:
+            schema_editor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_FTS_TABLE} USING fts5("
+                f"{_SQLITE_COLUMNS}, content='jobs_jobposting', content_rowid='id', "
+                f"tokenize='unicode61 remove_diacritics 2')"
+            )
+        except Exception as exc:
+            # SQLite builds without FTS5 fall back to BasicJobSearchBackend.
+            logger.warning(f"SQLite FTS5 unavailable, job search will use substring matching: {exc}")
+            return
+        for name, body in _SQLITE_TRIGGERS.items():
+            schema_editor.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+        schema_editor.execute(f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}) VALUES ('rebuild')")
+    _index_available.cache_clear()
+
+
+def drop_search_index(schema_editor, model):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute(f"DROP INDEX IF EXISTS {POSTGRES_GIN_INDEX}")
+    elif vendor == "mysql":
+        constraints = schema_editor.connection.introspection.get_constraints(
+            schema_editor.connection.cursor(), model._meta.db_table
+        )
+        if MYSQL_FULLTEXT_INDEX in constraints:
+            schema_editor.execute(f"DROP INDEX {MYSQL_FULLTEXT_INDEX} ON {model._meta.db_table}")
+    elif vendor == "sqlite":
+        for name in _SQLITE_TRIGGERS:
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {SQLITE_FTS_TABLE}")
+    _index_available.cache_clear()
+
+
+_VENDOR_BACKENDS = {
+    "postgresql": PostgresJobSearchBackend,
+    "mysql": MySQLJobSearchBackend,
+    "sqlite": SQLiteJobSearchBackend,
+}
+
+
+def _checked_periodically(func):
+    """
+    Cache ``func``'s result per argument for JOB_SEARCH_INDEX_CHECK_SECONDS.
+    Like ``lru_cache``, the wrapper has a ``cache_clear()``.
+    """
+    results = {}
+
+    @functools.wraps(func)
+    def wrapper(*args):
+        now = time.monotonic()
+        cached = results.get(args)
+        if cached is not None and now < cached[0]:
+            return cached[1]
+        value = func(*args)
+        results[args] = (now + getattr(settings, "JOB_SEARCH_INDEX_CHECK_SECONDS", 300), value)
+        return value
+
+    wrapper.cache_clear = results.clear
+    return wrapper
+
+
+@_checked_periodically
+def _mysql_min_token_size() -> int:
+    """The server's ``innodb_ft_min_token_size`` (3 unless configured)."""
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT @@innodb_ft_min_token_size")
+            return int(cursor.fetchone()[0])
+    except Exception as exc:
+        logger.warning(f"Could not read innodb_ft_min_token_size: {exc}")
+        return 3
+
+
+@_checked_periodically
+def _index_available(vendor: str) -> bool:
+    """Whether the migration managed to create the vendor's index."""
+    try:
+        with connection.cursor() as cursor:
+            if vendor == "sqlite":
+                # Table rebuilds during later migrations drop the triggers,
+                # which would leave the index silently stale.
+                expected = {SQLITE_FTS_TABLE, *_SQLITE_TRIGGERS}
+                cursor.execute(
+                    "SELECT name FROM sqlite_master WHERE name IN (%s)" % ", ".join(["%s"] * len(expected)),
+                    list(expected),
+                )
+                return {row[0] for row in cursor.fetchall()} == expected
+            constraints = connection.introspection.get_constraints(cursor, "jobs_jobposting")
+            name = POSTGRES_GIN_INDEX if vendor == "postgresql" else MYSQL_FULLTEXT_INDEX
+            return name in constraints
+    except Exception as exc:
+        logger.warning(f"Could not inspect job search index for {vendor}: {exc}")
+        return False
+
+
+def get_job_search_backend() -> BaseJobSearchBackend:
+    """Return the configured backend, or the best one for the current database."""
+    backend_path = getattr(settings, "JOB_SEARCH_BACKEND", None)
+    if backend_path:
+        return import_string(backend_path)()
+
+    backend_cls = _VENDOR_BACKENDS.get(connection.vendor)
+    if backend_cls and _index_available(connection.vendor):
+        return backend_cls()
+    return BasicJobSearchBackend()
+
+
+def search_jobs(queryset: QuerySet, query: str) -> QuerySet:
+    """Filter ``queryset`` to postings matching ``query``, annotated with ``search_rank``."""
+    return get_job_search_backend().search(queryset, query)
@@ -13,8 +13,14 @@ from django.core.cache import cache
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
-from jobs.models import JobPreference, JobPosting, UserJobAIScore
-from jobs.ai_global_sort import get_ai_profile_version, get_stale_job_ids_for_jobs, mark_scores_pending
+from jobs.models import JobPreference, JobPosting
+from jobs.ai_global_sort import (
+    get_ai_profile_version,
+    get_unscored_job_ids,
+    invalidate_job_scores,
+    mark_scores_pending,
+)
+from jobs.utils import sync_job_skill_index
 
 logger = logging.getLogger(__name__)
 
@@ -40,19 +46,31 @@ def create_job_preference(sender, instance, created, **kwargs):
 
 
 @receiver(post_save, sender=JobPosting, dispatch_uid="mark_ai_scores_pending_on_job_update")
-def mark_ai_scores_pending_on_job_update(sender, instance, created, **kwargs):
+def mark_ai_scores_pending_on_job_update(sender, instance, created, raw=False, **kwargs):
     """
-    Mark cached AI scores as pending when a job posting is edited.
+    Update this job's entries in each user's AI ranking after an edit.
+    Scores are only invalidated when the content sent to the model changed.
     """
-    if created:
+    if created or raw:
         return
 
-    UserJobAIScore.objects.filter(
-        job=instance,
-        status=UserJobAIScore.Status.READY,
-    ).update(
-        status=UserJobAIScore.Status.PENDING,
-    )
+    try:
+        invalidate_job_scores(instance)
+    except Exception as exc:
+        logger.error("Failed to refresh AI rankings for job=%s: %s", instance.pk, exc)
+
+
+@receiver(post_save, sender=JobPosting, dispatch_uid="sync_job_skill_index_on_save")
+def sync_job_skill_index_on_save(sender, instance, raw=False, **kwargs):
+    """
+    Keep the normalized JobSkill index in step with skills_required.
+    """
+    if raw:
+        return
+    try:
+        sync_job_skill_index(instance)
+    except Exception as exc:
+        logger.error("Failed to sync skill index for job=%s: %s", instance.pk, exc)
 
 
 @receiver(user_logged_in, dispatch_uid="enqueue_ai_global_scores_on_login")
@@ -87,13 +105,12 @@ def enqueue_ai_global_scores_on_login(sender, request, user, **kwargs):
     if cache.get(throttle_key):
         return
 
-    jobs = list(JobPosting.objects.filter(is_active=True).exclude(slug="").order_by("-posted_date"))
-    if not jobs:
-        cache.set(throttle_key, True, throttle_minutes * 60)
-        return
-
     profile_version = get_ai_profile_version(user.id)
-    stale_ids = get_stale_job_ids_for_jobs(user, jobs, profile_version)
+    stale_ids = get_unscored_job_ids(
+        user,
+        JobPosting.objects.filter(is_active=True).exclude(slug=""),
+        profile_version,
+    )
     if not stale_ids:
         cache.set(throttle_key, True, throttle_minutes * 60)
         return
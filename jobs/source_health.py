@@ -0,0 +1,84 @@
+"""
+Per-source freshness and yield index for the job scrapers.
+
+Every site result updates that source's ``SourceHealth`` row. Campaigns use
+the index to skip sources that keep failing and to scrape the most
+productive sources first.
+"""
+from datetime import timedelta
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import SourceHealth
+
+# Weight of the newest run in the exponentially weighted averages.
+EWMA_WEIGHT = 0.3
+
+
+def _ewma(average: float, value: float, first: bool) -> float:
+    return float(value) if first else average + EWMA_WEIGHT * (value - average)
+
+
+def _backoff(consecutive_failures: int) -> Optional[timedelta]:
+    """How long to bench a source after ``consecutive_failures`` failures in a row."""
+    over = consecutive_failures - getattr(settings, "SCRAPER_SOURCE_FAILURE_THRESHOLD", 3)
+    if over < 0:
+        return None
+    base = getattr(settings, "SCRAPER_SOURCE_BACKOFF_MINUTES", 30)
+    cap = getattr(settings, "SCRAPER_SOURCE_MAX_BACKOFF_MINUTES", 1440)
+    return timedelta(minutes=min(base * 2 ** over, cap))
+
+
+def record_source_result(result: Dict, incremental: bool = False, now=None) -> SourceHealth:
+    """
+    Fold one site result into its source's index. Only incremental runs
+    report how many jobs were new, so full scrapes leave the yield alone.
+    """
+    now = now or timezone.now()
+    succeeded = bool(result.get("success"))
+    found = result.get("total_found", 0)
+
+    with transaction.atomic():
+        health, _ = SourceHealth.objects.select_for_update().get_or_create(source=result.get("source") or "OTHER")
+        health.failure_rate = _ewma(health.failure_rate, 0.0 if succeeded else 1.0, health.runs == 0)
+        health.runs += 1
+        if "elapsed" in result:
+            health.avg_latency_seconds = _ewma(health.avg_latency_seconds, result["elapsed"], health.timed_runs == 0)
+            health.timed_runs += 1
+
+        if succeeded:
+            health.jobs_found += found
+            health.consecutive_failures = 0
+            health.retry_after = None
+            health.last_success_at = now
+            if incremental:
+                health.new_jobs += found
+                health.avg_new_jobs = _ewma(health.avg_new_jobs, found, health.incremental_runs == 0)
+                health.incremental_runs += 1
+                if found:
+                    health.last_new_job_at = now
+        else:
+            health.failures += 1
+            health.consecutive_failures += 1
+            health.last_failure_at = now
+            health.last_error = (result.get("error") or "")[:1000]
+            backoff = _backoff(health.consecutive_failures)
+            if backoff:
+                health.retry_after = now + backoff
+
+        health.save()
+    return health
+
+
+def plan_sources(sources: List[str], now=None) -> List[str]:
+    """
+    Drop benched sources and order the rest by ``SourceHealth.priority``.
+    Sources without a row yet go first so they get measured.
+    """
+    now = now or timezone.now()
+    index = {health.source: health for health in SourceHealth.objects.filter(source__in=sources)}
+    available = [source for source in sources if source not in index or index[source].is_available(now)]
+    return sorted(available, key=lambda source: -index[source].priority if source in index else float("-inf"))
@@ -1,21 +1,54 @@
 import json
 import sys
 import types
+from contextlib import contextmanager
 from datetime import timedelta
 from unittest.mock import Mock, patch
 
 from django.contrib.auth import get_user_model
-from django.db import IntegrityError
-from django.test import TestCase
+from django.core.cache import cache
+from django.db import IntegrityError, NotSupportedError, connection
+from django.db.models.constants import OnConflict
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 
-from jobs.ai_global_sort import is_ai_score_stale, rank_jobs_for_queryset
+from jobs.ai_global_sort import (
+    compute_scores_for_job_ids,
+    is_ai_score_stale,
+    mark_scores_pending,
+    rank_jobs_for_queryset,
+    save_ai_score_results,
+)
+from jobs.ai_matching import get_ai_match_scores_batch
 from jobs.models import JobPosting, UserJobAIScore
 
 User = get_user_model()
 
 
+@contextmanager
+def mysql_style_upsert():
+    """
+    Make bulk upserts on the test database behave like MySQL's: no conflict
+    target is supported, and ``ON DUPLICATE KEY UPDATE`` (here SQLite's
+    target-less ``ON CONFLICT DO UPDATE``) applies to any unique key.
+    """
+    def on_conflict_suffix_sql(fields, on_conflict, update_fields, unique_fields):
+        unique_fields = list(unique_fields)
+        if unique_fields:
+            raise NotSupportedError("This backend does not support conflict targets")
+        if on_conflict != OnConflict.UPDATE:
+            return original(fields, on_conflict, update_fields, unique_fields)
+        quoted = [connection.ops.quote_name(field) for field in update_fields]
+        return "ON CONFLICT DO UPDATE SET " + ", ".join(f"{field} = EXCLUDED.{field}" for field in quoted)
+
+    original = connection.ops.on_conflict_suffix_sql
+    with patch.object(connection.features, "supports_update_conflicts_with_target", False), \
+            patch.object(connection.ops, "on_conflict_suffix_sql", on_conflict_suffix_sql):
+        yield
+
+
 class UserJobAIScoreModelTests(TestCase):
     def setUp(self):
         self.user = User.objects.create_user(
@@ -52,7 +85,7 @@ class UserJobAIScoreModelTests(TestCase):
                 computed_at=timezone.now(),
             )
 
-    def test_stale_detection_profile_version_and_job_update(self):
+    def test_stale_detection_profile_version_ignores_job_timestamp(self):
         now = timezone.now()
         JobPosting.objects.filter(id=self.job.id).update(updated_at=now - timedelta(minutes=5))
         self.job.refresh_from_db()
@@ -69,9 +102,93 @@ class UserJobAIScoreModelTests(TestCase):
         self.assertFalse(is_ai_score_stale(row, self.job, 5))
         self.assertTrue(is_ai_score_stale(row, self.job, 6))
 
+        # Edits are handled by invalidate_job_scores(); a newer updated_at
+        # alone no longer discards the score.
         JobPosting.objects.filter(id=self.job.id).update(updated_at=now + timedelta(minutes=1))
         self.job.refresh_from_db()
-        self.assertTrue(is_ai_score_stale(row, self.job, 5))
+        self.assertFalse(is_ai_score_stale(row, self.job, 5))
+
+    def _save_ready_score(self, score=82):
+        save_ai_score_results(
+            user=self.user,
+            jobs_by_id={self.job.id: self.job},
+            profile_version=5,
+            results={self.job.id: {"score": score, "reason": "ok", "strengths": [], "gaps": []}},
+        )
+        return UserJobAIScore.objects.get(user=self.user, job=self.job)
+
+    def test_cosmetic_job_edit_keeps_ranking_entry(self):
+        row = self._save_ready_score()
+        self.assertTrue(row.job_digest)
+
+        self.job.is_featured = True
+        self.job.save()
+
+        row.refresh_from_db()
+        self.assertEqual(row.status, UserJobAIScore.Status.READY)
+        self.assertIsNotNone(row.rank_key)
+
+    def test_posted_date_change_rekeys_entry_in_place(self):
+        row = self._save_ready_score()
+        self.job.posted_date = self.job.posted_date + timedelta(days=1)
+        self.job.save()
+
+        row.refresh_from_db()
+        self.assertEqual(row.status, UserJobAIScore.Status.READY)
+        self.assertEqual(row.rank_key, UserJobAIScore.compute_rank_key(82, self.job.posted_date))
+
+    def test_content_edit_removes_entry_until_rescored(self):
+        row = self._save_ready_score()
+        self.job.job_description = "Build APIs and maintain pipelines"
+        self.job.save()
+
+        row.refresh_from_db()
+        self.assertEqual(row.status, UserJobAIScore.Status.PENDING)
+        self.assertIsNone(row.rank_key)
+
+    def test_rescoring_a_loaded_row_does_not_fetch_the_job(self):
+        self._save_ready_score()
+        row = UserJobAIScore.objects.get(user=self.user, job=self.job)
+
+        row.score = 91
+        with CaptureQueriesContext(connection) as queries:
+            row.save()
+
+        self.assertFalse([q for q in queries.captured_queries if "jobs_jobposting" in q["sql"]])
+        row.refresh_from_db()
+        self.assertEqual(row.rank_key, UserJobAIScore.compute_rank_key(91, self.job.posted_date))
+
+    def _user_with_checked_profile(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return User.objects.create_user(username="ai_profile_user", email="ai_profile_user@example.com")
+
+    def test_profile_save_without_ai_relevant_change_keeps_version(self):
+        user = self._user_with_checked_profile()
+        profile = user.profile
+        with self.captureOnCommitCallbacks(execute=True):
+            profile.save()
+        version = cache.get(f"ai_profile_version_{user.id}")
+        self.assertIsNotNone(version)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            profile.save()
+        self.assertEqual(cache.get(f"ai_profile_version_{user.id}"), version)
+
+    def test_profile_changes_are_checked_once_per_transaction_after_commit(self):
+        from accounts.models import Skill
+        from jobs import ai_matching
+
+        user = self._user_with_checked_profile()
+        cache.delete(f"ai_profile_version_{user.id}")
+        profile = user.profile
+        with patch("jobs.ai_matching.build_user_profile", wraps=ai_matching.build_user_profile) as build, \
+                self.captureOnCommitCallbacks(execute=True):
+            for name in ("Python", "Django", "SQL"):
+                Skill.objects.create(profile=profile, name=name, skill_type="TECH", proficiency_level=3)
+            self.assertFalse(build.called)
+
+        build.assert_called_once()
+        self.assertIsNotNone(cache.get(f"ai_profile_version_{user.id}"))
 
 
 class AIGlobalSortServiceTests(TestCase):
@@ -124,7 +241,70 @@ class AIGlobalSortServiceTests(TestCase):
 
         scored_ids = [self.jobs[4].id, self.jobs[1].id]
         remaining = [job.id for job in sorted(self.jobs, key=lambda j: j.posted_date, reverse=True) if job.id not in set(scored_ids)]
-        self.assertEqual(ranked["ordered_ids"], scored_ids + remaining)
+        ordered_ids = list(ranked["queryset"].values_list("id", flat=True))
+        self.assertEqual(ordered_ids, scored_ids + remaining)
+        self.assertEqual((ranked["scored_count"], ranked["total_count"]), (2, 6))
+
+    def test_stale_scores_rank_as_unscored(self):
+        now = timezone.now()
+        old_version = UserJobAIScore.objects.create(
+            user=self.user, job=self.jobs[5], status=UserJobAIScore.Status.READY,
+            score=99, profile_version=0, computed_at=now,
+        )
+        edited_job = UserJobAIScore.objects.create(
+            user=self.user, job=self.jobs[4], status=UserJobAIScore.Status.READY,
+            score=90, profile_version=1, computed_at=now,
+        )
+        fresh = UserJobAIScore.objects.create(
+            user=self.user, job=self.jobs[3], status=UserJobAIScore.Status.READY,
+            score=10, profile_version=1, computed_at=now,
+        )
+        self.assertIsNotNone(old_version.rank_key)
+        self.assertIsNotNone(edited_job.rank_key)
+
+        self.jobs[4].job_description = "Rewritten role description"
+        self.jobs[4].save()
+
+        ranked = rank_jobs_for_queryset(
+            user=self.user,
+            queryset=JobPosting.objects.filter(id__in=[j.id for j in self.jobs]),
+            profile_version=1,
+            compute_batch=False,
+        )
+        ordered_ids = list(ranked["queryset"].values_list("id", flat=True))
+        self.assertEqual(ordered_ids[0], fresh.job_id)
+        self.assertEqual(ranked["scored_count"], 1)
+
+    def test_ranked_page_query_has_no_per_job_case(self):
+        ranked = rank_jobs_for_queryset(
+            user=self.user,
+            queryset=JobPosting.objects.filter(id__in=[j.id for j in self.jobs]),
+            profile_version=1,
+            compute_batch=False,
+        )
+        sql = str(ranked["queryset"].query).upper()
+        self.assertNotIn("CASE", sql)
+        self.assertIn("RANK_KEY", sql)
+
+    @patch("jobs.ai_global_sort.get_ai_match_scores_batch")
+    def test_compute_batch_scores_newest_unscored_jobs_not_in_flight(self, mock_batch):
+        mock_batch.side_effect = lambda user, jobs: {
+            job.id: {"score": 50, "reason": "ok", "strengths": [], "gaps": []} for job in jobs
+        }
+        mark_scores_pending(self.user, [self.jobs[0].id], 1)
+
+        ranked = rank_jobs_for_queryset(
+            user=self.user,
+            queryset=JobPosting.objects.filter(id__in=[j.id for j in self.jobs]),
+            profile_version=1,
+            batch_size=2,
+        )
+
+        scored_jobs = [job.id for call in mock_batch.call_args_list for job in call.args[1]]
+        self.assertEqual(scored_jobs, [self.jobs[1].id, self.jobs[2].id])
+        self.assertEqual(ranked["computed_now"], 2)
+        self.assertEqual(ranked["scored_count"], 2)
+        self.assertEqual(ranked["pending_count"], 4)
 
 
 class AIGlobalSortViewTests(TestCase):
@@ -166,7 +346,7 @@ class AIGlobalSortViewTests(TestCase):
     def test_job_list_ai_global_applies_rank_before_pagination(self, mock_rank, _mock_ai_state):
         ordered_ids = [job.id for job in reversed(self.jobs)]
         mock_rank.return_value = {
-            "ordered_ids": ordered_ids,
+            "queryset": JobPosting.objects.filter(id__in=ordered_ids).order_by("posted_date"),
             "scored_count": 8,
             "pending_count": 7,
             "total_count": 15,
@@ -184,7 +364,7 @@ class AIGlobalSortViewTests(TestCase):
     @patch("jobs.views.rank_jobs_for_queryset")
     def test_ai_global_progress_endpoint_returns_counts(self, mock_rank, _mock_ai_state):
         mock_rank.return_value = {
-            "ordered_ids": [job.id for job in self.jobs],
+            "queryset": JobPosting.objects.none(),
             "scored_count": 5,
             "pending_count": 10,
             "total_count": 15,
@@ -293,6 +473,8 @@ class AIGlobalSortViewTests(TestCase):
             source_type="INTERNAL",
             job_type="FULL_TIME",
             salary_range="₱40,000 - ₱55,000",
+            salary_min_php=40000,
+            salary_max_php=55000,
             posted_date=timezone.now(),
         )
 
@@ -331,3 +513,177 @@ class AIGlobalSortViewTests(TestCase):
         response = self.client.get(reverse("jobs:job_list"))
         self.assertContains(response, 'id="openFilterSheetBtn"')
         self.assertContains(response, 'id="mobileSortSelect"')
+
+
+class AIBatchScoringTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="ai_batch_user",
+            email="ai_batch_user@example.com",
+            password="testpass123",
+        )
+        self.jobs = [
+            JobPosting.objects.create(
+                job_title=f"Batch Role {i}",
+                company_name="Acme",
+                location="Dumaguete",
+                job_type="FULL_TIME",
+                job_description="Role description",
+                posted_by=self.user,
+            )
+            for i in range(3)
+        ]
+
+    def _mock_client(self, payload_for_prompt):
+        client = Mock()
+
+        def generate_content(model, contents, config=None):
+            return types.SimpleNamespace(text=json.dumps(payload_for_prompt(contents)))
+
+        client.models.generate_content.side_effect = generate_content
+        return client
+
+    def _scores_for(self, prompt):
+        return [
+            {"job_id": job.id, "score": 50 + job.id % 10, "reason": "ok", "strengths": [], "gaps": []}
+            for job in self.jobs
+            if f'"job_id": {job.id}' in prompt
+        ]
+
+    @patch("jobs.ai_matching.build_user_profile", return_value={"skills": ["Python"]})
+    def test_batch_scores_all_jobs_with_one_request(self, _mock_profile):
+        client = self._mock_client(self._scores_for)
+        with patch("jobs.ai_matching._get_gemini_client", return_value=(client, "gemini-2.0-flash")):
+            results = get_ai_match_scores_batch(self.user, self.jobs)
+
+        self.assertEqual(client.models.generate_content.call_count, 1)
+        self.assertEqual(set(results), {job.id for job in self.jobs})
+        self.assertTrue(all(not r.get("error") for r in results.values()))
+
+        # Second call is served entirely from the per-job cache.
+        with patch("jobs.ai_matching._get_gemini_client", return_value=(client, "gemini-2.0-flash")):
+            cached = get_ai_match_scores_batch(self.user, self.jobs)
+        self.assertEqual(client.models.generate_content.call_count, 1)
+        self.assertTrue(all(r["cached"] for r in cached.values()))
+
+    @patch("jobs.ai_matching.build_user_profile", return_value={"skills": ["Python"]})
+    def test_batch_marks_omitted_jobs_as_failed(self, _mock_profile):
+        omitted = self.jobs[-1]
+        client = self._mock_client(
+            lambda prompt: [item for item in self._scores_for(prompt) if item["job_id"] != omitted.id]
+        )
+        with patch("jobs.ai_matching._get_gemini_client", return_value=(client, "gemini-2.0-flash")):
+            results = get_ai_match_scores_batch(self.user, self.jobs)
+
+        self.assertTrue(results[omitted.id]["error"])
+        self.assertIsNone(results[omitted.id]["score"])
+
+    @override_settings(AI_GLOBAL_PROMPT_BATCH_SIZE=2)
+    @patch("jobs.ai_matching.build_user_profile", return_value={"skills": ["Python"]})
+    def test_compute_scores_groups_jobs_into_prompt_batches(self, _mock_profile):
+        client = self._mock_client(self._scores_for)
+        with patch("jobs.ai_matching._get_gemini_client", return_value=(client, "gemini-2.0-flash")):
+            processed = compute_scores_for_job_ids(
+                user=self.user,
+                jobs_by_id={job.id: job for job in self.jobs},
+                job_ids=[job.id for job in self.jobs],
+                profile_version=1,
+            )
+
+        self.assertEqual(processed, 3)
+        self.assertEqual(client.models.generate_content.call_count, 2)
+        self.assertEqual(
+            UserJobAIScore.objects.filter(user=self.user, status=UserJobAIScore.Status.READY).count(),
+            3,
+        )
+
+
+class AIScoreBulkWriteTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="ai_bulk_user",
+            email="ai_bulk_user@example.com",
+            password="testpass123",
+        )
+        self.jobs = [
+            JobPosting.objects.create(
+                job_title=f"Bulk Role {i}",
+                company_name="Acme",
+                location="Dumaguete",
+                job_type="FULL_TIME",
+                job_description="Role description",
+                posted_by=self.user,
+            )
+            for i in range(100)
+        ]
+        self.jobs_by_id = {job.id: job for job in self.jobs}
+
+    def test_mark_pending_preserves_existing_score_fields(self):
+        existing = UserJobAIScore.objects.create(
+            user=self.user,
+            job=self.jobs[0],
+            status=UserJobAIScore.Status.READY,
+            score=88,
+            reason="Strong fit",
+            profile_version=1,
+            computed_at=timezone.now(),
+        )
+
+        mark_scores_pending(self.user, [job.id for job in self.jobs], 2)
+
+        existing.refresh_from_db()
+        self.assertEqual(existing.status, UserJobAIScore.Status.PENDING)
+        self.assertEqual(existing.profile_version, 2)
+        self.assertEqual(existing.score, 88)
+        self.assertEqual(existing.reason, "Strong fit")
+        self.assertEqual(UserJobAIScore.objects.filter(user=self.user).count(), 100)
+
+    def test_upsert_without_conflict_target_support(self):
+        existing = UserJobAIScore.objects.create(
+            user=self.user,
+            job=self.jobs[0],
+            status=UserJobAIScore.Status.READY,
+            score=88,
+            profile_version=1,
+            computed_at=timezone.now(),
+        )
+        job_ids = [job.id for job in self.jobs[:3]]
+
+        with mysql_style_upsert():
+            mark_scores_pending(self.user, job_ids, 2)
+            save_ai_score_results(
+                user=self.user,
+                jobs_by_id=self.jobs_by_id,
+                profile_version=2,
+                results={job_id: {"score": 70, "reason": "ok"} for job_id in job_ids},
+            )
+
+        existing.refresh_from_db()
+        self.assertEqual((existing.status, existing.score, existing.profile_version), (UserJobAIScore.Status.READY, 70, 2))
+        self.assertEqual(UserJobAIScore.objects.filter(user=self.user).count(), 3)
+
+    def test_bulk_writers_use_constant_queries_per_100_jobs(self):
+        job_ids = list(self.jobs_by_id)
+        results = {job_id: {"score": 140, "reason": "ok"} for job_id in job_ids}
+        results[job_ids[0]] = {"error": True, "score": None, "reason": "boom"}
+
+        with CaptureQueriesContext(connection) as pending_ctx:
+            mark_scores_pending(self.user, job_ids, 1)
+        with CaptureQueriesContext(connection) as results_ctx:
+            save_ai_score_results(
+                user=self.user,
+                jobs_by_id=self.jobs_by_id,
+                profile_version=1,
+                results=results,
+            )
+
+        # Batching depends on the backend's parameter limit, never on row count.
+        self.assertLessEqual(len(pending_ctx.captured_queries), 3)
+        self.assertLessEqual(len(results_ctx.captured_queries), 3)
+
+        rows = UserJobAIScore.objects.filter(user=self.user)
+        self.assertEqual(rows.filter(status=UserJobAIScore.Status.READY, score=100).count(), 99)
+        failed = rows.get(job_id=job_ids[0])
+        self.assertEqual(failed.status, UserJobAIScore.Status.FAILED)
+        self.assertEqual(failed.error_message, "boom")
@@ -0,0 +1,107 @@
+import json
+import types
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import Mock, patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from jobs.ai_matching import (
+    _MatchInputs,
+    _store_results,
+    get_ai_match_score,
+    get_ai_match_scores_batch,
+    get_single_flight_metrics,
+)
+from jobs.models import AIMatchResult, JobPosting
+from jobs.tests_ai_global_sort import mysql_style_upsert
+
+User = get_user_model()
+
+
+@patch("jobs.ai_matching.build_user_profile", return_value={"skills": ["Python (Expert, 3 yrs)"]})
+class AIMatchResultStoreTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="ai_store_user",
+            email="ai_store_user@example.com",
+            password="testpass123",
+        )
+        self.job = JobPosting.objects.create(
+            job_title="Backend Developer",
+            company_name="Acme",
+            location="Dumaguete",
+            job_description="Build APIs",
+            posted_by=self.user,
+        )
+        self.client_mock = Mock()
+        self.client_mock.models.generate_content.return_value = types.SimpleNamespace(
+            text=json.dumps({"score": 77, "reason": "ok", "strengths": ["Python"], "gaps": []})
+        )
+
+    def _score(self, user=None):
+        with patch("jobs.ai_matching._get_gemini_client", return_value=(self.client_mock, "gemini")):
+            return get_ai_match_score(user or self.user, self.job)
+
+    def test_result_survives_cache_flush_and_cosmetic_edit(self, _mock_profile):
+        self.assertEqual(self._score()["score"], 77)
+        self.assertEqual(AIMatchResult.objects.count(), 1)
+
+        cache.clear()
+        self.job.is_featured = True
+        self.job.save()
+
+        result = self._score()
+        self.assertEqual(result["score"], 77)
+        self.assertTrue(result["cached"])
+        self.assertEqual(self.client_mock.models.generate_content.call_count, 1)
+        self.assertEqual(get_single_flight_metrics()["durable_hits"], 1)
+
+    def test_results_persist_without_conflict_target_support(self, _mock_profile):
+        with mysql_style_upsert():
+            self._score()
+            inputs = _MatchInputs(self.user, [self.job])
+            _store_results(inputs, {self.job.id: {"score": 64, "reason": "rescored", "strengths": [], "gaps": []}})
+
+        stored = AIMatchResult.objects.get()
+        self.assertEqual((stored.score, stored.reason), (64, "rescored"))
+
+    def test_failed_durable_write_is_logged(self, _mock_profile):
+        with patch.object(AIMatchResult.objects, "bulk_create", side_effect=RuntimeError("boom")), \
+                self.assertLogs("jobs.ai_matching", level="ERROR") as logs:
+            self.assertEqual(self._score()["score"], 77)
+        self.assertIn("boom", logs.output[0])
+
+    def test_identical_profiles_share_results(self, _mock_profile):
+        other = User.objects.create_user(
+            username="ai_store_twin",
+            email="ai_store_twin@example.com",
+            password="testpass123",
+        )
+        self._score()
+        with patch("jobs.ai_matching._get_gemini_client", return_value=(self.client_mock, "gemini")):
+            results = get_ai_match_scores_batch(other, [self.job])
+
+        self.assertEqual(results[self.job.id]["score"], 77)
+        self.assertEqual(self.client_mock.models.generate_content.call_count, 1)
+
+    def test_content_change_triggers_new_score(self, _mock_profile):
+        self._score()
+        self.job.job_description = "Build APIs and data pipelines"
+        self.job.save()
+        self._score()
+
+        self.assertEqual(self.client_mock.models.generate_content.call_count, 2)
+        self.assertEqual(AIMatchResult.objects.count(), 2)
+
+    def test_cleanup_removes_unused_results(self, _mock_profile):
+        self._score()
+        AIMatchResult.objects.update(last_used_at=timezone.now() - timedelta(days=60))
+
+        call_command("cleanup_ai_scores", days=30, stdout=StringIO())
+        self.assertFalse(AIMatchResult.objects.exists())
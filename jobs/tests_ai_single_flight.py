@@ -0,0 +1,109 @@
+import json
+import threading
+import types
+from unittest.mock import Mock, patch
+
+from django.core.cache import cache
+from django.test import TransactionTestCase, override_settings
+from django.utils import timezone
+
+from jobs.ai_matching import (
+    _MatchInputs,
+    _lease_key,
+    get_ai_match_score,
+    get_ai_match_scores_batch,
+    get_single_flight_metrics,
+)
+
+
+# Threads use their own database connections, so no wrapping transaction.
+@override_settings(AI_MATCH_WAIT_SECONDS=2, AI_MATCH_POLL_SECONDS=0.01)
+@patch("jobs.ai_matching.build_job_summary", side_effect=lambda job: {"title": f"Role {job.id}"})
+@patch("jobs.ai_matching.build_user_profile", return_value={"skills": ["Python"]})
+class AIMatchSingleFlightTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = types.SimpleNamespace(id=7)
+        now = timezone.now()
+        self.jobs = [types.SimpleNamespace(id=i, updated_at=now) for i in (1, 2)]
+        self.release = threading.Event()
+        self.started = threading.Event()
+
+    def _blocking_client(self, payload):
+        client = Mock()
+
+        def generate_content(model, contents, config=None):
+            self.started.set()
+            self.release.wait(2)
+            return types.SimpleNamespace(text=json.dumps(payload))
+
+        client.models.generate_content.side_effect = generate_content
+        return client
+
+    def _cache_key(self, job):
+        return _MatchInputs(self.user, [job]).cache_keys[job.id]
+
+    def _run_in_thread(self, func, *args):
+        box = {}
+        thread = threading.Thread(target=lambda: box.setdefault("result", func(*args)))
+        thread.start()
+        return thread, box
+
+    def test_concurrent_single_calls_share_one_upstream_request(self, *_mocks):
+        client = self._blocking_client({"score": 81, "reason": "ok", "strengths": [], "gaps": []})
+        with patch("jobs.ai_matching._get_gemini_client", return_value=(client, "gemini")):
+            leader, leader_box = self._run_in_thread(get_ai_match_score, self.user, self.jobs[0])
+            self.assertTrue(self.started.wait(2))
+            follower, follower_box = self._run_in_thread(get_ai_match_score, self.user, self.jobs[0])
+            self.release.set()
+            leader.join(3)
+            follower.join(3)
+
+        self.assertEqual(client.models.generate_content.call_count, 1)
+        self.assertEqual(leader_box["result"]["score"], 81)
+        self.assertEqual(follower_box["result"]["score"], 81)
+        self.assertEqual(get_single_flight_metrics(), {
+            "hits": 0, "durable_hits": 0, "coalesced": 1, "upstream_calls": 1, "pending": 0,
+        })
+
+        self.assertEqual(get_ai_match_score(self.user, self.jobs[0])["score"], 81)
+        self.assertEqual(get_single_flight_metrics()["hits"], 1)
+        self.assertIsNone(cache.get(_lease_key(self._cache_key(self.jobs[0]))))
+
+    @override_settings(AI_MATCH_WAIT_SECONDS=0.05)
+    def test_returns_pending_when_lease_holder_is_slow(self, *_mocks):
+        cache.add(_lease_key(self._cache_key(self.jobs[0])), "other-worker", 60)
+        client = Mock()
+        with patch("jobs.ai_matching._get_gemini_client", return_value=(client, "gemini")):
+            result = get_ai_match_score(self.user, self.jobs[0])
+
+        self.assertTrue(result["pending"])
+        self.assertIsNone(result["score"])
+        client.models.generate_content.assert_not_called()
+        self.assertEqual(get_single_flight_metrics()["pending"], 1)
+
+    def test_batch_only_sends_jobs_it_holds_the_lease_for(self, *_mocks):
+        busy_key = self._cache_key(self.jobs[1])
+        cache.add(_lease_key(busy_key), "other-worker", 60)
+        self.release.set()
+        client = self._blocking_client([
+            {"job_id": 1, "score": 70, "reason": "ok", "strengths": [], "gaps": []},
+        ])
+
+        def publish_other_result():
+            self.started.wait(2)
+            cache.set(busy_key, {"score": 40, "reason": "other", "strengths": [], "gaps": []})
+            cache.delete(_lease_key(busy_key))
+
+        publisher = threading.Thread(target=publish_other_result)
+        publisher.start()
+        with patch("jobs.ai_matching._get_gemini_client", return_value=(client, "gemini")):
+            results = get_ai_match_scores_batch(self.user, self.jobs)
+        publisher.join(3)
+
+        prompt = client.models.generate_content.call_args.kwargs["contents"]
+        self.assertIn('"job_id": 1', prompt)
+        self.assertNotIn('"job_id": 2', prompt)
+        self.assertEqual(results[1]["score"], 70)
+        self.assertEqual(results[2]["score"], 40)
+        self.assertEqual(get_single_flight_metrics()["coalesced"], 1)
@@ -0,0 +1,256 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from bs4 import BeautifulSoup
+from django.test import SimpleTestCase
+
+from jobs.botasaurus_scrapers import kalibrr_scraper, philjobnet_scraper
+from jobs.botasaurus_scrapers.async_engine import FetchCache, SiteSpec, content_hash, scrape_sites
+from jobs.botasaurus_scrapers.base import build_job_dict, job_signature
+from jobs.botasaurus_scrapers.rate_limit import HostRateLimiter, TokenBucket
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        parts = urlsplit(self.path)
+        query = parse_qs(parts.query)
+        with server.lock:
+            server.hits.append((parts.path, time.monotonic()))
+            server.counts[parts.path] = server.counts.get(parts.path, 0) + 1
+            count = server.counts[parts.path]
+
+        if parts.path == "/slow":
+            time.sleep(2)
+        if parts.path == "/flaky" and count < 3:
+            self._send(503, "try again")
+            return
+
+        etag = f'"{server.version}"'
+        if parts.path == "/etag" and self.headers.get("If-None-Match") == etag:
+            self._send(304, "")
+            return
+
+        page = query.get("page", ["1"])[0]
+        items = "".join(f"<li class='job'>{server.name} p{page} #{i}</li>" for i in range(server.version + 1))
+        self._send(200, f"<ul>{items}</ul>", etag=etag if parts.path == "/etag" else None)
+
+    def _send(self, status, body, etag=None):
+        payload = body.encode()
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        try:
+            self.wfile.write(payload)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # client gave up (deadline test)
+
+    def log_message(self, *args):
+        pass
+
+
+class _StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+
+def _start_stub(name):
+    server = _StubServer(("127.0.0.1", 0), _StubHandler)
+    server.name = name
+    server.lock = threading.Lock()
+    server.hits = []
+    server.counts = {}
+    server.version = 1
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _parse(body, keyword, location):
+    soup = BeautifulSoup(body, "html.parser")
+    return [
+        build_job_dict(title=li.get_text(), company="Stub", location=location, source="STUB")
+        for li in soup.select("li.job")
+    ]
+
+
+def _spec(source, server, path="/search"):
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    return SiteSpec(source, lambda kw, loc, page=1: f"{base}{path}?q={kw}&page={page}", _parse)
+
+
+class AsyncScraperEngineTests(SimpleTestCase):
+    def setUp(self):
+        self.alpha = _start_stub("alpha")
+        self.beta = _start_stub("beta")
+        self.fast_limiter = HostRateLimiter(rate=1000, burst=10)
+
+    def tearDown(self):
+        for server in (self.alpha, self.beta):
+            server.shutdown()
+            server.server_close()
+
+    def _scrape(self, specs, **kwargs):
+        kwargs.setdefault("limiter", self.fast_limiter)
+        kwargs.setdefault("deadline_seconds", 5)
+        return scrape_sites("dev", "Cebu", list(specs), specs=specs, **kwargs)
+
+    def test_pages_every_site_concurrently(self):
+        specs = {"ALPHA": _spec("ALPHA", self.alpha), "BETA": _spec("BETA", self.beta)}
+
+        alpha, beta = self._scrape(specs, pages=3)
+
+        self.assertTrue(alpha["success"])
+        self.assertEqual(alpha["total_found"], 6)
+        self.assertEqual(
+            {job["title"] for job in beta["jobs"]},
+            {f"beta p{page} #{i}" for page in (1, 2, 3) for i in range(2)},
+        )
+
+    def test_requests_to_one_host_follow_its_token_bucket(self):
+        specs = {"ALPHA": _spec("ALPHA", self.alpha), "BETA": _spec("BETA", self.beta)}
+
+        started = time.monotonic()
+        self._scrape(specs, pages=4, limiter=HostRateLimiter(rate=10, burst=1))
+        elapsed = time.monotonic() - started
+
+        for server in (self.alpha, self.beta):
+            times = sorted(t for _, t in server.hits)
+            gaps = [b - a for a, b in zip(times, times[1:])]
+            self.assertTrue(all(gap >= 0.08 for gap in gaps), gaps)
+        # Hosts are throttled independently: ~0.3s each, not ~0.7s in series.
+        self.assertLess(elapsed, 0.6)
+
+    def test_retries_retryable_status_codes(self):
+        specs = {"ALPHA": _spec("ALPHA", self.alpha, path="/flaky")}
+
+        with self.settings(SCRAPER_RETRY_BACKOFF_SECONDS=0.01):
+            (result,) = self._scrape(specs)
+
+        self.assertTrue(result["success"])
+        self.assertEqual(self.alpha.counts["/flaky"], 3)
+
+    def test_deadline_bounds_the_run_by_time_not_by_slowest_site(self):
+        specs = {"ALPHA": _spec("ALPHA", self.alpha, path="/slow"), "BETA": _spec("BETA", self.beta)}
+
+        started = time.monotonic()
+        slow, fast = self._scrape(specs, deadline_seconds=0.5)
+        elapsed = time.monotonic() - started
+
+        self.assertLess(elapsed, 1.5)
+        self.assertFalse(slow["success"])
+        self.assertEqual(slow["source"], "ALPHA")
+        self.assertTrue(fast["success"])
+
+
+    def test_incremental_run_skips_pages_the_server_reports_unchanged(self):
+        specs = {"ALPHA": _spec("ALPHA", self.alpha, path="/etag")}
+        first_cache = FetchCache()
+        (first,) = self._scrape(specs, pages=2, cache=first_cache)
+        self.assertEqual(first["total_found"], 4)
+        self.assertTrue(all(update["changed"] and update["etag"] == '"1"' for update in first_cache.updates.values()))
+
+        cache = FetchCache(validators=first_cache.updates)
+        (second,) = self._scrape(specs, pages=2, cache=cache)
+
+        self.assertTrue(second["success"])
+        self.assertEqual((second["total_found"], second["unchanged_pages"]), (0, 2))
+        self.assertFalse(any(update["changed"] for update in cache.updates.values()))
+
+    def test_incremental_run_returns_only_new_or_changed_cards(self):
+        specs = {"ALPHA": _spec("ALPHA", self.alpha)}
+        (first,) = self._scrape(specs, cache=FetchCache())
+        known = {job["signature"] for job in first["jobs"]}
+
+        self.alpha.version = 2  # page now lists a third job
+        (second,) = self._scrape(specs, cache=FetchCache(known_signatures={"ALPHA": known}))
+
+        self.assertEqual([job["title"] for job in second["jobs"]], ["alpha p1 #2"])
+        self.assertEqual(second["known_jobs"], 2)
+
+    def test_pages_that_fail_to_parse_or_save_keep_no_validators(self):
+        def parse_first_page_only(body, keyword, location):
+            if " p2 " in body:
+                raise ValueError("unexpected markup")
+            return _parse(body, keyword, location)
+
+        spec = _spec("ALPHA", self.alpha, path="/etag")
+        specs = {"ALPHA": SiteSpec("ALPHA", spec.build_search_url, parse_first_page_only)}
+        cache = FetchCache()
+        (result,) = self._scrape(specs, pages=2, cache=cache)
+
+        self.assertTrue(result["success"])
+        self.assertEqual(list(cache.updates), [spec.build_search_url("dev", "Cebu", 1)])
+        self.assertEqual(cache.pending, {})
+
+        # A result that could not be saved is fetched again next time
+        cache = FetchCache()
+        self._scrape({"ALPHA": spec}, cache=cache, on_result=lambda result: 1 / 0)
+        self.assertEqual(cache.updates, {})
+
+    def test_identical_body_without_validators_is_not_parsed(self):
+        specs = {"ALPHA": _spec("ALPHA", self.alpha)}
+        body = "".join(f"<li class='job'>alpha p1 #{i}</li>" for i in range(2))
+        url = specs["ALPHA"].build_search_url("dev", "Cebu", 1)
+        cache = FetchCache(validators={url: {"content_hash": content_hash(f"<ul>{body}</ul>")}})
+
+        (result,) = self._scrape(specs, cache=cache)
+
+        self.assertEqual((result["total_found"], result["unchanged_pages"]), (0, 1))
+
+    def test_signature_tracks_card_fields(self):
+        job = build_job_dict(title="Nurse", company="Clinic", location="Cebu", salary="20,000")
+
+        self.assertEqual(job_signature(job), job_signature({**job, "title": "  NURSE "}))
+        self.assertNotEqual(job_signature(job), job_signature({**job, "salary": "25,000"}))
+
+
+class TokenBucketTests(SimpleTestCase):
+    def test_reservations_queue_up_behind_the_burst(self):
+        bucket = TokenBucket(rate=10, capacity=2)
+
+        delays = [bucket.reserve() for _ in range(4)]
+
+        self.assertEqual(delays[:2], [0.0, 0.0])
+        self.assertAlmostEqual(delays[2], 0.1, places=2)
+        self.assertAlmostEqual(delays[3], 0.2, places=2)
+
+    def test_reservation_beyond_max_wait_takes_no_token(self):
+        bucket = TokenBucket(rate=1, capacity=1)
+        bucket.reserve()
+
+        self.assertIsNone(bucket.reserve(max_wait=0.1))
+        self.assertAlmostEqual(bucket.reserve(), 1.0, places=1)
+
+
+class SiteParserTests(SimpleTestCase):
+    def test_kalibrr_pages_by_offset_and_parses_api_payload(self):
+        self.assertIn("offset=40", kalibrr_scraper.build_search_url("nurse", "Cebu", page=3))
+
+        jobs = kalibrr_scraper.parse_search_results(
+            '{"jobs": [{"title": "Nurse", "company": {"name": "Clinic"}, "slug": "nurse-1"}]}',
+            "nurse",
+            "Cebu",
+        )
+
+        self.assertEqual(jobs[0]["company"], "Clinic")
+        self.assertEqual(jobs[0]["url"], "https://www.kalibrr.com/jobs/nurse-1")
+
+    def test_philjobnet_detail_page_overrides_search_card(self):
+        (job,) = philjobnet_scraper.parse_search_results(
+            "<a href='/job-vacancies/job/1'>Clerk Salary 10,000</a>", "clerk", "Dumaguete",
+        )
+        self.assertEqual(job["title"], "Clerk")
+
+        detailed = philjobnet_scraper.apply_job_detail(
+            job,
+            "<h1 class='jobtitle'>Records Clerk</h1><span class='companytitle'>LGU</span>",
+            "Dumaguete",
+        )
+
+        self.assertEqual(detailed["title"], "Records Clerk")
+        self.assertEqual(detailed["company"], "LGU")
+        self.assertEqual(detailed["url"], "https://philjobnet.gov.ph/job-vacancies/job/1")
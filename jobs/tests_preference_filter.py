@@ -0,0 +1,82 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+
+from accounts.models import Skill
+from jobs.models import JobPosting, JobPreference
+from jobs.preference_filter import PreferenceFilterService
+
+User = get_user_model()
+
+
+class PreferenceFilterBatchScoringTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="pref_batch_user",
+            email="pref_batch_user@example.com",
+            password="testpass123",
+        )
+        Skill.objects.create(profile=self.user.profile, name="Python", skill_type="TECH", proficiency_level=4, years_of_experience=3)
+        Skill.objects.create(profile=self.user.profile, name="SQL", skill_type="TECH", proficiency_level=2, years_of_experience=1)
+
+        self.preferences = JobPreference.objects.get(user=self.user)
+        self.preferences.is_configured = True
+        self.preferences.industries = ["technology"]
+        self.preferences.experience_levels = ["MID"]
+        self.preferences.location_text = "Dumaguete, Cebu"
+        self.preferences.willing_to_relocate = True
+        self.preferences.skill_matching_enabled = True
+        self.preferences.skill_match_threshold = 20
+        self.preferences.save()
+
+        specs = [
+            ("technology", "MID", "Dumaguete City", "Python, SQL"),
+            ("technology", "ENTRY", "Manila", "Python, Java, Go"),
+            ("finance", "MID", "Cebu", "SQL, Excel"),
+            ("healthcare", "SENIOR", "Davao", "Patient Care"),
+            ("technology", "MID", "Remote", ""),
+        ]
+        self.jobs = [
+            JobPosting.objects.create(
+                job_title=f"Role {i}",
+                company_name="Acme",
+                location=location,
+                category=category,
+                experience_level=level,
+                job_description="Role description",
+                skills_required=skills,
+                posted_by=self.user,
+            )
+            for i, (category, level, location, skills) in enumerate(specs)
+        ]
+
+    def _reference_scores(self, service):
+        expected = []
+        for job in JobPosting.objects.filter(is_active=True):
+            preference_score = service.calculate_match_score(job)
+            skill_score = service.get_skill_match_score(job)
+            if skill_score < self.preferences.skill_match_threshold:
+                continue
+            expected.append((job.id, int(preference_score * 0.7 + skill_score * 0.3)))
+        expected.sort(key=lambda item: item[1], reverse=True)
+        return expected
+
+    def test_batch_scores_match_per_job_scoring(self):
+        service = PreferenceFilterService(self.user, self.preferences)
+        expected = self._reference_scores(service)
+
+        self.assertEqual(service.get_filtered_job_scores(), expected)
+        self.assertNotIn(self.jobs[3].id, [job_id for job_id, _ in expected])
+        self.assertNotIn(self.jobs[4].id, [job_id for job_id, _ in expected])
+
+    def test_cache_holds_id_score_pairs_only(self):
+        service = PreferenceFilterService(self.user, self.preferences)
+        matches = service.get_filtered_jobs()
+
+        cached = cache.get(service.cache_key)
+        self.assertTrue(all(isinstance(item, tuple) and len(item) == 2 for item in cached))
+        self.assertEqual([(m["job"].id, m["score"]) for m in matches], cached)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(PreferenceFilterService(self.user, self.preferences).get_filtered_job_scores(), cached)
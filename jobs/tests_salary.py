@@ -0,0 +1,82 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+
+from jobs.models import JobPosting, JobPreference
+from jobs.preference_filter import PreferenceFilterService
+from jobs.salary import parse_salary_bounds
+
+User = get_user_model()
+
+
+class ParseSalaryBoundsTests(SimpleTestCase):
+    def test_supported_formats(self):
+        cases = {
+            "₱20,000 - ₱30,000": (20000, 30000),
+            "20K-30K": (20000, 30000),
+            "20-30k": (20000, 30000),
+            "Above ₱50,000": (50000, 50000),
+            "₱25,000 monthly": (25000, 25000),
+            "PHP 18,000 to 22,000 per month": (18000, 22000),
+            "salary 30000php": (30000, 30000),
+            "25,000php": (25000, 25000),
+            "20k-30kphp per month": (20000, 30000),
+            "1.5M yearly": (1500000, 1500000),
+            "Up to ₱40,000.": (40000, 40000),
+            "Negotiable": (None, None),
+            "": (None, None),
+            None: (None, None),
+        }
+        for text, expected in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(parse_salary_bounds(text), expected)
+
+
+class SalaryColumnTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="salary_user",
+            email="salary_user@example.com",
+            password="testpass123",
+        )
+
+    def _job(self, title, salary_range):
+        return JobPosting.objects.create(
+            job_title=title,
+            company_name="Acme",
+            location="Dumaguete",
+            job_description="Role description",
+            salary_range=salary_range,
+            posted_by=self.user,
+        )
+
+    def test_columns_filled_on_save(self):
+        job = self._job("Analyst", "₱30,000 - ₱45,000")
+        self.assertEqual((job.salary_min_php, job.salary_max_php), (30000, 45000))
+
+        job.salary_range = ""
+        job.save()
+        job.refresh_from_db()
+        self.assertEqual((job.salary_min_php, job.salary_max_php), (None, None))
+
+    def test_preference_salary_filter_uses_columns(self):
+        high = self._job("Lead", "₱60,000 - ₱80,000")
+        self._job("Junior", "₱15,000 - ₱20,000")
+        self._job("Unknown", "Competitive")
+
+        preferences = JobPreference.objects.get(user=self.user)
+        service = PreferenceFilterService(self.user, preferences)
+        filtered = service.filter_by_salary(JobPosting.objects.all(), 50000)
+        self.assertEqual(list(filtered.values_list("id", flat=True)), [high.id])
+        self.assertIn("salary_min_php", str(filtered.query))
+
+    def test_backfill_command_fills_missing_columns(self):
+        job = self._job("Engineer", "40k-60k")
+        JobPosting.objects.filter(id=job.id).update(salary_min_php=None, salary_max_php=None)
+
+        call_command("backfill_salary_columns", stdout=StringIO())
+
+        job.refresh_from_db()
+        self.assertEqual((job.salary_min_php, job.salary_max_php), (40000, 60000))
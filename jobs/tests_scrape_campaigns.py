@@ -0,0 +1,201 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from jobs.models import JobPosting, ScrapeCampaign, ScrapeRun, SourceHealth
+from jobs.scrape_campaigns import dispatch_due_campaigns
+from jobs.scraper_tasks import run_scrape
+from jobs.source_health import plan_sources, record_source_result
+
+User = get_user_model()
+
+
+def _result(source, found=0, success=True, elapsed=1.0, error=""):
+    jobs = [{"title": f"{source} role {i}", "company": "Acme", "location": "Cebu"} for i in range(found)]
+    return {
+        "success": success, "jobs": jobs, "total_found": found, "source": source,
+        "elapsed": elapsed, "error": error,
+    }
+
+
+@override_settings(SCRAPER_SOURCE_FAILURE_THRESHOLD=2, SCRAPER_SOURCE_BACKOFF_MINUTES=30,
+                   SCRAPER_SOURCE_MAX_BACKOFF_MINUTES=60)
+class SourceHealthTests(TestCase):
+    def test_averages_weight_recent_runs(self):
+        record_source_result(_result("JORA", 10, elapsed=2.0), incremental=True)
+        health = record_source_result(_result("JORA", 0, elapsed=4.0), incremental=True)
+
+        self.assertEqual((health.runs, health.jobs_found, health.new_jobs), (2, 10, 10))
+        self.assertAlmostEqual(health.avg_new_jobs, 7.0)
+        self.assertAlmostEqual(health.avg_latency_seconds, 2.6)
+
+    def test_each_average_starts_from_its_own_first_sample(self):
+        record_source_result({"success": False, "source": "JORA", "total_found": 0, "error": "down"})
+        record_source_result(_result("JORA", 4, elapsed=3.0))
+        health = record_source_result(_result("JORA", 6, elapsed=5.0), incremental=True)
+
+        self.assertEqual((health.runs, health.timed_runs, health.incremental_runs), (3, 2, 1))
+        self.assertAlmostEqual(health.avg_latency_seconds, 3.6)
+        self.assertAlmostEqual(health.avg_new_jobs, 6.0)
+
+    def test_full_scrapes_do_not_count_as_new_jobs(self):
+        health = record_source_result(_result("JORA", 10))
+
+        self.assertEqual((health.jobs_found, health.new_jobs, health.avg_new_jobs), (10, 0, 0.0))
+
+    def test_repeated_failures_bench_the_source_with_growing_backoff(self):
+        now = timezone.now()
+        failed = _result("LINKEDIN", success=False, error="HTTP 429")
+
+        self.assertIsNone(record_source_result(failed, now=now).retry_after)
+        self.assertEqual(record_source_result(failed, now=now).retry_after, now + timedelta(minutes=30))
+        self.assertEqual(record_source_result(failed, now=now).retry_after, now + timedelta(minutes=60))
+        health = record_source_result(failed, now=now)
+        self.assertEqual(health.retry_after, now + timedelta(minutes=60))  # capped
+        self.assertEqual(health.last_error, "HTTP 429")
+
+        self.assertEqual(plan_sources(["LINKEDIN", "JORA"], now=now), ["JORA"])
+        self.assertEqual(plan_sources(["LINKEDIN"], now=now + timedelta(minutes=61)), ["LINKEDIN"])
+
+        health = record_source_result(_result("LINKEDIN", 1))
+        self.assertEqual((health.consecutive_failures, health.retry_after), (0, None))
+
+    def test_plan_orders_unmeasured_then_most_productive_sources(self):
+        record_source_result(_result("JORA", 1, elapsed=10.0), incremental=True)
+        record_source_result(_result("KALIBRR", 8, elapsed=1.0), incremental=True)
+
+        self.assertEqual(plan_sources(["JORA", "KALIBRR", "MYNIMO"]), ["MYNIMO", "KALIBRR", "JORA"])
+
+
+@override_settings(SCRAPER_CAMPAIGN_CONCURRENCY=2, SCRAPER_CAMPAIGN_RUN_TIMEOUT_MINUTES=30)
+class CampaignDispatchTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="campaigns", email="campaigns@example.com", password="x")
+
+    def _campaign(self, name, overdue_minutes=5, **kwargs):
+        return ScrapeCampaign.objects.create(
+            name=name,
+            search_keyword=name,
+            sources=kwargs.pop("sources", ["JORA"]),
+            next_run_at=timezone.now() - timedelta(minutes=overdue_minutes),
+            created_by=self.user,
+            **kwargs,
+        )
+
+    def _dispatch(self):
+        with patch("jobs.scrape_campaigns.enqueue_scrape_run", return_value=True) as enqueue:
+            started = dispatch_due_campaigns()
+        return started, enqueue
+
+    def test_starts_most_overdue_campaigns_up_to_the_cap(self):
+        oldest = self._campaign("oldest", overdue_minutes=30)
+        middle = self._campaign("middle", overdue_minutes=20)
+        newest = self._campaign("newest", overdue_minutes=10)
+        self._campaign("future", overdue_minutes=-10)
+        self._campaign("paused", is_active=False)
+
+        started, enqueue = self._dispatch()
+
+        self.assertEqual(started, 2)
+        self.assertEqual(enqueue.call_count, 2)
+        runs = ScrapeRun.objects.all()
+        self.assertEqual({run.campaign_id for run in runs}, {oldest.pk, middle.pk})
+        self.assertTrue(all(run.incremental and run.sources == ["JORA"] for run in runs))
+        oldest.refresh_from_db()
+        self.assertGreater(oldest.next_run_at, timezone.now() + timedelta(minutes=350))
+
+        # Both slots are taken until those runs finish.
+        self.assertEqual(self._dispatch()[0], 0)
+        runs.update(status=ScrapeRun.Status.COMPLETED)
+        self.assertEqual(self._dispatch()[0], 1)
+        self.assertTrue(ScrapeRun.objects.filter(campaign=newest).exists())
+
+    def test_abandoned_runs_release_their_slot(self):
+        stuck = self._campaign("stuck", overdue_minutes=-100)
+        for _ in range(2):
+            ScrapeRun.objects.create(
+                search_keyword="x", search_location="y", sources=[], campaign=stuck,
+                status=ScrapeRun.Status.RUNNING, scraped_by=self.user,
+            )
+        ScrapeRun.objects.update(created_at=timezone.now() - timedelta(hours=1))
+        self._campaign("due")
+
+        self.assertEqual(self._dispatch()[0], 1)
+        self.assertEqual(ScrapeRun.objects.filter(status=ScrapeRun.Status.FAILED).count(), 2)
+
+    def test_slow_worker_does_not_complete_an_expired_run(self):
+        run = ScrapeRun.objects.create(
+            search_keyword="x", search_location="y", sources=["JORA"], campaign=self._campaign("slow"),
+            scraped_by=self.user,
+        )
+
+        def expire_while_scraping(*args, on_result, **kwargs):
+            ScrapeRun.objects.filter(pk=run.pk).update(
+                status=ScrapeRun.Status.FAILED, error_message="Abandoned: the run did not finish in time",
+            )
+            on_result(_result("JORA", 1))
+            return [_result("JORA", 1)]
+
+        with patch("jobs.scraper_tasks.scrape_all_sites", side_effect=expire_while_scraping):
+            run_scrape(run.pk)
+
+        run.refresh_from_db()
+        self.assertEqual((run.status, run.published), (ScrapeRun.Status.FAILED, 0))
+        self.assertFalse(JobPosting.objects.exists())
+
+    def test_run_expired_while_queued_is_not_started(self):
+        run = ScrapeRun.objects.create(
+            search_keyword="x", search_location="y", sources=["JORA"], campaign=self._campaign("late"),
+            scraped_by=self.user,
+        )
+        ScrapeRun.objects.update(created_at=timezone.now() - timedelta(hours=1))
+        self._dispatch()
+        run.refresh_from_db()
+        self.assertEqual(run.status, ScrapeRun.Status.FAILED)
+
+        with patch("jobs.scraper_tasks.scrape_all_sites") as scrape:
+            self.assertEqual(run_scrape(run.pk), {"sources": 0, "jobs": 0})
+
+        scrape.assert_not_called()
+        run.refresh_from_db()
+        self.assertEqual((run.status, run.started_at), (ScrapeRun.Status.FAILED, None))
+        self.assertFalse(JobPosting.objects.exists())
+
+    def test_campaign_with_every_source_benched_only_advances(self):
+        SourceHealth.objects.create(source="JORA", retry_after=timezone.now() + timedelta(hours=1))
+        campaign = self._campaign("benched")
+
+        self.assertEqual(self._dispatch()[0], 0)
+        campaign.refresh_from_db()
+        self.assertGreater(campaign.next_run_at, timezone.now())
+
+    def test_campaign_run_auto_publishes_new_jobs(self):
+        campaign = self._campaign("nurse", sources=["JORA", "MYNIMO"])
+        with patch("jobs.scrape_campaigns.enqueue_scrape_run", return_value=False), \
+                patch("jobs.scraper_tasks.scrape_all_sites") as scrape:
+            def fake_scrape(*args, on_result, **kwargs):
+                results = [_result("JORA", 2), _result("MYNIMO", success=False, error="down")]
+                for result in results:
+                    on_result(result)
+                return results
+            scrape.side_effect = fake_scrape
+
+            dispatch_due_campaigns()
+
+        run = ScrapeRun.objects.get(campaign=campaign)
+        self.assertEqual((run.status, run.published), (ScrapeRun.Status.COMPLETED, 2))
+        self.assertEqual(JobPosting.objects.filter(posted_by=self.user).count(), 2)
+        self.assertEqual(SourceHealth.objects.get(source="JORA").new_jobs, 2)
+        self.assertEqual(SourceHealth.objects.get(source="MYNIMO").consecutive_failures, 1)
+
+    def test_manual_runs_do_not_publish(self):
+        run = ScrapeRun.objects.create(search_keyword="x", search_location="y", sources=["JORA"], scraped_by=self.user)
+
+        with patch("jobs.scraper_tasks.scrape_all_sites",
+                   side_effect=lambda *a, on_result, **kw: [on_result(_result("JORA", 1)) or _result("JORA", 1)]):
+            run_scrape(run.pk)
+
+        self.assertFalse(JobPosting.objects.exists())
@@ -0,0 +1,88 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from jobs.admin_scraper_utils import publish_multiple_scraped_jobs, publish_scraped_job
+from jobs.models import JobPosting, ScrapedJob
+
+User = get_user_model()
+
+
+class PublishScrapedJobsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="publisher",
+            email="publisher@example.com",
+            password="testpass123",
+        )
+
+    def _scraped(self, *jobs):
+        return ScrapedJob.objects.create(
+            source="JOBSTREET",
+            search_keyword="developer",
+            search_location="Dumaguete",
+            scraped_by=self.user,
+            scraped_data={"jobs": [
+                {"title": title, "company": company, "description": "Role"} for title, company in jobs
+            ]},
+        )
+
+    def _posting(self, title, company, slug):
+        return JobPosting.objects.create(
+            job_title=title,
+            company_name=company,
+            slug=slug,
+            location="Dumaguete",
+            job_description="Existing",
+            posted_by=self.user,
+        )
+
+    def test_skips_existing_and_in_batch_duplicates_case_insensitively(self):
+        self._posting("Python Developer", "Acme", "python-developer-acme")
+        scraped = self._scraped(
+            ("python developer", "ACME"),
+            ("Data Analyst", "Acme"),
+            ("DATA ANALYST", "acme"),
+            ("Job title not available", "Acme"),
+        )
+
+        summary = publish_scraped_job(scraped, self.user)
+
+        self.assertEqual(summary, {"published": 1, "skipped": 3, "errors": 0})
+        self.assertTrue(JobPosting.objects.filter(job_title="Data Analyst").exists())
+
+    def test_inactive_postings_do_not_block_publishing(self):
+        old = self._posting("Nurse", "Clinic", "nurse-clinic")
+        JobPosting.objects.filter(pk=old.pk).update(is_active=False)
+
+        summary = publish_scraped_job(self._scraped(("Nurse", "Clinic")), self.user)
+
+        self.assertEqual(summary["published"], 1)
+        self.assertTrue(JobPosting.objects.filter(slug="nurse-clinic-1").exists())
+
+    def test_slug_suffixes_resolved_against_existing_and_batch(self):
+        self._posting("Cook", "Diner Old", "cook-diner")
+        self._posting("Cook", "Diner Older", "cook-diner-1")
+        first = self._scraped(("Cook", "Diner"))
+        second = self._scraped(("Cook", "Diner!"))  # same slug, different dedup key
+
+        summary = publish_multiple_scraped_jobs([first, second], self.user)
+
+        self.assertEqual(summary["published"], 2)
+        self.assertEqual(
+            set(JobPosting.objects.filter(company_name__startswith="Diner").values_list("slug", flat=True))
+            - {"cook-diner", "cook-diner-1"},
+            {"cook-diner-2", "cook-diner-3"},
+        )
+
+    def test_queries_are_set_based_not_per_job(self):
+        scraped = self._scraped(*[(f"Role {i}", "Acme") for i in range(60)])
+
+        with CaptureQueriesContext(connection) as ctx:
+            summary = publish_scraped_job(scraped, self.user)
+
+        self.assertEqual(summary["published"], 60)
+        # dedup lookup + slug lookup + INSERT batches (split by backend
+        # parameter limits) + savepoint, never one query per job.
+        self.assertLess(len(ctx.captured_queries), 10)
@@ -0,0 +1,284 @@
+import asyncio
+import sys
+import types
+from unittest.mock import Mock, patch
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+
+from jobs.botasaurus_scrapers.async_engine import FetchCache
+from jobs.fetch_cache import load_fetch_cache, save_fetch_cache, search_urls
+from jobs.models import FetchCacheEntry, ScrapedJob, ScrapeRun
+from jobs.scraper_tasks import enqueue_scrape_run, run_scrape
+from jobs.tests_ai_global_sort import mysql_style_upsert
+
+User = get_user_model()
+
+
+def _result(source, jobs=1, success=True, error=""):
+    result = {
+        "success": success,
+        "jobs": [{"title": f"{source} job {i}", "company": "Acme"} for i in range(jobs)],
+        "total_found": jobs,
+        "source": source,
+    }
+    if error:
+        result["error"] = error
+    return result
+
+
+def _staff_user(username):
+    return User.objects.create_user(
+        username=username,
+        email=f"{username}@example.com",
+        password="testpass123",
+        is_staff=True,
+    )
+
+
+# The engine reports results from a worker thread, which needs its own
+# database connection.
+class RunScrapeTests(TransactionTestCase):
+    def setUp(self):
+        self.user = _staff_user("scraper_admin")
+        self.run = ScrapeRun.objects.create(
+            search_keyword="nurse",
+            search_location="Cebu",
+            sources=["JORA", "KALIBRR", "LINKEDIN"],
+            scraped_by=self.user,
+        )
+
+    def test_persists_each_source_as_it_finishes(self):
+        seen_mid_run = {}
+
+        def snapshot():
+            run = ScrapeRun.objects.get(pk=self.run.pk)
+            seen_mid_run.update(
+                status=run.status,
+                states={source: entry["state"] for source, entry in run.progress.items()},
+                records=ScrapedJob.objects.filter(run=run).count(),
+            )
+
+        async def fake_site(fetcher, spec, keyword, location, pages, cache=None):
+            if spec.source == "LINKEDIN":
+                await asyncio.sleep(0.2)  # the other sites finish first
+                await sync_to_async(snapshot, thread_sensitive=True)()
+                return _result("LINKEDIN", 0, success=False, error="HTTP 429")
+            return _result(spec.source, 2 if spec.source == "JORA" else 0)
+
+        with patch("jobs.botasaurus_scrapers.async_engine.scrape_site_async", side_effect=fake_site):
+            summary = run_scrape(self.run.pk)
+
+        # Finished sites were visible to the progress endpoint mid-run.
+        self.assertEqual(seen_mid_run, {
+            "status": "running",
+            "states": {"JORA": "done", "KALIBRR": "done", "LINKEDIN": "pending"},
+            "records": 1,
+        })
+        self.assertEqual(summary, {"sources": 3, "jobs": 2})
+
+        self.run.refresh_from_db()
+        self.assertEqual(self.run.status, ScrapeRun.Status.COMPLETED)
+        self.assertIsNotNone(self.run.finished_at)
+        self.assertEqual(
+            [(row["source"], row["state"], row["total_found"]) for row in self.run.source_progress()],
+            [("JORA", "done", 2), ("KALIBRR", "done", 0), ("LINKEDIN", "failed", 0)],
+        )
+        self.assertEqual(self.run.progress["LINKEDIN"]["error"], "HTTP 429")
+        # Sources without jobs leave no ScrapedJob record.
+        self.assertEqual(list(self.run.scraped_jobs.values_list("source", flat=True)), ["JORA"])
+
+    def test_supersedes_earlier_records_for_same_search(self):
+        older = ScrapedJob.objects.create(
+            search_keyword="nurse",
+            search_location="Cebu",
+            source="JORA",
+            scraped_data={},
+            scraped_by=self.user,
+        )
+
+        with patch("jobs.scraper_tasks.scrape_all_sites",
+                   side_effect=lambda *a, on_result, **kw: [on_result(_result("JORA")) or _result("JORA")]):
+            run_scrape(self.run.pk)
+
+        older.refresh_from_db()
+        self.assertFalse(older.is_active)
+
+    def test_marks_run_failed_when_scrape_raises(self):
+        with patch("jobs.scraper_tasks.scrape_all_sites", side_effect=RuntimeError("boom")):
+            run_scrape(self.run.pk)
+
+        self.run.refresh_from_db()
+        self.assertEqual(self.run.status, ScrapeRun.Status.FAILED)
+        self.assertEqual(self.run.error_message, "boom")
+
+
+class IncrementalScrapeTests(TestCase):
+    def setUp(self):
+        self.user = _staff_user("incremental_admin")
+
+    def test_known_signatures_come_from_the_users_active_records_for_the_search(self):
+        job = {"title": "Nurse", "company": "Clinic", "signature": "abc"}
+        legacy = {"title": "Midwife", "company": "Clinic"}
+        for active, keyword in ((True, "nurse"), (False, "nurse"), (True, "teacher")):
+            ScrapedJob.objects.create(
+                search_keyword=keyword, search_location="Cebu", source="JORA",
+                scraped_data={"jobs": [job, legacy] if active else [{"signature": "stale"}]},
+                is_active=active, scraped_by=self.user,
+            )
+        ScrapedJob.objects.create(
+            search_keyword="nurse", search_location="Cebu", source="JORA",
+            scraped_data={"jobs": [{"signature": "other-admin"}]}, scraped_by=_staff_user("other_admin"),
+        )
+
+        cache = load_fetch_cache("nurse", "Cebu", ["JORA"], pages=1, scraped_by_id=self.user.pk)
+
+        self.assertEqual(len(cache.known_signatures["JORA"]), 2)
+        self.assertIn("abc", cache.known_signatures["JORA"])
+        self.assertNotIn("stale", cache.known_signatures["JORA"])
+        self.assertNotIn("other-admin", cache.known_signatures["JORA"])
+
+    def test_validators_round_trip_and_unchanged_pages_keep_fetched_at(self):
+        url, = search_urls("nurse", "Cebu", ["JORA"], 1)
+        save_fetch_cache(FetchCache(updates={
+            url: {"etag": '"v1"', "last_modified": "", "content_hash": "h1", "changed": True},
+        }))
+        fetched_at = FetchCacheEntry.objects.get().fetched_at
+
+        save_fetch_cache(FetchCache(updates={
+            url: {"etag": '"v1"', "last_modified": "", "content_hash": "h1", "changed": False},
+        }))
+
+        entry = FetchCacheEntry.objects.get()
+        self.assertEqual(entry.fetched_at, fetched_at)
+        self.assertGreater(entry.checked_at, fetched_at)
+        cache = load_fetch_cache("nurse", "Cebu", ["JORA"], pages=1)
+        self.assertEqual(cache.validators[url]["etag"], '"v1"')
+        self.assertEqual(cache.request_headers(url), {"If-None-Match": '"v1"'})
+
+    def test_validators_are_kept_per_user(self):
+        url, = search_urls("nurse", "Cebu", ["JORA"], 1)
+        save_fetch_cache(FetchCache(updates={
+            url: {"etag": '"v1"', "last_modified": "", "content_hash": "h1", "changed": True},
+        }), self.user.pk)
+
+        self.assertIn(url, load_fetch_cache("nurse", "Cebu", ["JORA"], pages=1, scraped_by_id=self.user.pk).validators)
+        other = _staff_user("other_admin")
+        self.assertEqual(load_fetch_cache("nurse", "Cebu", ["JORA"], pages=1, scraped_by_id=other.pk).validators, {})
+
+    def test_validators_upsert_without_conflict_target_support(self):
+        url, = search_urls("nurse", "Cebu", ["JORA"], 1)
+        with mysql_style_upsert():
+            for etag in ('"v1"', '"v2"'):
+                save_fetch_cache(FetchCache(updates={
+                    url: {"etag": etag, "last_modified": "", "content_hash": etag, "changed": True},
+                }))
+
+        self.assertEqual(FetchCacheEntry.objects.get().etag, '"v2"')
+
+    def test_incremental_run_merges_into_the_record_it_supersedes(self):
+        older = ScrapedJob.objects.create(
+            search_keyword="nurse", search_location="Cebu", source="JORA",
+            scraped_data={"jobs": [{"title": "Old"}, {"title": "JORA job 0", "company": "Acme"}]},
+            scraped_by=self.user,
+        )
+        run = ScrapeRun.objects.create(
+            search_keyword="nurse", search_location="Cebu", sources=["JORA"],
+            incremental=True, scraped_by=self.user,
+        )
+
+        def fake_scrape(*args, on_result, fetch_cache, **kwargs):
+            self.assertIsInstance(fetch_cache, FetchCache)
+            result = {**_result("JORA", jobs=2), "known_jobs": 1, "unchanged_pages": 0}
+            on_result(result)
+            return [result]
+
+        with patch("jobs.scraper_tasks.scrape_all_sites", side_effect=fake_scrape):
+            run_scrape(run.pk)
+
+        older.refresh_from_db()
+        self.assertFalse(older.is_active)
+        run.refresh_from_db()
+        self.assertEqual(run.progress["JORA"]["known_jobs"], 1)
+        self.assertEqual(run.progress["JORA"]["total_found"], 2)
+        record = ScrapedJob.objects.get(is_active=True)
+        self.assertEqual(record.run, run)
+        self.assertEqual(
+            [job["title"] for job in record.scraped_data["jobs"]], ["Old", "JORA job 0", "JORA job 1"]
+        )
+        self.assertEqual(record.scraped_data["new_jobs"], 2)
+        self.assertEqual(record.total_found, 3)
+
+
+class ScraperDashboardTests(TestCase):
+    def setUp(self):
+        self.user = _staff_user("dashboard_admin")
+        self.client.force_login(self.user)
+
+    def _post(self):
+        return self.client.post(reverse("jobs:scraper_dashboard"), {
+            "run_scraper": "1",
+            "keyword": "accountant",
+            "location": "Dumaguete",
+            "sources": ["JORA", "MYNIMO"],
+        })
+
+    def test_post_queues_run_without_scraping_in_request(self):
+        dummy_module = types.ModuleType("django_q.tasks")
+        dummy_module.async_task = Mock(return_value="task-123")
+        dummy_package = types.ModuleType("django_q")
+        dummy_package.tasks = dummy_module
+
+        with patch.dict(sys.modules, {"django_q": dummy_package, "django_q.tasks": dummy_module}), \
+                patch("jobs.scraper_tasks.importlib.util.find_spec", return_value=object()), \
+                patch("jobs.scraper_tasks.scrape_all_sites") as mock_scrape:
+            response = self._post()
+
+        self.assertRedirects(response, reverse("jobs:scraper_dashboard"), fetch_redirect_response=False)
+        mock_scrape.assert_not_called()
+        run = ScrapeRun.objects.get()
+        self.assertEqual(run.status, ScrapeRun.Status.QUEUED)
+        self.assertEqual(run.sources, ["JORA", "MYNIMO"])
+        self.assertEqual(run.task_id, "task-123")
+        dummy_module.async_task.assert_called_once_with("jobs.scraper_tasks.run_scrape", run.pk)
+
+    def test_progress_endpoint_reports_per_source_state(self):
+        run = ScrapeRun.objects.create(
+            search_keyword="accountant",
+            search_location="Dumaguete",
+            sources=["JORA", "MYNIMO"],
+            progress={"JORA": {"state": "done", "total_found": 4, "error": ""}},
+            status=ScrapeRun.Status.RUNNING,
+            scraped_by=self.user,
+        )
+
+        payload = self.client.get(reverse("jobs:scrape_run_progress", args=[run.pk])).json()
+
+        self.assertFalse(payload["finished"])
+        self.assertEqual((payload["completed"], payload["total"], payload["total_jobs"]), (1, 2, 4))
+        self.assertEqual([row["state"] for row in payload["sources"]], ["done", "pending"])
+
+    def test_progress_endpoint_hides_other_users_runs(self):
+        run = ScrapeRun.objects.create(
+            search_keyword="x", search_location="y", sources=["JORA"], scraped_by=_staff_user("other_admin"),
+        )
+
+        response = self.client.get(reverse("jobs:scrape_run_progress", args=[run.pk]))
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_enqueue_reports_missing_django_q(self):
+        run = ScrapeRun.objects.create(search_keyword="x", search_location="y", sources=[], scraped_by=self.user)
+
+        with patch("jobs.scraper_tasks.importlib.util.find_spec", return_value=None):
+            self.assertFalse(enqueue_scrape_run(run))
+
+    def test_dashboard_polls_active_runs(self):
+        run = ScrapeRun.objects.create(search_keyword="x", search_location="y", sources=["JORA"], scraped_by=self.user)
+
+        response = self.client.get(reverse("jobs:scraper_dashboard"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, reverse("jobs:scrape_run_progress", args=[run.pk]))
@@ -0,0 +1,133 @@
+from unittest import skipUnless
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from jobs.models import JobPosting
+from jobs.search import (
+    BaseJobSearchBackend,
+    BasicJobSearchBackend,
+    MySQLJobSearchBackend,
+    SQLiteJobSearchBackend,
+    _index_available,
+    get_job_search_backend,
+    search_jobs,
+    tokenize_query,
+)
+
+User = get_user_model()
+
+
+class SearchBackendTestMixin:
+    def setUp(self):
+        _index_available.cache_clear()
+        self.user = User.objects.create_user(
+            username="search_user",
+            email="search_user@example.com",
+            password="testpass123",
+        )
+
+    def tearDown(self):
+        _index_available.cache_clear()
+
+    def _job(self, title, description="General duties", company="Acme", requirements=""):
+        return JobPosting.objects.create(
+            job_title=title,
+            company_name=company,
+            location="Dumaguete",
+            job_description=description,
+            requirements=requirements,
+            posted_by=self.user,
+        )
+
+    def _ids(self, queryset):
+        return list(queryset.values_list("id", flat=True))
+
+
+class TokenizeQueryTests(TestCase):
+    def test_strips_fts_operators(self):
+        self.assertEqual(tokenize_query('"Python" OR dev* -(NEAR)'), ["python", "or", "dev", "near"])
+        self.assertEqual(tokenize_query(""), [])
+        self.assertEqual(tokenize_query(None), [])
+
+
+@skipUnless(connection.vendor == "sqlite", "SQLite FTS5 backend")
+class SQLiteJobSearchBackendTests(SearchBackendTestMixin, TestCase):
+    def test_vendor_backend_selected_when_index_exists(self):
+        self.assertIsInstance(get_job_search_backend(), SQLiteJobSearchBackend)
+
+    def test_index_follows_saves_and_deletes(self):
+        job = self._job("Accountant")
+        self.assertEqual(self._ids(search_jobs(JobPosting.objects.all(), "accountant")), [job.id])
+
+        job.job_title = "Nurse"
+        job.save()
+        self.assertEqual(self._ids(search_jobs(JobPosting.objects.all(), "accountant")), [])
+        self.assertEqual(self._ids(search_jobs(JobPosting.objects.all(), "nurse")), [job.id])
+
+        job.delete()
+        self.assertEqual(self._ids(search_jobs(JobPosting.objects.all(), "nurse")), [])
+
+    def test_prefix_and_multi_term_match(self):
+        match = self._job("Senior Python Developer", requirements="Django experience")
+        self._job("Python Teacher")
+
+        self.assertIn(match.id, self._ids(search_jobs(JobPosting.objects.all(), "pyth")))
+        self.assertEqual(self._ids(search_jobs(JobPosting.objects.all(), "python djan")), [match.id])
+
+    def test_title_match_ranks_above_description_match(self):
+        in_description = self._job("Office Assistant", description="Some exposure to marketing tools")
+        in_title = self._job("Marketing Specialist")
+
+        results = search_jobs(JobPosting.objects.all(), "marketing").order_by("-search_rank")
+        self.assertEqual(self._ids(results), [in_title.id, in_description.id])
+
+    def test_query_of_only_operators_returns_nothing(self):
+        self._job("Accountant")
+        self.assertEqual(self._ids(search_jobs(JobPosting.objects.all(), '"*()')), [])
+
+
+class BasicJobSearchBackendTests(SearchBackendTestMixin, TestCase):
+    @override_settings(JOB_SEARCH_BACKEND="jobs.search.BasicJobSearchBackend")
+    def test_setting_overrides_vendor_choice(self):
+        self.assertIsInstance(get_job_search_backend(), BasicJobSearchBackend)
+
+        job = self._job("Data Analyst")
+        results = search_jobs(JobPosting.objects.all(), "analyst")
+        self.assertEqual(self._ids(results), [job.id])
+        self.assertEqual(results.get().search_rank, 0.0)
+
+    def test_backend_must_implement_search(self):
+        class IncompleteBackend(BaseJobSearchBackend):
+            vendor = "incomplete"
+
+        with self.assertRaises(TypeError):
+            IncompleteBackend()
+
+
+class IndexCheckTests(SearchBackendTestMixin, TestCase):
+    @override_settings(JOB_SEARCH_INDEX_CHECK_SECONDS=60)
+    def test_index_is_checked_again_once_the_result_is_stale(self):
+        with patch("jobs.search.connection.introspection.get_constraints", return_value={}) as inspect, \
+                patch("jobs.search.time.monotonic", side_effect=[0, 30, 61]):
+            for _ in range(3):
+                self.assertFalse(_index_available("postgresql"))
+        self.assertEqual(inspect.call_count, 2)
+
+
+@patch("jobs.search._mysql_min_token_size", return_value=3)
+class MySQLJobSearchBackendTests(SearchBackendTestMixin, TestCase):
+    # Only the generated SQL is checked: MATCH ... AGAINST needs MySQL.
+    def test_words_shorter_than_the_index_minimum_match_by_substring(self, min_size):
+        sql = str(MySQLJobSearchBackend().search(JobPosting.objects.all(), "HR manager").query)
+        self.assertIn("+manager*", sql)
+        self.assertNotIn("+hr*", sql)
+        self.assertIn("%hr%", sql)
+
+    def test_query_of_only_unindexed_words_is_a_substring_scan(self, min_size):
+        job = self._job("IT Support")
+        results = MySQLJobSearchBackend().search(JobPosting.objects.all(), "it")
+        self.assertNotIn("MATCH", str(results.query))
+        self.assertEqual(self._ids(results), [job.id])
@@ -0,0 +1,82 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import Skill, SkillMatch
+from jobs.models import JobPosting, JobSkill
+from jobs.tests_ai_global_sort import mysql_style_upsert
+from jobs.utils import find_matching_jobs, get_job_ids_for_skills, update_skill_matches
+
+User = get_user_model()
+
+
+class JobSkillIndexTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="skill_index_user",
+            email="skill_index_user@example.com",
+            password="testpass123",
+        )
+        self.profile = self.user.profile
+
+    def _job(self, title, skills):
+        return JobPosting.objects.create(
+            job_title=title,
+            company_name="Acme",
+            location="Dumaguete",
+            job_type="FULL_TIME",
+            job_description="Role description",
+            skills_required=skills,
+            posted_by=self.user,
+        )
+
+    def test_index_follows_skills_required_on_save(self):
+        job = self._job("Backend Engineer", "Python,  Django , python, SQL")
+        self.assertEqual(
+            list(JobSkill.objects.filter(job=job).values_list("name", flat=True)),
+            ["python", "django", "sql"],
+        )
+
+        job.skills_required = "Python, Docker"
+        job.save()
+        self.assertEqual(
+            set(JobSkill.objects.filter(job=job).values_list("name", flat=True)),
+            {"python", "docker"},
+        )
+        self.assertEqual(get_job_ids_for_skills(["DOCKER"]), {job.id})
+
+    def test_update_skill_matches_scores_only_overlapping_jobs(self):
+        Skill.objects.create(profile=self.profile, name="Python", skill_type="TECH", proficiency_level=5, years_of_experience=5)
+        Skill.objects.create(profile=self.profile, name="Django", skill_type="TECH", proficiency_level=5, years_of_experience=5)
+        strong = self._job("Django Developer", "Python, Django")
+        partial = self._job("Data Engineer", "Python, Spark")
+        for i in range(10):
+            self._job(f"Nurse {i}", "Patient Care, BLS")
+
+        with CaptureQueriesContext(connection) as ctx:
+            matches = find_matching_jobs(self.profile)
+        self.assertLessEqual(len(ctx.captured_queries), 4)
+        self.assertEqual([job.id for job, *_ in matches], [strong.id])
+
+        summary = update_skill_matches(self.profile)
+        self.assertEqual(summary["new_matches"], 1)
+        self.assertEqual(summary["updated_matches"], 0)
+
+        summary = update_skill_matches(self.profile)
+        self.assertEqual(summary["new_matches"], 0)
+        self.assertEqual(summary["updated_matches"], 1)
+        self.assertEqual(SkillMatch.objects.filter(profile=self.profile).count(), 1)
+        self.assertFalse(SkillMatch.objects.filter(profile=self.profile, job=partial).exists())
+
+    def test_update_skill_matches_without_conflict_target_support(self):
+        Skill.objects.create(profile=self.profile, name="Python", skill_type="TECH", proficiency_level=5, years_of_experience=5)
+        job = self._job("Python Developer", "Python")
+
+        with mysql_style_upsert():
+            self.assertEqual(update_skill_matches(self.profile)["new_matches"], 1)
+            SkillMatch.objects.filter(profile=self.profile).update(is_notified=True)
+            self.assertEqual(update_skill_matches(self.profile)["updated_matches"], 1)
+
+        match = SkillMatch.objects.get(profile=self.profile, job=job)
+        self.assertFalse(match.is_notified)
@@ -31,6 +31,7 @@ urlpatterns = [
     
     # Multi-site job scraper URLs (custom admin dashboard)
     path('scraper/', views_scraper.scraper_dashboard, name='scraper_dashboard'),
+    path('scraper/runs/<int:pk>/progress/', views_scraper.scrape_run_progress, name='scrape_run_progress'),
     path('scraper/publish/<int:pk>/', views_scraper.publish_scraped_job_view, name='publish_scraped_job'),
     path('scraper/delete/<int:pk>/', views_scraper.delete_scraped_job_view, name='delete_scraped_job'),
     
@@ -3,10 +3,12 @@ import json
 import re
 import logging
 from datetime import datetime
+from django.db import connection
 from django.db.models import Q
 from django.utils import timezone
 from accounts.models import Profile, Skill, SkillMatch
-from .models import JobPosting
+from .models import JobPosting, JobSkill
+from .salary import parse_salary_bounds
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +22,7 @@ def calculate_skill_relevancy(
     Returns a score between 0 and 1.
     """
     # Base match on skill name
-    if skill.name.lower() != required_skill_name.lower():
+    if normalize_skill_name(skill.name) != normalize_skill_name(required_skill_name):
         return 0.0
     
     # Calculate proficiency match (0-1)
@@ -49,36 +51,75 @@ def calculate_skill_relevancy(
     
     return weighted_score
 
-def calculate_job_match_score(
-    profile: Profile,
-    job: JobPosting,
-    required_skills_only: bool = False
+def normalize_skill_name(name: str) -> str:
+    """Lowercase and collapse whitespace so skill names compare reliably."""
+    return re.sub(r'\s+', ' ', (name or '').strip().lower())[:100]
+
+
+def parse_required_skills(skills_required: str) -> List[str]:
+    """Split a ``skills_required`` CSV into unique normalized skill names."""
+    names = []
+    seen = set()
+    for raw in (skills_required or '').split(','):
+        name = normalize_skill_name(raw)
+        if name and name not in seen:
+            seen.add(name)
+            names.append(name)
+    return names
+
+
+def sync_job_skill_index(job: JobPosting) -> None:
+    """
+    Bring the ``JobSkill`` rows of a posting in line with its
+    ``skills_required`` text. Only the difference is written.
+    """
+    wanted = parse_required_skills(job.skills_required)
+    existing = set(JobSkill.objects.filter(job=job).values_list('name', flat=True))
+
+    removed = existing.difference(wanted)
+    if removed:
+        JobSkill.objects.filter(job=job, name__in=removed).delete()
+
+    added = [JobSkill(job=job, name=name) for name in wanted if name not in existing]
+    if added:
+        JobSkill.objects.bulk_create(added, ignore_conflicts=True)
+
+
+def get_job_ids_for_skills(skill_names) -> set:
+    """Inverted lookup: ids of postings that require any of ``skill_names``."""
+    names = {normalize_skill_name(name) for name in skill_names}
+    names.discard('')
+    if not names:
+        return set()
+    return set(JobSkill.objects.filter(name__in=names).values_list('job_id', flat=True))
+
+
+def get_profile_skill_map(profile: Profile) -> Dict[str, Skill]:
+    """Fetch a profile's skills once, keyed by normalized name."""
+    return {normalize_skill_name(skill.name): skill for skill in profile.skills.all()}
+
+
+def score_required_skills(
+    user_skills: Dict[str, Skill],
+    required_skills: List[str],
+    job_title: str,
 ) -> Tuple[float, Dict, Dict]:
     """
-    Calculate match score between a user profile and a job posting.
+    Score normalized ``required_skills`` against a pre-fetched skill map.
     Returns a tuple of (match_score, matched_skills_dict, missing_skills_dict).
     """
-    user_skills = {skill.name.lower(): skill for skill in profile.skills.all()}
-    
-    # Get required skills from job posting
-    if job.skills_required:
-        required_skills = [skill.strip() for skill in job.skills_required.split(',') if skill.strip()]
-    else:
-        required_skills = []
-        
     if not required_skills:
         return 0.0, {}, {}
-    
+
     matched_skills = {}
     missing_skills = {}
     total_weight = 0
     match_score = 0
-    
+
     for skill_name in required_skills:
-        skill_name = skill_name.lower()
         weight = 1.0  # Default weight
         total_weight += weight
-        
+
         if skill_name in user_skills:
             relevancy = calculate_skill_relevancy(user_skills[skill_name], skill_name)
             if relevancy > 0:
@@ -91,14 +132,38 @@ def calculate_job_match_score(
                 match_score += relevancy * weight
         else:
             missing_skills[skill_name] = {
-                'description': f"Required for {job.job_title}"
+                'description': f"Required for {job_title}"
             }
-    
+
     # Normalize score to 0-100
     final_score = (match_score / total_weight) * 100 if total_weight > 0 else 0
-    
+
     return final_score, matched_skills, missing_skills
 
+
+def calculate_job_match_score(
+    profile: Profile,
+    job: JobPosting,
+    required_skills_only: bool = False,
+    user_skills: Optional[Dict[str, Skill]] = None,
+) -> Tuple[float, Dict, Dict]:
+    """
+    Calculate match score between a user profile and a job posting.
+    Returns a tuple of (match_score, matched_skills_dict, missing_skills_dict).
+
+    Pass ``user_skills`` (from ``get_profile_skill_map``) when scoring many
+    jobs for the same profile to avoid re-querying the profile's skills.
+    """
+    required_skills = parse_required_skills(job.skills_required)
+    if not required_skills:
+        return 0.0, {}, {}
+
+    if user_skills is None:
+        user_skills = get_profile_skill_map(profile)
+
+    return score_required_skills(user_skills, required_skills, job.job_title)
+
+
 def find_matching_jobs(
     profile: Profile,
     min_match_score: float = 50.0,
@@ -107,17 +172,30 @@ def find_matching_jobs(
     """
     Find matching jobs for a user profile.
     Returns a list of (job, score, matched_skills, missing_skills) tuples.
+
+    Only postings sharing at least one skill with the profile (via the
+    ``JobSkill`` index) are scored; the rest cannot score above zero.
     """
+    user_skills = get_profile_skill_map(profile)
+
     # Get active jobs that haven't been applied to
     active_jobs = JobPosting.objects.filter(is_active=True)
-    
+
     # Exclude jobs the user has already applied to
     if hasattr(profile, 'user'):
         active_jobs = active_jobs.exclude(applications__applicant=profile.user)
-    
+
+    if min_match_score > 0:
+        active_jobs = active_jobs.filter(id__in=get_job_ids_for_skills(user_skills))
+
+    active_jobs = list(active_jobs)
+    required_by_job = {job.id: [] for job in active_jobs}
+    for job_id, name in JobSkill.objects.filter(job_id__in=required_by_job).values_list('job_id', 'name'):
+        required_by_job[job_id].append(name)
+
     matches = []
     for job in active_jobs:
-        score, matched, missing = calculate_job_match_score(profile, job)
+        score, matched, missing = score_required_skills(user_skills, required_by_job[job.id], job.job_title)
         if score >= min_match_score:
             matches.append((job, score, matched, missing))
     
@@ -137,23 +215,34 @@ def update_skill_matches(profile: Profile) -> Dict:
         'updated_matches': 0,
         'timestamp': timezone.now()
     }
-    
-    for job, score, matched_skills, missing_skills in matching_jobs:
-        match, created = SkillMatch.objects.update_or_create(
-            job=job,
-            profile=profile,
-            defaults={
-                'match_score': score,
-                'matched_skills': json.dumps(matched_skills),
-                'missing_skills': json.dumps(missing_skills),
-                'is_notified': False
-            }
-        )
-        
-        if created:
-            summary['new_matches'] += 1
-        else:
-            summary['updated_matches'] += 1
+    if not matching_jobs:
+        return summary
+
+    job_ids = [job.id for job, _, _, _ in matching_jobs]
+    existing_ids = set(
+        SkillMatch.objects.filter(profile=profile, job_id__in=job_ids).values_list('job_id', flat=True)
+    )
+
+    SkillMatch.objects.bulk_create(
+        [
+            SkillMatch(
+                job=job,
+                profile=profile,
+                match_score=score,
+                matched_skills=json.dumps(matched_skills),
+                missing_skills=json.dumps(missing_skills),
+                is_notified=False,
+            )
+            for job, score, matched_skills, missing_skills in matching_jobs
+        ],
+        update_conflicts=True,
+        # MySQL upserts on any unique key and rejects an explicit target
+        unique_fields=['job', 'profile'] if connection.features.supports_update_conflicts_with_target else None,
+        update_fields=['match_score', 'matched_skills', 'missing_skills', 'is_notified'],
+    )
+
+    summary['updated_matches'] = len(existing_ids)
+    summary['new_matches'] = len(job_ids) - len(existing_ids)
     
     return summary
 
@@ -212,46 +301,5 @@ def parse_salary_range(salary_text: str) -> Optional[int]:
     Returns:
         The minimum salary as an integer, or None if unparseable
     """
-    if not salary_text or not isinstance(salary_text, str):
-        return None
-    
-    try:
-        # Clean the text
-        text = salary_text.strip()
-        
-        # Handle "Above ₱50,000" format
-        above_match = re.search(r'above\s*₱?\s*([\d,]+)', text, re.IGNORECASE)
-        if above_match:
-            salary_str = above_match.group(1).replace(',', '')
-            return int(salary_str)
-        
-        # Handle "20K-30K" or "20k-30k" format
-        k_range_match = re.search(r'(\d+)\s*k\s*-\s*(\d+)\s*k', text, re.IGNORECASE)
-        if k_range_match:
-            min_salary = int(k_range_match.group(1)) * 1000
-            return min_salary
-        
-        # Handle single "20K" or "20k" format
-        k_single_match = re.search(r'(\d+)\s*k', text, re.IGNORECASE)
-        if k_single_match:
-            return int(k_single_match.group(1)) * 1000
-        
-        # Handle "₱20,000 - ₱30,000" format
-        range_match = re.search(r'₱?\s*([\d,]+)\s*-\s*₱?\s*([\d,]+)', text)
-        if range_match:
-            min_salary_str = range_match.group(1).replace(',', '')
-            return int(min_salary_str)
-        
-        # Handle single "₱25,000" format
-        single_match = re.search(r'₱?\s*([\d,]+)', text)
-        if single_match:
-            salary_str = single_match.group(1).replace(',', '')
-            return int(salary_str)
-        
-        # If no pattern matches, return None
-        logger.warning(f"Unable to parse salary format: {salary_text}")
-        return None
-        
-    except (ValueError, AttributeError) as e:
-        logger.error(f"Error parsing salary '{salary_text}': {str(e)}")
-        return None 
\ No newline at end of file
+    salary_min, _ = parse_salary_bounds(salary_text)
+    return salary_min
@@ -3,7 +3,7 @@ from django.contrib.auth.decorators import login_required, user_passes_test
 from django.core.paginator import Paginator
 from django.core.cache import cache
 from django.contrib import messages
-from django.db.models import Q, Count
+from django.db.models import Count
 from django.http import JsonResponse, HttpResponse
 from django.template.loader import render_to_string
 from django.utils import timezone
@@ -17,8 +17,8 @@ from .forms import JobPostingForm, JobApplicationForm, RequiredDocumentFormSet,
 from .scraper_forms import JobScraperForm
 from .scraper_utils import scraper
 from .utils import calculate_job_match_score, get_skill_recommendations
+from .search import search_jobs
 from .ai_global_sort import (
-    apply_ordered_ids,
     compute_scores_for_job_ids,
     get_ai_profile_version,
     get_stale_job_ids_for_jobs,
@@ -132,11 +132,11 @@ def _build_job_list_dataset(request, show_all_override=None, include_modal_promp
             show_preference_modal = preference_service.should_show_modal(request.session)
 
         if preferences_configured and not show_all:
-            job_matches = preference_service.get_filtered_jobs()
-            job_ids = [match['job'].id for match in job_matches]
+            job_scores = preference_service.get_filtered_job_scores()
+            job_ids = [job_id for job_id, _ in job_scores]
             jobs = JobPosting.objects.filter(id__in=job_ids).exclude(slug="")
-            matching_jobs_count = len(job_matches)
-            match_data = {match['job'].id: match for match in job_matches}
+            matching_jobs_count = len(job_scores)
+            match_data = {job_id: {'score': score} for job_id, score in job_scores}
             active_filters = _build_active_filters_from_preferences(preference_service.preferences)
 
     return {
@@ -151,31 +151,6 @@ def _build_job_list_dataset(request, show_all_override=None, include_modal_promp
     }
 
 
-def _estimate_salary_max(salary_text: str) -> int | None:
-    """
-    Best-effort parser for salary text (e.g., '₱25,000-₱35,000', '20k-30k').
-    Returns inferred max salary in PHP, or None if not parseable.
-    """
-    if not salary_text:
-        return None
-    text = str(salary_text).lower().replace(',', '')
-    matches = re.findall(r'(\d+(?:\.\d+)?)\s*(k|m)?', text)
-    if not matches:
-        return None
-    values = []
-    for raw, unit in matches:
-        try:
-            val = float(raw)
-        except ValueError:
-            continue
-        if unit == 'k':
-            val *= 1000
-        elif unit == 'm':
-            val *= 1000000
-        values.append(int(val))
-    return max(values) if values else None
-
-
 def _normalize_filter_values(values):
     return {
         'q': str(values.get('q', '') or '').strip(),
@@ -199,12 +174,7 @@ def _apply_filter_values(jobs, filter_values):
     salary_min_raw = filter_values['salary_min']
 
     if query:
-        jobs = jobs.filter(
-            Q(job_title__icontains=query) |
-            Q(company_name__icontains=query) |
-            Q(job_description__icontains=query) |
-            Q(requirements__icontains=query)
-        )
+        jobs = search_jobs(jobs, query)
 
     if location:
         jobs = jobs.filter(location__icontains=location)
@@ -227,13 +197,7 @@ def _apply_filter_values(jobs, filter_values):
             salary_min = None
 
     if salary_min is not None:
-        candidates = jobs.exclude(salary_range__isnull=True).exclude(salary_range__exact='')
-        keep_ids = []
-        for item in candidates.only('id', 'salary_range'):
-            parsed_max = _estimate_salary_max(item.salary_range)
-            if parsed_max is not None and parsed_max >= salary_min:
-                keep_ids.append(item.id)
-        jobs = jobs.filter(id__in=keep_ids)
+        jobs = jobs.filter(salary_max_php__gte=salary_min)
 
     return jobs
 
@@ -324,11 +288,7 @@ def careers(request):
     if category:
         jobs = jobs.filter(category=category)
     if search_query:
-        jobs = jobs.filter(
-            Q(job_title__icontains=search_query) |
-            Q(company_name__icontains=search_query) |
-            Q(job_description__icontains=search_query)
-        )
+        jobs = search_jobs(jobs, search_query)
     
     # Get featured jobs
     featured_jobs = jobs.filter(is_featured=True)[:3]
@@ -477,7 +437,11 @@ def job_list(request):
     if eligible_for_ai_global and not sort_param:
         current_sort = 'ai_global'
 
-    if sort_param not in {'', 'ai_global', 'latest', 'updated'}:
+    if sort_param not in {'', 'ai_global', 'latest', 'updated', 'relevance'}:
+        current_sort = 'ai_global' if eligible_for_ai_global else 'latest'
+
+    # Relevance ordering only means something when there is a search query.
+    if current_sort == 'relevance' and not current_filters['q']:
         current_sort = 'ai_global' if eligible_for_ai_global else 'latest'
 
     ai_global_requested = current_sort == 'ai_global'
@@ -504,7 +468,7 @@ def job_list(request):
             batch_size=getattr(settings, 'AI_GLOBAL_SORT_BATCH_SIZE', 10),
             compute_batch=True,
         )
-        jobs = apply_ordered_ids(jobs, ranking['ordered_ids'])
+        jobs = ranking['queryset']
         ai_global_progress = {
             'scored_count': ranking['scored_count'],
             'pending_count': ranking['pending_count'],
@@ -514,6 +478,8 @@ def job_list(request):
         }
     elif current_sort == 'updated':
         jobs = jobs.order_by('-updated_at', '-posted_date')
+    elif current_sort == 'relevance':
+        jobs = jobs.order_by('-search_rank', '-posted_date')
     else:
         jobs = jobs.order_by('-posted_date')
 
@@ -898,7 +864,9 @@ def job_detail(request, slug):
             try:
                 from .ai_matching import get_ai_match_score
                 ai_match = get_ai_match_score(request.user, job)
-                if ai_match:
+                if ai_match and ai_match.get('pending'):
+                    ai_match_state = 'pending'
+                elif ai_match:
                     ai_match_state = 'failed' if ai_match.get('error') else 'ready'
             except Exception as e:
                 logger.error(f"AI matching failed for user={request.user.id}, job={job.id}: {e}")
@@ -1676,13 +1644,19 @@ def ai_sort_jobs(request):
             'error': 'AI matching is not configured. Please set up an AI API key in the admin dashboard.'
         }, status=503)
 
-    from .ai_matching import get_ai_match_score
-    jobs_qs = JobPosting.objects.filter(id__in=job_ids, is_active=True)
+    from .ai_matching import get_ai_match_scores_batch
+    jobs_qs = list(JobPosting.objects.filter(id__in=job_ids, is_active=True))
+
+    try:
+        scores_by_id = get_ai_match_scores_batch(request.user, jobs_qs)
+    except Exception as e:
+        logger.error(f"AI sort batch error for jobs {job_ids}: {e}")
+        scores_by_id = {}
 
     results = []
     for job in jobs_qs:
         try:
-            score_data = get_ai_match_score(request.user, job)
+            score_data = scores_by_id[job.id]
             results.append({
                 'id': job.id,
                 'score': score_data.get('score') or 0,
@@ -3,14 +3,16 @@ Custom admin views for the multi-site job scraper.
 Separate from Django admin - uses the custom admin dashboard.
 """
 import logging
+from django.http import JsonResponse
 from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib import messages
 from django.db import transaction
 
-from .models import ScrapedJob
-from .botasaurus_scrapers.orchestrator import SCRAPERS, scrape_all_sites
+from .models import ScrapedJob, ScrapeRun
+from .botasaurus_scrapers.orchestrator import SCRAPERS
 from .admin_scraper_utils import publish_scraped_job
+from .scraper_tasks import enqueue_scrape_run, run_scrape
 
 logger = logging.getLogger(__name__)
 
@@ -66,8 +68,13 @@ def scraper_dashboard(request):
             label="Sites to scrape",
             required=True,
         )
+        incremental = django_forms.BooleanField(
+            label="Only new or changed jobs",
+            required=False,
+            widget=django_forms.CheckboxInput(attrs={"class": "form-check-input"}),
+        )
 
-    # Handle POST - run scraper
+    # Handle POST - queue a background scrape
     if request.method == "POST" and "run_scraper" in request.POST:
         form = ScrapeForm(request.POST)
         if form.is_valid():
@@ -75,49 +82,38 @@ def scraper_dashboard(request):
             location = form.cleaned_data["location"]
             sources = form.cleaned_data["sources"]
 
-            messages.info(
-                request,
-                f"Scraping '{keyword}' in '{location}' from {len(sources)} site(s)… "
-                "This may take up to 60 seconds.",
+            run = ScrapeRun.objects.create(
+                search_keyword=keyword,
+                search_location=location,
+                sources=sources,
+                incremental=form.cleaned_data["incremental"],
+                scraped_by=request.user,
             )
 
             try:
-                results = scrape_all_sites(keyword, location, sources=sources, max_workers=4)
+                queued = enqueue_scrape_run(run)
             except Exception as exc:
-                logger.error(f"Scraping failed: {exc}", exc_info=True)
-                messages.error(request, f"Scraping failed: {exc}")
-                return redirect("jobs:scraper_dashboard")
-
-            saved = 0
-            total_jobs = 0
-            for result in results:
-                if not result.get("jobs"):
-                    continue
-                src = result.get("source", "OTHER")
-                # Deactivate previous entries for same search + source
-                ScrapedJob.objects.filter(
-                    search_keyword=keyword,
-                    search_location=location,
-                    source=src,
-                    scraped_by=request.user,
-                ).update(is_active=False)
-
-                ScrapedJob.objects.create(
-                    search_keyword=keyword,
-                    search_location=location,
-                    source=src,
-                    scraped_data=result,
-                    total_found=result.get("total_found", 0),
-                    scraped_by=request.user,
+                logger.error(f"Could not queue scrape run {run.pk}: {exc}", exc_info=True)
+                queued = False
+
+            if queued:
+                messages.info(
+                    request,
+                    f"Scraping '{keyword}' in '{location}' from {len(sources)} site(s) in the background. "
+                    "Results appear below as each site finishes.",
                 )
-                saved += 1
-                total_jobs += result.get("total_found", 0)
-
-            messages.success(
-                request,
-                f"Done! Saved {saved} scrape record(s) with {total_jobs} total job(s). "
-                "Use 'Publish' to make them visible to users.",
-            )
+            else:
+                # No queue worker available: run in this request instead.
+                summary = run_scrape(run.pk)
+                run.refresh_from_db()
+                if run.status == ScrapeRun.Status.FAILED:
+                    messages.error(request, f"Scraping failed: {run.error_message}")
+                else:
+                    messages.success(
+                        request,
+                        f"Done! Scraped {summary['sources']} site(s) with {summary['jobs']} total job(s). "
+                        "Use 'Publish' to make them visible to users.",
+                    )
             return redirect("jobs:scraper_dashboard")
     else:
         form = ScrapeForm()
@@ -128,14 +124,43 @@ def scraper_dashboard(request):
         is_active=True,
     ).order_by("-scraped_at")[:20]
 
+    active_runs = ScrapeRun.objects.filter(
+        scraped_by=request.user,
+        status__in=[ScrapeRun.Status.QUEUED, ScrapeRun.Status.RUNNING],
+    ).order_by("-created_at")[:5]
+
     context = {
         "form": form,
         "recent_scrapes": recent_scrapes,
+        "active_runs": active_runs,
         "scrapers": SCRAPERS,
     }
     return render(request, "jobs/scraper_dashboard.html", context)
 
 
+@login_required
+@user_passes_test(is_hr_or_admin)
+def scrape_run_progress(request, pk):
+    """JSON progress of a background scrape run, polled by the dashboard."""
+    try:
+        run = ScrapeRun.objects.get(pk=pk, scraped_by=request.user)
+    except ScrapeRun.DoesNotExist:
+        return JsonResponse({"success": False, "error": "Scrape run not found."}, status=404)
+
+    sources = run.source_progress()
+    return JsonResponse({
+        "success": True,
+        "id": run.pk,
+        "status": run.status,
+        "finished": run.is_finished,
+        "error": run.error_message,
+        "completed": sum(1 for row in sources if row["state"] != ScrapeRun.SOURCE_PENDING),
+        "total": len(sources),
+        "total_jobs": sum(row["total_found"] for row in sources),
+        "sources": sources,
+    })
+
+
 @login_required
 @user_passes_test(is_hr_or_admin)
 def publish_scraped_job_view(request, pk):
@@ -6,5 +6,7 @@ class LogViewerConfig(AppConfig):
     name = 'log_viewer'
     
     def ready(self):
-        """Import signal handlers when app is ready"""
-        import log_viewer.signals  # noqa
\ No newline at end of file
+        """Import signal handlers and start tracking audited models when app is ready"""
+        import log_viewer.signals  # noqa
+        from log_viewer.audit import connect_field_trackers
+        connect_field_trackers()
\ No newline at end of file
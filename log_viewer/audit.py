@@ -0,0 +1,474 @@
+"""
+Audit-log pipeline used by the CRUD signal handlers.
+
+Changes are diffed against a snapshot of each instance's field values taken
+when it is loaded (``post_init``), so an update needs no extra SELECT. Audit
+records are not written one by one: they are queued per thread and written
+with ``bulk_create`` when the outermost ``batch()`` block ends (the
+``AuditLogMiddleware`` wraps every request in one), straight away outside of
+one, or by a background writer thread when ``AUDIT_LOG_WORKER`` is on.
+Records queued inside a transaction only join the queue once it commits and
+are dropped with it when it rolls back.
+
+Deletes carry the deleted row's values from ``pre_delete`` to ``post_delete``
+in a small store scoped to the current context: it is replaced at the start
+of every ``batch()`` (so per request), loses an entry when the transaction
+that made it ends, and never holds more than
+``AUDIT_LOG_ORIGINAL_VALUES_LIMIT`` entries.
+
+Which models are audited is configured with ``AUDIT_LOG_EXCLUDE`` (app labels
+or ``app_label.model_name``) and ``AUDIT_LOG_SAMPLE_RATES``, which records
+only that fraction of creates and updates for an app or model. Deletes are
+always recorded.
+"""
+import atexit
+import contextvars
+import copy
+import logging
+import queue
+import random
+import threading
+import weakref
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import close_old_connections, connections, transaction
+from django.db.models.signals import post_init
+from django.dispatch import receiver
+
+logger = logging.getLogger('log_viewer.signals')
+
+_state = threading.local()
+
+# Model label -> sample rate (0 means not audited); rebuilt when the settings change
+_policies = {}
+# Model -> ((name, attname, field), ...) of the fields an audit record shows
+_audit_fields = {}
+# "label.pk" -> values of rows being deleted, oldest first; see original_values_scope()
+_original_values = contextvars.ContextVar('log_viewer_audit_original_values', default=None)
+_original_values_stats = Counter()
+_original_values_lock = threading.Lock()
+
+SENSITIVE_FIELDS = frozenset([
+    'password', 'password1', 'password2',  # Password fields
+    'secret_key', 'api_key', 'token',  # API keys
+    'created', 'modified', 'updated_at', 'created_at',  # Timestamps (handled separately)
+])
+# Apps never audited unless AUDIT_LOG_EXCLUDE says otherwise
+DEFAULT_EXCLUDE = ('contenttypes', 'sessions', 'admin', 'auth', 'authtoken', 'migrations')
+# Queued batches the writer thread may fall behind by before flushes write inline
+WORKER_QUEUE_SIZE = 100
+
+
+def _batch_size():
+    return getattr(settings, 'AUDIT_LOG_BATCH_SIZE', 500)
+
+
+def _original_values_limit():
+    return getattr(settings, 'AUDIT_LOG_ORIGINAL_VALUES_LIMIT', 10000)
+
+
+@receiver(setting_changed)
+def _reset_policies(setting, **kwargs):
+    if setting in ('AUDIT_LOG_EXCLUDE', 'AUDIT_LOG_SAMPLE_RATES'):
+        _policies.clear()
+
+
+def sample_rate(model):
+    """
+    Fraction of creates and updates of ``model`` to record; 0 when it is not audited.
+
+    A ``app_label.model_name`` entry in the settings wins over an app label entry.
+    """
+    label = model._meta.label_lower
+    try:
+        return _policies[label]
+    except KeyError:
+        pass
+    app_label = model._meta.app_label
+    exclude = set(getattr(settings, 'AUDIT_LOG_EXCLUDE', DEFAULT_EXCLUDE))
+    rates = getattr(settings, 'AUDIT_LOG_SAMPLE_RATES', {})
+    if label == 'log_viewer.auditlog' or label in exclude or app_label in exclude:
+        rate = 0.0
+    else:
+        rate = float(rates.get(label, rates.get(app_label, 1.0)))
+    _policies[label] = rate
+    return rate
+
+
+def is_audited(model):
+    return sample_rate(model) > 0
+
+
+def is_sampled(model):
+    """Decide whether this create or update of ``model`` is recorded."""
+    rate = sample_rate(model)
+    return rate >= 1 or (rate > 0 and random.random() < rate)
+
+
+def get_audit_fields(model):
+    """
+    Fields of ``model`` an audit record shows, as (name, attname, field) tuples.
+
+    That is its concrete fields minus sensitive ones and foreign keys;
+    one-to-one keys are kept.
+    """
+    try:
+        return _audit_fields[model]
+    except KeyError:
+        fields = tuple(
+            (field.name, field.attname, field)
+            for field in model._meta.concrete_fields
+            if field.name not in SENSITIVE_FIELDS and not field.many_to_one
+        )
+        _audit_fields[model] = fields
+        return fields
+
+
+def serialize_value(value):
+    """JSON-serializable form of one field value, as stored in AuditLog values."""
+    if value is None or isinstance(value, (str, int, float, bool, list, dict)):
+        return value
+    return str(value)
+
+
+def get_field_values(instance, exclude_fields=None):
+    """
+    Audited field values of ``instance`` as a JSON-serializable dict.
+
+    Relations are shown by their key, read from the instance itself; nothing
+    is fetched from the database.
+    """
+    values = {}
+    instance_dict = instance.__dict__
+    for name, attname, field in get_audit_fields(type(instance)):
+        if exclude_fields and name in exclude_fields:
+            continue
+        if attname not in instance_dict:
+            # Deferred field: reading it would cost a query
+            continue
+        value = instance_dict[attname]
+        if field.is_relation and value is not None:
+            related = field.get_cached_value(instance, None)
+            values[name] = {
+                'id': value,
+                'str': str(related) if related is not None else f"{field.related_model._meta.model_name} #{value}",
+            }
+        else:
+            values[name] = serialize_value(value)
+    return values
+
+
+def track_original_values(sender, instance, **kwargs):
+    """``post_init`` receiver: remember the field values the instance was loaded with."""
+    instance_dict = instance.__dict__
+    instance_dict['_audit_original'] = {
+        # JSON values are copied: a dict or list changed in place must not change its baseline too
+        attname: copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+        for _, attname, _ in get_audit_fields(sender)
+        if attname in instance_dict
+        for value in (instance_dict[attname],)
+    }
+
+
+def forget_original_values(instance):
+    """Drop the snapshot of an instance that was built rather than loaded; it is not what the row holds."""
+    instance.__dict__.pop('_audit_original', None)
+
+
+def refresh_original_values(instance):
+    """Make the instance's current values the baseline of its next update."""
+    track_original_values(type(instance), instance)
+
+
+def get_changes(instance, new_values, update_fields=None):
+    """
+    Return ``(old_values, changed_fields)`` for an update of ``instance``.
+
+    Both are None when the instance was not loaded from the database (it was
+    built with a primary key, or its model was not tracked when it loaded), as
+    its previous values are then unknown.
+    """
+    original = instance.__dict__.get('_audit_original')
+    if original is None:
+        return None, None
+    old_values = dict(new_values)
+    changed_fields = []
+    for name, attname, field in get_audit_fields(type(instance)):
+        if name not in new_values or attname not in original:
+            continue
+        if update_fields is not None and name not in update_fields and attname not in update_fields:
+            continue
+        old = original[attname]
+        if old != instance.__dict__[attname]:
+            changed_fields.append(name)
+            if field.is_relation and old is not None:
+                old_values[name] = {'id': old, 'str': f"{field.related_model._meta.model_name} #{old}"}
+            else:
+                old_values[name] = serialize_value(old)
+    return old_values, changed_fields
+
+
+def connect_field_trackers():
+    """Snapshot instances of every audited model when they are loaded."""
+    for model in apps.get_models():
+        if is_audited(model):
+            post_init.connect(
+                track_original_values,
+                sender=model,
+                dispatch_uid=f'log_viewer.audit.track:{model._meta.label_lower}',
+            )
+
+
+def _count(**counts):
+    with _original_values_lock:
+        _original_values_stats.update(counts)
+
+
+def _original_values_store():
+    store = _original_values.get()
+    if store is None:
+        store = OrderedDict()
+        _original_values.set(store)
+    return store
+
+
+def _discard_original_values(store, key, values):
+    # The transaction that stored the values ended without them being used
+    if store.get(key) is values:
+        del store[key]
+        _count(discarded=1)
+
+
+def store_original_values(key, values, using='default'):
+    """
+    Keep ``values`` under ``key`` until ``pop_original_values`` takes them.
+
+    Inside a transaction they are dropped when it commits or rolls back
+    without them being taken. The least recently stored entries are evicted
+    beyond ``AUDIT_LOG_ORIGINAL_VALUES_LIMIT``.
+    """
+    store = _original_values_store()
+    store.pop(key, None)
+    store[key] = values
+    evicted = 0
+    limit = max(1, _original_values_limit())
+    while len(store) > limit:
+        store.popitem(last=False)
+        evicted += 1
+    _count(stored=1, evicted=evicted)
+
+    connection = connections[using]
+    if connection.in_atomic_block:
+        # The batch lives only in the connection's on-commit callbacks, which
+        # are released on commit and thrown away on rollback
+        weakref.finalize(_transaction_batch(connection), _discard_original_values, store, key, values)
+
+
+def pop_original_values(key):
+    """Take the values stored under ``key``; None if there are none (any more)."""
+    store = _original_values.get()
+    values = store.pop(key, None) if store is not None else None
+    _count(**({'hits': 1} if values is not None else {'misses': 1}))
+    return values
+
+
+def original_values_stats():
+    """
+    Process-wide counters of the original-values store, plus the size of the
+    current context's store: ``stored``, ``hits``, ``misses``, ``evicted``
+    (over the limit) and ``discarded`` (never taken before their transaction
+    or scope ended).
+    """
+    with _original_values_lock:
+        stats = dict(_original_values_stats)
+    for name in ('stored', 'hits', 'misses', 'evicted', 'discarded'):
+        stats.setdefault(name, 0)
+    stats['size'] = len(_original_values.get() or ())
+    return stats
+
+
+@contextmanager
+def original_values_scope():
+    """Give the block a store of its own; whatever is left in it is discarded at the end."""
+    token = _original_values.set(OrderedDict())
+    try:
+        yield
+    finally:
+        left = len(_original_values.get())
+        _original_values.reset(token)
+        if left:
+            _count(discarded=left)
+
+
+def _pending():
+    pending = getattr(_state, 'pending', None)
+    if pending is None:
+        pending = _state.pending = []
+    return pending
+
+
+class _TransactionBatch:
+    """Records queued inside one transaction (savepoint) level, released on commit."""
+
+    def __init__(self):
+        self.records = []
+        self.released = False
+
+    def __call__(self):
+        self.released = True
+        _queue(self.records)
+
+
+def _transaction_batch(connection):
+    # Keep adding to the last batch while nothing else was registered after it
+    # at this savepoint level; a rolled back savepoint takes its batches along
+    if connection.run_on_commit:
+        callback_ids, callback, _ = connection.run_on_commit[-1]
+        if (
+            isinstance(callback, _TransactionBatch)
+            and not callback.released
+            and callback_ids == set(connection.savepoint_ids)
+        ):
+            return callback
+    batch = _TransactionBatch()
+    transaction.on_commit(batch, using=connection.alias)
+    return batch
+
+
+def _queue(records):
+    pending = _pending()
+    pending.extend(records)
+    if not getattr(_state, 'depth', 0) or len(pending) >= _batch_size():
+        flush()
+
+
+def enqueue(audit_log, using='default'):
+    """
+    Queue an unsaved AuditLog for writing.
+
+    ``using`` is the database the audited change was made on: while it is in
+    a transaction the record waits for that transaction to commit.
+    """
+    if is_suspended():
+        return
+    connection = connections[using]
+    if connection.in_atomic_block:
+        _transaction_batch(connection).records.append(audit_log)
+    else:
+        _queue([audit_log])
+
+
+def flush():
+    """Write this thread's queued records; returns how many were handed off."""
+    records = getattr(_state, 'pending', None)
+    if not records:
+        return 0
+    _state.pending = []
+    if getattr(settings, 'AUDIT_LOG_WORKER', False):
+        _writer.submit(records)
+    else:
+        write_records(records)
+    return len(records)
+
+
+def write_records(records):
+    """Insert audit records in bulk and mirror them to the file log."""
+    from .models import AuditLog
+
+    try:
+        AuditLog.objects.bulk_create(records, batch_size=_batch_size())
+    except Exception as e:
+        # Don't let logging errors break the application
+        logger.error(f"Error writing {len(records)} audit log records: {str(e)}", exc_info=True)
+        return
+    for record in records:
+        logger.log(
+            logging.WARNING if record.action == 'DELETE' else logging.INFO,
+            f"AUDIT {record.action}: {record.app_label}.{record.model_name} "
+            f"#{record.object_id} by {record.username or 'Anonymous'} - {record.message}"
+        )
+
+
+@contextmanager
+def batch():
+    """
+    Hold audit records until the outermost ``batch()`` block exits, then write
+    them together. The outermost block also gets its own original-values store.
+    """
+    _state.depth = getattr(_state, 'depth', 0) + 1
+    try:
+        if _state.depth == 1:
+            with original_values_scope():
+                yield
+        else:
+            yield
+    finally:
+        _state.depth -= 1
+        if not _state.depth:
+            flush()
+
+
+@contextmanager
+def suspend():
+    """Record nothing for changes made in this thread inside the block."""
+    previous = getattr(_state, 'suspended', False)
+    _state.suspended = True
+    try:
+        yield
+    finally:
+        _state.suspended = previous
+
+
+def is_suspended():
+    return getattr(_state, 'suspended', False)
+
+
+class _AuditWriter:
+    """Background thread that writes flushed batches off the request path."""
+
+    def __init__(self):
+        self._queue = queue.Queue(maxsize=WORKER_QUEUE_SIZE)
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, records):
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(records)
+        except queue.Full:
+            logger.warning("Audit log writer is behind; writing %d records inline", len(records))
+            write_records(records)
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='audit-log-writer', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            records = self._queue.get()
+            try:
+                if records is None:
+                    return
+                write_records(records)
+                close_old_connections()
+            finally:
+                self._queue.task_done()
+
+    def stop(self, timeout=10):
+        """Write what is queued and stop the thread (called at interpreter exit)."""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+
+_writer = _AuditWriter()
+atexit.register(_writer.stop)
@@ -0,0 +1,444 @@
+"""
+Sidecar index for the plain-text application logs.
+
+The log viewer used to read and parse a whole log file on every page. A
+``LogIndex`` keeps one column per field of every parsed entry under
+``logs/.index/<log name>/``:
+
+* ``offsets`` - byte offset of the entry's line in the log
+* ``stamps``  - entry time in seconds, carried forward from the previous
+  entry when a line has none and never decreasing, so date ranges are found
+  by bisection
+* ``levels``  - one byte per entry, an id into the level table of ``meta.json``
+* ``modules`` - an id into the module table of ``meta.json``
+
+``refresh`` parses only the complete lines appended since the last call and
+starts over when the log was rotated or rewritten. Level, module and date
+filters are answered from the columns; only the entries on the page shown
+(and the candidates of a message search) are read back from the log,
+through ``mmap``.
+"""
+import hashlib
+import json
+import logging
+import mmap
+import os
+import re
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: refreshes are only serialised within a process
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+INDEX_DIRNAME = '.index'
+# Leading bytes of the log remembered to notice it being rewritten in place
+HEAD_BYTES = 256
+MAX_LEVELS = 255
+MAX_MODULES = 65535
+
+LOG_LEVELS = ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']
+
+# LEVEL YYYY-MM-DD HH:MM:SS,mmm MODULE MESSAGE
+_ENTRY_PATTERN = re.compile(r'(\w+)\s+(\d{4}-\d{2}-\d{2})\s+(\d{2}:\d{2}:\d{2}(?:,\d+)?)\s+(\S+)\s+(.+)')
+_LEVEL_PATTERN = re.compile(r'^(DEBUG|INFO|WARNING|ERROR|CRITICAL)')
+_EPOCH = datetime(1970, 1, 1)
+
+_COLUMNS = ('offsets', 'stamps', 'modules')
+
+
+def parse_log_entry(line):
+    """
+    Parse a log entry line into structured data
+    Supports format: LEVEL DATE TIME MODULE MESSAGE
+    """
+    try:
+        match = _ENTRY_PATTERN.match(line)
+
+        if match:
+            level, date_str, time_str, module, message = match.groups()
+
+            # Combine date and time
+            try:
+                datetime_str = f"{date_str} {time_str.split(',')[0]}"
+                entry_date = datetime.strptime(datetime_str, '%Y-%m-%d %H:%M:%S')
+            except ValueError:
+                entry_date = None
+
+            return {
+                'level': level,
+                'date': entry_date,
+                'module': module,
+                'message': message,
+                'raw': line
+            }
+
+        # Fallback: Try to extract level from start
+        level_match = _LEVEL_PATTERN.match(line)
+
+        if level_match:
+            level = level_match.group(1)
+            message = line[len(level):].strip()
+
+            return {
+                'level': level,
+                'date': None,
+                'module': 'unknown',
+                'message': message,
+                'raw': line
+            }
+
+        # If no pattern matches, return None
+        return None
+
+    except Exception as e:
+        logger.error(f"Error parsing log entry: {str(e)}")
+        return None
+
+
+def _entry_fields(line):
+    """``(level, seconds or None, module)`` of a log line, as ``parse_log_entry`` reads it."""
+    match = _ENTRY_PATTERN.match(line)
+    if match:
+        level, date_str, time_str, module, _ = match.groups()
+        try:
+            entry_date = datetime(
+                int(date_str[:4]), int(date_str[5:7]), int(date_str[8:10]),
+                int(time_str[:2]), int(time_str[3:5]), int(time_str[6:8]),
+            )
+        except ValueError:
+            return level, None, module
+        return level, int((entry_date - _EPOCH).total_seconds()), module
+
+    level_match = _LEVEL_PATTERN.match(line)
+    if level_match:
+        return level_match.group(1), None, 'unknown'
+    return None
+
+
+def _day_start(day):
+    return int((datetime.combine(day, datetime.min.time()) - _EPOCH).total_seconds())
+
+
+def _app_name(module):
+    return module.split('.')[0]
+
+
+class LogIndex:
+    """Column index of the entries of one log file. Use ``get_log_index``."""
+
+    def __init__(self, log_path, index_root=None):
+        self.log_path = Path(log_path)
+        root = Path(index_root) if index_root else self.log_path.parent / INDEX_DIRNAME
+        self.index_dir = root / self.log_path.name
+        self._lock = threading.RLock()
+        self._clear()
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def _clear(self):
+        self.offsets = array('Q')
+        self.stamps = array('q')
+        self.levels = bytearray()
+        self.modules = array('H')
+        self.level_names = []
+        self.module_names = []
+        self._level_ids = {}
+        self._module_ids = {}
+        self.indexed_size = 0
+        self.inode = None
+        self.head = ''
+        self.head_len = 0
+
+    # Persistence
+
+    def _path(self, name):
+        return self.index_dir / name
+
+    def _read_meta(self):
+        try:
+            with open(self._path('meta.json'), encoding='utf-8') as meta_file:
+                meta = json.load(meta_file)
+        except (OSError, ValueError):
+            return None
+        return meta if meta.get('version') == INDEX_VERSION else None
+
+    def _write_meta(self):
+        meta = {
+            'version': INDEX_VERSION,
+            'count': len(self),
+            'size': self.indexed_size,
+            'inode': self.inode,
+            'head': self.head,
+            'head_len': self.head_len,
+            'levels': self.level_names,
+            'modules': self.module_names,
+        }
+        partial = self._path('meta.json.part')
+        with open(partial, 'w', encoding='utf-8') as meta_file:
+            json.dump(meta, meta_file)
+        os.replace(partial, self._path('meta.json'))
+
+    def _load(self, meta):
+        """Read the rows another process (or an earlier request) has indexed."""
+        start, count = len(self), meta['count']
+        for name in _COLUMNS:
+            column = getattr(self, name)
+            with open(self._path(name), 'rb') as column_file:
+                column_file.seek(start * column.itemsize)
+                column.fromfile(column_file, count - start)
+        with open(self._path('levels'), 'rb') as column_file:
+            column_file.seek(start)
+            levels = column_file.read(count - start)
+        if len(levels) != count - start:
+            raise EOFError('levels column is shorter than the index')
+        self.levels.extend(levels)
+        self.level_names = meta['levels']
+        self.module_names = meta['modules']
+        self._level_ids = {name: i for i, name in enumerate(self.level_names)}
+        self._module_ids = {name: i for i, name in enumerate(self.module_names)}
+        self.indexed_size = meta['size']
+        self.inode = meta['inode']
+        self.head = meta['head']
+        self.head_len = meta['head_len']
+
+    def _save(self, start):
+        """Append rows from ``start`` to the column files, then publish them in meta.json."""
+        for name in _COLUMNS:
+            column = getattr(self, name)
+            with open(self._path(name), 'ab') as column_file:
+                column_file.truncate(start * column.itemsize)
+                column[start:].tofile(column_file)
+        with open(self._path('levels'), 'ab') as column_file:
+            column_file.truncate(start)
+            column_file.write(self.levels[start:])
+        self._write_meta()
+
+    @contextmanager
+    def _file_lock(self):
+        with open(self._path('lock'), 'a') as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    # Indexing
+
+    def _head_of(self, log_file, length):
+        log_file.seek(0)
+        return hashlib.sha1(log_file.read(length)).hexdigest()
+
+    def _same_log(self, meta, log_file, stat):
+        return (
+            meta['inode'] == stat.st_ino
+            and meta['size'] <= stat.st_size
+            and meta['head'] == self._head_of(log_file, meta['head_len'])
+        )
+
+    @staticmethod
+    def _intern(names, ids, name, limit):
+        if name not in ids:
+            if len(names) >= limit:
+                return ids.get('unknown', 0)
+            ids[name] = len(names)
+            names.append(name)
+        return ids[name]
+
+    def refresh(self):
+        """Index whatever was appended to the log since the last refresh."""
+        with self._lock:
+            try:
+                log_file = open(self.log_path, 'rb')
+            except FileNotFoundError:
+                self._clear()
+                return self
+
+            with log_file:
+                stat = os.fstat(log_file.fileno())
+                self.index_dir.mkdir(parents=True, exist_ok=True)
+                with self._file_lock():
+                    meta = self._read_meta()
+                    if meta is None or not self._same_log(meta, log_file, stat):
+                        self._clear()
+                        self.inode = stat.st_ino
+                        meta = None
+                    elif meta['inode'] != self.inode or meta['head'] != self.head or meta['count'] < len(self):
+                        self._clear()
+
+                    if meta is not None and meta['size'] > self.indexed_size:
+                        try:
+                            self._load(meta)
+                        except (OSError, EOFError, KeyError):
+                            logger.warning(f"Rebuilding damaged log index for {self.log_path}")
+                            self._clear()
+                            self.inode = stat.st_ino
+                            meta = None
+
+                    if meta is None or stat.st_size > self.indexed_size:
+                        start = len(self)
+                        self._index_from(log_file, stat)
+                        self._save(start)
+        return self
+
+    def _index_from(self, log_file, stat):
+        position = self.indexed_size
+        last_stamp = self.stamps[-1] if self.stamps else 0
+        log_file.seek(position)
+        for raw in log_file:
+            if not raw.endswith(b'\n'):
+                break  # still being written
+            fields = _entry_fields(raw.decode('utf-8', errors='ignore').strip())
+            if fields:
+                level, stamp, module = fields
+                if stamp is not None and stamp > last_stamp:
+                    last_stamp = stamp
+                self.offsets.append(position)
+                self.stamps.append(last_stamp)
+                self.levels.append(self._intern(self.level_names, self._level_ids, level, MAX_LEVELS))
+                self.modules.append(self._intern(self.module_names, self._module_ids, module, MAX_MODULES))
+            position += len(raw)
+        self.indexed_size = position
+
+        if self.head_len < HEAD_BYTES:
+            self.head_len = min(position, HEAD_BYTES)
+            self.head = self._head_of(log_file, self.head_len)
+
+    # Queries
+
+    @contextmanager
+    def _mapped_log(self):
+        with open(self.log_path, 'rb') as log_file:
+            if os.fstat(log_file.fileno()).st_size == 0:
+                yield b''
+                return
+            with mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                yield data
+
+    @staticmethod
+    def _line(data, offset):
+        end = data.find(b'\n', offset)
+        return data[offset:end if end != -1 else len(data)].decode('utf-8', errors='ignore').strip()
+
+    @property
+    def available_apps(self):
+        return sorted({_app_name(module) for module in self.module_names})
+
+    def query(self, level='', app='', date_from=None, date_to=None, search=''):
+        """
+        Positions of the entries matching every given filter, oldest first.
+        ``date_from``/``date_to`` are dates; ``app`` matches part of the module
+        and ``search`` part of the message, ignoring case.
+        """
+        with self._lock:
+            lo = bisect_left(self.stamps, _day_start(date_from)) if date_from else 0
+            hi = bisect_left(self.stamps, _day_start(date_to + timedelta(days=1))) if date_to else len(self)
+            positions = range(lo, max(lo, hi))
+
+            if level:
+                if level not in self.level_names:
+                    return []
+                level_id = bytes([self.level_names.index(level)])
+                positions = [
+                    lo + match.start()
+                    for match in re.finditer(re.escape(level_id), self.levels[positions.start:positions.stop])
+                ]
+            if app:
+                module_ids = {i for i, module in enumerate(self.module_names) if app in module}
+                modules = self.modules
+                positions = [i for i in positions if modules[i] in module_ids]
+            if search:
+                positions = self._search(positions, search)
+            return positions
+
+    def _search(self, positions, search):
+        needle = search.lower()
+        with self._mapped_log() as data:
+            candidates = positions
+            if needle.isascii():
+                # Let the regex engine find the few lines worth parsing
+                allowed = positions if isinstance(positions, range) else set(positions)
+                hits = {
+                    bisect_right(self.offsets, match.start()) - 1
+                    for match in re.finditer(re.escape(needle.encode()), data, re.IGNORECASE)
+                }
+                candidates = sorted(i for i in hits if i in allowed)
+            matches = []
+            for i in candidates:
+                entry = parse_log_entry(self._line(data, self.offsets[i]))
+                if entry and needle in entry['message'].lower():
+                    matches.append(i)
+        return matches
+
+    def counts(self, positions):
+        """``(level_counts, app_counts)`` of the entries at ``positions``."""
+        with self._lock:
+            if isinstance(positions, range):
+                level_ids = Counter(self.levels[positions.start:positions.stop])
+                module_ids = Counter(self.modules[positions.start:positions.stop])
+            else:
+                level_ids = Counter(self.levels[i] for i in positions)
+                module_ids = Counter(self.modules[i] for i in positions)
+
+            level_counts = {self.level_names[i]: count for i, count in level_ids.items()}
+            app_counts = Counter()
+            for i, count in module_ids.items():
+                app_counts[_app_name(self.module_names[i])] += count
+            return level_counts, dict(app_counts)
+
+    def entries(self, positions):
+        """Parsed entries at ``positions``, read from the log."""
+        with self._lock:
+            offsets = [self.offsets[i] for i in positions]
+        if not offsets:
+            return []
+        with self._mapped_log() as data:
+            entries = (parse_log_entry(self._line(data, offset)) for offset in offsets)
+            return [entry for entry in entries if entry]
+
+
+class LogEntries:
+    """Newest-first entries at ``positions``, parsed only when a page is sliced out."""
+
+    def __init__(self, index, positions):
+        self.index = index
+        self.positions = positions[::-1]
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return self.index.entries(self.positions[key])
+        return self.index.entries([self.positions[key]])[0]
+
+    def __iter__(self):
+        chunk = 1000
+        for start in range(0, len(self), chunk):
+            yield from self[start:start + chunk]
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_log_index(log_path):
+    """The up-to-date index of ``log_path``, shared by the requests of this process."""
+    key = os.path.abspath(log_path)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = LogIndex(log_path)
+    return index.refresh()
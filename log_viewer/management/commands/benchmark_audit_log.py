@@ -0,0 +1,162 @@
+"""
+Management command to benchmark model save throughput with auditing on and off.
+
+Creates --rows LogOperationHistory rows, then loads, changes and saves each
+of them --rounds times: without auditing, with the previous per-save audit
+handlers (a SELECT of the old row before the save and an AuditLog INSERT
+after it) and with the batched pipeline, one simulated request per --batch
+saves. Reports saves per second and queries per save; the rows and their
+audit records are removed afterwards.
+
+Usage:
+    python manage.py benchmark_audit_log
+    python manage.py benchmark_audit_log --rows 500 --rounds 4 --batch 50
+"""
+import time
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models.signals import post_save, pre_save
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from log_viewer import audit, signals
+from log_viewer.models import AuditLog, LogOperationHistory
+
+# The previous handlers' cache of old values, keyed by "label.pk"
+_legacy_original_values = {}
+
+
+def legacy_store_original_values(sender, instance, **kwargs):
+    """The pre_save handler as it was before batching: fetch the old row."""
+    if sender is not LogOperationHistory or not instance.pk:
+        return
+    old_instance = sender.objects.get(pk=instance.pk)
+    _legacy_original_values[f"{sender._meta.label}.{instance.pk}"] = signals.get_model_field_values(old_instance)
+
+
+def legacy_log_create_or_update(sender, instance, created, **kwargs):
+    """The post_save handler as it was before batching: one INSERT per save."""
+    if sender is not LogOperationHistory:
+        return
+    new_values = signals.get_model_field_values(instance)
+    old_values = _legacy_original_values.pop(f"{sender._meta.label}.{instance.pk}", None)
+    changed_fields = [
+        name for name, value in (old_values or {}).items() if new_values.get(name) != value
+    ]
+    action = 'CREATE' if created else 'UPDATE'
+    message = f"{action}: {sender._meta.verbose_name} '{str(instance)[:200]}' updated"
+    AuditLog.objects.create(
+        content_type=ContentType.objects.get_for_model(sender),
+        object_id=instance.pk,
+        action=action,
+        model_name=sender._meta.model_name,
+        app_label=sender._meta.app_label,
+        old_values=old_values,
+        new_values=new_values,
+        changed_fields=changed_fields or None,
+        user_agent='',
+        request_path='',
+        message=message,
+        timestamp=timezone.now(),
+    )
+    signals.logger.info(
+        f"AUDIT {action}: {sender._meta.app_label}.{sender._meta.model_name} "
+        f"#{instance.pk} by Anonymous - {message}"
+    )
+
+
+class Command(BaseCommand):
+    help = "Compare model save throughput without auditing, with per-save auditing and with batched auditing."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=200,
+            help='Rows to create and update (default: 200).'
+        )
+        parser.add_argument(
+            '--rounds',
+            type=int,
+            default=5,
+            help='Times each row is loaded, changed and saved per mode (default: 5).'
+        )
+        parser.add_argument(
+            '--batch',
+            type=int,
+            default=20,
+            help='Saves per simulated request for the batched pipeline (default: 20).'
+        )
+
+    def handle(self, *args, **options):
+        if min(options['rows'], options['rounds'], options['batch']) < 1:
+            raise CommandError('--rows, --rounds and --batch must be at least 1')
+        if not audit.is_audited(LogOperationHistory) or not signals.audit_log_table_exists():
+            raise CommandError('log_viewer.LogOperationHistory must be audited and migrated to run this benchmark')
+
+        with audit.suspend():
+            ids = [
+                LogOperationHistory.objects.create(
+                    operation_type='manual', status='success', started_at=timezone.now()
+                ).pk
+                for _ in range(options['rows'])
+            ]
+        content_type = ContentType.objects.get_for_model(LogOperationHistory)
+        try:
+            self._run(ids, options)
+        finally:
+            with audit.suspend():
+                LogOperationHistory.objects.filter(pk__in=ids).delete()
+            AuditLog.objects.filter(content_type=content_type, object_id__in=ids).delete()
+
+    def _run(self, ids, options):
+        saves = len(ids) * options['rounds']
+        self.stdout.write(f'{saves} saves of {len(ids)} rows per mode')
+
+        def update_all(round_number):
+            for pk in ids:
+                row = LogOperationHistory.objects.get(pk=pk)
+                row.audit_logs_processed = round_number * len(ids) + pk
+                row.save()
+
+        def off():
+            with audit.suspend():
+                for round_number in range(options['rounds']):
+                    update_all(round_number)
+
+        def legacy():
+            pre_save.disconnect(signals.forget_unloaded_original_values)
+            post_save.disconnect(signals.log_create_or_update)
+            pre_save.connect(legacy_store_original_values)
+            post_save.connect(legacy_log_create_or_update)
+            try:
+                for round_number in range(options['rounds']):
+                    update_all(round_number)
+            finally:
+                pre_save.disconnect(legacy_store_original_values)
+                post_save.disconnect(legacy_log_create_or_update)
+                pre_save.connect(signals.forget_unloaded_original_values)
+                post_save.connect(signals.log_create_or_update)
+
+        def batched():
+            for round_number in range(options['rounds']):
+                for start in range(0, len(ids), options['batch']):
+                    with audit.batch():
+                        for pk in ids[start:start + options['batch']]:
+                            row = LogOperationHistory.objects.get(pk=pk)
+                            row.audit_logs_processed = round_number * len(ids) + pk
+                            row.save()
+
+        for label, run in (('off', off), ('per-save', legacy), ('batched', batched)):
+            before = AuditLog.objects.count()
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                run()
+                elapsed = time.perf_counter() - started
+            written = AuditLog.objects.count() - before
+            self.stdout.write(
+                f'  {label:<9} {saves / elapsed:>9.0f} saves/s '
+                f'{len(queries) / saves:>6.2f} queries/save {written:>8} audit records'
+            )
@@ -0,0 +1,231 @@
+"""
+Management command to benchmark file-log retention on a generated log.
+
+Writes a log of the requested size (entries spread over --days days, with a
+traceback every few hundred entries) to a scratch directory, then applies a
+--retention-days cutoff with the previous in-memory implementation and with
+the streaming one, each on its own copy, reporting time, peak Python memory
+(from a second run under tracemalloc) and entry counts. CSV archives are
+written for both.
+
+Usage:
+    python manage.py benchmark_log_retention
+    python manage.py benchmark_log_retention --size-mb 200
+    python manage.py benchmark_log_retention --skip-legacy --skip-memory
+"""
+import filecmp
+import os
+import re
+import shutil
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from log_viewer.services import FileLogArchiveWriter, LogManagementService
+
+MODULES = ['core.views', 'accounts.views', 'surveys.tracer_study', 'jobs.scraper', 'log_viewer.services']
+LEVELS = ['INFO', 'INFO', 'INFO', 'WARNING', 'ERROR', 'DEBUG']
+TRACEBACK = (
+    'Traceback (most recent call last):\n'
+    '  File "/srv/app/core/views.py", line 120, in dashboard\n'
+    '    raise ValueError("benchmark failure")\n'
+    'ValueError: benchmark failure\n'
+)
+
+
+def legacy_parse_log_file(log_path, cutoff_date):
+    """The parser as it was before streaming: every entry of the log in two lists."""
+    old_entries = []
+    remaining_entries = []
+    timestamp_patterns = [
+        r'(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})',
+        r'\[(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})\]',
+    ]
+    with open(log_path, 'r', encoding='utf-8', errors='ignore') as f:
+        current_entry = []
+        current_timestamp = None
+        for line in f:
+            timestamp = None
+            for pattern in timestamp_patterns:
+                match = re.search(pattern, line)
+                if match:
+                    for fmt in ['%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M:%S,%f']:
+                        try:
+                            timestamp = datetime.strptime(match.group(1), fmt)
+                            break
+                        except ValueError:
+                            continue
+                    break
+            if timestamp:
+                if current_entry:
+                    entry_text = ''.join(current_entry)
+                    if current_timestamp and current_timestamp < cutoff_date:
+                        old_entries.append(entry_text)
+                    else:
+                        remaining_entries.append(entry_text)
+                current_entry = [line]
+                current_timestamp = timestamp
+            else:
+                current_entry.append(line)
+        if current_entry:
+            entry_text = ''.join(current_entry)
+            if current_timestamp and current_timestamp < cutoff_date:
+                old_entries.append(entry_text)
+            else:
+                remaining_entries.append(entry_text)
+    return old_entries, remaining_entries
+
+
+def legacy_delete_old_file_logs(log_path, remaining_entries):
+    """The rewrite as it was before streaming: backup copy, full re-read, rewrite."""
+    shutil.copy2(log_path, f"{log_path}.backup")
+    with open(log_path, 'r', encoding='utf-8', errors='ignore') as f:
+        original_content = f.read()
+    with open(log_path, 'w', encoding='utf-8') as f:
+        f.writelines(remaining_entries)
+    return max(0, len(original_content.split('\n')) - len(''.join(remaining_entries).split('\n')))
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare time and peak memory of the in-memory and streaming file-log retention "
+        "on a generated log."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--size-mb',
+            type=int,
+            default=1024,
+            help='Size of the generated log in MiB (default: 1024).'
+        )
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=60,
+            help='Days of entries in the generated log (default: 60).'
+        )
+        parser.add_argument(
+            '--retention-days',
+            type=int,
+            default=30,
+            help='Keep entries newer than this many days (default: 30).'
+        )
+        parser.add_argument(
+            '--skip-legacy',
+            action='store_true',
+            help='Only run the streaming retention (the legacy one holds the whole log in memory).'
+        )
+        parser.add_argument(
+            '--skip-memory',
+            action='store_true',
+            help='Do not repeat each run under tracemalloc to measure peak memory.'
+        )
+        parser.add_argument(
+            '--directory',
+            help='Scratch directory for the generated log and archives (default: a temp dir, removed afterwards).'
+        )
+
+    def handle(self, *args, **options):
+        if options['size_mb'] < 1 or options['days'] < 1:
+            raise CommandError('--size-mb and --days must be at least 1')
+
+        directory = options['directory'] or tempfile.mkdtemp(prefix='log-retention-benchmark-')
+        os.makedirs(directory, exist_ok=True)
+        try:
+            self._run(directory, options)
+        finally:
+            if not options['directory']:
+                shutil.rmtree(directory, ignore_errors=True)
+
+    def _generate(self, path, size, days):
+        self.stdout.write(f'Generating a {size / 2 ** 20:.0f} MiB log...')
+        start = datetime.now().replace(microsecond=0) - timedelta(days=days)
+        # Estimate the entry count from the average entry length, then spread them over the window
+        sample = self._entry(start, 1)
+        entries = max(1, size // (len(sample) + len(TRACEBACK) // 250))
+        step = days * 86400 / entries
+        written = 0
+        with open(path, 'w', encoding='utf-8', buffering=2 ** 20) as log_file:
+            i = 0
+            while written < size:
+                chunk = ''.join(
+                    self._entry(start + timedelta(seconds=int((i + n) * step)), i + n) for n in range(1000)
+                )
+                log_file.write(chunk)
+                written += len(chunk)
+                i += 1000
+        return i
+
+    @staticmethod
+    def _entry(timestamp, i):
+        line = (
+            f"{LEVELS[i % len(LEVELS)]} {timestamp:%Y-%m-%d %H:%M:%S},{i % 1000:03d} "
+            f"{MODULES[i % len(MODULES)]} Request {i} handled for user{i % 9973} in {i % 500} ms\n"
+        )
+        return line + TRACEBACK if i % 250 == 0 else line
+
+    def _measure(self, run, trace_memory):
+        # tracemalloc slows allocation-heavy loops several times over, so the
+        # time comes from an untraced run and the peak from a second, traced one
+        started = time.perf_counter()
+        counts = run()
+        elapsed = time.perf_counter() - started
+        peak = None
+        if trace_memory:
+            tracemalloc.start()
+            run()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        return elapsed, peak, counts
+
+    def _run(self, directory, options):
+        source = os.path.join(directory, 'generated.log')
+        entries = self._generate(source, options['size_mb'] * 2 ** 20, options['days'])
+        cutoff = datetime.now() - timedelta(days=options['retention_days'])
+        self.stdout.write(
+            f'{entries} entries, {os.path.getsize(source) / 2 ** 20:.0f} MiB; '
+            f'removing entries older than {cutoff:%Y-%m-%d %H:%M:%S}'
+        )
+        service = LogManagementService()
+
+        def legacy():
+            log_path = os.path.join(directory, 'legacy.log')
+            shutil.copyfile(source, log_path)
+            old_entries, remaining_entries = legacy_parse_log_file(log_path, cutoff)
+            service.export_file_logs_to_csv(old_entries, os.path.join(directory, 'legacy.csv'), 'legacy.log')
+            legacy_delete_old_file_logs(log_path, remaining_entries)
+            os.remove(f"{log_path}.backup")
+            return len(old_entries), len(remaining_entries), log_path
+
+        def streaming():
+            log_path = os.path.join(directory, 'streaming.log')
+            shutil.copyfile(source, log_path)
+            archive = FileLogArchiveWriter(
+                service, 'streaming.log', csv_path=os.path.join(directory, 'streaming.csv')
+            )
+            expired, kept, temp_path, bytes_read = service.split_file_log(
+                log_path, cutoff, on_expired=archive.add
+            )
+            archive.close()
+            service.replace_file_log(log_path, temp_path, bytes_read)
+            return expired, kept, log_path
+
+        cases = [('streaming', streaming)]
+        if not options['skip_legacy']:
+            cases.insert(0, ('in-memory', legacy))
+
+        outputs = []
+        for label, run in cases:
+            elapsed, peak, (expired, kept, log_path) = self._measure(run, not options['skip_memory'])
+            outputs.append(log_path)
+            peak = f'{peak / 2 ** 20:>9.1f} MiB peak' if peak is not None else ''
+            self.stdout.write(
+                f'  {label:<10} {elapsed:>8.2f} s {peak} {expired:>10} expired {kept:>10} kept'
+            )
+        if len(outputs) == 2:
+            same = filecmp.cmp(outputs[0], outputs[1], shallow=False)
+            self.stdout.write(f'  Kept logs identical: {"yes" if same else "NO"}')
@@ -1,10 +1,13 @@
 """
 Middleware to store the current request in thread-local storage
-so that signals can access it for audit logging.
+so that signals can access it for audit logging, and to write the
+request's audit records in one batch.
 """
 import threading
 import logging
 
+from . import audit
+
 logger = logging.getLogger(__name__)
 
 # Thread-local storage for the current request
@@ -27,7 +30,7 @@ def get_current_user():
 class AuditLogMiddleware:
     """
     Middleware to store the current request in thread-local storage
-    for use by audit logging signals.
+    for use by audit logging signals, and to batch the request's audit records.
     """
     
     def __init__(self, get_response):
@@ -38,7 +41,10 @@ class AuditLogMiddleware:
         _thread_locals.request = request
         
         try:
-            response = self.get_response(request)
+            # Audit records of the request are written together once it is done,
+            # and values kept for its deletes do not outlive it
+            with audit.batch():
+                response = self.get_response(request)
         finally:
             # Clean up thread-local storage
             if hasattr(_thread_locals, 'request'):
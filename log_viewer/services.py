@@ -7,6 +7,8 @@ import os
 import csv
 import logging
 import re
+import shutil
+import tempfile
 from datetime import datetime, timedelta
 from decimal import Decimal
 from pathlib import Path
@@ -32,6 +34,69 @@ from .models import (
 
 logger = logging.getLogger(__name__)
 
+# First "YYYY-MM-DD HH:MM:SS" on a line, bracketed or not; such a line starts a file-log entry
+FILE_LOG_TIMESTAMP = re.compile(rb'(\d{4}-\d{2}-\d{2})\s+(\d{2}):(\d{2}):(\d{2})')
+# File-log archives as PDFs show this many entries; the CSV has them all
+FILE_LOG_PDF_ENTRY_LIMIT = 500
+FILE_LOG_BUFFER_SIZE = 1024 * 1024
+
+
+class FileLogArchiveWriter:
+    """
+    Archive expired file-log entries as retention finds them, one at a time.
+
+    CSV rows are written as entries arrive and the PDF only keeps the entries
+    it shows, so memory does not grow with the number of entries. Files are
+    created on the first entry.
+    """
+
+    def __init__(self, service, log_filename, csv_path=None, pdf_path=None):
+        self.service = service
+        self.log_filename = log_filename
+        self.csv_path = csv_path
+        self.pdf_path = pdf_path
+        self.count = 0
+        self._csv_file = None
+        self._csv_writer = None
+        self._pdf_entries = []
+
+    def add(self, entry):
+        self.count += 1
+        if self.csv_path:
+            if self._csv_writer is None:
+                os.makedirs(os.path.dirname(self.csv_path), exist_ok=True)
+                self._csv_file = open(self.csv_path, 'w', newline='', encoding='utf-8')
+                self._csv_writer = csv.writer(self._csv_file)
+                self._csv_writer.writerow(['Source File', 'Log Entry'])
+            self._csv_writer.writerow([self.log_filename, entry.strip()])
+        if self.pdf_path and len(self._pdf_entries) < FILE_LOG_PDF_ENTRY_LIMIT:
+            self._pdf_entries.append(entry)
+
+    def close(self):
+        """Finish the archives; returns the paths written."""
+        archive_files = []
+        if self._csv_file:
+            self._csv_file.close()
+            self._csv_file = None
+            archive_files.append(self.csv_path)
+            self.service.logger.info(
+                f"Exported {self.count} file log entries to CSV: {self.csv_path}"
+            )
+        if self.pdf_path and self.count:
+            self.service.export_file_logs_to_pdf(
+                self._pdf_entries, self.pdf_path, self.log_filename, total_entries=self.count
+            )
+            archive_files.append(self.pdf_path)
+        return archive_files
+
+    def discard(self):
+        """Drop a partly written archive after a failed retention run."""
+        if self._csv_file:
+            self._csv_file.close()
+            self._csv_file = None
+        if self.csv_path and os.path.exists(self.csv_path):
+            os.remove(self.csv_path)
+
 
 class NotificationService:
     """Service for sending admin notifications about log management operations"""
@@ -509,176 +574,188 @@ class LogManagementService:
                 self.logger.warning(f"Log file not found: {log_path}")
                 continue
             
+            archive = None
+            if export_enabled and policy.export_before_delete:
+                suffix = f"_{log_filename.replace('.log', '')}"
+                archive = FileLogArchiveWriter(
+                    self,
+                    log_filename,
+                    csv_path=(
+                        self._create_archive_filepath(policy, 'csv', suffix=suffix)
+                        if policy.export_format in ['csv', 'both'] else None
+                    ),
+                    pdf_path=(
+                        self._create_archive_filepath(policy, 'pdf', suffix=suffix)
+                        if policy.export_format in ['pdf', 'both'] else None
+                    ),
+                )
+            
+            partial_path = None
             try:
-                # Parse log file and extract old entries
-                old_entries, remaining_entries = self._parse_log_file(log_path, cutoff_date)
+                # One pass: recent entries go to a temp file, old ones to the archives
+                expired_count, kept_count, partial_path, read_until = self.split_file_log(
+                    log_path, cutoff_date, on_expired=archive.add if archive else None
+                )
                 
-                if not old_entries:
+                if not expired_count:
+                    os.remove(partial_path)
                     self.logger.info(f"No old entries in {log_filename}")
                     continue
                 
-                processed_count = len(old_entries)
-                total_processed += processed_count
-                self.logger.info(f"Found {processed_count} old entries in {log_filename}")
+                total_processed += expired_count
+                self.logger.info(
+                    f"Found {expired_count} old entries in {log_filename} ({kept_count} kept)"
+                )
                 
-                # Export before deletion if enabled
-                if export_enabled and policy.export_before_delete:
-                    # Export to CSV if requested
-                    if policy.export_format in ['csv', 'both']:
-                        csv_file = self._create_archive_filepath(
-                            policy, 'csv', suffix=f"_{log_filename.replace('.log', '')}"
-                        )
-                        self.export_file_logs_to_csv(old_entries, csv_file, log_filename)
-                        archive_files.append(csv_file)
-                        self.logger.info(f"Exported {log_filename} to CSV: {csv_file}")
-                    
-                    # Export to PDF if requested
-                    if policy.export_format in ['pdf', 'both']:
-                        pdf_file = self._create_archive_filepath(
-                            policy, 'pdf', suffix=f"_{log_filename.replace('.log', '')}"
-                        )
-                        self.export_file_logs_to_pdf(old_entries, pdf_file, log_filename)
-                        archive_files.append(pdf_file)
-                        self.logger.info(f"Exported {log_filename} to PDF: {pdf_file}")
+                # Archives are complete before the log loses its old entries
+                if archive:
+                    archive_files.extend(archive.close())
                 
-                # Delete old entries by rewriting file
-                deleted_count = self.delete_old_file_logs(log_path, remaining_entries)
-                total_deleted += deleted_count
+                self.replace_file_log(log_path, partial_path, read_until)
+                partial_path = None
+                total_deleted += expired_count
+                self.logger.info(f"Deleted {expired_count} entries from {log_path}")
                 
             except Exception as e:
+                if archive:
+                    archive.discard()
+                if partial_path and os.path.exists(partial_path):
+                    os.remove(partial_path)
                 self.logger.error(f"Error processing {log_filename}: {str(e)}")
                 raise Exception(f"File log processing failed for {log_filename}: {str(e)}")
         
         return total_processed, total_deleted, archive_files
     
-    def _parse_log_file(self, log_path, cutoff_date):
+    @staticmethod
+    def _cutoff_key(cutoff_date):
         """
-        Parse log file and separate old entries from recent ones.
+        ``(key, inclusive)``: a file-log timestamp (whole seconds) formatted as
+        ``YYYY-MM-DD HH:MM:SS`` is older than ``cutoff_date`` when it sorts
+        before ``key``, or equals it and ``inclusive`` is set.
+        """
+        if timezone.is_aware(cutoff_date):
+            cutoff_date = timezone.make_naive(cutoff_date)
+        return cutoff_date.strftime('%Y-%m-%d %H:%M:%S').encode(), cutoff_date.microsecond > 0
+    
+    @staticmethod
+    def _valid_file_log_timestamp(match, valid_days):
+        day, hour, minute, second = match.groups()
+        if hour > b'23' or minute > b'59' or second > b'59':
+            return False
+        valid = valid_days.get(day)
+        if valid is None:
+            try:
+                datetime.strptime(day.decode(), '%Y-%m-%d')
+                valid = True
+            except ValueError:
+                valid = False
+            if len(valid_days) > 4096:
+                valid_days.clear()
+            valid_days[day] = valid
+        return valid
+    
+    def split_file_log(self, log_path, cutoff_date, on_expired=None):
+        """
+        Separate the entries of a log file older than ``cutoff_date`` in one
+        forward pass, without holding the file in memory.
+        
+        An entry is a line with a timestamp plus the lines after it without one
+        (tracebacks); lines before the first timestamp are kept. Kept entries
+        are copied to a temp file next to the log, and ``on_expired`` is called
+        with the text of each expired entry.
         
         Args:
             log_path: Path to log file
             cutoff_date: DateTime threshold
+            on_expired: Optional callable receiving each expired entry
         
         Returns:
-            Tuple of (old_entries, remaining_entries)
+            Tuple of (expired_count, kept_count, temp_path, bytes_read); pass
+            the last two to ``replace_file_log``.
         """
-        old_entries = []
-        remaining_entries = []
+        cutoff_key, cutoff_inclusive = self._cutoff_key(cutoff_date)
+        valid_days = {}
+        expired_count = kept_count = 0
+        bytes_read = 0
+        expired_lines = None  # lines of the expired entry being read
+        in_kept_entry = False
         
-        # Common log timestamp patterns
-        timestamp_patterns = [
-            # ISO format: 2025-11-12 14:30:22,123
-            r'(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})',
-            # Alternative: [2025-11-12 14:30:22]
-            r'\[(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})\]',
-        ]
+        search = FILE_LOG_TIMESTAMP.search
+        is_valid = self._valid_file_log_timestamp
         
+        log_dir, log_name = os.path.split(os.path.abspath(log_path))
+        fd, temp_path = tempfile.mkstemp(dir=log_dir, prefix=f'.{log_name}.', suffix='.part')
         try:
-            with open(log_path, 'r', encoding='utf-8', errors='ignore') as f:
-                current_entry = []
-                current_timestamp = None
-                
-                for line in f:
-                    # Try to extract timestamp from line
-                    timestamp = None
-                    for pattern in timestamp_patterns:
-                        match = re.search(pattern, line)
-                        if match:
-                            try:
-                                timestamp_str = match.group(1)
-                                # Parse timestamp (handle both with and without milliseconds)
-                                for fmt in ['%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M:%S,%f']:
-                                    try:
-                                        timestamp = datetime.strptime(timestamp_str, fmt)
-                                        # Make timezone aware/naive to match cutoff_date
-                                        if settings.USE_TZ:
-                                            if timezone.is_naive(timestamp):
-                                                timestamp = timezone.make_aware(timestamp)
-                                        else:
-                                            if timezone.is_aware(timestamp):
-                                                timestamp = timezone.make_naive(timestamp)
-                                        break
-                                    except ValueError:
-                                        continue
-                                break
-                            except Exception:
-                                continue
+            with open(log_path, 'rb', buffering=FILE_LOG_BUFFER_SIZE) as source, \
+                    os.fdopen(fd, 'wb', buffering=FILE_LOG_BUFFER_SIZE) as kept:
+                for line in source:
+                    bytes_read += len(line)
+                    match = search(line)
+                    if match is None or not is_valid(match, valid_days):
+                        # Continuation of the current entry
+                        if expired_lines is not None:
+                            expired_lines.append(line)
+                        else:
+                            if not in_kept_entry:
+                                kept_count += 1
+                                in_kept_entry = True
+                            kept.write(line)
+                        continue
+                    
+                    if expired_lines is not None and on_expired:
+                        on_expired(b''.join(expired_lines).decode('utf-8', errors='ignore'))
                     
-                    # If we found a timestamp, this is a new log entry
-                    if timestamp:
-                        # Save previous entry if exists
-                        if current_entry:
-                            entry_text = ''.join(current_entry)
-                            if current_timestamp and current_timestamp < cutoff_date:
-                                old_entries.append(entry_text)
-                            else:
-                                remaining_entries.append(entry_text)
-                        
-                        # Start new entry
-                        current_entry = [line]
-                        current_timestamp = timestamp
+                    key = b'%s %s:%s:%s' % match.groups()
+                    if key < cutoff_key or (cutoff_inclusive and key == cutoff_key):
+                        expired_count += 1
+                        expired_lines = [line]
                     else:
-                        # Continuation of current entry
-                        current_entry.append(line)
+                        kept_count += 1
+                        in_kept_entry = True
+                        expired_lines = None
+                        kept.write(line)
                 
-                # Don't forget the last entry
-                if current_entry:
-                    entry_text = ''.join(current_entry)
-                    if current_timestamp and current_timestamp < cutoff_date:
-                        old_entries.append(entry_text)
-                    else:
-                        remaining_entries.append(entry_text)
-        
+                if expired_lines is not None and on_expired:
+                    on_expired(b''.join(expired_lines).decode('utf-8', errors='ignore'))
         except Exception as e:
             self.logger.error(f"Error parsing log file {log_path}: {str(e)}")
+            os.remove(temp_path)
             raise
         
-        return old_entries, remaining_entries
+        return expired_count, kept_count, temp_path, bytes_read
     
-    def delete_old_file_logs(self, log_path, remaining_entries):
+    def replace_file_log(self, log_path, temp_path, bytes_read):
         """
-        Delete old file log entries by rewriting the log file.
-        Creates a backup before modification.
-        
-        Args:
-            log_path: Path to log file
-            remaining_entries: List of log entries to keep
-        
-        Returns:
-            Number of entries deleted
+        Atomically replace a log file with the kept entries from
+        ``split_file_log``, carrying over lines appended since it read the log.
         """
-        try:
-            # Create backup
-            backup_path = f"{log_path}.backup"
-            if os.path.exists(log_path):
-                import shutil
-                shutil.copy2(log_path, backup_path)
-                self.logger.info(f"Created backup: {backup_path}")
-            
-            # Count original entries
-            with open(log_path, 'r', encoding='utf-8', errors='ignore') as f:
-                original_content = f.read()
-            
-            # Rewrite file with remaining entries
-            with open(log_path, 'w', encoding='utf-8') as f:
-                f.writelines(remaining_entries)
-            
-            deleted_count = len(original_content.split('\n')) - len(''.join(remaining_entries).split('\n'))
-            self.logger.info(f"Deleted approximately {deleted_count} lines from {log_path}")
-            
-            # Remove backup after 24 hours (in production, this would be a scheduled task)
-            # For now, we keep it
-            
-            return max(0, deleted_count)
-            
-        except Exception as e:
-            self.logger.error(f"Error deleting old file logs: {str(e)}")
-            # Restore from backup if exists
-            if os.path.exists(backup_path):
-                import shutil
-                shutil.copy2(backup_path, log_path)
-                self.logger.info("Restored from backup due to error")
-            raise
+        with open(log_path, 'rb') as source, open(temp_path, 'ab') as kept:
+            source.seek(bytes_read)
+            shutil.copyfileobj(source, kept, FILE_LOG_BUFFER_SIZE)
+        shutil.copymode(log_path, temp_path)
+        os.replace(temp_path, log_path)
+        self._reopen_file_handlers(log_path)
+    
+    @staticmethod
+    def _reopen_file_handlers(log_path):
+        """
+        Point this process's logging file handlers at the new log file; they
+        reopen it on their next record instead of writing to the replaced one.
+        """
+        log_path = os.path.abspath(log_path)
+        loggers = [logging.getLogger()] + [
+            item for item in logging.Logger.manager.loggerDict.values()
+            if isinstance(item, logging.Logger)
+        ]
+        for handler in {handler for item in loggers for handler in item.handlers}:
+            if isinstance(handler, logging.FileHandler) and handler.baseFilename == log_path:
+                handler.acquire()
+                try:
+                    if handler.stream:
+                        handler.stream.close()
+                    handler.stream = None
+                finally:
+                    handler.release()
 
     def export_audit_logs_to_csv(self, logs, filepath):
         """
@@ -927,7 +1004,7 @@ class LogManagementService:
             self.logger.error(f"Error exporting audit logs to PDF: {str(e)}")
             raise
     
-    def export_file_logs_to_pdf(self, log_entries, filepath, log_filename):
+    def export_file_logs_to_pdf(self, log_entries, filepath, log_filename, total_entries=None):
         """
         Export file logs to PDF format with proper styling.
         
@@ -935,8 +1012,13 @@ class LogManagementService:
             log_entries: List of log entry strings
             filepath: Full path to output PDF file
             log_filename: Name of the source log file
+            total_entries: Number of entries archived, when ``log_entries``
+                only holds the first ones
         """
         try:
+            if total_entries is None:
+                total_entries = len(log_entries)
+            
             # Import LogoHeaderService
             from core.export_utils import LogoHeaderService
             
@@ -979,7 +1061,7 @@ class LogManagementService:
             metadata = Paragraph(
                 f"<b>Export Date:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}<br/>"
                 f"<b>Source File:</b> {log_filename}<br/>"
-                f"<b>Total Entries:</b> {len(log_entries)}",
+                f"<b>Total Entries:</b> {total_entries}",
                 metadata_style
             )
             elements.append(metadata)
@@ -997,7 +1079,7 @@ class LogManagementService:
                 wordWrap='CJK'
             )
             
-            for i, entry in enumerate(log_entries[:500]):  # Limit to 500 entries per PDF
+            for i, entry in enumerate(log_entries[:FILE_LOG_PDF_ENTRY_LIMIT]):
                 # Clean and escape entry
                 clean_entry = entry.strip().replace('<', '&lt;').replace('>', '&gt;')
                 
@@ -1009,14 +1091,14 @@ class LogManagementService:
                 elements.append(entry_para)
                 
                 # Add page break every 50 entries
-                if (i + 1) % 50 == 0 and i < len(log_entries) - 1:
+                if (i + 1) % 50 == 0 and i < min(total_entries, FILE_LOG_PDF_ENTRY_LIMIT) - 1:
                     elements.append(PageBreak())
             
             # Add note if entries were truncated
-            if len(log_entries) > 500:
+            if total_entries > FILE_LOG_PDF_ENTRY_LIMIT:
                 note_style = styles['Italic']
                 note = Paragraph(
-                    f"<i>Note: Only first 500 of {len(log_entries)} entries shown. "
+                    f"<i>Note: Only first {FILE_LOG_PDF_ENTRY_LIMIT} of {total_entries} entries shown. "
                     f"See CSV export for complete data.</i>",
                     note_style
                 )
@@ -1039,7 +1121,7 @@ class LogManagementService:
             # Build PDF with custom canvas
             doc.build(elements, canvasmaker=HeaderCanvas)
             
-            self.logger.info(f"Exported {len(log_entries)} file log entries to PDF: {filepath}")
+            self.logger.info(f"Exported {total_entries} file log entries to PDF: {filepath}")
             
         except Exception as e:
             self.logger.error(f"Error exporting file logs to PDF: {str(e)}")
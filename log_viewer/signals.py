@@ -8,17 +8,14 @@ from django.dispatch import receiver
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
 from django.utils import timezone
-from django.core.exceptions import ObjectDoesNotExist
 from django.apps import apps
 from django.db import connection
+from . import audit
 from .models import AuditLog
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
 
-# Store original values before updates
-_original_values_cache = {}
-
 # Cache for table existence check to avoid repeated database queries during migrations
 _table_existence_cache = {}
 
@@ -129,47 +126,9 @@ def audit_log_table_exists():
 def get_model_field_values(instance, exclude_fields=None):
     """
     Get all field values from a model instance.
-    Excludes sensitive fields and relationships.
+    Excludes sensitive fields and foreign keys, and reads nothing from the database.
     """
-    exclude_fields = exclude_fields or []
-    exclude_fields.extend([
-        'password', 'password1', 'password2',  # Password fields
-        'secret_key', 'api_key', 'token',  # API keys
-        'created', 'modified', 'updated_at', 'created_at',  # Timestamps (handled separately)
-    ])
-    
-    values = {}
-    for field in instance._meta.get_fields():
-        if field.name in exclude_fields:
-            continue
-        
-        # Skip reverse relations
-        if field.one_to_many or field.many_to_many or field.many_to_one:
-            continue
-        
-        try:
-            value = getattr(instance, field.name, None)
-            
-            # Convert to JSON-serializable format
-            if value is None:
-                values[field.name] = None
-            elif hasattr(value, 'pk'):
-                # Foreign key or related object
-                values[field.name] = {
-                    'id': value.pk,
-                    'str': str(value)
-                }
-            elif isinstance(value, (str, int, float, bool)):
-                values[field.name] = value
-            elif isinstance(value, (list, dict)):
-                values[field.name] = value
-            else:
-                # Convert other types to string
-                values[field.name] = str(value)
-        except (AttributeError, ObjectDoesNotExist):
-            pass
-    
-    return values
+    return audit.get_field_values(instance, exclude_fields)
 
 
 def get_current_user():
@@ -212,95 +171,63 @@ def get_client_ip(request):
     return ip
 
 
-@receiver(pre_save)
-def store_original_values(sender, instance, **kwargs):
+def _skip_audit(sender, instance, handler_name):
     """
-    Store original values before update so we can compare them later.
+    Return True when the change ``handler_name`` got should not be audited:
+    auditing is suspended, the model is excluded, migrations are running
+    or the AuditLog table does not exist yet.
     """
+    if audit.is_suspended() or not audit.is_audited(sender):
+        return True
+
     try:
         # Skip if running in migration context
         if is_running_in_migration():
-            return
+            return True
     except Exception as e:
-        logger.debug(f"Migration detection failed in store_original_values for {sender._meta.label}: {str(e)}")
+        logger.debug(f"Migration detection failed in {handler_name} for {sender._meta.label}: {str(e)}")
         # Fail-safe: continue execution if detection fails
-    
+
     try:
         # Skip if audit log table doesn't exist yet
         if not audit_log_table_exists():
-            return
+            return True
     except Exception as e:
-        logger.error(f"Table existence check failed in store_original_values for {sender._meta.label}: {str(e)}")
+        logger.error(f"Table existence check failed in {handler_name} for {sender._meta.label}: {str(e)}")
         # Fail-safe: skip execution if table check fails
-        return
-    
-    # Skip for AuditLog itself
-    if isinstance(instance, AuditLog):
-        return
-    
-    # Skip for migrations
-    if sender._meta.app_label == 'migrations':
-        return
-    
-    # Skip for system models
-    skip_apps = ['contenttypes', 'sessions', 'admin', 'auth', 'authtoken']
-    if sender._meta.app_label in skip_apps:
-        return
-    
-    # Only store if instance has a primary key (i.e., it's an update, not a create)
-    if instance.pk:
-        try:
-            # Get the existing instance from database
-            old_instance = sender.objects.get(pk=instance.pk)
-            cache_key = f"{sender._meta.label}.{instance.pk}"
-            _original_values_cache[cache_key] = get_model_field_values(old_instance)
-        except (ObjectDoesNotExist, sender.DoesNotExist):
-            # Instance doesn't exist yet, it's a create
-            pass
-        except Exception as e:
-            migration_context = "during migration" if is_running_in_migration() else "in normal operation"
-            logger.error(
-                f"Error storing original values for {sender._meta.label} {migration_context}: {str(e)}",
-                exc_info=True
-            )
+        return True
+
+    return False
+
+
+@receiver(pre_save)
+def forget_unloaded_original_values(sender, instance, **kwargs):
+    """
+    Drop the loaded-values snapshot of an instance that is being added.
+
+    Such an instance was built, not loaded, so if its save turns out to update
+    an existing row the previous values are unknown rather than those it was
+    built with.
+    """
+    if instance._state.adding:
+        audit.forget_original_values(instance)
 
 
 @receiver(post_save)
-def log_create_or_update(sender, instance, created, **kwargs):
+def log_create_or_update(sender, instance, created, update_fields=None, using='default', **kwargs):
     """
     Log CREATE or UPDATE operations for all models.
     """
-    try:
-        # Skip if running in migration context
-        if is_running_in_migration():
-            return
-    except Exception as e:
-        logger.debug(f"Migration detection failed in log_create_or_update for {sender._meta.label}: {str(e)}")
-        # Fail-safe: continue execution if detection fails
-    
-    try:
-        # Skip if audit log table doesn't exist yet
-        if not audit_log_table_exists():
-            return
-    except Exception as e:
-        logger.error(f"Table existence check failed in log_create_or_update for {sender._meta.label}: {str(e)}")
-        # Fail-safe: skip execution if table check fails
-        return
-    
-    # Skip logging for AuditLog itself to avoid recursion
-    if isinstance(instance, AuditLog):
-        return
-    
-    # Skip logging for migrations
-    if sender._meta.app_label == 'migrations':
+    if _skip_audit(sender, instance, 'log_create_or_update'):
+        if audit.is_audited(sender):
+            # An unlogged save still moves the baseline of the next update
+            audit.refresh_original_values(instance)
         return
-    
-    # Skip logging for system models
-    skip_apps = ['contenttypes', 'sessions', 'admin', 'auth', 'authtoken']
-    if sender._meta.app_label in skip_apps:
-        return
-    
+
     try:
+        if not audit.is_sampled(sender):
+            return
+
         action = 'CREATE' if created else 'UPDATE'
         object_id = _get_numeric_object_id(instance)
         if object_id is None:
@@ -329,20 +256,8 @@ def log_create_or_update(sender, instance, created, **kwargs):
         old_values = None
         
         if not created:
-            # Get old values from cache
-            cache_key = f"{sender._meta.label}.{instance.pk}"
-            old_values = _original_values_cache.pop(cache_key, None)
-            
-            if old_values:
-                # Compare to find changed fields
-                for field_name, old_value in old_values.items():
-                    new_value = new_values.get(field_name)
-                    if old_value != new_value:
-                        changed_fields.append(field_name)
-            
-            # If no cache, we can't determine changes
-            if not old_values:
-                changed_fields = None
+            # Compare with the values the instance was loaded with
+            old_values, changed_fields = audit.get_changes(instance, new_values, update_fields)
         
         # Create message
         object_repr = str(instance)[:200]  # Limit length
@@ -354,8 +269,8 @@ def log_create_or_update(sender, instance, created, **kwargs):
             else:
                 message = f"{action}: {sender._meta.verbose_name} '{object_repr}' updated"
         
-        # Create audit log entry
-        audit_log = AuditLog.objects.create(
+        # Queue the audit log entry; it is written (and mirrored to the file log) in bulk
+        audit.enqueue(AuditLog(
             content_type=content_type,
             object_id=object_id,
             action=action,
@@ -371,13 +286,7 @@ def log_create_or_update(sender, instance, created, **kwargs):
             request_path=request_info.get('request_path', '')[:500],
             message=message,
             timestamp=timezone.now(),
-        )
-        
-        # Also log to file logger
-        logger.info(
-            f"AUDIT {action}: {sender._meta.app_label}.{sender._meta.model_name} "
-            f"#{instance.pk} by {username or 'Anonymous'} - {message}"
-        )
+        ), using=using)
         
     except Exception as e:
         # Don't let logging errors break the application
@@ -386,47 +295,23 @@ def log_create_or_update(sender, instance, created, **kwargs):
             f"Error creating audit log for {sender._meta.label} {migration_context}: {str(e)}",
             exc_info=True
         )
+    finally:
+        # The saved values are the baseline of the next update
+        audit.refresh_original_values(instance)
 
 
 @receiver(pre_delete)
-def log_pre_delete(sender, instance, **kwargs):
+def log_pre_delete(sender, instance, using='default', **kwargs):
     """
     Store original values before deletion so we can log them.
     """
-    try:
-        # Skip if running in migration context
-        if is_running_in_migration():
-            return
-    except Exception as e:
-        logger.debug(f"Migration detection failed in log_pre_delete for {sender._meta.label}: {str(e)}")
-        # Fail-safe: continue execution if detection fails
-    
-    try:
-        # Skip if audit log table doesn't exist yet
-        if not audit_log_table_exists():
-            return
-    except Exception as e:
-        logger.error(f"Table existence check failed in log_pre_delete for {sender._meta.label}: {str(e)}")
-        # Fail-safe: skip execution if table check fails
-        return
-    
-    # Skip logging for AuditLog itself
-    if isinstance(instance, AuditLog):
-        return
-    
-    # Skip logging for migrations
-    if sender._meta.app_label == 'migrations':
-        return
-    
-    # Skip logging for system models
-    skip_apps = ['contenttypes', 'sessions', 'admin', 'auth', 'authtoken']
-    if sender._meta.app_label in skip_apps:
+    if _skip_audit(sender, instance, 'log_pre_delete'):
         return
     
     try:
         # Store original values for deletion logging
         cache_key = f"{sender._meta.label}.{instance.pk}"
-        _original_values_cache[cache_key] = get_model_field_values(instance)
+        audit.store_original_values(cache_key, get_model_field_values(instance), using=using)
     except Exception as e:
         migration_context = "during migration" if is_running_in_migration() else "in normal operation"
         logger.error(
@@ -436,38 +321,11 @@ def log_pre_delete(sender, instance, **kwargs):
 
 
 @receiver(post_delete)
-def log_delete(sender, instance, **kwargs):
+def log_delete(sender, instance, using='default', **kwargs):
     """
     Log DELETE operations for all models.
     """
-    try:
-        # Skip if running in migration context
-        if is_running_in_migration():
-            return
-    except Exception as e:
-        logger.debug(f"Migration detection failed in log_delete for {sender._meta.label}: {str(e)}")
-        # Fail-safe: continue execution if detection fails
-    
-    try:
-        # Skip if audit log table doesn't exist yet
-        if not audit_log_table_exists():
-            return
-    except Exception as e:
-        logger.error(f"Table existence check failed in log_delete for {sender._meta.label}: {str(e)}")
-        # Fail-safe: skip execution if table check fails
-        return
-    
-    # Skip logging for AuditLog itself
-    if isinstance(instance, AuditLog):
-        return
-    
-    # Skip logging for migrations
-    if sender._meta.app_label == 'migrations':
-        return
-    
-    # Skip logging for system models
-    skip_apps = ['contenttypes', 'sessions', 'admin', 'auth', 'authtoken']
-    if sender._meta.app_label in skip_apps:
+    if _skip_audit(sender, instance, 'log_delete'):
         return
     
     try:
@@ -492,7 +350,7 @@ def log_delete(sender, instance, **kwargs):
         
         # Get old values from cache
         cache_key = f"{sender._meta.label}.{instance.pk}"
-        old_values = _original_values_cache.pop(cache_key, None)
+        old_values = audit.pop_original_values(cache_key)
         
         # Get object representation before deletion
         try:
@@ -503,8 +361,8 @@ def log_delete(sender, instance, **kwargs):
         # Create message
         message = f"DELETE: {sender._meta.verbose_name} '{object_repr}' deleted"
         
-        # Create audit log entry
-        audit_log = AuditLog.objects.create(
+        # Queue the audit log entry; it is written (and mirrored to the file log) in bulk
+        audit.enqueue(AuditLog(
             content_type=content_type,
             object_id=object_id,
             action='DELETE',
@@ -520,13 +378,7 @@ def log_delete(sender, instance, **kwargs):
             request_path=request_info.get('request_path', '')[:500],
             message=message,
             timestamp=timezone.now(),
-        )
-        
-        # Also log to file logger
-        logger.warning(
-            f"AUDIT DELETE: {sender._meta.app_label}.{sender._meta.model_name} "
-            f"#{instance.pk if hasattr(instance, 'pk') else '?'} by {username or 'Anonymous'} - {message}"
-        )
+        ), using=using)
         
     except Exception as e:
         # Don't let logging errors break the application
@@ -1,3 +1,446 @@
-from django.test import TestCase
+import csv
+import logging
+import os
+import shutil
+import tempfile
+from datetime import date, datetime
+from pathlib import Path
+from unittest.mock import patch
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from . import audit, log_index, signals
+from .log_index import LogEntries, LogIndex, parse_log_entry
+from .models import AuditLog, LogRetentionPolicy
+from .services import LogManagementService
+
+LINES = [
+    "INFO 2025-01-01 08:00:00,100 accounts.views User alice logged in",
+    "Traceback (most recent call last):",
+    "ERROR 2025-01-01 09:30:00,200 core.export_jobs Export 5 failed: disk full",
+    "WARNING 2025-01-02 10:00:00,300 surveys.tracer_study Chrome missing",
+    "DEBUG 2025-01-02 11:00:00,400 accounts.forms Form cleaned for ALICE",
+    "INFO some message without a date",
+    "ERROR 2025-01-03 12:00:00,500 core.views Unhandled error for alice",
+]
+
+
+class LogIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.log_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.log_dir, ignore_errors=True)
+        self.log_path = self.log_dir / 'alumni_system.log'
+        self._write(LINES)
+
+    def _write(self, lines, mode='w'):
+        with open(self.log_path, mode, encoding='utf-8') as log_file:
+            log_file.write(''.join(f'{line}\n' for line in lines))
+
+    def _scan(self, level='', app='', date_from=None, date_to=None, search=''):
+        """
+        Every line parsed and filtered, as the viewer did before the index.
+        An entry without a time is dated like the entry before it.
+        """
+        entries = []
+        last_date = None
+        with open(self.log_path, encoding='utf-8') as log_file:
+            for line in log_file:
+                entry = parse_log_entry(line.strip())
+                if not entry:
+                    continue
+                entry['date'] = last_date = entry['date'] or last_date
+                if level and entry['level'] != level:
+                    continue
+                if app and app not in entry['module']:
+                    continue
+                if search and search.lower() not in entry['message'].lower():
+                    continue
+                if date_from and entry['date'] and entry['date'].date() < date_from:
+                    continue
+                if date_to and entry['date'] and entry['date'].date() > date_to:
+                    continue
+                entries.append(entry['raw'])
+        return entries[::-1]
+
+    def _indexed(self, index, **filters):
+        return [entry['raw'] for entry in LogEntries(index, index.query(**filters))]
+
+    def test_filters_match_a_full_scan(self):
+        index = LogIndex(self.log_path).refresh()
+
+        for filters in (
+            {},
+            {'level': 'ERROR'},
+            {'level': 'TRACE'},
+            {'app': 'accounts'},
+            {'search': 'alice'},
+            {'search': 'ALICE', 'app': 'accounts'},
+            {'date_from': date(2025, 1, 2)},
+            {'date_to': date(2025, 1, 1)},
+            {'date_from': date(2025, 1, 2), 'date_to': date(2025, 1, 2), 'level': 'DEBUG'},
+        ):
+            with self.subTest(filters=filters):
+                self.assertEqual(self._indexed(index, **filters), self._scan(**filters))
+
+        self.assertEqual(index.available_apps, ['accounts', 'core', 'surveys', 'unknown'])
+        level_counts, app_counts = index.counts(index.query(search='alice'))
+        self.assertEqual(level_counts, {'INFO': 1, 'DEBUG': 1, 'ERROR': 1})
+        self.assertEqual(app_counts, {'accounts': 2, 'core': 1})
+
+    def test_pages_are_sliced_newest_first(self):
+        index = LogIndex(self.log_path).refresh()
+        entries = LogEntries(index, index.query())
+
+        self.assertEqual(len(entries), 6)
+        self.assertEqual([entry['module'] for entry in entries[:2]], ['core.views', 'unknown'])
+        self.assertEqual(entries[5]['module'], 'accounts.views')
+
+    def test_refresh_indexes_only_complete_appended_lines(self):
+        index = LogIndex(self.log_path).refresh()
+        indexed_size = index.indexed_size
+
+        with open(self.log_path, 'a', encoding='utf-8') as log_file:
+            log_file.write("INFO 2025-01-04 08:00:00,000 events.views Event created\nINFO 2025-01-04 08:0")
+        with patch.object(log_index, '_entry_fields', wraps=log_index._entry_fields) as parse:
+            index.refresh()
+
+        self.assertEqual(parse.call_count, 1)
+        self.assertEqual(len(index), 7)
+        self.assertGreater(index.indexed_size, indexed_size)
+        self.assertLess(index.indexed_size, os.path.getsize(self.log_path))
+
+    def test_index_is_reused_from_disk_and_rebuilt_after_rotation(self):
+        LogIndex(self.log_path).refresh()
+
+        with patch.object(log_index, '_entry_fields') as parse:
+            reloaded = LogIndex(self.log_path).refresh()
+        parse.assert_not_called()
+        self.assertEqual(self._indexed(reloaded), self._scan())
+
+        # RotatingFileHandler renames the log and starts a new file
+        os.replace(self.log_path, self.log_dir / 'alumni_system.log.1')
+        self._write(["CRITICAL 2025-02-01 00:00:00,000 core.views Fresh file"])
+        reloaded.refresh()
+        self.assertEqual(self._indexed(reloaded), self._scan())
+
+        # Retention rewrites the log in place
+        self._write(["INFO 2025-03-01 00:00:00,000 events.views Kept entry", "INFO 2025-03-01 00:00:01,000 x y"])
+        reloaded.refresh()
+        self.assertEqual(self._indexed(reloaded), self._scan())
+
+
+class LogListViewTests(TestCase):
+    def setUp(self):
+        self.base_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.base_dir, ignore_errors=True)
+        (self.base_dir / 'logs').mkdir()
+        (self.base_dir / 'logs' / 'alumni_system.log').write_text(
+            ''.join(f'{line}\n' for line in LINES), encoding='utf-8'
+        )
+
+        setup_patcher = patch(
+            "setup.middleware.SetupRequiredMiddleware._is_setup_complete",
+            return_value=True,
+        )
+        setup_patcher.start()
+        self.addCleanup(setup_patcher.stop)
+
+        admin = get_user_model().objects.create_user(
+            'logadmin', 'logadmin@example.com', 'pass', is_staff=True
+        )
+        self.client.force_login(admin)
+
+    def test_log_list_filters_through_the_index(self):
+        with override_settings(BASE_DIR=self.base_dir):
+            response = self.client.get(reverse('log_viewer:log_list'), {'log_level': 'ERROR'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['total_entries'], 2)
+        self.assertEqual(response.context['level_counts'], {'ERROR': 2})
+        self.assertEqual(response.context['available_apps'], ['accounts', 'core', 'surveys', 'unknown'])
+        self.assertEqual(
+            [entry['message'] for entry in response.context['log_entries']],
+            ['Unhandled error for alice', 'Export 5 failed: disk full'],
+        )
+        self.assertTrue((self.base_dir / 'logs' / '.index' / 'alumni_system.log' / 'meta.json').exists())
+
+
+RETENTION_LOG = (
+    "started without a timestamp\n"
+    "INFO 2025-01-01 08:00:00,100 core.views Old entry\n"
+    "ERROR 2025-01-01 09:00:00,000 core.views Old failure\n"
+    "Traceback (most recent call last):\n"
+    "  ValueError: seen on 2025-13-40 10:00:00\n"
+    "[2025-01-09 23:59:59] legacy bracketed entry\n"
+    "INFO 2025-01-10 00:00:00,000 core.views Exactly at the cutoff\n"
+    "WARNING 2025-01-11 12:00:00,000 core.views Recent entry\n"
+    "  continued\n"
+)
+RETENTION_CUTOFF = datetime(2025, 1, 10)
+
+
+class FileLogRetentionTests(TestCase):
+    def setUp(self):
+        self.base_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.base_dir, ignore_errors=True)
+        self.log_dir = self.base_dir / 'logs'
+        self.log_dir.mkdir()
+        self.log_path = self.log_dir / 'alumni_system.log'
+        self.log_path.write_text(RETENTION_LOG, encoding='utf-8')
+        self.service = LogManagementService()
+
+    def test_split_streams_expired_entries_and_keeps_the_rest(self):
+        expired = []
+        expired_count, kept_count, temp_path, bytes_read = self.service.split_file_log(
+            self.log_path, RETENTION_CUTOFF, on_expired=expired.append
+        )
+
+        self.assertEqual((expired_count, kept_count), (3, 3))
+        self.assertEqual(expired, [
+            "INFO 2025-01-01 08:00:00,100 core.views Old entry\n",
+            "ERROR 2025-01-01 09:00:00,000 core.views Old failure\n"
+            "Traceback (most recent call last):\n"
+            "  ValueError: seen on 2025-13-40 10:00:00\n",
+            "[2025-01-09 23:59:59] legacy bracketed entry\n",
+        ])
+        self.assertEqual(bytes_read, os.path.getsize(self.log_path))
+
+        # Lines written while retention ran are carried over
+        with open(self.log_path, 'a', encoding='utf-8') as log_file:
+            log_file.write("INFO 2025-01-12 00:00:00,000 core.views Appended meanwhile\n")
+        self.service.replace_file_log(self.log_path, temp_path, bytes_read)
+
+        self.assertFalse(os.path.exists(temp_path))
+        self.assertEqual(self.log_path.read_text(encoding='utf-8'), (
+            "started without a timestamp\n"
+            "INFO 2025-01-10 00:00:00,000 core.views Exactly at the cutoff\n"
+            "WARNING 2025-01-11 12:00:00,000 core.views Recent entry\n"
+            "  continued\n"
+            "INFO 2025-01-12 00:00:00,000 core.views Appended meanwhile\n"
+        ))
+
+    def test_cutoff_with_microseconds_expires_its_own_second(self):
+        expired_count, _, temp_path, _ = self.service.split_file_log(
+            self.log_path, RETENTION_CUTOFF.replace(microsecond=1)
+        )
+        os.remove(temp_path)
+        self.assertEqual(expired_count, 4)
+
+    def test_process_file_logs_archives_and_counts_exactly(self):
+        media_root = self.base_dir / 'media'
+        policy = LogRetentionPolicy(
+            log_type='file', retention_days=30, export_before_delete=True,
+            export_format='both', archive_path='log_archives',
+        )
+        handler = logging.FileHandler(self.log_path, encoding='utf-8')
+        test_logger = logging.getLogger('log_viewer.tests.retention')
+        test_logger.addHandler(handler)
+        test_logger.propagate = False
+        self.addCleanup(test_logger.removeHandler, handler)
+        self.addCleanup(handler.close)
+        test_logger.warning("INFO 2025-01-12 00:00:00,000 core.views Before cleanup")
+
+        with override_settings(BASE_DIR=self.base_dir, MEDIA_ROOT=media_root), \
+                patch('log_viewer.services.timezone.now', return_value=datetime(2025, 2, 9)):
+            processed, deleted, archives = self.service.process_file_logs(policy)
+
+        self.assertEqual((processed, deleted), (3, 3))
+        self.assertEqual(sorted(Path(path).suffix for path in archives), ['.csv', '.pdf'])
+        csv_path = next(path for path in archives if path.endswith('.csv'))
+        with open(csv_path, newline='', encoding='utf-8') as csv_file:
+            rows = list(csv.reader(csv_file))
+        self.assertEqual(rows[0], ['Source File', 'Log Entry'])
+        self.assertEqual([row[1].splitlines()[0] for row in rows[1:]], [
+            "INFO 2025-01-01 08:00:00,100 core.views Old entry",
+            "ERROR 2025-01-01 09:00:00,000 core.views Old failure",
+            "[2025-01-09 23:59:59] legacy bracketed entry",
+        ])
+
+        # This process's handler writes to the new file, not the replaced one
+        test_logger.warning("INFO 2025-02-09 00:00:00,000 core.views After cleanup")
+        handler.flush()
+        content = self.log_path.read_text(encoding='utf-8')
+        self.assertNotIn("Old entry", content)
+        self.assertTrue(content.endswith("After cleanup\n"))
+        self.assertEqual([p.name for p in self.log_dir.iterdir()], ['alumni_system.log'])
+
+    def test_process_file_logs_leaves_a_log_without_old_entries_alone(self):
+        inode = os.stat(self.log_path).st_ino
+        policy = LogRetentionPolicy(log_type='file', retention_days=3650, export_before_delete=False)
+
+        with override_settings(BASE_DIR=self.base_dir):
+            self.assertEqual(self.service.process_file_logs(policy), (0, 0, []))
+
+        self.assertEqual(os.stat(self.log_path).st_ino, inode)
+        self.assertEqual(self.log_path.read_text(encoding='utf-8'), RETENTION_LOG)
+
+
+class AuditPipelineTests(TestCase):
+    def setUp(self):
+        # The table check may have been cached before the test database existed
+        signals._table_existence_cache.clear()
+        self.assertTrue(signals.audit_log_table_exists())
+        # Keep only the default audit policy, with 30 days
+        with audit.suspend():
+            LogRetentionPolicy.objects.filter(log_type='file').delete()
+            LogRetentionPolicy.objects.update(retention_days=30)
+
+    def test_update_is_diffed_without_a_select_and_written_on_commit(self):
+        policy = LogRetentionPolicy.objects.get(log_type='audit')
+        policy.retention_days = 90
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            with self.assertNumQueries(1):
+                policy.save()
+        self.assertFalse(AuditLog.objects.exists())
+
+        with self.assertNumQueries(1):
+            for callback in callbacks:
+                callback()
+        record = AuditLog.objects.get()
+        self.assertEqual(record.action, 'UPDATE')
+        self.assertEqual(record.changed_fields, ['retention_days'])
+        self.assertEqual(record.old_values['retention_days'], 30)
+        self.assertEqual(record.new_values['retention_days'], 90)
+
+        # The saved values are the baseline of the next update
+        policy.enabled = True
+        with self.captureOnCommitCallbacks(execute=True):
+            policy.save()
+        self.assertEqual(AuditLog.objects.latest('id').changed_fields, ['enabled'])
+
+    def test_json_changed_in_place_is_diffed(self):
+        from jobs.models import ScrapeRun
+
+        with audit.suspend():
+            user = get_user_model().objects.create_user('scraper')
+            ScrapeRun.objects.create(
+                search_keyword='nurse', search_location='Cebu', progress={'JORA': {}}, scraped_by=user,
+            )
+        run = ScrapeRun.objects.get()
+        run.progress['JORA'] = {'state': 'done'}
+
+        old_values, changed_fields = audit.get_changes(run, audit.get_field_values(run), ['progress'])
+        self.assertEqual(changed_fields, ['progress'])
+        self.assertEqual(old_values['progress'], {'JORA': {}})
+
+    def test_unlogged_saves_move_the_baseline(self):
+        policy = LogRetentionPolicy.objects.get(log_type='audit')
+        policy.retention_days = 60
+        with audit.suspend():
+            policy.save()
+
+        policy.enabled = not policy.enabled
+        with self.captureOnCommitCallbacks(execute=True):
+            policy.save()
+        record = AuditLog.objects.get()
+        self.assertEqual(record.changed_fields, ['enabled'])
+        self.assertEqual(record.old_values['retention_days'], 60)
+
+    def test_batch_writes_every_record_with_one_insert(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            for days in (60, 90, 120):
+                LogRetentionPolicy.objects.filter(log_type='audit').get().save()
+                LogRetentionPolicy.objects.update(retention_days=days)
+
+        with audit.batch():
+            for callback in callbacks:
+                callback()
+            self.assertFalse(AuditLog.objects.exists())
+            with self.assertNumQueries(1):
+                audit.flush()
+        self.assertEqual(AuditLog.objects.count(), 3)
+
+    def test_records_of_a_rolled_back_savepoint_are_dropped(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    LogRetentionPolicy.objects.create(log_type='file', retention_days=7)
+                    raise ValueError
+            except ValueError:
+                pass
+            LogRetentionPolicy.objects.get(log_type='audit').delete()
+
+        record = AuditLog.objects.get()
+        self.assertEqual(record.action, 'DELETE')
+        self.assertEqual(record.old_values['retention_days'], 30)
+
+    def test_instance_built_with_a_primary_key_has_unknown_changes(self):
+        pk = LogRetentionPolicy.objects.get().pk
+        with self.captureOnCommitCallbacks(execute=True):
+            LogRetentionPolicy(pk=pk, log_type='audit', retention_days=10, created_at=datetime.now()).save()
+
+        record = AuditLog.objects.get()
+        self.assertEqual(record.action, 'UPDATE')
+        self.assertIsNone(record.old_values)
+        self.assertIsNone(record.changed_fields)
+
+    def test_excluded_and_sampled_models(self):
+        with override_settings(AUDIT_LOG_EXCLUDE=['log_viewer.logretentionpolicy']):
+            with self.captureOnCommitCallbacks(execute=True):
+                LogRetentionPolicy.objects.get().save()
+        self.assertFalse(AuditLog.objects.exists())
+
+        with override_settings(AUDIT_LOG_SAMPLE_RATES={'log_viewer': 0.5}):
+            with patch('log_viewer.audit.random.random', side_effect=[0.7, 0.2]):
+                with self.captureOnCommitCallbacks(execute=True):
+                    LogRetentionPolicy.objects.get().save()
+                    LogRetentionPolicy.objects.get().save()
+        self.assertEqual(AuditLog.objects.count(), 1)
+
+        with audit.suspend(), self.captureOnCommitCallbacks(execute=True):
+            LogRetentionPolicy.objects.get().delete()
+        self.assertEqual(AuditLog.objects.count(), 1)
+
+
+class OriginalValuesStoreTests(TestCase):
+    def _stats_delta(self, before):
+        after = audit.original_values_stats()
+        return {name: after[name] - before[name] for name in ('stored', 'hits', 'misses', 'evicted', 'discarded')}
+
+    def test_values_are_taken_once(self):
+        before = audit.original_values_stats()
+        audit.store_original_values('app.Model.1', {'name': 'a'})
+
+        self.assertEqual(audit.pop_original_values('app.Model.1'), {'name': 'a'})
+        self.assertIsNone(audit.pop_original_values('app.Model.1'))
+        self.assertEqual(
+            self._stats_delta(before),
+            {'stored': 1, 'hits': 1, 'misses': 1, 'evicted': 0, 'discarded': 0},
+        )
+
+    def test_values_of_a_rolled_back_transaction_are_discarded(self):
+        before = audit.original_values_stats()
+        try:
+            with transaction.atomic():
+                audit.store_original_values('app.Model.1', {'name': 'a'})
+                raise ValueError
+        except ValueError:
+            pass
+
+        self.assertIsNone(audit.pop_original_values('app.Model.1'))
+        self.assertEqual(self._stats_delta(before)['discarded'], 1)
+
+    @override_settings(AUDIT_LOG_ORIGINAL_VALUES_LIMIT=2)
+    def test_least_recently_stored_values_are_evicted(self):
+        before = audit.original_values_stats()
+        for pk in (1, 2, 3):
+            audit.store_original_values(f'app.Model.{pk}', {'pk': pk})
+
+        self.assertIsNone(audit.pop_original_values('app.Model.1'))
+        self.assertEqual(audit.pop_original_values('app.Model.3'), {'pk': 3})
+        self.assertEqual(self._stats_delta(before)['evicted'], 1)
+
+    def test_batch_scope_discards_what_it_leaves(self):
+        audit.store_original_values('app.Model.1', {'name': 'outer'})
+        before = audit.original_values_stats()
+        with audit.batch():
+            audit.store_original_values('app.Model.2', {'name': 'inner'})
+            self.assertIsNone(audit.pop_original_values('app.Model.1'))
+
+        self.assertIsNone(audit.pop_original_values('app.Model.2'))
+        self.assertEqual(audit.pop_original_values('app.Model.1'), {'name': 'outer'})
+        self.assertEqual(self._stats_delta(before)['discarded'], 1)
@@ -11,9 +11,7 @@ from django.conf import settings
 from django.utils import timezone
 from django.views.decorators.http import require_POST
 from datetime import datetime, timedelta
-import re
 import csv
-from collections import defaultdict
 from .models import (
     AuditLog, 
     LogRetentionPolicy, 
@@ -21,6 +19,7 @@ from .models import (
     LogOperationHistory, 
     ArchiveStorageConfig
 )
+from .log_index import LOG_LEVELS, LogEntries, get_log_index, parse_log_entry
 from .services import LogManagementService
 
 logger = logging.getLogger(__name__)
@@ -78,92 +77,16 @@ def log_list(request):
         date_to = request.GET.get('date_to', '')
         app_filter = request.GET.get('app', '')
         
-        # Read and parse log file
-        log_entries = []
-        current_file_path = log_dir / selected_file
-        
-        if current_file_path.exists():
-            try:
-                with open(current_file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    lines = f.readlines()
-                    
-                    # Parse log entries (assuming format: LEVEL DATE MODULE MESSAGE)
-                    for line in lines:
-                        line = line.strip()
-                        if not line:
-                            continue
-                        
-                        # Parse log entry
-                        entry = parse_log_entry(line)
-                        if entry:
-                            # Apply filters
-                            if log_level and entry['level'] != log_level:
-                                continue
-                            
-                            if search_query and search_query.lower() not in entry['message'].lower():
-                                continue
-                            
-                            if date_from:
-                                try:
-                                    date_from_obj = datetime.strptime(date_from, '%Y-%m-%d').date()
-                                    if entry['date'] and entry['date'].date() < date_from_obj:
-                                        continue
-                                except ValueError:
-                                    pass
-                            
-                            if date_to:
-                                try:
-                                    date_to_obj = datetime.strptime(date_to, '%Y-%m-%d').date()
-                                    if entry['date'] and entry['date'].date() > date_to_obj:
-                                        continue
-                                except ValueError:
-                                    pass
-                            
-                            if app_filter and app_filter not in entry['module']:
-                                continue
-                            
-                            log_entries.append(entry)
-            except Exception as e:
-                logger.error(f"Error reading log file: {str(e)}")
-        
-        # Reverse to show newest first
-        log_entries.reverse()
-        
-        # Get statistics
-        total_entries = len(log_entries)
-        level_counts = defaultdict(int)
-        app_counts = defaultdict(int)
-        
-        for entry in log_entries:
-            level_counts[entry['level']] += 1
-            # Extract app name from module
-            module_parts = entry['module'].split('.')
-            if module_parts:
-                app_counts[module_parts[0]] += 1
+        # Filter through the log's index; only the requested page is read from disk
+        results = _filtered_file_log(log_dir / selected_file, request.GET)
         
         # Pagination
-        paginator = Paginator(log_entries, 50)  # 50 entries per page
+        paginator = Paginator(results['entries'], 50)  # 50 entries per page
         page_number = request.GET.get('page', 1)
         page_obj = paginator.get_page(page_number)
         
         # Get available log levels
-        log_levels = ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']
-        
-        # Get available apps from all entries (not just filtered)
-        all_apps = set()
-        if current_file_path.exists():
-            try:
-                with open(current_file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    for line in f:
-                        entry = parse_log_entry(line.strip())
-                        if entry:
-                            module_parts = entry['module'].split('.')
-                            if module_parts:
-                                all_apps.add(module_parts[0])
-            except Exception:
-                pass
-        
-        available_apps = sorted(all_apps) if all_apps else sorted(set(app_counts.keys()))
+        log_levels = LOG_LEVELS
         
         # Count active filters
         active_filters = sum([
@@ -180,10 +103,10 @@ def log_list(request):
             'log_files': log_files_info,
             'selected_file': selected_file,
             'log_levels': log_levels,
-            'available_apps': available_apps,
-            'level_counts': dict(level_counts),
-            'app_counts': dict(app_counts),
-            'total_entries': total_entries,
+            'available_apps': results['available_apps'],
+            'level_counts': results['level_counts'],
+            'app_counts': results['app_counts'],
+            'total_entries': results['total'],
             'filters': {
                 'log_level': log_level,
                 'search': search_query,
@@ -203,56 +126,37 @@ def log_list(request):
             'error_message': f'Error loading logs: {str(e)}'
         })
 
-def parse_log_entry(line):
+def _parse_filter_date(value):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date() if value else None
+    except ValueError:
+        return None
+
+def _filtered_file_log(log_path, params):
     """
-    Parse a log entry line into structured data
-    Supports format: LEVEL DATE TIME MODULE MESSAGE
+    Entries of a log file matching the log viewer's filters, newest first,
+    with their level and app counts and the apps found in the whole file.
     """
     try:
-        # Pattern: LEVEL YYYY-MM-DD HH:MM:SS,mmm MODULE MESSAGE
-        pattern = r'(\w+)\s+(\d{4}-\d{2}-\d{2})\s+(\d{2}:\d{2}:\d{2}(?:,\d+)?)\s+(\S+)\s+(.+)'
-        match = re.match(pattern, line)
-        
-        if match:
-            level, date_str, time_str, module, message = match.groups()
-            
-            # Combine date and time
-            try:
-                datetime_str = f"{date_str} {time_str.split(',')[0]}"
-                entry_date = datetime.strptime(datetime_str, '%Y-%m-%d %H:%M:%S')
-            except ValueError:
-                entry_date = None
-            
-            return {
-                'level': level,
-                'date': entry_date,
-                'module': module,
-                'message': message,
-                'raw': line
-            }
-        
-        # Fallback: Try to extract level from start
-        level_pattern = r'^(DEBUG|INFO|WARNING|ERROR|CRITICAL)'
-        level_match = re.match(level_pattern, line)
-        
-        if level_match:
-            level = level_match.group(1)
-            message = line[len(level):].strip()
-            
-            return {
-                'level': level,
-                'date': None,
-                'module': 'unknown',
-                'message': message,
-                'raw': line
-            }
-        
-        # If no pattern matches, return None
-        return None
-        
+        index = get_log_index(log_path)
+        positions = index.query(
+            level=params.get('log_level', ''),
+            app=params.get('app', ''),
+            date_from=_parse_filter_date(params.get('date_from', '')),
+            date_to=_parse_filter_date(params.get('date_to', '')),
+            search=params.get('search', '').strip(),
+        )
+        level_counts, app_counts = index.counts(positions)
     except Exception as e:
-        logger.error(f"Error parsing log entry: {str(e)}")
-        return None
+        logger.error(f"Error reading log file: {str(e)}")
+        return {'entries': [], 'total': 0, 'level_counts': {}, 'app_counts': {}, 'available_apps': []}
+    return {
+        'entries': LogEntries(index, positions),
+        'total': len(positions),
+        'level_counts': level_counts,
+        'app_counts': app_counts,
+        'available_apps': index.available_apps,
+    }
 
 @staff_member_required
 def log_detail(request, log_id):
@@ -479,86 +383,16 @@ def logs(request):
             date_to = request.GET.get('date_to', '')
             app_filter = request.GET.get('app', '')
             
-            # Read and parse log file
-            log_entries = []
-            current_file_path = log_dir / selected_file
-            
-            if current_file_path.exists():
-                try:
-                    with open(current_file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        lines = f.readlines()
-                        
-                        # Parse log entries
-                        for line in lines:
-                            line = line.strip()
-                            if not line:
-                                continue
-                            
-                            entry = parse_log_entry(line)
-                            if entry:
-                                # Apply filters
-                                if log_level and entry['level'] != log_level:
-                                    continue
-                                if search_query and search_query.lower() not in entry['message'].lower():
-                                    continue
-                                if date_from:
-                                    try:
-                                        date_from_obj = datetime.strptime(date_from, '%Y-%m-%d').date()
-                                        if entry['date'] and entry['date'].date() < date_from_obj:
-                                            continue
-                                    except ValueError:
-                                        pass
-                                if date_to:
-                                    try:
-                                        date_to_obj = datetime.strptime(date_to, '%Y-%m-%d').date()
-                                        if entry['date'] and entry['date'].date() > date_to_obj:
-                                            continue
-                                    except ValueError:
-                                        pass
-                                if app_filter and app_filter not in entry['module']:
-                                    continue
-                                
-                                log_entries.append(entry)
-                except Exception as e:
-                    logger.error(f"Error reading log file: {str(e)}")
-            
-            # Reverse to show newest first
-            log_entries.reverse()
-            
-            # Get statistics
-            total_entries = len(log_entries)
-            level_counts = defaultdict(int)
-            app_counts = defaultdict(int)
-            
-            for entry in log_entries:
-                level_counts[entry['level']] += 1
-                module_parts = entry['module'].split('.')
-                if module_parts:
-                    app_counts[module_parts[0]] += 1
+            # Filter through the log's index; only the requested page is read from disk
+            results = _filtered_file_log(log_dir / selected_file, request.GET)
             
             # Pagination
-            paginator = Paginator(log_entries, 50)
+            paginator = Paginator(results['entries'], 50)
             page_number = request.GET.get('page', 1)
             page_obj = paginator.get_page(page_number)
             
             # Get available log levels
-            log_levels = ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']
-            
-            # Get available apps from all entries
-            all_apps = set()
-            if current_file_path.exists():
-                try:
-                    with open(current_file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        for line in f:
-                            entry = parse_log_entry(line.strip())
-                            if entry:
-                                module_parts = entry['module'].split('.')
-                                if module_parts:
-                                    all_apps.add(module_parts[0])
-                except Exception:
-                    pass
-            
-            available_apps_file = sorted(all_apps) if all_apps else sorted(set(app_counts.keys()))
+            log_levels = LOG_LEVELS
             
             # Count active filters
             active_filters = sum([
@@ -575,10 +409,10 @@ def logs(request):
                 'log_files': log_files_info,
                 'selected_file': selected_file,
                 'log_levels': log_levels,
-                'available_apps_file': available_apps_file,
-                'level_counts': dict(level_counts),
-                'app_counts': dict(app_counts),
-                'total_entries': total_entries,
+                'available_apps_file': results['available_apps'],
+                'level_counts': results['level_counts'],
+                'app_counts': results['app_counts'],
+                'total_entries': results['total'],
                 'filters': {
                     'log_level': log_level,
                     'search': search_query,
@@ -653,15 +653,85 @@ DOCS_TOC_CACHE_TIMEOUT = 3600  # 1 hour for table of contents
 
 # Job preferences cache settings
 JOB_PREFERENCES_CACHE_TIMEOUT = 300  # 5 minutes for filtered job results
+# How long the job search trusts its last look at the full-text index (seconds)
+JOB_SEARCH_INDEX_CHECK_SECONDS = config('JOB_SEARCH_INDEX_CHECK_SECONDS', default=300, cast=int)
 
 # Global AI sort settings
 AI_GLOBAL_SORT_BATCH_SIZE = config('AI_GLOBAL_SORT_BATCH_SIZE', default=10, cast=int)
+AI_GLOBAL_PROMPT_BATCH_SIZE = config('AI_GLOBAL_PROMPT_BATCH_SIZE', default=10, cast=int)  # jobs per Gemini request
 AI_GLOBAL_ASYNC_CHUNK_SIZE = config('AI_GLOBAL_ASYNC_CHUNK_SIZE', default=50, cast=int)
 AI_GLOBAL_ASYNC_MAX_RETRIES = config('AI_GLOBAL_ASYNC_MAX_RETRIES', default=2, cast=int)
 AI_GLOBAL_ASYNC_BACKOFF_SECONDS = config('AI_GLOBAL_ASYNC_BACKOFF_SECONDS', default=0.5, cast=float)
 AI_GLOBAL_PENDING_TIMEOUT_MINUTES = config('AI_GLOBAL_PENDING_TIMEOUT_MINUTES', default=5, cast=int)
 AI_GLOBAL_SCORE_RETENTION_DAYS = config('AI_GLOBAL_SCORE_RETENTION_DAYS', default=30, cast=int)
 
+# Single-flight lease for AI match scoring: one caller computes a score,
+# concurrent callers wait up to AI_MATCH_WAIT_SECONDS for its result.
+AI_MATCH_LEASE_SECONDS = config('AI_MATCH_LEASE_SECONDS', default=60, cast=int)
+AI_MATCH_WAIT_SECONDS = config('AI_MATCH_WAIT_SECONDS', default=5, cast=float)
+
+# Async job scraper: every request to a host draws from a shared token
+# bucket (SCRAPER_HOST_RATE requests/second, bursts of SCRAPER_HOST_BURST),
+# and a whole scrape run is bounded by SCRAPER_DEADLINE_SECONDS.
+SCRAPER_HOST_RATE = config('SCRAPER_HOST_RATE', default=0.5, cast=float)
+SCRAPER_HOST_BURST = config('SCRAPER_HOST_BURST', default=2, cast=int)
+SCRAPER_DEADLINE_SECONDS = config('SCRAPER_DEADLINE_SECONDS', default=60, cast=float)
+SCRAPER_REQUEST_TIMEOUT = config('SCRAPER_REQUEST_TIMEOUT', default=15, cast=float)
+SCRAPER_MAX_RETRIES = config('SCRAPER_MAX_RETRIES', default=3, cast=int)
+SCRAPER_RETRY_BACKOFF_SECONDS = config('SCRAPER_RETRY_BACKOFF_SECONDS', default=0.5, cast=float)
+SCRAPER_MAX_CONNECTIONS = config('SCRAPER_MAX_CONNECTIONS', default=20, cast=int)
+SCRAPER_PAGES_PER_SITE = config('SCRAPER_PAGES_PER_SITE', default=1, cast=int)
+
+# Scheduled scrape campaigns: at most SCRAPER_CAMPAIGN_CONCURRENCY campaign
+# runs are queued or running at once; runs older than
+# SCRAPER_CAMPAIGN_RUN_TIMEOUT_MINUTES are treated as abandoned. A source
+# failing SCRAPER_SOURCE_FAILURE_THRESHOLD times in a row is skipped for
+# SCRAPER_SOURCE_BACKOFF_MINUTES, doubling up to SCRAPER_SOURCE_MAX_BACKOFF_MINUTES.
+SCRAPER_CAMPAIGN_CONCURRENCY = config('SCRAPER_CAMPAIGN_CONCURRENCY', default=2, cast=int)
+SCRAPER_CAMPAIGN_RUN_TIMEOUT_MINUTES = config('SCRAPER_CAMPAIGN_RUN_TIMEOUT_MINUTES', default=30, cast=int)
+SCRAPER_SOURCE_FAILURE_THRESHOLD = config('SCRAPER_SOURCE_FAILURE_THRESHOLD', default=3, cast=int)
+SCRAPER_SOURCE_BACKOFF_MINUTES = config('SCRAPER_SOURCE_BACKOFF_MINUTES', default=30, cast=int)
+SCRAPER_SOURCE_MAX_BACKOFF_MINUTES = config('SCRAPER_SOURCE_MAX_BACKOFF_MINUTES', default=1440, cast=int)
+
+# Background exports: artifacts are written under MEDIA_ROOT/EXPORT_JOB_DIR
+# and kept (and reused for identical requests) for EXPORT_JOB_TTL_MINUTES.
+# Jobs still queued or running after EXPORT_JOB_TIMEOUT_SECONDS count as lost.
+EXPORT_JOB_DIR = config('EXPORT_JOB_DIR', default='exports')
+EXPORT_JOB_TTL_MINUTES = config('EXPORT_JOB_TTL_MINUTES', default=60, cast=int)
+EXPORT_JOB_TIMEOUT_SECONDS = config('EXPORT_JOB_TIMEOUT_SECONDS', default=1800, cast=int)
+
+# Alumni CSV imports are staged when uploaded and applied by a worker,
+# ALUMNI_IMPORT_CHUNK_SIZE rows per transaction, within ALUMNI_IMPORT_TIMEOUT_SECONDS.
+ALUMNI_IMPORT_CHUNK_SIZE = config('ALUMNI_IMPORT_CHUNK_SIZE', default=500, cast=int)
+ALUMNI_IMPORT_TIMEOUT_SECONDS = config('ALUMNI_IMPORT_TIMEOUT_SECONDS', default=1800, cast=int)
+
+# Notifications sent to many users at once (e.g. an event's notified groups)
+# are created by a worker, NOTIFICATION_FANOUT_CHUNK_SIZE rows per INSERT.
+NOTIFICATION_FANOUT_CHUNK_SIZE = config('NOTIFICATION_FANOUT_CHUNK_SIZE', default=1000, cast=int)
+
+# Tracer-study filled-form ZIP exports render on TRACER_PDF_WORKERS local
+# Chromium processes and keep each PDF under TRACER_PDF_CACHE_DIR until the
+# response it was rendered from changes.
+TRACER_PDF_WORKERS = config('TRACER_PDF_WORKERS', default=3, cast=int)
+TRACER_PDF_CACHE_DIR = config('TRACER_PDF_CACHE_DIR', default=os.path.join(BASE_DIR, 'tmp', 'tracer-pdf-cache'))
+
+# Audit log: model changes are recorded in AuditLog except for the apps or
+# app_label.model_name entries in AUDIT_LOG_EXCLUDE. AUDIT_LOG_SAMPLE_RATES
+# ("app=0.1,app.model=0.5") records only that fraction of their creates and
+# updates. Records are written AUDIT_LOG_BATCH_SIZE at a time when the request
+# ends, by a background thread when AUDIT_LOG_WORKER is on. Values of rows
+# being deleted are held for at most AUDIT_LOG_ORIGINAL_VALUES_LIMIT rows.
+AUDIT_LOG_EXCLUDE = config(
+    'AUDIT_LOG_EXCLUDE', default='contenttypes,sessions,admin,auth,authtoken,migrations', cast=Csv()
+)
+AUDIT_LOG_SAMPLE_RATES = {
+    label.strip(): float(rate)
+    for label, _, rate in (item.partition('=') for item in config('AUDIT_LOG_SAMPLE_RATES', default='', cast=Csv()))
+}
+AUDIT_LOG_BATCH_SIZE = config('AUDIT_LOG_BATCH_SIZE', default=500, cast=int)
+AUDIT_LOG_WORKER = config('AUDIT_LOG_WORKER', default=False, cast=bool)
+AUDIT_LOG_ORIGINAL_VALUES_LIMIT = config('AUDIT_LOG_ORIGINAL_VALUES_LIMIT', default=10000, cast=int)
+
 # Cache middleware settings
 CACHE_MIDDLEWARE_ALIAS = 'default'
 CACHE_MIDDLEWARE_SECONDS = 300
@@ -1,11 +1,11 @@
 import logging
 
 from django.contrib.contenttypes.models import ContentType
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.urls import reverse
 from core.models.notifications import Notification
-from .models import Survey
+from .models import Survey, SurveyResponse
 from .tracer_metadata import ALUMNI_TITLE, extract_cycle_label
 
 logger = logging.getLogger(__name__)
@@ -67,3 +67,10 @@ def notify_alumni_tracer_survey_active(sender, instance, **kwargs):
         logger.exception(
             f"Failed to create notifications for survey {instance.pk}: {exc}"
         )
+
+
+@receiver(post_delete, sender=SurveyResponse)
+def discard_cached_tracer_pdf(sender, instance, **kwargs):
+    from .tracer_study import _tracer_pdf_cache_discard
+
+    _tracer_pdf_cache_discard(instance)
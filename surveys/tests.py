@@ -1,6 +1,7 @@
 import json
 import zipfile
 import base64
+import shutil
 import tempfile
 from datetime import date, timedelta
 from io import BytesIO
@@ -10,8 +11,10 @@ from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
 from django.conf import settings
+from django.db import connection
 from django.core.management import call_command
 from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.template.loader import render_to_string
 from django.urls import reverse
 from django.utils import timezone
@@ -502,19 +505,132 @@ class TracerStudyReportResponseStatusTests(TestCase):
             def quit(self):
                 pass
 
-        with patch("surveys.tracer_study._tracer_browser_driver", return_value=Driver()):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        with patch("surveys.tracer_study._tracer_browser_driver", return_value=Driver()), \
+                patch("surveys.tracer_study._tracer_chrome_binary", return_value=""), \
+                patch("core.export_jobs.enqueue_export_job", return_value=False), \
+                override_settings(MEDIA_ROOT=media_root, TRACER_PDF_CACHE_DIR=media_root):
             export = self.client.get(
                 reverse("surveys:tracer_study_report_export", args=[self.survey.id]),
                 {"format": "zip"},
+                follow=True,
             )
+            content = b"".join(export.streaming_content)
 
+        # The archive is rendered by an export job and served from its download link
+        self.assertEqual(export.redirect_chain[0][1], 302)
         self.assertEqual(export["Content-Type"], "application/zip")
-        with zipfile.ZipFile(BytesIO(export.content)) as archive:
+        with zipfile.ZipFile(BytesIO(content)) as archive:
             names = archive.namelist()
             expected = "NORSU MAIN/CAS/BSINT/TracerStudy_Responded_Rina_CAS.pdf"
             self.assertIn(expected, names)
             self.assertTrue(archive.read(expected).startswith(b"%PDF"))
 
+    def _export_zip(self):
+        self.client.force_login(self.admin)
+        with patch("surveys.tracer_study.is_export_job", return_value=True):
+            export = self.client.get(
+                reverse("surveys:tracer_study_report_export", args=[self.survey.id]),
+                {"format": "zip"},
+            )
+            content = b"".join(export.streaming_content)
+        return zipfile.ZipFile(BytesIO(content))
+
+    def test_filled_forms_zip_reuses_cached_pdfs(self):
+        printed = []
+
+        class Driver:
+            def get(self, url):
+                pass
+
+            def execute_cdp_cmd(self, name, params):
+                if name == "Page.printToPDF":
+                    printed.append(name)
+                    return {"data": base64.b64encode(b"%PDF-1.4 cached").decode("ascii")}
+                return {}
+
+            def quit(self):
+                pass
+
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir, ignore_errors=True)
+        with patch("surveys.tracer_study._tracer_browser_driver", return_value=Driver()), \
+                patch("surveys.tracer_study._tracer_chrome_binary", return_value=""), \
+                override_settings(TRACER_PDF_CACHE_DIR=cache_dir):
+            first = self._export_zip()
+            second = self._export_zip()
+
+            self.assertEqual(printed, ["Page.printToPDF"])
+            self.assertEqual(first.namelist(), second.namelist())
+            self.assertEqual(second.read(second.namelist()[0]), b"%PDF-1.4 cached")
+
+            # Editing what the form shows renders it again, replacing the old PDF
+            self.response.alumni.user.first_name = "Rinah"
+            self.response.alumni.user.save()
+            self._export_zip()
+            self.assertEqual(printed, ["Page.printToPDF"] * 2)
+
+            # Deleting the response drops its cached form
+            self.assertEqual(len(list(Path(cache_dir).rglob("*.pdf"))), 1)
+            self.response.delete()
+            self.assertEqual(list(Path(cache_dir).rglob("*.pdf")), [])
+
+    def test_filled_forms_zip_renders_on_a_bounded_browser_pool(self):
+        for index in range(5):
+            user = get_user_model().objects.create_user(
+                f"pool{index}", f"pool{index}@example.com", "pass",
+                first_name=f"Pool{index}", last_name="Responded",
+            )
+            alumni = Alumni.objects.create(
+                user=user,
+                college="CAS",
+                campus="MAIN",
+                graduation_year=2025,
+                course="BSINT",
+                gender="F",
+                province="Negros Oriental",
+                city="Dumaguete",
+                address="A",
+            )
+            SurveyResponse.objects.create(survey=self.survey, alumni=alumni)
+
+        started = []
+
+        class Browser:
+            def __init__(self, chrome_binary):
+                started.append(self)
+                self.closed = False
+
+            def start(self):
+                return self
+
+            def print_pdf(self, html):
+                return b"%PDF-1.4 pooled"
+
+            def close(self):
+                self.closed = True
+
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir, ignore_errors=True)
+        with patch("surveys.tracer_study._TracerChromeBrowser", Browser), \
+                patch("surveys.tracer_study._tracer_chrome_binary", return_value="/usr/bin/chromium"), \
+                override_settings(TRACER_PDF_CACHE_DIR=cache_dir, TRACER_PDF_WORKERS=2), \
+                CaptureQueriesContext(connection) as queries:
+            archive = self._export_zip()
+
+        # Answers are prefetched per chunk of responses, not loaded per form
+        answer_table = ResponseAnswer._meta.db_table
+        self.assertEqual(
+            len([query for query in queries if f'FROM "{answer_table}"' in query["sql"]]), 1
+        )
+        names = archive.namelist()
+        self.assertEqual(len(names), 6)
+        self.assertEqual({archive.read(name) for name in names}, {b"%PDF-1.4 pooled"})
+        self.assertEqual(len(list(Path(cache_dir).rglob("*.pdf"))), 6)
+        self.assertTrue(1 <= len(started) <= 2)
+        self.assertTrue(all(browser.closed for browser in started))
+
 
 class TracerStudyToggleVisibilityTests(TestCase):
     def setUp(self):
@@ -12,19 +12,23 @@ URLs:
                                 thereafter)
 * ``/tracer-study/public/``  - Public index of discoverable tracer studies
 """
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime as _datetime, timedelta
-from io import BytesIO
 from pathlib import Path
 import asyncio
 import base64
 import csv
+import hashlib
 import json
 import logging
 import os
+import queue
 import re
 import shutil
 import subprocess
 import tempfile
+import threading
 import time
 import urllib.request
 import zipfile
@@ -34,7 +38,7 @@ from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.db import transaction
 from django.db.models import Count, Q
-from django.http import Http404, HttpResponse, HttpResponseRedirect
+from django.http import Http404, HttpResponse, HttpResponseRedirect, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.template.loader import render_to_string
 from django.urls import reverse
@@ -44,6 +48,8 @@ from django.utils.decorators import method_decorator
 from django.views.decorators.http import require_http_methods
 from django.views.generic import View
 
+from core.export_jobs import export_job_response, is_export_job, report_export_progress, start_export_job
+
 from alumni_directory.models import Alumni
 from core.rate_limiters import (
     PUBLIC_FORM_HONEYPOT_FIELD,
@@ -444,7 +450,13 @@ def _answer_key(question):
 
 def _filled_alumni_answers(response):
     by_key = {}
-    for answer in response.answers.select_related("question", "selected_option"):
+    answers = response.answers
+    if "answers" in getattr(response, "_prefetched_objects_cache", {}):
+        # Exports prefetch answers__question / answers__selected_option
+        answers = answers.all()
+    else:
+        answers = answers.select_related("question", "selected_option")
+    for answer in answers:
         key = _answer_key(answer.question)
         item = by_key.setdefault(key, {"text": "", "rating": "", "selected": set(), "other": ""})
         if answer.text_answer:
@@ -807,12 +819,13 @@ def _tracer_chrome_base_args(chrome_binary, headless_arg, user_data_dir):
     ]
 
 
-async def _tracer_chrome_cdp_print_pdf(websocket_url):
+async def _tracer_chrome_cdp_print_pdf(websocket_url, page_url=None):
     import websockets
 
     next_id = 0
 
-    async with websockets.connect(websocket_url) as websocket:
+    # printToPDF answers with the whole document base64-encoded in one message
+    async with websockets.connect(websocket_url, max_size=None) as websocket:
         async def command(method, params=None):
             nonlocal next_id
             next_id += 1
@@ -827,6 +840,10 @@ async def _tracer_chrome_cdp_print_pdf(websocket_url):
                 return message.get("result", {})
 
         await command("Page.enable")
+        if page_url:
+            navigation = await command("Page.navigate", {"url": page_url})
+            if navigation.get("errorText"):
+                raise RuntimeError(navigation["errorText"])
         for _ in range(50):
             result = await command("Runtime.evaluate", {"expression": "document.readyState", "returnByValue": True})
             if result.get("result", {}).get("value") == "complete":
@@ -952,10 +969,204 @@ def _tracer_response_chrome_cli_pdf_bytes(response):
         raise RuntimeError(last_error or "Chrome/Chromium PDF export failed")
 
 
+# Bump when the filled-form template changes so cached PDFs are re-rendered.
+TRACER_PDF_CACHE_VERSION = 1
+# Seconds one page may take to load and print before its browser is discarded
+TRACER_PDF_RENDER_TIMEOUT = 90
+
+
+def _tracer_pdf_cache_dir(survey_id):
+    root = getattr(settings, "TRACER_PDF_CACHE_DIR", Path(settings.BASE_DIR) / "tmp" / "tracer-pdf-cache")
+    return Path(root) / f"v{TRACER_PDF_CACHE_VERSION}" / str(survey_id)
+
+
+def _tracer_pdf_cache_path(response, html):
+    """
+    Where the PDF of ``response`` rendered from ``html`` is kept. The key is
+    a digest of the page itself, so edits to the alumni record, the user's
+    name or the answers all lead to a new render.
+    """
+    digest = hashlib.sha256(html.encode("utf-8")).hexdigest()[:32]
+    return _tracer_pdf_cache_dir(response.survey_id) / f"{response.pk}-{digest}.pdf"
+
+
+def _tracer_pdf_cache_store(cache_path, pdf):
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=cache_path.parent, suffix=".part", delete=False) as partial:
+        partial.write(pdf)
+    os.replace(partial.name, cache_path)
+    # Earlier renders of the same response are stale now
+    response_id = cache_path.name.split("-", 1)[0]
+    for path in cache_path.parent.glob(f"{response_id}-*.pdf"):
+        if path != cache_path:
+            try:
+                path.unlink()
+            except OSError as exc:
+                logger.warning("Could not remove cached tracer PDF %s: %s", path, exc)
+    return cache_path
+
+
+def _tracer_pdf_cache_discard(response):
+    for path in _tracer_pdf_cache_dir(response.survey_id).glob(f"{response.pk}-*.pdf"):
+        try:
+            path.unlink()
+        except OSError as exc:
+            logger.warning("Could not remove cached tracer PDF %s: %s", path, exc)
+
+
+class _TracerChromeBrowser:
+    """A long-lived headless Chromium that prints pages over the DevTools protocol."""
+
+    def __init__(self, chrome_binary):
+        self.chrome_binary = chrome_binary
+        self.process = None
+        self.work_path = None
+        self.websocket_url = None
+
+    def start(self):
+        self.work_path = Path(tempfile.mkdtemp(dir=_tracer_chrome_work_root()))
+        user_data_dir = self.work_path / "chrome-profile"
+        runtime_dir = self.work_path / "xdg-runtime"
+        runtime_dir.mkdir(mode=0o700)
+        port_file = user_data_dir / "DevToolsActivePort"
+
+        for headless_arg in ("--headless=new", "--headless"):
+            self.process = subprocess.Popen(
+                _tracer_chrome_base_args(self.chrome_binary, headless_arg, user_data_dir)
+                + ["--remote-debugging-port=0", "about:blank"],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                env=_tracer_chrome_pdf_env(self.work_path, runtime_dir),
+            )
+            for _ in range(100):
+                if self.process.poll() is not None:
+                    break
+                port = port_file.read_text(encoding="utf-8").strip() if port_file.exists() else ""
+                if port:
+                    self.websocket_url = self._page_websocket_url(port.splitlines()[0].strip())
+                    if self.websocket_url:
+                        return self
+                time.sleep(0.1)
+            self._stop_process()
+
+        self.close()
+        raise RuntimeError("Chrome DevTools page target was not available")
+
+    @staticmethod
+    def _page_websocket_url(port):
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/json/list", timeout=10) as response_file:
+            targets = json.loads(response_file.read().decode("utf-8"))
+        page = next((target for target in targets if target.get("type") == "page"), None)
+        return page.get("webSocketDebuggerUrl") if page else None
+
+    def print_pdf(self, html):
+        html_path = self.work_path / f"{time.monotonic_ns()}.html"
+        html_path.write_text(html, encoding="utf-8")
+        try:
+            pdf = asyncio.run(
+                asyncio.wait_for(
+                    _tracer_chrome_cdp_print_pdf(self.websocket_url, page_url=html_path.resolve().as_uri()),
+                    timeout=TRACER_PDF_RENDER_TIMEOUT,
+                )
+            )
+        finally:
+            html_path.unlink(missing_ok=True)
+        if b"%PDF" not in pdf[:1024]:
+            raise RuntimeError("Chrome DevTools PDF output was not a PDF")
+        return pdf
+
+    def _stop_process(self):
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        self.process = None
+
+    def close(self):
+        self._stop_process()
+        if self.work_path:
+            shutil.rmtree(self.work_path, ignore_errors=True)
+            self.work_path = None
+
+
+class _TracerPdfPool:
+    """
+    Render filled forms on up to ``workers`` Chromium processes at once.
+
+    Each thread borrows an idle browser (starting one when none is free) and
+    gives it back after printing, so no more than ``workers`` browsers run.
+    Chromium does the rendering in its own processes, which is why threads
+    are enough here; django-q workers are daemonic and could not fork a
+    multiprocessing pool anyway.
+    """
+
+    def __init__(self, chrome_binary, workers):
+        self.chrome_binary = chrome_binary
+        self.workers = max(1, workers)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="tracer-pdf")
+        self._idle = queue.SimpleQueue()
+        self._browsers = []
+        self._lock = threading.Lock()
+
+    def submit(self, html, cache_path):
+        """Print ``html`` into ``cache_path`` in the background; returns a Future."""
+        return self._executor.submit(self._render, html, cache_path)
+
+    def _render(self, html, cache_path):
+        try:
+            browser = self._idle.get_nowait()
+        except queue.Empty:
+            browser = _TracerChromeBrowser(self.chrome_binary).start()
+            with self._lock:
+                self._browsers.append(browser)
+        try:
+            pdf = browser.print_pdf(html)
+        except Exception:
+            # A browser that failed once may be wedged; the next render starts a fresh one
+            browser.close()
+            raise
+        self._idle.put(browser)
+        return _tracer_pdf_cache_store(cache_path, pdf)
+
+    def close(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        with self._lock:
+            for browser in self._browsers:
+                browser.close()
+            self._browsers.clear()
+
+
+class _ZipStream:
+    """Write-only file for ``zipfile`` whose contents are drained as they are written."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
 def _tracer_study_forms_zip_response(
     survey, start_date=None, end_date=None, campus=None, college=None,
-    program=None, year_from=None, year_to=None,
+    program=None, year_from=None, year_to=None, progress=None,
 ):
+    """
+    Stream a ZIP of every filled form, one PDF per response. PDFs come from
+    the on-disk cache when the same page was rendered before; the rest are
+    printed by a pool of local Chromium processes (or, without one, by the
+    Selenium driver) a few responses ahead of the entry being written.
+    """
     responses = _filtered_alumni_responses(
         survey,
         start_date=start_date,
@@ -965,18 +1176,18 @@ def _tracer_study_forms_zip_response(
         program=program,
         year_from=year_from,
         year_to=year_to,
-    ).order_by(
+    ).select_related("survey").order_by(
         "alumni__campus", "alumni__college", "alumni__course",
         "alumni__user__last_name", "alumni__user__first_name",
     )
-    buffer = BytesIO()
-    used_paths = set()
+
+    chrome_binary = _tracer_chrome_binary()
     driver = None
-    try:
-        driver = _tracer_browser_driver()
-    except Exception as exc:
-        logger.warning("Tracer filled-form PDF Selenium renderer unavailable; using Chrome CLI renderer: %s", exc)
-        if not _tracer_chrome_binary():
+    if not chrome_binary:
+        try:
+            driver = _tracer_browser_driver()
+        except Exception as exc:
+            logger.warning("Tracer filled-form PDF Selenium renderer unavailable: %s", exc)
             return HttpResponse(
                 "Exact tracer filled-form ZIP export requires Chrome/Chromium or SELENIUM_REMOTE_URL on the server. "
                 "Install Chromium, set CHROME_BIN, or set SELENIUM_REMOTE_URL.",
@@ -984,35 +1195,79 @@ def _tracer_study_forms_zip_response(
                 content_type="text/plain",
             )
 
-    try:
-        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
-            for response in responses:
-                alumni = response.alumni
-                campus = _safe_export_name(_tracer_campus_folder(alumni), "UNKNOWN CAMPUS")
-                college = _safe_export_name(alumni.college, "UNKNOWN COLLEGE")
-                program = _safe_export_name(alumni.course, "UNKNOWN PROGRAM")
-                filename = _tracer_response_pdf_filename(response)
-                path = f"{campus}/{college}/{program}/{filename}"
-                base, ext = path[:-4], ".pdf"
-                counter = 2
-                while path.lower() in used_paths:
-                    path = f"{base}_{counter}{ext}"
-                    counter += 1
-                used_paths.add(path.lower())
-                pdf = (
-                    _tracer_response_template_pdf_bytes(response, driver)
-                    if driver
-                    else _tracer_response_chrome_cli_pdf_bytes(response)
-                )
-                zip_file.writestr(path, pdf)
-
-            if not used_paths:
-                zip_file.writestr("README.txt", "No tracer study responses found.")
-    finally:
-        if driver:
-            driver.quit()
+    workers = getattr(settings, "TRACER_PDF_WORKERS", 3)
+    total = responses.count()
 
-    response = HttpResponse(buffer.getvalue(), content_type="application/zip")
+    def render(response, cache_path, future):
+        if future is not None:
+            try:
+                return future.result()
+            except Exception as exc:
+                logger.warning("Tracer filled-form PDF pool render failed; using Chrome CLI renderer: %s", exc)
+                return _tracer_pdf_cache_store(cache_path, _tracer_response_chrome_cli_pdf_bytes(response))
+        if not cache_path.exists():
+            _tracer_pdf_cache_store(cache_path, _tracer_response_template_pdf_bytes(response, driver))
+        return cache_path
+
+    def stream():
+        pool = _TracerPdfPool(chrome_binary, workers) if chrome_binary else None
+        # Renders queued ahead of the entry being written, in archive order
+        window = 2 * workers if pool else 1
+        pending = deque()
+        used_paths = set()
+        output = _ZipStream()
+        done = 0
+        try:
+            with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as zip_file:
+                if progress:
+                    progress(0, total)
+                for response in responses.iterator(chunk_size=200):
+                    alumni = response.alumni
+                    campus = _safe_export_name(_tracer_campus_folder(alumni), "UNKNOWN CAMPUS")
+                    college = _safe_export_name(alumni.college, "UNKNOWN COLLEGE")
+                    program = _safe_export_name(alumni.course, "UNKNOWN PROGRAM")
+                    filename = _tracer_response_pdf_filename(response)
+                    path = f"{campus}/{college}/{program}/{filename}"
+                    base, ext = path[:-4], ".pdf"
+                    counter = 2
+                    while path.lower() in used_paths:
+                        path = f"{base}_{counter}{ext}"
+                        counter += 1
+                    used_paths.add(path.lower())
+
+                    html = _tracer_response_filled_form_html(response)
+                    cache_path = _tracer_pdf_cache_path(response, html)
+                    future = None
+                    if pool and not cache_path.exists():
+                        future = pool.submit(html, cache_path)
+                    pending.append((path, response, cache_path, future))
+
+                    while len(pending) >= window:
+                        path, response, cache_path, future = pending.popleft()
+                        zip_file.write(render(response, cache_path, future), arcname=path)
+                        done += 1
+                        if progress:
+                            progress(done, total)
+                        yield output.drain()
+
+                while pending:
+                    path, response, cache_path, future = pending.popleft()
+                    zip_file.write(render(response, cache_path, future), arcname=path)
+                    done += 1
+                    if progress:
+                        progress(done, total)
+                    yield output.drain()
+
+                if not used_paths:
+                    zip_file.writestr("README.txt", "No tracer study responses found.")
+            yield output.drain()
+        finally:
+            if pool:
+                pool.close()
+            if driver:
+                driver.quit()
+
+    response = StreamingHttpResponse(stream(), content_type="application/zip")
     response["Content-Disposition"] = 'attachment; filename="tracer-study-filled-forms.zip"'
     return response
 
@@ -2161,10 +2416,18 @@ def tracer_study_report_export(request, survey_id, format_type=None):
         report_type = "full"
 
     if format_type == "zip":
+        # One rendered PDF per response: too slow for the request cycle
+        if not is_export_job(request):
+            job = start_export_job(
+                request, "surveys.tracer_study.tracer_study_report_export", survey.id, format_type,
+                label=f"{survey.title}: filled forms (ZIP)",
+            )
+            return export_job_response(request, job)
         return _tracer_study_forms_zip_response(
             survey, start_date=start_date, end_date=end_date,
             campus=campus, college=college, program=program,
             year_from=year_from, year_to=year_to,
+            progress=lambda done, total: report_export_progress(request, done, total),
         )
 
     rows = _filtered_alumni_response_rows(
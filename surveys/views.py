@@ -1979,8 +1979,16 @@ def survey_export_responses(request, pk):
     from openpyxl.utils import get_column_letter
     from django.utils.text import slugify
     from core.export_utils import LogoHeaderService
+    from core.export_jobs import export_job_response, is_export_job, report_export_progress, start_export_job
     
     survey = get_object_or_404(Survey, pk=pk)
+    if not is_export_job(request):
+        # Every response times every question: render it in a worker
+        job = start_export_job(
+            request, 'surveys.views.survey_export_responses', survey.pk,
+            label=f"{survey.title}: responses (Excel)",
+        )
+        return export_job_response(request, job)
     
     # Create workbook
     wb = Workbook()
@@ -2025,7 +2033,9 @@ def survey_export_responses(request, pk):
     
     # Write data rows
     current_row = start_row + 1
+    report_export_progress(request, 0, responses.count())
     for response in responses:
+        report_export_progress(request, current_row - start_row - 1)
         # Basic response info
         ws.cell(row=current_row, column=1, value=response.id)
         ws.cell(row=current_row, column=2, value=f"{response.alumni.user.first_name} {response.alumni.user.last_name}")